@@ -18,6 +18,9 @@ from utils.logger import get_logger
 from utils.i18n import I18n
 from ui.themes import ThemeManager
 from core.capacity import CapacityTester
+from core.fill import FillTester
+from core.benchmark import BenchmarkEngine
+from core.jobs import JobManager
 
 class FlashTestProApp:
     """Основной класс приложения"""
@@ -72,6 +75,9 @@ class FlashTestProApp:
         self.disk_formatter = DiskFormatter(self)
         self.data_wiper = DataWiper(self)
         self.capacity_tester = CapacityTester(self)
+        self.fill_tester = FillTester(self)
+        self.benchmark = BenchmarkEngine(self)
+        self.job_manager = JobManager(self)
 
         # Создание главного окна интерфейса
         self.main_window = MainWindow(self)
@@ -185,6 +191,23 @@ class FlashTestProApp:
             ):
                 self.disk_tester.stop()
                 self.root.quit()
+        elif self.fill_tester.is_running():
+            # Файлы заполнения удаляются потоком после остановки
+            self.fill_tester.stop()
+            self.fill_tester.test_thread.join(timeout=10)
+            self.root.quit()
+        elif self.benchmark.is_running():
+            # Временный файл бенчмарка удаляется потоком после остановки
+            self.benchmark.stop()
+            self.benchmark.test_thread.join(timeout=10)
+            self.root.quit()
+        elif self.job_manager.is_active():
+            if messagebox.askyesno(
+                self.i18n.get("confirm_exit_title", "Подтверждение"),
+                self.i18n.get("confirm_exit_jobs", "Выполняются задания на дисках. Остановить их и выйти?")
+            ):
+                self.job_manager.stop()
+                self.root.quit()
         else:
             self.root.quit()
 
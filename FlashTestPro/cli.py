@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+FlashTest Pro - запуск без графического интерфейса.
+Тестирование, затирание, проверка ёмкости, заполнение свободного места и
+форматирование выполняются теми же движками, что и в приложении, но без
+tkinter и matplotlib. События движков выводятся в stdout построчно в формате
+JSON, журнал приложения — в stderr, а код завершения отражает результат.
+Несколько дисков обрабатываются одновременно, каждый своим экземпляром движка:
+
+    python -m FlashTestPro.cli test /media/card --mode full --passes 2 --yes
+    python -m FlashTestPro.cli capacity /media/sd1 /media/sd2 /media/sd3 --yes
+    python -m FlashTestPro.cli list
+"""
+import argparse
+import json
+import math
+import os
+import signal
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, TextIO
+
+# Добавляем путь к модулям проекта
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Коды завершения
+EXIT_OK = 0
+EXIT_ERROR = 1          # ошибка запуска или выполнения
+EXIT_USAGE = 2          # неверные аргументы или нет подтверждения (как у argparse)
+EXIT_DEFECTS = 3        # операция завершена, найдены дефекты или подделка
+EXIT_INTERRUPTED = 130  # прервано пользователем (Ctrl+C, SIGTERM)
+
+# Код завершения по итогу задания
+EXIT_CODES = {'passed': EXIT_OK, 'defects': EXIT_DEFECTS, 'failed': EXIT_ERROR, 'stopped': EXIT_INTERRUPTED}
+
+# Период опроса заданий, секунды
+POLL_INTERVAL = 0.1
+# Период сводки по заданиям при работе с несколькими дисками, секунды
+AGGREGATE_INTERVAL = 1.0
+
+WIPE_METHODS = ('simple', 'dod', 'gutmann', 'random')
+FILESYSTEMS = ('FAT32', 'exFAT', 'NTFS', 'EXT4')
+TEST_PATTERNS = ('ones', 'zeros', 'random')
+SYNC_POLICIES = ('chunk', 'interval', 'pass', 'direct')
+SYNC_POLICY_HELP = ("сброс на носитель: chunk — после каждого блока, interval — каждые sync_interval_mb, "
+                    "pass — в конце прохода, direct — только прямой ввод-вывод (по умолчанию из конфигурации)")
+
+
+class HeadlessApp:
+    """Минимальная замена FlashTestProApp для движков: конфигурация и менеджер дисков"""
+
+    def __init__(self, config_path: str = "config.json"):
+        from utils.config import ConfigManager
+        from core.drive_manager import DriveManager
+
+        self.config_manager = ConfigManager(config_path)
+        self.config = self.config_manager.load_config()
+        self.drive_manager = DriveManager()
+
+
+def _jsonable(value):
+    """Приведение статистики к JSON: бесконечности и NaN — null, множества и кортежи — списки"""
+    if isinstance(value, dict):
+        return {str(key): _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [_jsonable(item) for item in value]
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if value is None or isinstance(value, (str, int)):
+        return value
+    return str(value)
+
+
+class EventWriter:
+    """Вывод событий построчно в формате JSON (JSON Lines)"""
+
+    def __init__(self, job: str, stream: Optional[TextIO] = None):
+        self.job = job
+        self.stream = stream or sys.stdout
+
+    def emit(self, event: str, **fields):
+        record = {'event': event, 'job': self.job, 'time': round(time.time(), 3)}
+        record.update(fields)
+        self.stream.write(json.dumps(_jsonable(record), ensure_ascii=False) + "\n")
+        self.stream.flush()
+
+
+def message_fields(msg: tuple) -> Dict:
+    """Поля события по сообщению движка (тип, аргументы)"""
+    msg_type, args = msg[0], msg[1:]
+    if msg_type == 'log':
+        return {'message': args[0], 'level': args[1] if len(args) > 1 else 'info'}
+    if msg_type == 'progress':
+        return {'percent': round(float(args[0]), 2)}
+    if msg_type in ('complete', 'error'):
+        return {'message': args[0]}
+    if msg_type == 'result':
+        return {'result': args[0]}
+    if msg_type == 'benchmark_step':
+        return {'step': args[0]}
+    if msg_type == 'speed':
+        return {'speed': args[0], 'elapsed': args[1], 'phase': args[2] if len(args) > 2 else None}
+    if msg_type == 'pass':
+        return {'pass': args[0], 'total': args[1]}
+    if msg_type == 'bad_sector':
+        return {'location': args[0], 'error': args[1], 'count': args[2] if len(args) > 2 else 1}
+    if msg_type == 'unmount_notice':
+        return {'drive': args[0]}
+    return {'args': list(args)}
+
+
+def run_jobs(manager, events: EventWriter, aggregate_interval: float = 0.0) -> bool:
+    """
+    Опрос менеджера заданий до их завершения; первое прерывание останавливает задания
+    штатно (журналы сохраняются, временные файлы удаляются), повторное — завершает сразу.
+    Возвращает True, если выполнение было прервано.
+    """
+    interrupted = False
+    last_aggregate = time.time()
+    while True:
+        try:
+            while True:
+                manager.poll()
+                if not manager.is_active():
+                    return interrupted
+                if aggregate_interval and time.time() - last_aggregate >= aggregate_interval:
+                    last_aggregate = time.time()
+                    events.emit('aggregate', **manager.aggregate())
+                time.sleep(POLL_INTERVAL)
+        except KeyboardInterrupt:
+            if interrupted:
+                raise
+            interrupted = True
+            events.emit('interrupted', message="Остановка по запросу пользователя")
+            manager.stop()
+
+
+def _raise_interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def _needs_confirmation(args) -> bool:
+    """Операции, уничтожающие данные на диске"""
+    if args.command == 'test':
+        return args.mode == 'full' and not args.resume
+    if args.command == 'benchmark':
+        return args.mode == 'full'
+    return args.command in ('wipe', 'capacity', 'format')
+
+
+def _needs_admin(args) -> bool:
+    """Операции с прямым доступом к устройству"""
+    if args.command == 'test':
+        # Режим продолжаемого теста берётся из журнала: без прав полный режим не откроет устройство
+        return args.mode == 'full'
+    if args.command == 'benchmark':
+        return args.mode == 'full'
+    return args.command in ('wipe', 'capacity', 'format')
+
+
+def _test_params(args) -> Dict:
+    """Параметры DiskTester в том же виде, что и у вкладки тестирования"""
+    if args.resume:
+        return {'resume': True}
+    patterns = set(args.patterns)
+    params = {
+        'passes': args.passes,
+        'test_ones': 'ones' in patterns,
+        'test_zeros': 'zeros' in patterns,
+        'test_random': 'random' in patterns,
+        'test_verify': not args.no_verify,
+        'auto_format': False,
+        'mode': args.mode,
+        'filesystem': 'FAT32',
+        'chunk_size_mb': args.chunk_mb,
+        'adaptive_chunk': not args.fixed_chunk,
+        'parallel_testing': args.threads > 1,
+        'num_threads': args.threads,
+        'quick_test': args.quick is not None,
+        'two_phase': args.two_phase
+    }
+    if args.quick is not None:
+        params['quick_test_fraction'] = args.quick
+    if args.seed is not None:
+        params['pattern_seed'] = args.seed
+    if args.queue_depth is not None:
+        params['queue_depth'] = args.queue_depth
+    if args.sync_policy is not None:
+        params['sync_policy'] = args.sync_policy
+    return params
+
+
+def job_params(app, args) -> Dict:
+    """Параметры задания по аргументам командной строки"""
+    if args.command == 'test':
+        testing = app.config.get('testing', {})
+        if args.passes is None:
+            args.passes = testing.get('default_passes', 1)
+        if args.two_phase is None:
+            args.two_phase = testing.get('two_phase', False)
+        return _test_params(args)
+    if args.command == 'wipe':
+        return {'method': args.method, 'passes': args.passes, 'verify': not args.no_verify, 'resume': args.resume,
+                'queue_depth': args.queue_depth, 'sync_policy': args.sync_policy}
+    if args.command == 'fill':
+        writers = args.writers or app.config.get('testing', {}).get('fill_writers', 1)
+        return {'writers': writers, 'cleanup': not args.keep}
+    if args.command == 'format':
+        return {'filesystem': args.filesystem, 'quick': not args.full, 'label': args.label}
+    if args.command == 'benchmark':
+        params = {'mode': args.mode, 'size_mb': args.size_mb, 'duration': args.duration}
+        if args.sweep_queue_depth is not None:
+            params['sweep_queue_depth'] = args.sweep_queue_depth
+        if args.compliance or args.claim:
+            params['compliance'] = True
+            params['claim'] = args.claim or []
+        if args.sustained_duration is not None:
+            params['sustained_duration'] = args.sustained_duration
+        return params
+    return {}
+
+
+def _class_list(value: str) -> List[str]:
+    """Список классов скорости SD из аргумента --claim"""
+    from core.compliance import CLASS_NAMES
+
+    classes = [name.strip().upper() for name in value.split(',') if name.strip()]
+    unknown = [name for name in classes if name not in CLASS_NAMES]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"неизвестные классы: {', '.join(unknown)} "
+                                         f"(допустимы: {', '.join(CLASS_NAMES)})")
+    return classes
+
+
+def overall_exit_code(statuses: List[str]) -> int:
+    """Общий код завершения: прерывание важнее ошибки, ошибка важнее дефектов"""
+    codes = [EXIT_CODES.get(status, EXIT_ERROR) for status in statuses]
+    for code in (EXIT_INTERRUPTED, EXIT_ERROR, EXIT_DEFECTS):
+        if code in codes:
+            return code
+    return EXIT_OK
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m FlashTestPro.cli",
+        description="FlashTest Pro без графического интерфейса: события в stdout в формате JSON Lines"
+    )
+    parser.add_argument('--config', default="config.json", help="файл конфигурации")
+    parser.add_argument('--log-dir', default="logs", help="каталог журналов приложения")
+    parser.add_argument('--jobs', type=int, default=None,
+                        help="сколько дисков обрабатывать одновременно (по умолчанию из конфигурации)")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    list_parser = sub.add_parser('list', help="список дисков")
+    list_parser.add_argument('--all', action='store_true', help="включая неразмеченные устройства")
+
+    def add_job(name: str, help_text: str) -> argparse.ArgumentParser:
+        job = sub.add_parser(name, help=help_text)
+        job.add_argument('drives', nargs='+', metavar='drive',
+                         help="буквы дисков или точки монтирования (задания выполняются параллельно)")
+        job.add_argument('--yes', action='store_true', help="подтверждение уничтожения данных")
+        return job
+
+    test = add_job('test', "тестирование диска")
+    test.add_argument('--mode', choices=('free', 'full'), default='free')
+    test.add_argument('--passes', type=int, default=None)
+    test.add_argument('--patterns', type=lambda text: text.split(','), default=list(TEST_PATTERNS),
+                      help="паттерны через запятую: ones,zeros,random")
+    test.add_argument('--no-verify', action='store_true', help="без проверки чтением")
+    test.add_argument('--chunk-mb', type=int, default=None, help="размер блока, MB")
+    test.add_argument('--fixed-chunk', action='store_true', help="без адаптации размера блока")
+    test.add_argument('--threads', type=int, default=1)
+    test.add_argument('--queue-depth', type=int, default=None, metavar='N',
+                      help="одновременных запросов к устройству, 1..32 (по умолчанию из конфигурации)")
+    test.add_argument('--sync-policy', choices=SYNC_POLICIES, default=None, help=SYNC_POLICY_HELP)
+    test.add_argument('--quick', type=float, default=None, metavar='FRACTION',
+                      help="быстрый тест: доля проверяемого объёма (0..1)")
+    test.add_argument('--two-phase', action='store_true', default=None,
+                      help="сначала запись всего объёма, затем чтение")
+    test.add_argument('--seed', type=int, default=None, help="seed случайного паттерна")
+    test.add_argument('--resume', action='store_true', help="продолжить прерванный тест")
+
+    wipe = add_job('wipe', "затирание диска")
+    wipe.add_argument('--method', choices=WIPE_METHODS, default='dod')
+    wipe.add_argument('--passes', type=int, default=3)
+    wipe.add_argument('--no-verify', action='store_true')
+    wipe.add_argument('--queue-depth', type=int, default=None, metavar='N',
+                      help="одновременных запросов к устройству, 1..32 (по умолчанию из конфигурации)")
+    wipe.add_argument('--sync-policy', choices=SYNC_POLICIES, default=None, help=SYNC_POLICY_HELP)
+    wipe.add_argument('--resume', action='store_true', help="продолжить прерванное затирание")
+
+    add_job('capacity', "проверка реальной ёмкости")
+
+    fill = add_job('fill', "заполнение свободного места файлами с проверкой")
+    fill.add_argument('--writers', type=int, default=None)
+    fill.add_argument('--keep', action='store_true', help="не удалять файлы заполнения")
+
+    bench = add_job('benchmark', "последовательная скорость и IOPS случайного доступа")
+    bench.add_argument('--mode', choices=('free', 'full'), default='free',
+                       help="free — временный файл, full — начало устройства (данные уничтожаются)")
+    bench.add_argument('--size-mb', type=int, default=None, help="размер области теста, MB")
+    bench.add_argument('--duration', type=float, default=None, help="длительность каждого случайного замера, с")
+    bench.add_argument('--sweep-queue-depth', type=int, default=None, metavar='N',
+                       help="глубина очереди серии замеров по размеру блока")
+    bench.add_argument('--compliance', action='store_true',
+                       help="проверка классов скорости SD (C, U, V, A) по устойчивой записи")
+    bench.add_argument('--claim', type=_class_list, default=None, metavar='CLASSES',
+                       help="заявленные классы через запятую (например, U3,V30,A2): "
+                            "неподтверждённый класс даёт код дефектов")
+    bench.add_argument('--sustained-duration', type=float, default=None, metavar='SECONDS',
+                       help="длительность замера устойчивой записи, с")
+
+    fmt = add_job('format', "форматирование")
+    fmt.add_argument('--filesystem', choices=FILESYSTEMS, default='FAT32')
+    fmt.add_argument('--label', default="")
+    fmt.add_argument('--full', action='store_true', help="полное (не быстрое) форматирование")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None, stdout: Optional[TextIO] = None) -> int:
+    args = build_parser().parse_args(argv)
+    events = EventWriter(args.command, stdout)
+
+    # Журнал приложения — в stderr: stdout занят событиями
+    from utils.logger import setup_global_logger
+    logger = setup_global_logger(args.log_dir, stream=sys.stderr)
+
+    if args.command != 'list' and _needs_confirmation(args) and not args.yes:
+        events.emit('error', message="Операция уничтожит данные на диске: подтвердите её параметром --yes")
+        return EXIT_USAGE
+
+    try:
+        app = HeadlessApp(args.config)
+        if args.command == 'list':
+            for drive in app.drive_manager.get_drives_list(show_all=args.all):
+                events.emit('drive', drive=drive)
+            return EXIT_OK
+        if _needs_admin(args) and not app.drive_manager.is_admin():
+            events.emit('error', message="Для прямого доступа к устройству нужны права администратора")
+            return EXIT_ERROR
+
+        # SIGTERM (остановка задания в CI) обрабатывается как Ctrl+C; обработчик ставится только из главного потока
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, _raise_interrupt)
+        if args.jobs:
+            app.config.setdefault('jobs', {})['max_concurrent'] = args.jobs
+
+        from core.jobs import JobManager
+        manager = JobManager(app, listener=lambda job, msg: events.emit(msg[0], drive=job.drive_path,
+                                                                         **message_fields(msg)))
+        params = job_params(app, args)
+        for drive in args.drives:
+            manager.submit(args.command, drive, params)
+        run_jobs(manager, events, AGGREGATE_INTERVAL if len(args.drives) > 1 else 0.0)
+    except KeyboardInterrupt:
+        events.emit('interrupted', message="Прервано")
+        return EXIT_INTERRUPTED
+    except Exception as e:
+        logger.critical(f"Критическая ошибка: {e}", exc_info=True)
+        events.emit('error', message=str(e))
+        return EXIT_ERROR
+
+    jobs = manager.jobs()
+    for job in jobs:
+        events.emit('summary', drive=job.drive_path, status=job.status, exit_code=EXIT_CODES[job.status],
+                    result=job.result, stats=job.stats)
+    if len(jobs) > 1:
+        events.emit('aggregate', **manager.aggregate())
+    return overall_exit_code([job.status for job in jobs])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""
+Адаптивный выбор размера блока во время теста.
+Контроллер измеряет скорость и задержку каждого блока и подбирает размер,
+при котором устройство выходит на «колено» кривой производительности:
+дальнейшее увеличение блока уже не даёт прироста скорости.
+"""
+import threading
+from typing import Dict, Optional
+
+MB = 1024 * 1024
+
+
+class AdaptiveChunkController:
+    """Замкнутый контур управления размером блока (потокобезопасный)"""
+
+    # Сколько блоков измеряется на каждом размере перед принятием решения
+    SAMPLES_PER_STEP = 3
+    # Минимальный прирост скорости, ради которого стоит увеличивать блок
+    GROW_GAIN = 1.05
+    # Во сколько раз задержка блока должна превысить ожидаемую, чтобы считаться всплеском
+    SPIKE_FACTOR = 3.0
+    # Сколько блоков держать размер после отката из-за всплеска задержки
+    COOLDOWN_CHUNKS = 8
+    # Через сколько блоков на «колене» повторно пробовать больший размер
+    REPROBE_CHUNKS = 64
+    # Коэффициент сглаживания задержки на мегабайт
+    EWMA_ALPHA = 0.2
+
+    def __init__(self, initial_size: int, min_size: int, max_size: int, enabled: bool = True):
+        self.min_size = max(MB, (min_size // MB) * MB)
+        self.max_size = max(self.min_size, (max_size // MB) * MB)
+        self.enabled = enabled
+        self.size = self._clamp(initial_size)
+        self.lock = threading.Lock()
+
+        self._samples = []              # скорости (MB/s) на текущем размере
+        self._best_speed = 0.0          # лучшая скорость среди проверенных размеров
+        self._best_size = self.size
+        self._state = 'up'              # 'up' — рост блока, 'down' — уменьшение, 'stable' — на колене
+        self._grew = False              # был ли успешный шаг роста в текущем поиске
+        self._cooldown = 0
+        self._stable_chunks = 0
+        self._latency_per_mb = None     # EWMA задержки, с/MB
+
+        self.changes = 0
+        self.spikes = 0
+        self.min_used = self.size
+        self.max_used = self.size
+
+    def _clamp(self, size: int) -> int:
+        """Ограничение размера границами и выравнивание по мегабайту"""
+        size = max(self.min_size, min(self.max_size, int(size)))
+        return max(MB, (size // MB) * MB)
+
+    def next_size(self) -> int:
+        """Текущий рекомендуемый размер блока"""
+        with self.lock:
+            return self.size
+
+    def observe(self, nbytes: int, elapsed: float) -> Optional[int]:
+        """
+        Учёт результата блока.
+        Возвращает новый размер блока, если он изменился, иначе None.
+        """
+        if not self.enabled or nbytes <= 0 or elapsed <= 0:
+            return None
+
+        with self.lock:
+            size_mb = nbytes / MB
+            latency_per_mb = elapsed / size_mb
+            speed = size_mb / elapsed
+
+            # Всплеск задержки (например, сборка мусора SD-карты): немедленный откат
+            if self._latency_per_mb is not None and latency_per_mb > self._latency_per_mb * self.SPIKE_FACTOR:
+                self.spikes += 1
+                self._cooldown = self.COOLDOWN_CHUNKS
+                self._state = 'stable'
+                self._stable_chunks = 0
+                self._samples = []
+                return self._set_size(self.size // 2)
+
+            if self._latency_per_mb is None:
+                self._latency_per_mb = latency_per_mb
+            else:
+                self._latency_per_mb += self.EWMA_ALPHA * (latency_per_mb - self._latency_per_mb)
+
+            if self._cooldown > 0:
+                self._cooldown -= 1
+                return None
+
+            # Блок меньше текущего размера (хвост региона) не характеризует размер
+            if nbytes < self.size:
+                return None
+
+            self._samples.append(speed)
+            if len(self._samples) < self.SAMPLES_PER_STEP:
+                return None
+
+            avg_speed = sum(self._samples) / len(self._samples)
+            self._samples = []
+            return self._step(avg_speed)
+
+    def _step(self, avg_speed: float) -> Optional[int]:
+        """Один шаг поиска колена по средней скорости на текущем размере"""
+        if self._state == 'up':
+            if self._best_speed == 0.0 or avg_speed >= self._best_speed * self.GROW_GAIN:
+                # Прирост есть — запоминаем и пробуем больший блок
+                if self._best_speed > 0.0:
+                    self._grew = True
+                self._best_speed = avg_speed
+                self._best_size = self.size
+                if self.size < self.max_size:
+                    return self._set_size(self.size * 2)
+                return self._settle()
+            if not self._grew and self._best_size > self.min_size:
+                # Рост ничего не дал — проверяем, не хватит ли блока меньше
+                self._state = 'down'
+                return self._set_size(self._best_size // 2)
+            return self._settle()
+
+        if self._state == 'down':
+            if avg_speed * self.GROW_GAIN >= self._best_speed:
+                # Меньший блок не хуже — меньше задержка при той же скорости
+                self._best_speed = max(self._best_speed, avg_speed)
+                self._best_size = self.size
+                if self.size > self.min_size:
+                    return self._set_size(self.size // 2)
+            return self._settle()
+
+        # Стабильный режим: держим размер, периодически пробуем вырасти снова
+        self._stable_chunks += self.SAMPLES_PER_STEP
+        if self._stable_chunks >= self.REPROBE_CHUNKS and self.size < self.max_size:
+            self._state = 'up'
+            self._grew = False
+            self._best_speed = avg_speed
+            self._best_size = self.size
+            return self._set_size(self.size * 2)
+        return None
+
+    def _settle(self) -> Optional[int]:
+        """Фиксация лучшего найденного размера (колено кривой)"""
+        self._state = 'stable'
+        self._stable_chunks = 0
+        return self._set_size(self._best_size)
+
+    def on_error(self) -> Optional[int]:
+        """Ошибка ввода-вывода: уменьшаем блок для более точной локализации"""
+        if not self.enabled:
+            return None
+        with self.lock:
+            self._state = 'stable'
+            self._stable_chunks = 0
+            self._cooldown = self.COOLDOWN_CHUNKS
+            self._samples = []
+            return self._set_size(self.size // 2)
+
+    def _set_size(self, size: int) -> Optional[int]:
+        size = self._clamp(size)
+        if size == self.size:
+            return None
+        self.size = size
+        self.changes += 1
+        self.min_used = min(self.min_used, size)
+        self.max_used = max(self.max_used, size)
+        return size
+
+    def get_summary(self) -> Dict:
+        """Итоги работы контроллера для отчёта"""
+        with self.lock:
+            return {
+                'enabled': self.enabled,
+                'final_chunk_mb': self.size // MB,
+                'min_chunk_mb': self.min_used // MB,
+                'max_chunk_mb': self.max_used // MB,
+                'changes': self.changes,
+                'latency_spikes': self.spikes
+            }
@@ -0,0 +1,570 @@
+"""
+Бенчмарк производительности диска.
+Измеряет последовательную скорость записи и чтения, IOPS случайных запросов 4K
+на глубине очереди 1 и 32 (характеристики классов A1/A2) и скорость случайного
+доступа для ряда размеров блока. Работает со свободным местом через временный
+файл или напрямую с устройством (режим full уничтожает данные в начале диска).
+Случайные запросы ограничены областью, записанной последовательным тестом,
+поэтому чтение идёт по реально записанным данным.
+Режим соответствия (compliance) добавляет замер устойчивой записи последовательностями,
+выровненными по allocation unit, и вердикт по классам скорости SD (core.compliance).
+"""
+import os
+import platform
+import queue
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from utils.logger import get_logger
+from core.direct_io import ALIGNMENT, DeviceIO, aligned_buffer
+from core.io_queue import IOQueue, IORequest, clamp_depth
+from core.latency import LatencyHistogram
+from core.compliance import SD_MB, CLASS_NAMES, sliding_windows, worst_window, evaluate_classes, check_claims
+from core.patterns import PatternGenerator, new_seed
+from core.block_devices import resolve_block_device, describe_block_device
+from core.partitions import invalidate_partition_cache
+
+if platform.system() == "Windows":
+    import wmi
+
+
+class BenchmarkEngine:
+    """Последовательные и случайные замеры скорости с заданной глубиной очереди"""
+
+    # Размер области теста по умолчанию и нижняя граница
+    DEFAULT_SIZE = 1024 * 1024 * 1024
+    MIN_SIZE = 64 * 1024 * 1024
+    # Доля свободного места, которую может занять временный файл
+    FREE_FRACTION = 0.5
+    # Блок и глубина очереди последовательных замеров
+    SEQ_BLOCK = 8 * 1024 * 1024
+    SEQ_QUEUE_DEPTH = 4
+    # Случайный доступ: размер блока, глубины очереди и длительность каждого замера
+    RANDOM_BLOCK = 4096
+    RANDOM_QUEUE_DEPTHS = (1, 32)
+    DEFAULT_DURATION = 3.0
+    # Размеры блока для серии замеров случайного доступа
+    SWEEP_SIZES = (4096, 16 * 1024, 64 * 1024, 256 * 1024, 1024 * 1024)
+    # Предел числа запросов одного замера (защита от бесконечного цикла на очень быстрых носителях)
+    MAX_OPS = 1000000
+    # Период отправки прогресса внутри замера, секунды
+    PROGRESS_INTERVAL = 0.2
+    # Замер устойчивой записи: allocation unit, блок записи (recording unit), длительность и окно
+    AU_SIZE = 4 * 1024 * 1024
+    RU_SIZE = 512 * 1024
+    SUSTAINED_DURATION = 30.0
+    SUSTAINED_WINDOW = 1.0
+    # Названия замеров в журнале
+    STEP_NAMES = {
+        ('seq', 'write'): "Последовательная запись",
+        ('seq', 'read'): "Последовательное чтение",
+        ('random', 'write'): "Случайная запись",
+        ('random', 'read'): "Случайное чтение"
+    }
+
+    def __init__(self, app):
+        self.app = app
+        self.logger = get_logger(__name__)
+        self.system = platform.system()
+
+        self.test_thread = None
+        self.running = False
+        self.stop_requested = False
+        self.message_queue = queue.Queue(maxsize=100)
+        self.stats_lock = threading.Lock()
+
+        self.drive_path = ""
+        self.params: Dict = {}
+        self.device_io: Optional[DeviceIO] = None
+        self.device_path = None
+        self.unmounted = False
+        self.test_file_path: Optional[str] = None
+        self._steps_done = 0
+        self._steps_total = 1
+        self._last_progress = 0.0
+        self.stats = self._init_stats()
+
+    def _init_stats(self) -> Dict:
+        return {
+            'drive_path': '',
+            'mode': 'free',
+            'target': '',
+            'area_bytes': 0,
+            'io_method': 'buffered',
+            'duration': 0.0,
+            'sequential': {},
+            'random': [],
+            'sweep': [],
+            'compliance': {},
+            'started': None,
+            'elapsed': 0.0,
+            'status': 'idle'
+        }
+
+    def start_test(self, drive_path: str, params: Optional[Dict] = None):
+        """
+        Запуск бенчмарка: params — mode ('free'|'full'), size_mb, duration, sweep_queue_depth,
+        compliance (проверка классов скорости SD), claim (заявленные классы), sustained_duration
+        """
+        if self.running:
+            self.logger.warning("Бенчмарк уже выполняется")
+            return
+
+        self.drive_path = drive_path
+        self.params = dict(params or {})
+        self.stop_requested = False
+        self.device_path = None
+        self.unmounted = False
+        self.test_file_path = None
+        self.stats = self._init_stats()
+        self.stats['drive_path'] = drive_path
+        self.stats['mode'] = self.params.get('mode', 'free')
+        self.stats['duration'] = self._get_duration()
+
+        claimed = [name.upper() for name in self.params.get('claim') or []]
+        unknown = [name for name in claimed if name not in CLASS_NAMES]
+        if unknown:
+            self._send_message('error', f"Неизвестные классы скорости: {', '.join(unknown)}")
+            return
+        self.params['claim'] = claimed
+
+        if self.stats['mode'] == 'full':
+            # Путь к устройству определяется в главном потоке, как у остальных движков
+            self.device_path = self._get_device_path(drive_path)
+            if not self.device_path:
+                self._send_message('error', "Не удалось определить путь к физическому устройству")
+                return
+            self._unmount_drive(drive_path)
+
+        self.running = True
+        self.test_thread = threading.Thread(target=self._test_worker, daemon=True)
+        self.test_thread.start()
+        self.logger.info(f"Бенчмарк запущен для диска {drive_path} в режиме {self.stats['mode']}")
+
+    def _config(self) -> Dict:
+        return self.app.config.get('benchmark', {})
+
+    def _get_duration(self) -> float:
+        duration = self.params.get('duration')
+        if duration is None:
+            duration = self._config().get('duration', self.DEFAULT_DURATION)
+        try:
+            return max(0.1, float(duration))
+        except (TypeError, ValueError):
+            return self.DEFAULT_DURATION
+
+    def _compliance_config(self) -> Dict:
+        return self.app.config.get('compliance', {})
+
+    def _use_compliance(self) -> bool:
+        """Проверка классов скорости: параметр запуска; заявленные классы включают её автоматически"""
+        return bool(self.params.get('compliance') or self.params.get('claim'))
+
+    def _get_device_path(self, drive_path: str) -> Optional[str]:
+        if self.system == "Windows":
+            try:
+                c = wmi.WMI()
+                drive_letter = drive_path[0].upper()
+                for logical_disk in c.Win32_LogicalDisk(DeviceID=f"{drive_letter}:"):
+                    for partition in logical_disk.associators("Win32_LogicalDiskToPartition"):
+                        for disk_drive in partition.associators("Win32_DiskDriveToDiskPartition"):
+                            return r"\\.\PhysicalDrive" + str(disk_drive.Index)
+            except Exception as e:
+                self.logger.error(f"Ошибка получения пути устройства: {e}")
+            return None
+        if self.system == "Linux":
+            info = resolve_block_device(drive_path)
+            if info is None:
+                self.logger.error(f"Не найдено блочное устройство для {drive_path}")
+                return None
+            self.logger.info(f"Устройство: {describe_block_device(info)}")
+            return info['path']
+        self.logger.warning("Бенчмарк устройства поддерживается только на Windows и Linux, используйте free режим")
+        return None
+
+    def _unmount_drive(self, drive_path: str):
+        """Размонтирование тома перед записью на устройство (только Windows)"""
+        if self.system != "Windows":
+            return
+        try:
+            import win32file
+            import win32con
+            handle = win32file.CreateFile(
+                f"\\\\.\\{drive_path[0]}:",
+                win32con.GENERIC_READ | win32con.GENERIC_WRITE,
+                win32con.FILE_SHARE_READ | win32con.FILE_SHARE_WRITE,
+                None,
+                win32con.OPEN_EXISTING,
+                0,
+                None
+            )
+            FSCTL_DISMOUNT_VOLUME = getattr(win32file, 'FSCTL_DISMOUNT_VOLUME', 0x00090020)
+            win32file.DeviceIoControl(handle, FSCTL_DISMOUNT_VOLUME, None, None)
+            win32file.CloseHandle(handle)
+            self.unmounted = True
+            self._send_message('log', f"Том {drive_path[0]} размонтирован для прямого доступа к диску", 'info')
+        except Exception as e:
+            self.logger.warning(f"Ошибка при размонтировании тома {drive_path}: {e}")
+
+    def _area_size(self, available: int) -> int:
+        """Размер области теста: из параметров или конфигурации, в пределах доступного места"""
+        size_mb = self.params.get('size_mb') or self._config().get('size_mb', self.DEFAULT_SIZE // (1024 * 1024))
+        size = min(int(size_mb) * 1024 * 1024, available)
+        return size // self.SEQ_BLOCK * self.SEQ_BLOCK if size >= self.SEQ_BLOCK else size // ALIGNMENT * ALIGNMENT
+
+    def _open_target(self) -> int:
+        """Открытие временного файла или устройства; возвращает размер области теста"""
+        # Без O_SYNC: каждый случайный запрос стал бы синхронным сбросом и занизил бы IOPS записи.
+        # Записанное сбрасывается на носитель одним sync в конце каждого этапа записи, внутри замера
+        flags = os.O_RDWR | getattr(os, 'O_BINARY', 0)
+        direct = self._config().get('direct_io', True)
+
+        if self.stats['mode'] == 'full':
+            self.device_io = DeviceIO(self.device_path, flags, direct=direct)
+            total = os.lseek(self.device_io.fd, 0, os.SEEK_END)
+            self.stats['target'] = self.device_path
+            return self._area_size(total)
+
+        free_bytes = 0
+        for drive in self.app.drive_manager.get_drives_list():
+            if drive['path'] == self.drive_path:
+                free_bytes = drive['free_bytes']
+                break
+        size = self._area_size(int(free_bytes * self.FREE_FRACTION))
+        if size < self.MIN_SIZE:
+            raise Exception(f"Недостаточно свободного места для бенчмарка "
+                            f"(нужно минимум {self.MIN_SIZE * 2 // (1024**2)} MB)")
+        self.test_file_path = os.path.join(self.drive_path,
+                                           f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.tmp")
+        self.device_io = DeviceIO(self.test_file_path, flags | os.O_CREAT | os.O_TRUNC, direct=direct)
+        self.device_io.preallocate(size)
+        self.stats['target'] = self.test_file_path
+        return size
+
+    def _test_worker(self):
+        start_time = time.time()
+        self.stats['started'] = datetime.now().isoformat(timespec='seconds')
+        try:
+            area = self._open_target()
+            self.stats['area_bytes'] = area
+            self.stats['io_method'] = self.device_io.method
+            if not self.device_io.direct:
+                self._send_message('log', "Прямой ввод-вывод недоступен: перед чтением кэш ОС сбрасывается, "
+                                          "результаты чтения могут быть завышены", 'warning')
+            self._send_message('log', f"Область теста: {area / (1024**2):.0f} MB ({self.stats['target']}), "
+                                      f"метод ввода-вывода: {self.device_io.method}", 'info')
+
+            sweep_depth = clamp_depth(self.params.get('sweep_queue_depth',
+                                                      self._config().get('sweep_queue_depth', 1)))
+            random_steps = [(op, self.RANDOM_BLOCK, depth) for depth in self.RANDOM_QUEUE_DEPTHS
+                            for op in ('read', 'write')]
+            sweep_steps = [(op, size, sweep_depth) for size in self.SWEEP_SIZES for op in ('read', 'write')]
+            self._steps_done = 0
+            self._steps_total = 2 + len(random_steps) + len(sweep_steps) + self._use_compliance()
+
+            # Последовательная запись заодно заполняет область данными для случайного чтения
+            generator = PatternGenerator(new_seed())
+            self.stats['sequential'] = {'block_size': self.SEQ_BLOCK, 'queue_depth': self.SEQ_QUEUE_DEPTH}
+            self.stats['sequential']['write_mbps'] = self._run_sequential('write', area, generator)
+            self._drop_cache()
+            if not self.stop_requested:
+                self.stats['sequential']['read_mbps'] = self._run_sequential('read', area, generator)
+            if self._use_compliance() and not self.stop_requested:
+                self.stats['compliance'] = self._run_sustained(area, generator)
+
+            for op, block, depth in random_steps:
+                if self.stop_requested:
+                    break
+                self.stats['random'].append(self._run_random(op, block, depth, area, generator))
+            for op, block, depth in sweep_steps:
+                if self.stop_requested:
+                    break
+                self.stats['sweep'].append(self._run_random(op, block, depth, area, generator))
+            if self.stats['compliance'] and not self.stop_requested:
+                self._evaluate_compliance()
+
+            self.stats['elapsed'] = time.time() - start_time
+            self._finish()
+
+        except Exception as e:
+            self.logger.error(f"Ошибка в потоке бенчмарка: {e}", exc_info=True)
+            self.stats['status'] = 'error'
+            self._send_message('error', str(e))
+        finally:
+            if self.device_io is not None:
+                self.device_io.close()
+                self.device_io = None
+                if self.stats['mode'] == 'full':
+                    # Начало устройства перезаписано: таблица разделов в кэше устарела
+                    invalidate_partition_cache(self.device_path)
+            if self.test_file_path:
+                try:
+                    os.remove(self.test_file_path)
+                except OSError as e:
+                    self.logger.warning(f"Не удалось удалить временный файл бенчмарка: {e}")
+            if self.unmounted:
+                self._send_message('unmount_notice', self.drive_path)
+            self.running = False
+
+    def _drop_cache(self):
+        """Без прямого доступа чтение должно идти с носителя: записанные страницы вытесняются"""
+        if self.device_io.direct:
+            return
+        try:
+            self.device_io.drop_cache()
+        except OSError as e:
+            self.logger.warning(f"Не удалось сбросить кэш: {e}")
+
+    def _allocate(self, size: int):
+        return aligned_buffer(size) if self.device_io.direct else bytearray(size)
+
+    def _run_sequential(self, op: str, area: int, generator: PatternGenerator) -> float:
+        """Последовательная запись или чтение всей области; возвращает MB/s"""
+        depth = self.SEQ_QUEUE_DEPTH
+        buffers = [memoryview(self._allocate(self.SEQ_BLOCK)) for _ in range(depth)]
+        if op == 'write':
+            for index, buffer in enumerate(buffers):
+                generator.fill(buffer, 1, index * self.SEQ_BLOCK)
+        fn = self.device_io.pwrite if op == 'write' else self.device_io.preadinto
+        errors = []
+        done = [0]
+
+        def on_complete(request: IORequest):
+            if request.error is not None:
+                errors.append(request.error)
+                return
+            done[0] += request.length
+            self._step_progress(done[0] / area)
+
+        start = time.perf_counter()
+        with IOQueue(depth, on_complete=on_complete) as io_queue:
+            offset = 0
+            index = 0
+            while offset < area and not self.stop_requested and not errors:
+                length = min(self.SEQ_BLOCK, area - offset)
+                io_queue.submit(op, fn, buffers[index % depth][:length], offset)
+                offset += length
+                index += 1
+        if op == 'write':
+            self.device_io.sync()
+        elapsed = max(time.perf_counter() - start, 0.001)
+        if errors:
+            raise errors[0]
+
+        speed = done[0] / (1024**2) / elapsed
+        self._step_done({'op': f"seq_{op}", 'block_size': self.SEQ_BLOCK, 'queue_depth': depth, 'mbps': speed})
+        self._send_message('log', f"{self.STEP_NAMES[('seq', op)]}: {speed:.1f} MB/s", 'info')
+        return speed
+
+    def _run_random(self, op: str, block: int, depth: int, area: int, generator: PatternGenerator) -> Dict:
+        """Случайные запросы блоком block на глубине depth в течение заданного времени"""
+        if op == 'read':
+            self._drop_cache()
+        duration = self.stats['duration']
+        buffers = [memoryview(self._allocate(block)) for _ in range(depth)]
+        if op == 'write':
+            for index, buffer in enumerate(buffers):
+                generator.fill(buffer, 2, index * block)
+        fn = self.device_io.pwrite if op == 'write' else self.device_io.preadinto
+        # Смещения выровнены по размеру блока (не меньше страницы — условие прямого доступа)
+        step = max(block, ALIGNMENT)
+        slots = max(1, (area - block) // step + 1)
+        rng = random.Random(new_seed())
+        histogram = LatencyHistogram()
+        errors = []
+        completed = [0]
+
+        def on_complete(request: IORequest):
+            if request.error is not None:
+                errors.append(request.error)
+                return
+            completed[0] += 1
+            histogram.record(request.latency_ns)
+
+        start = time.perf_counter()
+        deadline = start + duration
+        with IOQueue(depth, on_complete=on_complete) as io_queue:
+            submitted = 0
+            while not self.stop_requested and not errors and submitted < self.MAX_OPS:
+                now = time.perf_counter()
+                if now >= deadline:
+                    break
+                io_queue.submit(op, fn, buffers[submitted % depth], rng.randrange(slots) * step)
+                submitted += 1
+                self._step_progress((now - start) / duration)
+        if op == 'write':
+            self.device_io.sync()
+        elapsed = max(time.perf_counter() - start, 0.001)
+        if errors:
+            raise errors[0]
+
+        iops = completed[0] / elapsed
+        result = {
+            'op': op,
+            'block_size': block,
+            'queue_depth': depth,
+            'ops': completed[0],
+            'seconds': elapsed,
+            'iops': iops,
+            'mbps': iops * block / (1024**2),
+            'latency': histogram.summary()
+        }
+        self._step_done(result)
+        self._send_message('log', f"{self.STEP_NAMES[('random', op)]} {block // 1024}K "
+                                  f"QD{depth}: {iops:.0f} IOPS, {result['mbps']:.2f} MB/s, "
+                                  f"p99 {result['latency']['p99_ms']:.2f} мс", 'info')
+        return result
+
+    def _run_sustained(self, area: int, generator: PatternGenerator) -> Dict:
+        """
+        Устойчивая последовательная запись блоками RU внутри целых AU, выровненных по границе AU,
+        в течение заданного времени (по кругу по области теста). Скорость оценивается
+        по скользящим окнам; худшее окно определяет соответствие классам скорости.
+        """
+        config = self._compliance_config()
+        au = int(config.get('au_size_mb', self.AU_SIZE // (1024 * 1024))) * 1024 * 1024
+        ru = min(int(config.get('ru_size_kb', self.RU_SIZE // 1024)) * 1024, au)
+        duration = float(self.params.get('sustained_duration') or config.get('duration', self.SUSTAINED_DURATION))
+        window = float(config.get('window', self.SUSTAINED_WINDOW))
+        units = area // au
+        if units == 0:
+            raise Exception(f"Область теста меньше allocation unit ({au // (1024 * 1024)} MB)")
+        if self.stats['mode'] != 'full':
+            self._send_message('log', "Свободный режим: выравнивание по AU задаётся внутри временного файла, "
+                                      "точное выравнивание по носителю — только в режиме full", 'warning')
+
+        buffer = memoryview(self._allocate(ru))
+        generator.fill(buffer, 3, 0)
+        samples = []
+        errors = []
+        # Без прямого доступа запросы завершаются в кэше ОС: AU засчитывается после её сброса на носитель
+        per_request = self.device_io.direct
+        start = time.perf_counter()
+
+        def on_complete(request: IORequest):
+            if request.error is not None:
+                errors.append(request.error)
+                return
+            if per_request:
+                samples.append((time.perf_counter() - start, request.length, request.offset))
+
+        # Запись по одному запросу: классы скорости определены для последовательной записи
+        with IOQueue(1, on_complete=on_complete) as io_queue:
+            unit = 0
+            while not self.stop_requested and not errors:
+                elapsed = time.perf_counter() - start
+                if elapsed >= duration:
+                    break
+                au_start = (unit % units) * au
+                for offset in range(au_start, au_start + au, ru):
+                    io_queue.submit('write', self.device_io.pwrite, buffer, offset)
+                if not per_request:
+                    io_queue.drain()
+                    self.device_io.sync()
+                    samples.append((time.perf_counter() - start, au, au_start))
+                unit += 1
+                self._step_progress(elapsed / duration)
+        self.device_io.sync()
+        total_time = time.perf_counter() - start
+        if errors:
+            raise errors[0]
+
+        windows = sliding_windows(samples, window)
+        worst = worst_window(windows)
+        result = {
+            'au_size': au,
+            'ru_size': ru,
+            'window': window,
+            'seconds': total_time,
+            'written_bytes': sum(nbytes for _, nbytes, _ in samples),
+            'mean_mbps': sum(nbytes for _, nbytes, _ in samples) / SD_MB / max(total_time, 1e-9),
+            'windows': len(windows),
+            'worst_window': worst,
+            'sustained_mbps': worst['mbps'] if worst else None,
+            'classes': [],
+            'claimed': list(self.params.get('claim') or []),
+            'claimed_pass': None
+        }
+        if worst:
+            self._send_message('log', f"Устойчивая запись (AU {au // (1024 * 1024)} MB, окно {window:g} с): "
+                                      f"средняя {result['mean_mbps']:.1f} MB/s, худшее окно {worst['mbps']:.1f} MB/s "
+                                      f"на {worst['start']:.1f} с (смещение {worst['offset'] // (1024 * 1024)} MB)",
+                               'info')
+        self._step_done({'op': 'sustained_write', 'block_size': ru, 'queue_depth': 1,
+                         'mbps': result['sustained_mbps'] or 0.0})
+        return result
+
+    def _evaluate_compliance(self):
+        """Вердикт по классам: скорость — по худшему окну, классы A — по случайным 4K на QD1"""
+        compliance = self.stats['compliance']
+        iops = {item['op']: item['iops'] for item in self.stats['random']
+                if item['block_size'] == self.RANDOM_BLOCK and item['queue_depth'] == 1}
+        compliance['classes'] = evaluate_classes(compliance['sustained_mbps'], iops.get('read'), iops.get('write'))
+        compliance['claimed_pass'] = check_claims(compliance['classes'], compliance['claimed'])
+
+        passed = [item['class'] for item in compliance['classes'] if item['passed']]
+        failed = [item['class'] for item in compliance['classes'] if item['passed'] is False]
+        self._send_message('log', f"Классы скорости: соответствует {', '.join(passed) or '—'}; "
+                                  f"не соответствует {', '.join(failed) or '—'}", 'info')
+        if compliance['claimed_pass'] is not None:
+            claimed = ', '.join(compliance['claimed'])
+            if compliance['claimed_pass']:
+                self._send_message('log', f"Заявленные классы подтверждены: {claimed}", 'success')
+            else:
+                self._send_message('log', f"Заявленные классы не подтверждены: {claimed}", 'error')
+
+    def _step_progress(self, fraction: float):
+        """Прогресс внутри замера не чаще PROGRESS_INTERVAL: очередь сообщений ограничена"""
+        now = time.time()
+        if now - self._last_progress < self.PROGRESS_INTERVAL:
+            return
+        self._last_progress = now
+        fraction = max(0.0, min(1.0, fraction))
+        self._send_message('progress', (self._steps_done + fraction) / self._steps_total * 100)
+
+    def _step_done(self, result: Dict):
+        self._steps_done += 1
+        self._send_message('benchmark_step', result)
+        self._send_message('progress', self._steps_done / self._steps_total * 100)
+
+    def _finish(self):
+        if self.stop_requested:
+            self.stats['status'] = 'stopped'
+            self._send_message('log', "Бенчмарк остановлен", 'warning')
+            self._send_message('complete', "Бенчмарк прерван")
+            return
+        self.stats['status'] = 'ok'
+        self._send_message('result', self.get_statistics())
+        self._send_message('complete', "Бенчмарк завершён")
+
+    def _send_message(self, msg_type: str, *args):
+        try:
+            self.message_queue.put_nowait((msg_type,) + args)
+        except queue.Full:
+            pass
+
+    def get_message(self):
+        try:
+            return self.message_queue.get_nowait()
+        except queue.Empty:
+            return None
+
+    def stop(self):
+        if self.running:
+            self.stop_requested = True
+            self._send_message('log', "Запрошена остановка бенчмарка...", 'warning')
+
+    def is_running(self) -> bool:
+        return self.running
+
+    def get_statistics(self) -> Dict:
+        with self.stats_lock:
+            stats = self.stats.copy()
+            stats['sequential'] = dict(self.stats['sequential'])
+            stats['random'] = [dict(item) for item in self.stats['random']]
+            stats['sweep'] = [dict(item) for item in self.stats['sweep']]
+            stats['compliance'] = dict(self.stats['compliance'])
+        return stats
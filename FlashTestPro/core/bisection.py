@@ -0,0 +1,137 @@
+"""
+Локализация ошибок ввода-вывода делением блока пополам.
+Блок, на котором запись или чтение завершились OSError, повторно проверяется
+половинами, затем четвертями и так далее вплоть до логического сектора:
+исправные части засчитываются как проверенные, а для сбойных остаётся
+точный список нечитаемых или незаписываемых секторов.
+"""
+from typing import Callable, Dict, List, Optional
+
+from core.mismatch import SECTOR_SIZE, find_mismatched_sectors
+from core.pipeline import buffers_equal
+
+# Повторы проверки одного сектора перед тем, как признать его сбойным
+DEFAULT_RETRIES = 2
+# Предел повторных проверок на один блок: полностью мёртвая область
+# не должна растягивать тест на посекторную проверку сотен мегабайт
+MAX_PROBES = 4096
+
+
+class ErrorLocalizer:
+    """Повторная проверка сбойного блока участками геометрически убывающего размера"""
+
+    def __init__(self, write: Callable, sync: Callable, readinto: Optional[Callable],
+                 sector_size: int = SECTOR_SIZE, retries: int = DEFAULT_RETRIES,
+                 max_probes: int = MAX_PROBES, should_stop: Optional[Callable[[], bool]] = None):
+        self.write = write
+        self.sync = sync
+        self.readinto = readinto
+        self.sector_size = max(1, sector_size)
+        self.retries = max(0, retries)
+        self.max_probes = max(1, max_probes)
+        self.should_stop = should_stop or (lambda: False)
+
+    def localize(self, offset: int, data, read_buffer=None) -> Dict:
+        """
+        Локализация ошибок в блоке data, записанном по смещению offset.
+        read_buffer — буфер проверки не меньше блока (нужен, если задан readinto).
+        Возвращает {'good_bytes', 'bad': [{'sector', 'count', 'error', 'stage', ...}],
+        'probes', 'recovered', 'complete'}; complete=False, если проверка прервана остановкой.
+        """
+        data = memoryview(data).cast('B')
+        read_view = memoryview(read_buffer).cast('B') if read_buffer is not None else None
+        result = {'good_bytes': 0, 'bad': [], 'probes': 0, 'recovered': 0, 'complete': True}
+        # Весь блок уже завершился ошибкой: сразу переходим к половинам
+        self._bisect(offset, data, read_view, 0, len(data), result, probe_first=False)
+        result['bad'] = self._merge(result['bad'])
+        return result
+
+    def _bisect(self, offset: int, data: memoryview, read_view: Optional[memoryview],
+                start: int, end: int, result: Dict, probe_first: bool = True):
+        if self.should_stop():
+            result['complete'] = False
+            return
+        length = end - start
+        if result['probes'] >= self.max_probes:
+            # Лимит исчерпан: остаток считается сбойным без дальнейшего деления
+            self._add_bad(result, offset + start, length, "Диапазон не локализован: "
+                          "исчерпан лимит повторных проверок", 'bisect')
+            return
+
+        leaf = length <= self.sector_size
+        if probe_first or leaf:
+            attempts = 1 + self.retries if leaf else 1
+            failure = None
+            for attempt in range(attempts):
+                if attempt and result['probes'] >= self.max_probes:
+                    break
+                failure = self._probe(offset + start, data[start:end],
+                                      read_view[start:end] if read_view is not None else None, result)
+                if failure is None:
+                    result['good_bytes'] += length
+                    if attempt:
+                        # Сектор прошёл проверку только при повторе
+                        result['recovered'] += length
+                    return
+                if failure.get('mismatches') is not None:
+                    # Данные прочитаны, но не совпали: сбойные секторы уже известны точно
+                    break
+            if failure.get('mismatches') is not None:
+                self._add_mismatches(result, failure['mismatches'], length)
+                return
+            if leaf:
+                self._add_bad(result, offset + start, length, failure['error'], failure['stage'])
+                return
+
+        # Граница деления выровнена по сектору
+        mid = start + max(self.sector_size, (length // 2) // self.sector_size * self.sector_size)
+        self._bisect(offset, data, read_view, start, mid, result)
+        self._bisect(offset, data, read_view, mid, end, result)
+
+    def _probe(self, offset: int, data: memoryview, read_view: Optional[memoryview],
+               result: Dict) -> Optional[Dict]:
+        """Запись, сброс и (при наличии readinto) чтение со сравнением одного участка"""
+        result['probes'] += 1
+        try:
+            self.write(data, offset)
+            self.sync()
+        except OSError as e:
+            return {'error': str(e), 'stage': 'write'}
+        if self.readinto is None:
+            return None
+        try:
+            n = self.readinto(read_view, offset)
+        except OSError as e:
+            return {'error': str(e), 'stage': 'read'}
+        if n != len(data):
+            return {'error': f"Неполное чтение: {n} из {len(data)} байт", 'stage': 'read'}
+        if not buffers_equal(read_view, data):
+            return {'error': None, 'stage': 'verify',
+                    'mismatches': find_mismatched_sectors(data, read_view, offset)}
+        return None
+
+    def _add_bad(self, result: Dict, offset: int, length: int, error: str, stage: str):
+        first = offset // SECTOR_SIZE
+        last = (offset + length - 1) // SECTOR_SIZE
+        result['bad'].append({'sector': first, 'count': last - first + 1, 'error': error, 'stage': stage})
+
+    def _add_mismatches(self, result: Dict, mismatches: List[Dict], length: int):
+        bad_bytes = 0
+        for mismatch in mismatches:
+            item = dict(mismatch, error=None, stage='verify')
+            result['bad'].append(item)
+            bad_bytes += mismatch['count'] * SECTOR_SIZE
+        result['good_bytes'] += max(0, length - bad_bytes)
+
+    @staticmethod
+    def _merge(bad: List[Dict]) -> List[Dict]:
+        """Объединение соседних секторов с одинаковой ошибкой в диапазоны"""
+        merged: List[Dict] = []
+        for item in sorted(bad, key=lambda entry: entry['sector']):
+            last = merged[-1] if merged else None
+            if (last is not None and last['stage'] == item['stage'] and last['error'] == item['error']
+                    and item['stage'] != 'verify' and last['sector'] + last['count'] >= item['sector']):
+                last['count'] = max(last['count'], item['sector'] + item['count'] - last['sector'])
+            else:
+                merged.append(item)
+        return merged
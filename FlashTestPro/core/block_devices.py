@@ -0,0 +1,150 @@
+"""
+Определение физического устройства по точке монтирования или разделу (Linux).
+Номер устройства (major:minor) берётся из stat, а родительский диск, размер,
+размеры секторов и признак съёмности — из /sys/dev/block. Так корректно
+обрабатываются имена с цифрами (mmcblk0p1, nvme0n1p2, loop0p1), которые
+нельзя получить отбрасыванием номера раздела из имени.
+"""
+import os
+import stat
+import threading
+from typing import Dict, Optional, Tuple
+
+SYS_DEV_BLOCK = '/sys/dev/block'
+PROC_MOUNTS = '/proc/mounts'
+# Размер в sysfs всегда указывается в 512-байтных секторах
+SYSFS_SECTOR = 512
+
+# (major, minor) -> (ключ актуальности, сведения об устройстве)
+_cache: Dict[Tuple[int, int], Tuple[Tuple, Dict]] = {}
+_cache_lock = threading.Lock()
+
+
+def _read_sysfs(path: str, default: str = '') -> str:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return default
+
+
+def _read_int(path: str, default: int = 0) -> int:
+    try:
+        return int(_read_sysfs(path))
+    except ValueError:
+        return default
+
+
+def _device_node(sys_dir: str) -> str:
+    """Путь в /dev по DEVNAME из uevent (имя каталога sysfs — запасной вариант)"""
+    for line in _read_sysfs(os.path.join(sys_dir, 'uevent')).splitlines():
+        key, _, value = line.partition('=')
+        if key == 'DEVNAME' and value:
+            return '/dev/' + value
+    return '/dev/' + os.path.basename(sys_dir)
+
+
+def _serial(disk_dir: str) -> Optional[str]:
+    """Серийный номер носителя: CID карты памяти, WWID или serial контроллера"""
+    for name in (('device', 'cid'), ('wwid',), ('device', 'wwid'), ('device', 'serial')):
+        value = _read_sysfs(os.path.join(disk_dir, *name))
+        if value:
+            return value
+    return None
+
+
+def block_device_info(major: int, minor: int, sys_root: str = SYS_DEV_BLOCK) -> Optional[Dict]:
+    """
+    Сведения о блочном устройстве major:minor и его родительском диске:
+    {'path', 'name', 'partition', 'partition_number', 'size', 'logical_sector_size',
+    'physical_sector_size', 'removable', 'serial'}. Для раздела path — весь диск, partition — сам раздел.
+    Результат кэшируется, пока не изменились ссылка в sysfs и размер диска.
+    """
+    link = os.path.join(sys_root, f"{major}:{minor}")
+    sys_dir = os.path.realpath(link)
+    if not os.path.isdir(sys_dir):
+        return None
+
+    is_partition = os.path.exists(os.path.join(sys_dir, 'partition'))
+    disk_dir = os.path.dirname(sys_dir) if is_partition else sys_dir
+    # Ключ актуальности: другая карта в том же картридере получит тот же номер, но не тот же размер
+    key = (sys_dir, _read_sysfs(os.path.join(disk_dir, 'size')))
+    with _cache_lock:
+        cached = _cache.get((major, minor))
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    info = {
+        'path': _device_node(disk_dir),
+        'name': os.path.basename(disk_dir),
+        'partition': _device_node(sys_dir) if is_partition else None,
+        'partition_number': _read_int(os.path.join(sys_dir, 'partition')) if is_partition else None,
+        'size': _read_int(os.path.join(disk_dir, 'size')) * SYSFS_SECTOR,
+        'logical_sector_size': _read_int(os.path.join(disk_dir, 'queue', 'logical_block_size'), 512),
+        'physical_sector_size': _read_int(os.path.join(disk_dir, 'queue', 'physical_block_size'), 512),
+        'removable': _read_sysfs(os.path.join(disk_dir, 'removable')) == '1',
+        'serial': _serial(disk_dir)
+    }
+    with _cache_lock:
+        _cache[(major, minor)] = (key, info)
+    return info
+
+
+def _mount_source(mountpoint: str) -> Optional[str]:
+    """Источник монтирования из /proc/mounts (последняя запись перекрывает предыдущие)"""
+    source = None
+    try:
+        with open(PROC_MOUNTS) as f:
+            for line in f:
+                parts = line.split()
+                # Пробелы в путях экранированы как \040
+                if len(parts) > 1 and parts[1].replace('\\040', ' ') == mountpoint:
+                    source = parts[0]
+    except OSError:
+        return None
+    return source
+
+
+def resolve_block_device(path: str, sys_root: str = SYS_DEV_BLOCK) -> Optional[Dict]:
+    """
+    Родительский диск для точки монтирования, файла на ней, раздела или самого диска.
+    Возвращает сведения block_device_info или None, если блочное устройство не найдено.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if stat.S_ISBLK(st.st_mode):
+        dev = st.st_rdev
+    else:
+        dev = st.st_dev
+        if os.major(dev) == 0:
+            # btrfs, overlay и подобные ФС дают анонимный номер — берём источник из /proc/mounts
+            source = _mount_source(os.path.normpath(path))
+            if not source or not source.startswith('/dev/'):
+                return None
+            try:
+                source_st = os.stat(source)
+            except OSError:
+                return None
+            if not stat.S_ISBLK(source_st.st_mode):
+                return None
+            dev = source_st.st_rdev
+    return block_device_info(os.major(dev), os.minor(dev), sys_root)
+
+
+def invalidate_block_device_cache():
+    """Сброс кэша (например, после подключения или извлечения устройства)"""
+    with _cache_lock:
+        _cache.clear()
+
+
+def describe_block_device(info: Dict) -> str:
+    """Строка для журнала: путь, размер, размеры секторов и съёмность"""
+    text = (f"{info['path']}, {info['size'] / (1024**3):.2f} GB, "
+            f"сектор {info['logical_sector_size']}/{info['physical_sector_size']} байт")
+    if info['partition']:
+        text += f", раздел {info['partition']}"
+    if info['removable']:
+        text += ", съёмное"
+    return text
@@ -1,6 +1,8 @@
 """
 Модуль для проверки реальной ёмкости накопителя (выявление поддельных карт памяти).
 Использует прямой доступ к устройству и бинарный поиск.
+Каждая пробная запись сбрасывается на носитель до чтения маркера (политика
+синхронизации chunk): иначе проверка читала бы кэш, а не память накопителя.
 """
 import os
 import time
@@ -10,6 +12,9 @@ import platform
 from typing import Optional, Dict
 
 from utils.logger import get_logger
+from core.partitions import read_partition_table, invalidate_partition_cache
+from core.block_devices import resolve_block_device, describe_block_device
+from core.sync_policy import SyncPolicy
 
 # Для Windows
 if platform.system() == "Windows":
@@ -36,6 +41,7 @@ class CapacityTester:
         self.device_path = None
         self.device_handle = None
         self.unmounted = False
+        self.sync_policy: Optional[SyncPolicy] = None
 
         # Параметры теста
         self.marker = b"FLASHTESTPRO_MARKER"  # уникальный маркер (20 байт)
@@ -70,19 +76,13 @@ class CapacityTester:
         return None
 
     def _get_device_path_linux(self, mountpoint: str) -> Optional[str]:
-        """Linux: получает базовое устройство (например, /dev/sda) из /proc/mounts"""
-        try:
-            with open('/proc/mounts') as f:
-                for line in f:
-                    parts = line.split()
-                    if len(parts) > 1 and parts[1] == mountpoint:
-                        dev = parts[0]
-                        # Убираем цифры в конце (номер раздела)
-                        base = ''.join(c for c in dev if not c.isdigit())
-                        return base
-        except Exception as e:
-            self.logger.error(f"Ошибка получения пути устройства (Linux): {e}")
-        return None
+        """Linux: родительский диск (например, /dev/mmcblk0) через sysfs"""
+        info = resolve_block_device(mountpoint)
+        if info is None:
+            self.logger.error(f"Не найдено блочное устройство для {mountpoint}")
+            return None
+        self.logger.info(f"Устройство: {describe_block_device(info)}")
+        return info['path']
 
     def _get_device_path_macos(self, mountpoint: str) -> Optional[str]:
         """macOS: получает raw-устройство через diskutil"""
@@ -264,8 +264,8 @@ class CapacityTester:
                 self.logger.info(f"Дескриптор преобразован, объект device_handle создан")
 
             else:
-                # Linux / macOS
-                flags = os.O_RDWR | os.O_SYNC
+                # Linux / macOS; без O_SYNC: запись сбрасывается явно после каждой пробы
+                flags = os.O_RDWR
                 if hasattr(os, 'O_BINARY'):
                     flags |= os.O_BINARY
                 self.logger.info(f"Открытие устройства через os.open: {self.device_path}")
@@ -273,6 +273,8 @@ class CapacityTester:
                 self.device_handle = os.fdopen(fd, 'rb+', buffering=0)
                 self.logger.info(f"Файловый дескриптор получен: {fd}")
 
+            self.sync_policy = SyncPolicy(self._fdatasync, 'chunk')
+
             # --- Проверка чтения ---
             try:
                 self.device_handle.seek(0)
@@ -293,11 +295,7 @@ class CapacityTester:
                 self.device_handle.seek(test_offset)
                 test_data = b'\xAA'
                 self.device_handle.write(test_data)
-                self.device_handle.flush()
-                if hasattr(os, 'fdatasync'):
-                    os.fdatasync(self.device_handle.fileno())
-                else:
-                    os.fsync(self.device_handle.fileno())
+                self._commit(len(test_data))
                 # Проверяем чтением
                 self.device_handle.seek(test_offset)
                 read_back = self.device_handle.read(1)
@@ -327,6 +325,9 @@ class CapacityTester:
             claimed_gb = total_bytes / (1024**3)
             self._send_message('log', f"Заявленный объём: {claimed_gb:.2f} GB", 'info')
 
+            # --- Таблица разделов до записи (для сверки с реальной ёмкостью) ---
+            partition_table = self._read_partition_table()
+
             # --- Запись маркера в начало ---
             if not self._write_marker(0):
                 raise Exception("Не удалось записать маркер в начало")
@@ -362,8 +363,11 @@ class CapacityTester:
             result = {
                 'claimed': claimed_gb,
                 'real': real_gb,
-                'status': '✅ Подлинный' if real_gb >= claimed_gb * 0.95 else '❌ Поддельный'
+                'status': '✅ Подлинный' if real_gb >= claimed_gb * 0.95 else '❌ Поддельный',
+                'sync': self.sync_policy.summary()
             }
+            self._send_message('log', self.sync_policy.describe(), 'info')
+            self._check_partitions(partition_table, real_bytes)
             self._send_message('result', result)
 
             if result['status'].startswith('✅'):
@@ -380,11 +384,34 @@ class CapacityTester:
                     self.device_handle.close()
                 except:
                     pass
+                invalidate_partition_cache(self.device_path)
             if self.unmounted:
                 self._send_message('unmount_notice', self.drive_path)
             self.running = False
             self.device_handle = None
 
+    def _read_partition_table(self) -> Optional[Dict]:
+        """Таблица разделов устройства (GPT/MBR) или None, если её не удалось прочитать"""
+        try:
+            table = read_partition_table(self.device_path)
+        except OSError as e:
+            self.logger.debug(f"Не удалось прочитать таблицу разделов: {e}")
+            return None
+        if table['partitions']:
+            self._send_message('log', f"Таблица разделов {table['scheme'].upper()}: "
+                                      f"{len(table['partitions'])} разделов", 'info')
+        return table
+
+    def _check_partitions(self, table: Optional[Dict], real_bytes: int):
+        """Предупреждение о разделах, выходящих за реальную ёмкость (типично для поддельных карт)"""
+        if not table:
+            return
+        for partition in table['partitions']:
+            if partition['end'] > real_bytes:
+                self._send_message('log', f"Раздел {partition['index']} заканчивается на "
+                                          f"{partition['end'] / (1024**3):.2f} GB — за пределами реальной ёмкости: "
+                                          f"данные за {real_bytes / (1024**3):.2f} GB будут потеряны", 'warning')
+
     def _write_marker(self, offset: int) -> bool:
         """Записывает маркер по заданному смещению с подробным логированием"""
         try:
@@ -393,12 +420,7 @@ class CapacityTester:
             self.logger.debug("Позиционирование выполнено")
             self.device_handle.write(self.marker)
             self.logger.debug("Запись выполнена")
-            self.device_handle.flush()
-            self.logger.debug("Сброс буфера выполнен")
-            if hasattr(os, 'fdatasync'):
-                os.fdatasync(self.device_handle.fileno())
-            else:
-                os.fsync(self.device_handle.fileno())
+            self._commit(self.marker_size)
             self.logger.debug("Синхронизация выполнена")
             return True
         except OSError as e:
@@ -425,11 +447,7 @@ class CapacityTester:
             block = os.urandom(self.chunk_size)
             self.device_handle.seek(offset)
             self.device_handle.write(block)
-            self.device_handle.flush()
-            if hasattr(os, 'fdatasync'):
-                os.fdatasync(self.device_handle.fileno())
-            else:
-                os.fsync(self.device_handle.fileno())
+            self._commit(len(block))
             return True
         except OSError as e:
             # Ошибка записи – вероятно, выход за пределы реальной ёмкости
@@ -439,6 +457,19 @@ class CapacityTester:
             self.logger.warning(f"Неожиданная ошибка при записи блока: {e}")
             return False
 
+    def _fdatasync(self):
+        """Сброс буфера объекта файла и записанных данных на носитель"""
+        self.device_handle.flush()
+        if hasattr(os, 'fdatasync'):
+            os.fdatasync(self.device_handle.fileno())
+        else:
+            os.fsync(self.device_handle.fileno())
+
+    def _commit(self, nbytes: int):
+        """Пробная запись сбрасывается через политику синхронизации, которая измеряет стоимость sync"""
+        self.sync_policy.written(nbytes)
+        self.sync_policy.commit()
+
     def _send_message(self, msg_type: str, *args):
         """Отправка сообщения в очередь"""
         try:
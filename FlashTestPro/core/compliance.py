@@ -0,0 +1,110 @@
+"""
+Проверка соответствия классам скорости SD: Speed Class (C2–C10), UHS Speed Class
+(U1, U3), Video Speed Class (V6–V90) и Application Performance Class (A1, A2).
+Классы скорости задают минимальную устойчивую скорость последовательной записи,
+поэтому оценивается худшее скользящее окно записи, а не средняя скорость.
+Скорости в спецификации SD указаны в единицах 1 MB/s = 1 000 000 байт/с.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Единица скорости спецификации SD
+SD_MB = 1000 * 1000
+
+# Классы скорости: (имя, семейство, минимальная устойчивая запись MB/s)
+SPEED_CLASSES = (
+    ('C2', 'speed', 2),
+    ('C4', 'speed', 4),
+    ('C6', 'speed', 6),
+    ('C10', 'speed', 10),
+    ('U1', 'uhs', 10),
+    ('U3', 'uhs', 30),
+    ('V6', 'video', 6),
+    ('V10', 'video', 10),
+    ('V30', 'video', 30),
+    ('V60', 'video', 60),
+    ('V90', 'video', 90),
+)
+# Классы приложений: (имя, случайное чтение 4K IOPS, случайная запись 4K IOPS, устойчивая запись MB/s)
+APP_CLASSES = (
+    ('A1', 1500, 500, 10),
+    ('A2', 4000, 2000, 10),
+)
+CLASS_NAMES = tuple(name for name, _, _ in SPEED_CLASSES) + tuple(name for name, _, _, _ in APP_CLASSES)
+
+
+def sliding_windows(samples: Sequence[Tuple[float, int, int]], window: float) -> List[Dict]:
+    """
+    Скорость записи в скользящих окнах длиной window секунд.
+    samples — завершения запросов по порядку: (время завершения от начала, байт, смещение).
+    Окно заканчивается на каждом завершении, начиная с первого, до которого прошло не меньше
+    window секунд; если замер короче окна, возвращается одно окно на весь замер.
+    Скорость в MB/s спецификации SD.
+    """
+    if not samples:
+        return []
+    if samples[-1][0] < window:
+        total = sum(nbytes for _, nbytes, _ in samples)
+        elapsed = max(samples[-1][0], 1e-9)
+        return [{'start': 0.0, 'offset': samples[0][2], 'mbps': total / SD_MB / elapsed}]
+
+    windows = []
+    first = 0
+    window_bytes = 0
+    for end_time, nbytes, _ in samples:
+        window_bytes += nbytes
+        # В окно входят запросы, завершившиеся позже его начала
+        while samples[first][0] <= end_time - window:
+            window_bytes -= samples[first][1]
+            first += 1
+        if end_time >= window:
+            windows.append({'start': end_time - window, 'offset': samples[first][2],
+                            'mbps': window_bytes / SD_MB / window})
+    return windows
+
+
+def worst_window(windows: Sequence[Dict]) -> Optional[Dict]:
+    """Окно с наименьшей скоростью"""
+    return min(windows, key=lambda w: w['mbps']) if windows else None
+
+
+def evaluate_classes(sustained_mbps: Optional[float], read_iops: Optional[float] = None,
+                     write_iops: Optional[float] = None) -> List[Dict]:
+    """
+    Вердикт по каждому классу. passed — None, если для класса нет замера
+    (например, IOPS не измерялись).
+    """
+    results = []
+    for name, family, min_write in SPEED_CLASSES:
+        results.append({
+            'class': name,
+            'family': family,
+            'required': {'write_mbps': min_write},
+            'measured': {'write_mbps': sustained_mbps},
+            'passed': None if sustained_mbps is None else sustained_mbps >= min_write
+        })
+    for name, min_read, min_write_iops, min_write in APP_CLASSES:
+        measured = {'read_iops': read_iops, 'write_iops': write_iops, 'write_mbps': sustained_mbps}
+        if None in measured.values():
+            passed = None
+        else:
+            passed = read_iops >= min_read and write_iops >= min_write_iops and sustained_mbps >= min_write
+        results.append({
+            'class': name,
+            'family': 'app',
+            'required': {'read_iops': min_read, 'write_iops': min_write_iops, 'write_mbps': min_write},
+            'measured': measured,
+            'passed': passed
+        })
+    return results
+
+
+def check_claims(classes: Sequence[Dict], claimed: Sequence[str]) -> Optional[bool]:
+    """Соответствие заявленным классам: False, если хотя бы один заявленный класс не подтверждён"""
+    verdicts = {item['class']: item['passed'] for item in classes}
+    claimed = [name.upper() for name in claimed]
+    if not claimed:
+        return None
+    unknown = [name for name in claimed if name not in verdicts]
+    if unknown:
+        raise ValueError(f"Неизвестные классы скорости: {', '.join(unknown)}")
+    return all(verdicts[name] is True for name in claimed)
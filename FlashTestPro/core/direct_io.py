@@ -0,0 +1,284 @@
+"""
+Позиционный ввод-вывод на устройстве с необязательным обходом страничного кэша.
+На Linux используется O_DIRECT, на macOS — F_NOCACHE. Если устройство или ФС
+отказывает в прямом доступе, дескриптор прозрачно открывается в обычном режиме.
+Прямой ввод-вывод требует выровненных по странице буферов и выровненных по сектору
+смещений и длин: такие буферы выделяются через анонимный mmap.
+"""
+import ctypes
+import errno
+import mmap
+import os
+import threading
+from typing import Optional
+
+# Выравнивание буферов, смещений и длин для прямого ввода-вывода
+ALIGNMENT = 4096
+# Логический сектор по умолчанию (если устройство не сообщает свой)
+DEFAULT_SECTOR_SIZE = 512
+# ioctl Linux: размер логического сектора блочного устройства
+BLKSSZGET = 0x1268
+
+
+def aligned_buffer(size: int) -> mmap.mmap:
+    """Буфер, выровненный по странице (анонимный mmap), размером не меньше size"""
+    size = max(ALIGNMENT, -(-size // ALIGNMENT) * ALIGNMENT)
+    return mmap.mmap(-1, size)
+
+
+def _is_aligned_buffer(view: memoryview) -> bool:
+    """Проверка адреса буфера на выравнивание (только для изменяемых буферов)"""
+    if view.readonly:
+        return False
+    try:
+        address = ctypes.addressof(ctypes.c_char.from_buffer(view))
+    except (TypeError, ValueError):
+        return False
+    return address % ALIGNMENT == 0
+
+
+class DeviceIO:
+    """Дескриптор устройства с pwrite/preadinto/sync и прямым доступом при возможности"""
+
+    def __init__(self, path: str, flags: int, direct: bool = False, mode: int = 0o644):
+        self.path = path
+        self.flags = flags
+        self.mode = mode
+        self.io_lock = threading.Lock()
+        self._bounce_lock = threading.Lock()
+        self.method = 'buffered'
+        self.fd = None
+        # Обычный дескриптор для невыровненных хвостов при прямом доступе
+        self._fallback_fd = None
+        self._fallback_used = False
+        # Промежуточный выровненный буфер для невыровненных по адресу данных
+        self._bounce: Optional[mmap.mmap] = None
+
+        if direct:
+            self._open_direct()
+        if self.fd is None:
+            self.fd = os.open(path, flags, mode)
+        self.sector_size = self._query_sector_size()
+
+    @property
+    def direct(self) -> bool:
+        return self.method != 'buffered'
+
+    def _open_direct(self):
+        """Попытка открыть устройство в обход кэша; при отказе fd остаётся None"""
+        try:
+            if hasattr(os, 'O_DIRECT'):
+                self.fd = os.open(self.path, self.flags | os.O_DIRECT, self.mode)
+                self.method = 'O_DIRECT'
+            else:
+                import fcntl
+                if not hasattr(fcntl, 'F_NOCACHE'):
+                    return
+                self.fd = os.open(self.path, self.flags, self.mode)
+                fcntl.fcntl(self.fd, fcntl.F_NOCACHE, 1)
+                self.method = 'F_NOCACHE'
+        except (OSError, ImportError):
+            self._close_fd()
+            self.method = 'buffered'
+            return
+
+        # Некоторые драйверы принимают флаг при открытии, но отказывают при чтении
+        if self.method == 'O_DIRECT':
+            probe = aligned_buffer(ALIGNMENT)
+            try:
+                os.preadv(self.fd, [probe], 0)
+            except OSError as e:
+                if e.errno == errno.EINVAL:
+                    self._close_fd()
+                    self.method = 'buffered'
+            finally:
+                probe.close()
+
+    def _query_sector_size(self) -> int:
+        """Логический размер сектора устройства (для файлов и других ОС — 512 байт)"""
+        try:
+            import fcntl
+            import struct
+            raw = fcntl.ioctl(self.fd, BLKSSZGET, struct.pack('I', 0))
+            size = struct.unpack('I', raw)[0]
+        except (ImportError, OSError, ValueError):
+            return DEFAULT_SECTOR_SIZE
+        return size if size > 0 else DEFAULT_SECTOR_SIZE
+
+    def _close_fd(self):
+        if self.fd is not None:
+            try:
+                os.close(self.fd)
+            except OSError:
+                pass
+        self.fd = None
+
+    def _is_direct_range(self, offset: int, length: int) -> bool:
+        return offset % ALIGNMENT == 0 and length % ALIGNMENT == 0
+
+    def _get_fallback_fd(self) -> int:
+        """Обычный дескриптор для участков, не выровненных по сектору"""
+        with self.io_lock:
+            if self._fallback_fd is None:
+                flags = self.flags & ~(os.O_CREAT | os.O_TRUNC)
+                self._fallback_fd = os.open(self.path, flags)
+            self._fallback_used = True
+            return self._fallback_fd
+
+    def _get_bounce(self, size: int) -> memoryview:
+        if self._bounce is None or len(self._bounce) < size:
+            if self._bounce is not None:
+                self._bounce.close()
+            self._bounce = aligned_buffer(size)
+        return memoryview(self._bounce)[:size]
+
+    def pwrite(self, data, offset: int):
+        """Позиционная запись всего буфера"""
+        view = memoryview(data).cast('B')
+        if self.method == 'O_DIRECT':
+            if not self._is_direct_range(offset, len(view)):
+                self._write(self._get_fallback_fd(), view, offset)
+                return
+            if not _is_aligned_buffer(view):
+                # Данные не выровнены по странице — копия через промежуточный буфер
+                with self._bounce_lock:
+                    bounce = self._get_bounce(len(view))
+                    bounce[:] = view
+                    self._write(self.fd, bounce, offset)
+                return
+        self._write(self.fd, view, offset)
+
+    def _write(self, fd: int, view: memoryview, offset: int):
+        written = 0
+        while written < len(view):
+            if hasattr(os, 'pwrite'):
+                n = os.pwrite(fd, view[written:], offset + written)
+            else:
+                with self.io_lock:
+                    os.lseek(fd, offset + written, os.SEEK_SET)
+                    n = os.write(fd, view[written:])
+            if n <= 0:
+                raise OSError(f"Не удалось записать данные по смещению {offset + written}")
+            written += n
+
+    def preadinto(self, buffer, offset: int) -> int:
+        """Позиционное чтение в буфер; возвращает число прочитанных байт"""
+        view = memoryview(buffer).cast('B')
+        if self.method == 'O_DIRECT':
+            if not self._is_direct_range(offset, len(view)):
+                return self._read(self._get_fallback_fd(), view, offset)
+            if not _is_aligned_buffer(view):
+                with self._bounce_lock:
+                    bounce = self._get_bounce(len(view))
+                    done = self._read(self.fd, bounce, offset)
+                    view[:done] = bounce[:done]
+                return done
+        return self._read(self.fd, view, offset)
+
+    def _read(self, fd: int, view: memoryview, offset: int) -> int:
+        done = 0
+        while done < len(view):
+            if hasattr(os, 'preadv'):
+                n = os.preadv(fd, [view[done:]], offset + done)
+            else:
+                with self.io_lock:
+                    os.lseek(fd, offset + done, os.SEEK_SET)
+                    part = os.read(fd, len(view) - done)
+                n = len(part)
+                view[done:done + n] = part
+            if n <= 0:
+                break
+            done += n
+        return done
+
+    def pread(self, size: int, offset: int) -> bytes:
+        """Позиционное чтение size байт в новый объект bytes"""
+        if not self.direct:
+            parts = []
+            done = 0
+            while done < size:
+                if hasattr(os, 'pread'):
+                    part = os.pread(self.fd, size - done, offset + done)
+                else:
+                    with self.io_lock:
+                        os.lseek(self.fd, offset + done, os.SEEK_SET)
+                        part = os.read(self.fd, size - done)
+                if not part:
+                    break
+                parts.append(part)
+                done += len(part)
+            return parts[0] if len(parts) == 1 else b''.join(parts)
+
+        buffer = bytearray(size)
+        n = self.preadinto(buffer, offset)
+        return bytes(buffer[:n])
+
+    def sync(self):
+        """Сброс записанных данных на носитель"""
+        fds = [self.fd]
+        if self._fallback_used:
+            fds.append(self._fallback_fd)
+        for fd in fds:
+            if hasattr(os, 'fdatasync'):
+                os.fdatasync(fd)
+            else:
+                os.fsync(fd)
+
+    def drop_cache(self) -> bool:
+        """
+        Сброс записанных данных и вытеснение страниц устройства из кэша ОС,
+        чтобы последующее чтение шло с носителя. Возвращает False, если ОС
+        не поддерживает posix_fadvise.
+        """
+        self.sync()
+        if not hasattr(os, 'posix_fadvise'):
+            return False
+        fds = [self.fd]
+        if self._fallback_used:
+            fds.append(self._fallback_fd)
+        for fd in fds:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        return True
+
+    def evict(self, offset: int, length: int) -> bool:
+        """
+        Вытеснение участка из кэша ОС перед чтением, чтобы проверка шла с носителя.
+        Грязные страницы не вытесняются, поэтому участок должен быть уже сброшен sync().
+        Возвращает False, если ОС не поддерживает posix_fadvise.
+        """
+        if not hasattr(os, 'posix_fadvise'):
+            return False
+        fds = [self.fd]
+        if self._fallback_used:
+            fds.append(self._fallback_fd)
+        for fd in fds:
+            os.posix_fadvise(fd, offset, length, os.POSIX_FADV_DONTNEED)
+        return True
+
+    def preallocate(self, size: int) -> bool:
+        """
+        Резервирование места под файл размером size (posix_fallocate): нехватка места
+        обнаруживается сразу (OSError ENOSPC), а не посреди теста. Возвращает False,
+        если ОС или ФС не поддерживают резервирование.
+        """
+        if not hasattr(os, 'posix_fallocate'):
+            return False
+        try:
+            os.posix_fallocate(self.fd, 0, size)
+        except OSError as e:
+            if e.errno in (errno.EOPNOTSUPP, errno.EINVAL, errno.ENOSYS):
+                return False
+            raise
+        return True
+
+    def close(self):
+        if self._fallback_fd is not None:
+            try:
+                os.close(self._fallback_fd)
+            except OSError:
+                pass
+            self._fallback_fd = None
+        if self._bounce is not None:
+            self._bounce.close()
+            self._bounce = None
+        self._close_fd()
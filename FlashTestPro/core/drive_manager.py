@@ -8,6 +8,8 @@ import psutil
 import subprocess
 from typing import List, Dict, Optional
 from utils.logger import get_logger
+from core.partitions import read_partition_table, partition_intervals
+from core.block_devices import resolve_block_device
 
 class DriveManager:
     """Класс для работы с дисками (включая неотформатированные и S.M.A.R.T.)"""
@@ -491,14 +493,9 @@ class DriveManager:
         if self.system == "Windows":
             return self._get_physical_drive_path_from_mountpoint(mountpoint)
         elif self.system == "Linux":
-            try:
-                with open('/proc/mounts') as f:
-                    for line in f:
-                        parts = line.split()
-                        if len(parts) > 1 and parts[1] == mountpoint:
-                            return parts[0]
-            except:
-                pass
+            info = resolve_block_device(mountpoint)
+            if info is not None:
+                return info['path']
         elif self.system == "Darwin":
             try:
                 result = subprocess.run(
@@ -525,11 +522,11 @@ class DriveManager:
 
     def get_partition_offsets(self, device_path):
         """
-        Для Windows: возвращает список кортежей (start, end) в байтах для каждого раздела на физическом диске.
-        Для Linux: пока не реализовано (возвращает пустой список).
+        Возвращает список кортежей (start, end) в байтах для каждого раздела на физическом диске.
+        Windows: через WMI; остальные ОС (и Windows без WMI): разбор таблицы GPT/MBR на устройстве.
         """
         if self.system != "Windows" or not self.wmi_conn:
-            return []
+            return self._get_partition_offsets_from_table(device_path)
         import re
         match = re.search(r'PhysicalDrive(\d+)', device_path, re.IGNORECASE)
         if not match:
@@ -547,3 +544,18 @@ class DriveManager:
         except Exception as e:
             self.logger.error(f"Ошибка получения разделов: {e}")
         return offsets
+
+    def get_partition_table(self, device_path) -> Dict:
+        """Таблица разделов устройства (схема и разделы); при ошибке чтения — пустая"""
+        try:
+            return read_partition_table(device_path)
+        except OSError as e:
+            self.logger.debug(f"Не удалось прочитать таблицу разделов {device_path}: {e}")
+            return {'scheme': 'none', 'partitions': []}
+
+    def _get_partition_offsets_from_table(self, device_path):
+        """Границы разделов по таблице GPT/MBR, прочитанной с устройства"""
+        if not device_path:
+            return []
+        table = self.get_partition_table(device_path)
+        return partition_intervals(table, table.get('disk_size', 0))
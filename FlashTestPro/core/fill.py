@@ -0,0 +1,381 @@
+"""
+Проверка свободного места заполнением файлами (в духе h2testw).
+Свободное место смонтированного тома заполняется последовательностью файлов
+не больше 1 GB (ограничение FAT32 — 4 GB на файл), затем все файлы читаются
+и сверяются, после чего удаляются. Данные каждого файла зависят от его
+положения в общей последовательности, поэтому поддельная карта, которая
+«заворачивает» запись на уже занятые ячейки, выдаёт себя несовпадением.
+Не требует прямого доступа к устройству и прав администратора.
+"""
+import errno
+import os
+import queue
+import shutil
+import threading
+import time
+from typing import Dict, List, Optional
+
+from utils.logger import get_logger
+from core.direct_io import DeviceIO
+from core.pipeline import buffers_equal
+from core.mismatch import SECTOR_SIZE, find_mismatched_sectors
+from core.patterns import PatternGenerator, new_seed
+
+
+class FillTester:
+    """Заполнение свободного места файлами с последующей проверкой и очисткой"""
+
+    # Размер одного файла: заметно меньше предела FAT32 (4 GB - 1 байт)
+    FILE_SIZE = 1024 * 1024 * 1024
+    # Размер блока записи и чтения
+    CHUNK_SIZE = 8 * 1024 * 1024
+    # Свободное место, оставляемое файловой системе под метаданные
+    RESERVE_BYTES = 4 * 1024 * 1024
+    # Предел числа одновременных писателей
+    MAX_WRITERS = 8
+    # Каталог с файлами заполнения в корне тома
+    FILL_DIR = "FlashTestPro_fill"
+    # Проход генератора паттерна: данные задаются seed и сквозным смещением в последовательности файлов
+    PATTERN_PASS = 1
+
+    def __init__(self, app):
+        self.app = app
+        self.logger = get_logger(__name__)
+
+        self.test_thread = None
+        self.running = False
+        self.stop_requested = False
+        self.message_queue = queue.Queue(maxsize=100)
+        self.stats_lock = threading.Lock()
+
+        self.drive_path = ""
+        self.params: Dict = {}
+        self.fill_dir = ""
+        self.pattern_generator: Optional[PatternGenerator] = None
+        # Том заполнен: новые файлы не создаются
+        self._fs_full = False
+        self._cache_warned = False
+        self.stats = self._init_stats()
+
+    def _init_stats(self) -> Dict:
+        return {
+            'drive_path': '',
+            'total_bytes': 0,
+            'free_bytes': 0,
+            'written_bytes': 0,
+            'verified_bytes': 0,
+            'corrupted_bytes': 0,
+            # Недописанные или непрочитанные из-за ошибок ввода-вывода байты (входят в corrupted_bytes)
+            'unverified_bytes': 0,
+            'first_error_offset': None,
+            'write_speed': 0.0,
+            'read_speed': 0.0,
+            'files': [],
+            'writers': 1,
+            'pattern_seed': None,
+            'elapsed': 0.0,
+            'status': 'idle'
+        }
+
+    def start_test(self, drive_path: str, params: Optional[Dict] = None):
+        """Запуск заполнения тома drive_path (точка монтирования или буква диска)"""
+        if self.running:
+            self.logger.warning("Тест уже выполняется")
+            return
+
+        self.drive_path = drive_path
+        self.params = dict(params or {})
+        self.stop_requested = False
+        self._fs_full = False
+        self._cache_warned = False
+        self.stats = self._init_stats()
+        self.stats['drive_path'] = drive_path
+
+        self.running = True
+        self.test_thread = threading.Thread(target=self._test_worker, daemon=True)
+        self.test_thread.start()
+        self._send_message('log', f"Запуск заполнения свободного места на {drive_path}", 'info')
+
+    def _get_writers(self) -> int:
+        try:
+            writers = int(self.params.get('writers', 1))
+        except (TypeError, ValueError):
+            writers = 1
+        return max(1, min(writers, self.MAX_WRITERS))
+
+    def _plan_files(self, free_bytes: int) -> List[int]:
+        """Размеры файлов заполнения: файлы по FILE_SIZE и остаток, выровненный по сектору"""
+        fill_bytes = max(0, free_bytes - self.RESERVE_BYTES) // SECTOR_SIZE * SECTOR_SIZE
+        sizes = [self.FILE_SIZE] * (fill_bytes // self.FILE_SIZE)
+        if fill_bytes % self.FILE_SIZE:
+            sizes.append(fill_bytes % self.FILE_SIZE)
+        return sizes
+
+    def _file_path(self, index: int) -> str:
+        return os.path.join(self.fill_dir, f"{index + 1:04d}.fill")
+
+    def _test_worker(self):
+        start_time = time.time()
+        try:
+            self.fill_dir = os.path.join(self.drive_path, self.FILL_DIR)
+            os.makedirs(self.fill_dir, exist_ok=True)
+
+            usage = shutil.disk_usage(self.fill_dir)
+            sizes = self._plan_files(usage.free)
+            if not sizes:
+                raise Exception("Недостаточно свободного места для заполнения")
+            self.stats['total_bytes'] = usage.total
+            self.stats['free_bytes'] = usage.free
+            self.stats['writers'] = self._get_writers()
+            self.stats['files'] = [{'name': os.path.basename(self._file_path(index)), 'size': size,
+                                    'offset': index * self.FILE_SIZE, 'written': 0, 'verified': 0, 'write_speed': 0.0,
+                                    'read_speed': 0.0, 'corrupted_bytes': 0, 'error': None}
+                                   for index, size in enumerate(sizes)]
+
+            seed = self.params.get('pattern_seed')
+            self.pattern_generator = PatternGenerator(new_seed() if seed is None else seed)
+            self.stats['pattern_seed'] = self.pattern_generator.seed
+            self._send_message('log', f"Свободно {usage.free / (1024**3):.2f} GB из {usage.total / (1024**3):.2f} GB: "
+                                      f"{len(sizes)} файлов по ≤ {self.FILE_SIZE // (1024**2)} MB, "
+                                      f"писателей: {self.stats['writers']}", 'info')
+
+            self._run_phase('write', self._write_file, self.stats['writers'])
+            if not self.stop_requested:
+                self._run_phase('read', self._verify_file, self.stats['writers'])
+            self._finish(time.time() - start_time)
+
+        except Exception as e:
+            self.logger.error(f"Ошибка в потоке заполнения: {e}", exc_info=True)
+            self._send_message('error', str(e))
+        finally:
+            if self.params.get('cleanup', True):
+                self._cleanup()
+            self.running = False
+
+    def _run_phase(self, phase: str, handler, workers: int):
+        """Обработка всех файлов фазы несколькими потоками (каждый файл целиком в одном потоке)"""
+        tasks = queue.Queue()
+        for index in range(len(self.stats['files'])):
+            tasks.put(index)
+        self._phase_bytes = 0
+        self._phase_start = time.time()
+        self._phase_total = sum(f['size'] if phase == 'write' else f['written'] for f in self.stats['files'])
+
+        def worker():
+            while not self.stop_requested:
+                try:
+                    index = tasks.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    handler(index)
+                except Exception as e:
+                    self.logger.error(f"Ошибка обработки файла {index + 1}: {e}", exc_info=True)
+                    self.stats['files'][index]['error'] = str(e)
+                    self._record_failure(self.stats['files'][index], phase)
+                    self._send_message('log', f"Файл {self.stats['files'][index]['name']}: {e}", 'error')
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        elapsed = max(time.time() - self._phase_start, 0.001)
+        self.stats[f"{phase}_speed"] = self._phase_bytes / (1024**2) / elapsed
+
+    def _add_progress(self, nbytes: int, phase: str):
+        with self.stats_lock:
+            self._phase_bytes += nbytes
+            done = self._phase_bytes
+        # Запись — первая половина шкалы, проверка — вторая
+        fraction = done / self._phase_total if self._phase_total else 1.0
+        self._send_message('progress', (fraction + (phase == 'read')) * 50)
+
+    def _write_file(self, index: int):
+        """Запись файла данными, зависящими от сквозного смещения; переполнение тома завершает запись"""
+        info = self.stats['files'][index]
+        if self._fs_full:
+            info['size'] = 0
+            return
+        path = self._file_path(index)
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+        device_io = DeviceIO(path, flags)
+        buffer = bytearray(self.CHUNK_SIZE)
+        view = memoryview(buffer)
+        start = time.perf_counter()
+        offset = 0
+        try:
+            while offset < info['size'] and not self.stop_requested:
+                length = min(self.CHUNK_SIZE, info['size'] - offset)
+                self.pattern_generator.fill(view[:length], self.PATTERN_PASS, info['offset'] + offset)
+                try:
+                    device_io.pwrite(view[:length], offset)
+                except OSError as e:
+                    if e.errno != errno.ENOSPC:
+                        raise
+                    # Том заполнен раньше расчёта (метаданные ФС): файл укорачивается до записанного
+                    self._fs_full = True
+                    self._send_message('log', f"Том заполнен на файле {info['name']}", 'info')
+                    break
+                offset += length
+                info['written'] = offset
+                self._add_progress(length, 'write')
+            # Проверка должна читать носитель, а не кэш ОС
+            if not device_io.drop_cache() and not self._cache_warned:
+                self._cache_warned = True
+                self._send_message('log', "ОС не поддерживает сброс кэша файлов: проверка может читать "
+                                          "данные из памяти. Для надёжного результата извлеките и "
+                                          "снова подключите диск", 'warning')
+        finally:
+            device_io.close()
+        if offset < info['size']:
+            os.truncate(path, offset)
+            info['size'] = offset
+        elapsed = max(time.perf_counter() - start, 0.001)
+        info['write_speed'] = offset / (1024**2) / elapsed
+        with self.stats_lock:
+            self.stats['written_bytes'] += offset
+
+    def _verify_file(self, index: int):
+        """Чтение файла и сверка с ожидаемыми данными"""
+        info = self.stats['files'][index]
+        if not info['written']:
+            return
+        flags = os.O_RDONLY | getattr(os, 'O_BINARY', 0)
+        device_io = DeviceIO(self._file_path(index), flags)
+        expected = bytearray(self.CHUNK_SIZE)
+        actual = bytearray(self.CHUNK_SIZE)
+        start = time.perf_counter()
+        offset = 0
+        try:
+            while offset < info['written'] and not self.stop_requested:
+                length = min(self.CHUNK_SIZE, info['written'] - offset)
+                expected_view = memoryview(expected)[:length]
+                actual_view = memoryview(actual)[:length]
+                self.pattern_generator.fill(expected_view, self.PATTERN_PASS, info['offset'] + offset)
+                n = device_io.preadinto(actual_view, offset)
+                if n != length or not buffers_equal(actual_view, expected_view):
+                    self._record_corruption(info, offset, expected_view[:n], actual_view[:n], length - n)
+                offset += length
+                info['verified'] = offset
+                self._add_progress(length, 'read')
+        finally:
+            device_io.close()
+        elapsed = max(time.perf_counter() - start, 0.001)
+        info['read_speed'] = offset / (1024**2) / elapsed
+        with self.stats_lock:
+            self.stats['verified_bytes'] += offset
+        status = "OK" if not info['corrupted_bytes'] else f"повреждено {info['corrupted_bytes'] // 1024} KB"
+        self._send_message('log', f"Файл {info['name']}: {info['written'] / (1024**2):.0f} MB, "
+                                  f"запись {info['write_speed']:.1f} MB/s, чтение {info['read_speed']:.1f} MB/s, "
+                                  f"{status}", 'info' if not info['corrupted_bytes'] else 'error')
+
+    def _record_corruption(self, info: Dict, offset: int, expected, actual, missing: int):
+        """Учёт несовпавших секторов блока; сквозное смещение первой ошибки — граница реальной ёмкости"""
+        mismatches = find_mismatched_sectors(expected, actual, info['offset'] + offset)
+        corrupted = sum(m['count'] for m in mismatches) * SECTOR_SIZE + missing
+        first = mismatches[0]['sector'] * SECTOR_SIZE if mismatches else info['offset'] + offset + len(actual)
+        with self.stats_lock:
+            info['corrupted_bytes'] += corrupted
+            self.stats['corrupted_bytes'] += corrupted
+            if self.stats['first_error_offset'] is None or first < self.stats['first_error_offset']:
+                self.stats['first_error_offset'] = first
+
+    def _record_failure(self, info: Dict, phase: str):
+        """
+        Ошибка ввода-вывода в файле: недописанный или непроверенный остаток считается повреждённым,
+        а сквозное смещение сбоя ограничивает реальную ёмкость
+        """
+        done = info['written'] if phase == 'write' else info['verified']
+        lost = max(0, (info['size'] if phase == 'write' else info['written']) - done)
+        failed_at = info['offset'] + done
+        with self.stats_lock:
+            self.stats['written_bytes' if phase == 'write' else 'verified_bytes'] += done
+            info['corrupted_bytes'] += lost
+            self.stats['corrupted_bytes'] += lost
+            self.stats['unverified_bytes'] += lost
+            if self.stats['first_error_offset'] is None or failed_at < self.stats['first_error_offset']:
+                self.stats['first_error_offset'] = failed_at
+
+    def _finish(self, elapsed: float):
+        """Итог: объём исправных данных и вердикт о подлинности ёмкости"""
+        stats = self.stats
+        stats['elapsed'] = elapsed
+        if self.stop_requested:
+            stats['status'] = 'stopped'
+            self._send_message('complete', "Заполнение прервано")
+            return
+        used_before = stats['total_bytes'] - stats['free_bytes']
+        ok_bytes = stats['verified_bytes'] - (stats['corrupted_bytes'] - stats['unverified_bytes'])
+        failed_files = [info['name'] for info in stats['files'] if info['error']]
+        if stats['first_error_offset'] is None:
+            real = stats['total_bytes']
+        else:
+            # Данные до первой ошибки сохранились — это и есть пригодная ёмкость
+            real = used_before + stats['first_error_offset']
+        genuine = stats['corrupted_bytes'] == 0 and not failed_files
+        if failed_files:
+            self._send_message('log', f"Ошибки ввода-вывода в файлах: {', '.join(failed_files)}", 'error')
+        stats['status'] = 'ok' if genuine else 'corrupted'
+        self._send_message('log', f"Запись {stats['write_speed']:.1f} MB/s, чтение {stats['read_speed']:.1f} MB/s; "
+                                  f"проверено {ok_bytes / (1024**3):.2f} GB без ошибок, "
+                                  f"повреждено {stats['corrupted_bytes'] / (1024**2):.1f} MB",
+                           'success' if genuine else 'error')
+        self._send_message('result', {
+            'claimed': stats['total_bytes'] / (1024**3),
+            'real': real / (1024**3),
+            'status': '✅ Подлинный' if genuine else '❌ Поддельный или неисправный'
+        })
+        if genuine:
+            self._send_message('complete', "Проверка заполнением завершена. Все данные прочитаны без ошибок.")
+        else:
+            self._send_message('complete', f"Проверка заполнением завершена. Пригодно "
+                                           f"{real / (1024**3):.2f} GB, остальные данные повреждены.")
+
+    def _cleanup(self):
+        """Удаление файлов заполнения и каталога"""
+        if not self.fill_dir or not os.path.isdir(self.fill_dir):
+            return
+        removed = 0
+        for index in range(len(self.stats['files'])):
+            try:
+                os.remove(self._file_path(index))
+                removed += 1
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self.logger.warning(f"Не удалось удалить файл заполнения: {e}")
+        try:
+            os.rmdir(self.fill_dir)
+        except OSError:
+            # В каталоге остались посторонние файлы — не трогаем их
+            pass
+        if removed:
+            self._send_message('log', f"Удалено файлов заполнения: {removed}", 'info')
+
+    def _send_message(self, msg_type: str, *args):
+        try:
+            self.message_queue.put_nowait((msg_type,) + args)
+        except queue.Full:
+            pass
+
+    def get_message(self):
+        try:
+            return self.message_queue.get_nowait()
+        except queue.Empty:
+            return None
+
+    def stop(self):
+        if self.running:
+            self.stop_requested = True
+            self._send_message('log', "Запрошена остановка заполнения...", 'warning')
+
+    def is_running(self) -> bool:
+        return self.running
+
+    def get_statistics(self) -> Dict:
+        with self.stats_lock:
+            stats = self.stats.copy()
+            stats['files'] = [dict(info) for info in self.stats['files']]
+        return stats
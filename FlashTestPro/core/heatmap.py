@@ -0,0 +1,104 @@
+"""
+Тепловая карта устройства: скорость и ошибки в фиксированных корзинах по LBA.
+График скорости показывает только время, а медленные или сбойные зоны на постоянном
+смещении (признак поддельной или изношенной памяти) видны лишь в координатах носителя.
+Память фиксирована: на корзину хранятся байты, время и число битых секторов за все проходы.
+"""
+import math
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from core.mismatch import SECTOR_SIZE
+
+# Число корзин по умолчанию
+DEFAULT_BINS = 1024
+# Корзина считается медленной, если её скорость ниже этой доли медианы
+SLOW_FRACTION = 0.5
+
+
+def grid_shape(bins: int) -> Tuple[int, int]:
+    """Строки и столбцы сетки для отображения корзин (близко к квадрату)"""
+    columns = max(1, int(math.ceil(math.sqrt(bins))))
+    return int(math.ceil(bins / columns)), columns
+
+
+class LBAHeatMap:
+    """Накопитель скорости и ошибок по корзинам адресного пространства; методы не потокобезопасны"""
+
+    def __init__(self, total_bytes: int, bins: int = DEFAULT_BINS):
+        self.total_bytes = max(0, int(total_bytes))
+        try:
+            bins = int(bins)
+        except (TypeError, ValueError):
+            bins = DEFAULT_BINS
+        # Корзина не меньше сектора: у маленьких областей корзин меньше
+        bins = max(1, min(bins, self.total_bytes // SECTOR_SIZE or 1))
+        self.bin_bytes = max(1, -(-self.total_bytes // bins))
+        self.bins = max(1, -(-self.total_bytes // self.bin_bytes))
+        self._bytes = [0] * self.bins
+        self._seconds = [0.0] * self.bins
+        self._errors = [0] * self.bins
+
+    def _spans(self, offset: int, length: int) -> Iterator[Tuple[int, int]]:
+        """Корзины, которые пересекает диапазон, и размер пересечения"""
+        end = min(offset + length, self.total_bytes)
+        while offset < end:
+            index = offset // self.bin_bytes
+            part = min(end, (index + 1) * self.bin_bytes) - offset
+            yield index, part
+            offset += part
+
+    def record(self, offset: int, length: int, elapsed: float):
+        """Учёт обработанного блока: время делится между корзинами пропорционально объёму"""
+        if length <= 0 or elapsed <= 0:
+            return
+        for index, part in self._spans(offset, length):
+            self._bytes[index] += part
+            self._seconds[index] += elapsed * part / length
+
+    def add_error(self, sector: int, count: int = 1):
+        """Учёт битых секторов sector..sector+count-1"""
+        for index, part in self._spans(sector * SECTOR_SIZE, count * SECTOR_SIZE):
+            self._errors[index] += max(1, part // SECTOR_SIZE)
+
+    def speeds(self) -> List[Optional[float]]:
+        """Скорость корзин в MB/s; None — корзина не проверялась"""
+        return [nbytes / (1024 * 1024) / seconds if seconds > 0 else None
+                for nbytes, seconds in zip(self._bytes, self._seconds)]
+
+    def _zones(self, indices: List[int], speeds: List[Optional[float]]) -> List[Dict]:
+        """Соседние корзины объединяются в зоны с границами в байтах"""
+        zones = []
+        for index in indices:
+            if zones and zones[-1]['last'] == index - 1:
+                zone = zones[-1]
+                zone['last'] = index
+                zone['min_speed'] = min(zone['min_speed'], speeds[index])
+                zone['errors'] += self._errors[index]
+            else:
+                zones.append({'first': index, 'last': index, 'min_speed': speeds[index],
+                              'errors': self._errors[index]})
+        for zone in zones:
+            zone['start'] = zone['first'] * self.bin_bytes
+            zone['end'] = min((zone['last'] + 1) * self.bin_bytes, self.total_bytes)
+        return zones
+
+    def summary(self) -> Dict:
+        speeds = self.speeds()
+        measured = sorted(speed for speed in speeds if speed is not None)
+        median = measured[len(measured) // 2] if measured else 0.0
+        slow = [index for index, speed in enumerate(speeds)
+                if speed is not None and speed < median * SLOW_FRACTION]
+        return {
+            'bins': self.bins,
+            'bin_bytes': self.bin_bytes,
+            'total_bytes': self.total_bytes,
+            'speeds': [round(speed, 2) if speed is not None else None for speed in speeds],
+            'errors': list(self._errors),
+            'tested_bins': len(measured),
+            'min_speed': measured[0] if measured else 0.0,
+            'median_speed': median,
+            'max_speed': measured[-1] if measured else 0.0,
+            'slow_bins': slow,
+            'slow_zones': self._zones(slow, speeds),
+            'error_bins': [index for index, errors in enumerate(self._errors) if errors]
+        }
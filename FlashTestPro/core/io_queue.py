@@ -0,0 +1,168 @@
+"""
+Очередь запросов ввода-вывода с настраиваемой глубиной (queue depth).
+Контроллеры флеш-памяти и мосты UAS достигают паспортной скорости и IOPS только
+при нескольких одновременно выполняемых командах. Запросы pwrite/preadinto по
+независимым смещениям выполняются пулом потоков (системные вызовы отпускают GIL),
+а завершения сообщаются строго в порядке постановки.
+При глубине 1 пул не создаётся и запросы выполняются в вызывающем потоке.
+"""
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Deque, List, Optional
+
+from core.direct_io import ALIGNMENT
+
+MIN_DEPTH = 1
+MAX_DEPTH = 32
+# Наименьший размер одного запроса при разбиении блока на запросы
+MIN_REQUEST_SIZE = 64 * 1024
+
+
+def clamp_depth(depth) -> int:
+    """Глубина очереди в допустимых пределах 1..MAX_DEPTH"""
+    try:
+        depth = int(depth)
+    except (TypeError, ValueError):
+        return MIN_DEPTH
+    return max(MIN_DEPTH, min(depth, MAX_DEPTH))
+
+
+def request_size(length: int, depth: int) -> int:
+    """Размер запроса, при котором блок length делится примерно на depth частей, выровненных по странице"""
+    size = -(-length // max(depth, 1))
+    size = -(-size // ALIGNMENT) * ALIGNMENT
+    return max(size, MIN_REQUEST_SIZE)
+
+
+class IORequest:
+    """Один запрос: операция, смещение, длина и итог выполнения"""
+
+    __slots__ = ('op', 'offset', 'length', 'tag', 'result', 'error', 'latency_ns', 'future')
+
+    def __init__(self, op: str, offset: int, length: int, tag=None):
+        self.op = op
+        self.offset = offset
+        self.length = length
+        self.tag = tag
+        # Значение, возвращённое операцией (для чтения — число прочитанных байт)
+        self.result = None
+        self.error: Optional[Exception] = None
+        self.latency_ns = 0
+        self.future = None
+
+
+class IOQueue:
+    """
+    Пул из depth потоков, держащий до depth запросов к устройству одновременно.
+    submit()/drain() — поток запросов одного производителя с завершением по порядку;
+    write_all()/readinto_all() — разбиение одного блока на параллельные запросы,
+    их можно вызывать из нескольких потоков: общая глубина по устройству не превышает depth.
+    """
+
+    def __init__(self, depth: int = MIN_DEPTH, on_complete: Optional[Callable[[IORequest], None]] = None):
+        self.depth = clamp_depth(depth)
+        # on_complete(request) вызывается в потоке submit()/drain() в порядке постановки запросов
+        self.on_complete = on_complete
+        self._pending: Deque[IORequest] = deque()
+        self._executor = None
+        if self.depth > 1:
+            self._executor = ThreadPoolExecutor(max_workers=self.depth, thread_name_prefix='io-queue')
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    def submit(self, op: str, fn: Callable, buffer, offset: int, tag=None) -> IORequest:
+        """
+        Постановка запроса fn(buffer, offset). Если в очереди уже depth запросов,
+        сначала дожидается самого старого. Буфер нельзя переиспользовать до завершения запроса.
+        """
+        request = IORequest(op, offset, len(buffer), tag)
+        if self._executor is None:
+            self._execute(request, fn, buffer)
+            self._complete(request)
+            return request
+        while len(self._pending) >= self.depth:
+            self._reap()
+        request.future = self._executor.submit(self._execute, request, fn, buffer)
+        self._pending.append(request)
+        # Уже выполненные запросы в голове очереди сообщаются без ожидания
+        while self._pending and self._pending[0].future.done():
+            self._reap()
+        return request
+
+    def drain(self):
+        """Ожидание всех поставленных запросов"""
+        while self._pending:
+            self._reap()
+
+    def write_all(self, write: Callable, data, offset: int):
+        """Запись блока параллельными запросами; первая ошибка пробрасывается после завершения всех"""
+        for request in self._split('write', write, data, offset):
+            if request.error is not None:
+                raise request.error
+
+    def readinto_all(self, readinto: Callable, buffer, offset: int) -> int:
+        """
+        Чтение блока параллельными запросами. Возвращает число байт, прочитанных
+        подряд от начала блока (короткое чтение части обрывает результат на ней).
+        """
+        done = 0
+        for request in self._split('read', readinto, buffer, offset):
+            if request.error is not None:
+                raise request.error
+            if done == request.offset - offset:
+                done += request.result or 0
+        return done
+
+    def _split(self, op: str, fn: Callable, buffer, offset: int) -> List[IORequest]:
+        view = memoryview(buffer).cast('B')
+        length = len(view)
+        if self._executor is None or length <= MIN_REQUEST_SIZE:
+            request = IORequest(op, offset, length)
+            self._execute(request, fn, view)
+            return [request]
+        size = request_size(length, self.depth)
+        requests = []
+        for pos in range(0, length, size):
+            request = IORequest(op, offset + pos, min(size, length - pos))
+            request.future = self._executor.submit(self._execute, request, fn, view[pos:pos + request.length])
+            requests.append(request)
+        for request in requests:
+            request.future.result()
+        return requests
+
+    @staticmethod
+    def _execute(request: IORequest, fn: Callable, buffer):
+        start = time.perf_counter_ns()
+        try:
+            request.result = fn(buffer, request.offset)
+        except Exception as e:
+            request.error = e
+        request.latency_ns = time.perf_counter_ns() - start
+
+    def _reap(self):
+        request = self._pending.popleft()
+        request.future.result()
+        self._complete(request)
+
+    def _complete(self, request: IORequest):
+        request.future = None
+        if self.on_complete is not None:
+            self.on_complete(request)
+
+    def close(self):
+        """Ожидание оставшихся запросов и остановка пула"""
+        try:
+            self.drain()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
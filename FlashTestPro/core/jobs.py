@@ -0,0 +1,281 @@
+"""
+Одновременное выполнение заданий на нескольких дисках.
+Каждое задание (тест, затирание, проверка ёмкости, заполнение, форматирование)
+получает собственный экземпляр движка со своим потоком, статистикой и очередью
+сообщений, поэтому независимые картридеры обрабатываются параллельно и
+суммарная пропускная способность стенда используется полностью.
+Менеджер не создаёт своих потоков: poll() периодически вызывается из цикла
+интерфейса или консольного запуска, запускает ожидающие задания в пределах
+лимита и разбирает сообщения движков.
+"""
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.logger import get_logger
+
+JOB_KINDS = ('test', 'wipe', 'capacity', 'fill', 'format', 'benchmark')
+# Задания, уничтожающие данные на диске
+DESTRUCTIVE_KINDS = ('wipe', 'capacity', 'format')
+# Итоговые состояния задания
+FINAL_STATUSES = ('passed', 'defects', 'failed', 'stopped')
+# Сколько последних сообщений движка хранится у задания
+EVENT_HISTORY = 500
+
+
+class Job:
+    """Задание на одном диске: движок, состояние и последние сообщения"""
+
+    def __init__(self, job_id: int, kind: str, drive_path: str, params: Dict):
+        self.id = job_id
+        self.kind = kind
+        self.drive_path = drive_path
+        self.params = params
+        self.engine = None
+        # queued → running → passed | defects | failed | stopped
+        self.status = 'queued'
+        self.progress = 0.0
+        # Скорость последнего окна, MB/s (0 — нет данных или задание не выполняется)
+        self.speed = 0.0
+        self.completed = False
+        self.errors: List[str] = []
+        self.result: Optional[Dict] = None
+        self.stats: Optional[Dict] = None
+        self.stop_requested = False
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.events = deque(maxlen=EVENT_HISTORY)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINAL_STATUSES
+
+    def snapshot(self) -> Dict:
+        """Состояние задания для таблицы интерфейса и консольного вывода"""
+        end = self.finished_at or time.time()
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'drive_path': self.drive_path,
+            'status': self.status,
+            'progress': self.progress,
+            'speed': self.speed,
+            'errors': list(self.errors),
+            'result': self.result,
+            'elapsed': end - self.started_at if self.started_at else 0.0
+        }
+
+
+class JobManager:
+    """Очередь заданий по дискам с ограничением числа одновременно выполняемых"""
+
+    # Значения по умолчанию (секция jobs конфигурации)
+    MAX_CONCURRENT = 8
+    MEMORY_LIMIT_MB = 2048
+    # Нижняя граница памяти конвейеров одного теста
+    MIN_TEST_MEMORY = 64 * 1024 * 1024
+
+    def __init__(self, app, engine_factory: Optional[Callable[[str], object]] = None,
+                 listener: Optional[Callable[[Job, tuple], None]] = None):
+        self.app = app
+        self.logger = get_logger(__name__)
+        self.engine_factory = engine_factory or self._create_engine
+        # listener(job, msg) получает каждое сообщение движка (консольный вывод, журнал интерфейса)
+        self.listener = listener
+        self.lock = threading.Lock()
+        self._jobs: List[Job] = []
+        self._next_id = 1
+
+    def _config(self) -> Dict:
+        return self.app.config.get('jobs', {})
+
+    @property
+    def max_concurrent(self) -> int:
+        return max(1, int(self._config().get('max_concurrent', self.MAX_CONCURRENT)))
+
+    def submit(self, kind: str, drive_path: str, params: Optional[Dict] = None) -> Job:
+        """Постановка задания в очередь; на одном диске не может быть двух активных заданий"""
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Неизвестный тип задания: {kind}")
+        with self.lock:
+            if any(job.drive_path == drive_path and not job.finished for job in self._jobs):
+                raise ValueError(f"Для диска {drive_path} уже есть активное задание")
+            job = Job(self._next_id, kind, drive_path, dict(params or {}))
+            self._next_id += 1
+            self._jobs.append(job)
+        self.logger.info(f"Задание {job.id} ({kind}) поставлено в очередь для {drive_path}")
+        return job
+
+    def jobs(self) -> List[Job]:
+        with self.lock:
+            return list(self._jobs)
+
+    def is_active(self) -> bool:
+        return any(not job.finished for job in self.jobs())
+
+    def stop(self, job_id: Optional[int] = None):
+        """Остановка задания (job_id=None — всех); ожидающие задания снимаются сразу"""
+        for job in self.jobs():
+            if job_id is not None and job.id != job_id or job.finished:
+                continue
+            job.stop_requested = True
+            if job.status == 'queued':
+                self._finish(job, 'stopped')
+            elif hasattr(job.engine, 'stop'):
+                job.engine.stop()
+
+    def clear_finished(self):
+        """Удаление завершённых заданий из списка"""
+        with self.lock:
+            self._jobs = [job for job in self._jobs if not job.finished]
+
+    def poll(self) -> List[Tuple[Job, tuple]]:
+        """Разбор сообщений движков, завершение отработавших и запуск ожидающих заданий"""
+        messages = []
+        for job in self.jobs():
+            if job.status != 'running':
+                continue
+            messages.extend((job, msg) for msg in self._drain(job))
+            if not self._engine_alive(job):
+                # Последние сообщения могли прийти между опросом и остановкой потока
+                messages.extend((job, msg) for msg in self._drain(job))
+                self._finish(job, self._outcome(job))
+
+        running = sum(1 for job in self.jobs() if job.status == 'running')
+        for job in self.jobs():
+            if running >= self.max_concurrent:
+                break
+            if job.status == 'queued':
+                self._start(job)
+                running += 1
+        return messages
+
+    def aggregate(self) -> Dict:
+        """Сводка по всем заданиям: число по состояниям и суммарная скорость выполняемых"""
+        jobs = self.jobs()
+        by_status: Dict[str, int] = {}
+        for job in jobs:
+            by_status[job.status] = by_status.get(job.status, 0) + 1
+        return {
+            'total': len(jobs),
+            'by_status': by_status,
+            'running': by_status.get('running', 0),
+            'queued': by_status.get('queued', 0),
+            'throughput': sum(job.speed for job in jobs if job.status == 'running')
+        }
+
+    def _create_engine(self, kind: str):
+        """Новый экземпляр движка для задания (импорт по требованию)"""
+        if kind == 'test':
+            from core.tester import DiskTester
+            engine = DiskTester(self.app)
+            # Память конвейеров делится между одновременно выполняемыми тестами
+            limit = int(self._config().get('memory_limit_mb', self.MEMORY_LIMIT_MB)) * 1024 * 1024
+            engine.PIPELINE_MEMORY_LIMIT = max(self.MIN_TEST_MEMORY,
+                                               min(DiskTester.PIPELINE_MEMORY_LIMIT, limit // self.max_concurrent))
+            return engine
+        if kind == 'wipe':
+            from core.wiper import DataWiper
+            return DataWiper(self.app)
+        if kind == 'capacity':
+            from core.capacity import CapacityTester
+            return CapacityTester(self.app)
+        if kind == 'fill':
+            from core.fill import FillTester
+            return FillTester(self.app)
+        if kind == 'benchmark':
+            from core.benchmark import BenchmarkEngine
+            return BenchmarkEngine(self.app)
+        from core.formatter import DiskFormatter
+        return DiskFormatter(self.app)
+
+    def _start(self, job: Job):
+        job.status = 'running'
+        job.started_at = time.time()
+        try:
+            job.engine = self.engine_factory(job.kind)
+            params = job.params
+            if job.kind == 'test':
+                job.engine.start_test(job.drive_path, params)
+            elif job.kind == 'wipe':
+                job.engine.wipe_disk(job.drive_path, params.get('method', 'dod'), params.get('passes', 3),
+                                     params.get('verify', True), resume=params.get('resume', False),
+                                     queue_depth=params.get('queue_depth'),
+                                     sync_policy=params.get('sync_policy'))
+            elif job.kind == 'capacity':
+                job.engine.start_test(job.drive_path)
+            elif job.kind in ('fill', 'benchmark'):
+                job.engine.start_test(job.drive_path, params)
+            else:
+                job.engine.format_disk(job.drive_path, params.get('filesystem', 'FAT32'),
+                                       params.get('quick', True), params.get('label', ''))
+        except Exception as e:
+            self.logger.error(f"Не удалось запустить задание {job.id}: {e}", exc_info=True)
+            job.errors.append(str(e))
+            self._finish(job, 'failed')
+            return
+        self.logger.info(f"Задание {job.id} ({job.kind}) запущено для {job.drive_path}")
+
+    def _drain(self, job: Job) -> List[tuple]:
+        messages = []
+        msg = job.engine.get_message()
+        while msg:
+            self._apply(job, msg)
+            messages.append(msg)
+            if self.listener is not None:
+                self.listener(job, msg)
+            msg = job.engine.get_message()
+        return messages
+
+    def _apply(self, job: Job, msg: tuple):
+        """Обновление состояния задания по сообщению движка"""
+        job.events.append(msg)
+        msg_type = msg[0]
+        if msg_type == 'progress':
+            job.progress = float(msg[1])
+        elif msg_type == 'speed':
+            job.speed = float(msg[1])
+        elif msg_type == 'complete':
+            job.completed = True
+        elif msg_type == 'error':
+            job.errors.append(str(msg[1]))
+        elif msg_type == 'result':
+            job.result = msg[1]
+
+    @staticmethod
+    def _engine_alive(job: Job) -> bool:
+        engine = job.engine
+        for attr in ('test_thread', 'wipe_thread', 'format_thread'):
+            thread = getattr(engine, attr, None)
+            if thread is not None and thread.is_alive():
+                return True
+        return engine.is_running()
+
+    def _outcome(self, job: Job) -> str:
+        """Итог задания по сообщениям и статистике движка"""
+        if hasattr(job.engine, 'get_statistics'):
+            job.stats = job.engine.get_statistics()
+        stats = job.stats or {}
+        if job.stop_requested:
+            return 'stopped'
+        if job.errors or not job.completed:
+            return 'failed'
+        if job.kind == 'test' and (stats.get('bad_sectors_count') or stats.get('system_bad_sectors')):
+            return 'defects'
+        if job.kind == 'wipe' and stats.get('errors'):
+            return 'defects'
+        if job.kind == 'benchmark' and (stats.get('compliance') or {}).get('claimed_pass') is False:
+            return 'defects'
+        if job.kind in ('capacity', 'fill') and job.result is not None \
+                and not str(job.result.get('status', '')).startswith('✅'):
+            return 'defects'
+        return 'passed'
+
+    def _finish(self, job: Job, status: str):
+        job.status = status
+        job.speed = 0.0
+        job.finished_at = time.time()
+        if status == 'passed':
+            job.progress = 100.0
+        self.logger.info(f"Задание {job.id} ({job.kind}) для {job.drive_path}: {status}")
@@ -0,0 +1,221 @@
+"""
+Журнал контрольных точек длительных операций (тест, затирание).
+Файл дописывается построчно в формате JSON: заголовок с идентификацией
+устройства, планом и seed, затем отметки о завершённых участках и найденные
+битые сектора. Записи копятся в памяти и сбрасываются на диск с fsync
+пакетами (по времени или числу записей), поэтому журнал почти не влияет на
+скорость теста, а после сбоя теряются только последние секунды работы.
+Оборванная последняя строка при загрузке отбрасывается.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from core.block_devices import resolve_block_device
+
+JOURNAL_DIR = "journals"
+JOURNAL_VERSION = 1
+# Сброс накопленных записей с fsync не реже чем раз в FLUSH_INTERVAL секунд
+FLUSH_INTERVAL = 2.0
+# ...или при накоплении FLUSH_RECORDS записей
+FLUSH_RECORDS = 256
+
+
+def journal_path(engine: str, drive_path: str, directory: str = JOURNAL_DIR) -> str:
+    """Путь к журналу операции engine ('test', 'wipe') для диска drive_path"""
+    digest = hashlib.sha1(drive_path.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(directory, f"{engine}_{digest}.jsonl")
+
+
+def device_identity(device_path: str, total_bytes: int) -> Dict:
+    """Идентификация носителя: путь, размер и серийный номер (если известен)"""
+    identity = {'path': device_path, 'size': total_bytes, 'serial': None}
+    info = resolve_block_device(device_path) if os.name == 'posix' else None
+    if info is not None:
+        identity['serial'] = info.get('serial')
+    return identity
+
+
+def plan_digest(*parts) -> str:
+    """Отпечаток плана (участки, паттерны): продолжение возможно только при том же плане"""
+    return hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def merge_intervals(intervals: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Объединение пересекающихся и смежных интервалов"""
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(intervals):
+        if start >= end:
+            continue
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_intervals(ranges: Sequence[Tuple[int, int]],
+                       done: Sequence[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Части участков ranges, не покрытые объединёнными интервалами done"""
+    remaining = []
+    for start, end in ranges:
+        pos = start
+        for done_start, done_end in done:
+            if done_end <= pos:
+                continue
+            if done_start >= end:
+                break
+            if done_start > pos:
+                remaining.append((pos, done_start))
+            pos = max(pos, done_end)
+            if pos >= end:
+                break
+        if pos < end:
+            remaining.append((pos, end))
+    return remaining
+
+
+def _key(key: Sequence) -> str:
+    return json.dumps(list(key))
+
+
+class CheckpointJournal:
+    """Журнал одной операции: заголовок, завершённые участки по ключам и битые сектора"""
+
+    def __init__(self, path: str, header: Dict, flush_interval: float = FLUSH_INTERVAL,
+                 flush_records: int = FLUSH_RECORDS):
+        self.path = path
+        self.header = header
+        self.flush_interval = flush_interval
+        self.flush_records = flush_records
+        self.lock = threading.Lock()
+        # Завершённые участки: ключ -> объединённые интервалы
+        self._done: Dict[str, List[Tuple[int, int]]] = {}
+        self.bad_sectors: List[Dict] = []
+        # Ещё не записанные отметки: (ключ, начало участка) -> конец; новая отметка заменяет старую
+        self._pending_done: Dict[Tuple[str, int], int] = {}
+        self._pending_lines: List[str] = []
+        self._last_flush = time.monotonic()
+        self._fd: Optional[int] = None
+
+    @classmethod
+    def create(cls, path: str, header: Dict, **kwargs) -> 'CheckpointJournal':
+        """Новый журнал (существующий файл перезаписывается); заголовок сразу сбрасывается на диск"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        journal = cls(path, dict(header, version=JOURNAL_VERSION), **kwargs)
+        journal._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_APPEND, 0o644)
+        journal._write_lines([json.dumps(dict(journal.header, type='header'))])
+        return journal
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> Optional['CheckpointJournal']:
+        """Загрузка журнала для продолжения; None, если файла нет или заголовок не читается"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return None
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                # Оборванная при сбое запись — всё после неё недостоверно
+                break
+        if not records or records[0].get('type') != 'header' or records[0].get('version') != JOURNAL_VERSION:
+            return None
+        header = dict(records[0])
+        header.pop('type', None)
+        journal = cls(path, header, **kwargs)
+        done: Dict[str, List[Tuple[int, int]]] = {}
+        for record in records[1:]:
+            if record.get('type') == 'done':
+                done.setdefault(record['key'], []).append((record['start'], record['end']))
+            elif record.get('type') == 'bad':
+                journal.bad_sectors.append(record['record'])
+        journal._done = {key: merge_intervals(intervals) for key, intervals in done.items()}
+        journal._fd = os.open(path, os.O_WRONLY | os.O_APPEND)
+        return journal
+
+    def matches(self, header: Dict, fields: Sequence[str]) -> bool:
+        """Совпадение полей заголовка с текущей операцией (устройство, план, параметры)"""
+        # Сравнение через JSON: кортежи и списки в заголовке равнозначны
+        return all(json.dumps(self.header.get(field), sort_keys=True) == json.dumps(header.get(field), sort_keys=True)
+                   for field in fields)
+
+    def completed(self, key: Sequence) -> List[Tuple[int, int]]:
+        """Завершённые участки по ключу (например, проход, паттерн, фаза)"""
+        with self.lock:
+            return list(self._done.get(_key(key), []))
+
+    def completed_bytes(self) -> int:
+        with self.lock:
+            return sum(end - start for intervals in self._done.values() for start, end in intervals)
+
+    def mark_done(self, key: Sequence, start: int, end: int):
+        """Участок [start, end) завершён; отметки одного участка копятся и заменяют друг друга"""
+        key_str = _key(key)
+        with self.lock:
+            self._done[key_str] = merge_intervals(self._done.get(key_str, []) + [(start, end)])
+            pending_key = (key_str, start)
+            if self._pending_done.get(pending_key, start) < end:
+                self._pending_done[pending_key] = end
+        self._maybe_flush()
+
+    def add_bad_sector(self, record: Dict):
+        with self.lock:
+            self.bad_sectors.append(record)
+            self._pending_lines.append(json.dumps({'type': 'bad', 'record': record}))
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        with self.lock:
+            pending = len(self._pending_done) + len(self._pending_lines)
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+        if pending >= self.flush_records or (pending and due):
+            self.flush()
+
+    def flush(self):
+        """Запись накопленных отметок одним вызовом write и fsync"""
+        with self.lock:
+            lines = self._pending_lines
+            lines.extend(json.dumps({'type': 'done', 'key': key, 'start': start, 'end': end})
+                         for (key, start), end in self._pending_done.items())
+            self._pending_lines = []
+            self._pending_done = {}
+            self._last_flush = time.monotonic()
+            if lines and self._fd is not None:
+                self._write_lines(lines)
+
+    def _write_lines(self, lines: List[str]):
+        data = ("\n".join(lines) + "\n").encode('utf-8')
+        while data:
+            written = os.write(self._fd, data)
+            data = data[written:]
+        os.fsync(self._fd)
+
+    def close(self):
+        """Сброс оставшихся записей; журнал остаётся для продолжения"""
+        if self._fd is None:
+            return
+        try:
+            self.flush()
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    def discard(self):
+        """Операция завершена: журнал больше не нужен"""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
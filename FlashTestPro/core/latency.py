@@ -0,0 +1,125 @@
+"""
+Гистограммы задержек отдельных операций ввода-вывода.
+Средняя скорость в MB/s скрывает редкие многосекундные «зависания» записи,
+из-за которых карты памяти теряют кадры при записи видео. Гистограмма в духе
+HdrHistogram хранит задержки в логарифмически-линейных корзинах
+(относительная погрешность < 1%) в фиксированном объёме памяти.
+"""
+import math
+import threading
+from typing import Dict, Sequence
+
+# Операции, для которых ведутся гистограммы
+LATENCY_OPS = ('write', 'sync', 'read')
+# Перцентили сводки
+LATENCY_PERCENTILES = (50, 99, 99.9)
+
+
+class LatencyHistogram:
+    """Лог-линейная гистограмма задержек в наносекундах (потокобезопасная)"""
+
+    # 2**SUB_BUCKET_BITS линейных корзин на каждую степень двойки
+    SUB_BUCKET_BITS = 7
+    # Верхняя граница: 2**42 нс ≈ 73 минуты, большие значения попадают в последнюю корзину
+    MAX_BITS = 42
+
+    def __init__(self):
+        self._sub_count = 1 << self.SUB_BUCKET_BITS
+        self._half = self._sub_count // 2
+        num_buckets = self._sub_count + (self.MAX_BITS - self.SUB_BUCKET_BITS) * self._half
+        self._counts = [0] * num_buckets
+        self.lock = threading.Lock()
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.min_ns = 0
+
+    def _index(self, value: int) -> int:
+        if value < self._sub_count:
+            return value
+        shift = value.bit_length() - self.SUB_BUCKET_BITS
+        index = self._sub_count + (shift - 1) * self._half + ((value >> shift) - self._half)
+        return min(index, len(self._counts) - 1)
+
+    def _value_at(self, index: int) -> int:
+        """Середина диапазона значений корзины"""
+        if index < self._sub_count:
+            return index
+        shift = (index - self._sub_count) // self._half + 1
+        mantissa = (index - self._sub_count) % self._half + self._half
+        return (mantissa << shift) + (1 << (shift - 1))
+
+    def record(self, value_ns: int):
+        """Учёт одной задержки"""
+        value_ns = max(0, int(value_ns))
+        index = self._index(value_ns)
+        with self.lock:
+            self._counts[index] += 1
+            if self.count == 0 or value_ns < self.min_ns:
+                self.min_ns = value_ns
+            self.count += 1
+            self.total_ns += value_ns
+            if value_ns > self.max_ns:
+                self.max_ns = value_ns
+
+    def merge(self, other: 'LatencyHistogram'):
+        """Добавление замеров другой гистограммы"""
+        with other.lock:
+            counts = list(other._counts)
+            count, total, max_ns, min_ns = other.count, other.total_ns, other.max_ns, other.min_ns
+        if not count:
+            return
+        with self.lock:
+            for index, value in enumerate(counts):
+                if value:
+                    self._counts[index] += value
+            self.min_ns = min_ns if self.count == 0 else min(self.min_ns, min_ns)
+            self.count += count
+            self.total_ns += total
+            self.max_ns = max(self.max_ns, max_ns)
+
+    def reset(self):
+        with self.lock:
+            for index in range(len(self._counts)):
+                self._counts[index] = 0
+            self.count = 0
+            self.total_ns = 0
+            self.max_ns = 0
+            self.min_ns = 0
+
+    def percentiles(self, percentiles: Sequence[float] = LATENCY_PERCENTILES) -> Dict[float, int]:
+        """Значения перцентилей в наносекундах за один проход по корзинам"""
+        with self.lock:
+            counts = list(self._counts)
+            total, max_ns, min_ns = self.count, self.max_ns, self.min_ns
+        result = dict.fromkeys(percentiles, 0)
+        if not total:
+            return result
+        # Округление убирает погрешность float (99.9% от 1000 — ровно 999-е значение)
+        targets = sorted((max(1, math.ceil(round(p * total / 100.0, 9))), p) for p in percentiles)
+        seen = 0
+        pending = iter(targets)
+        rank, p = next(pending)
+        for index, value in enumerate(counts):
+            if not value:
+                continue
+            seen += value
+            while seen >= rank:
+                result[p] = max(min_ns, min(max_ns, self._value_at(index)))
+                try:
+                    rank, p = next(pending)
+                except StopIteration:
+                    return result
+        return result
+
+    def summary(self) -> Dict:
+        """Сводка в миллисекундах для статистики, панели прогресса и отчётов"""
+        values = self.percentiles(LATENCY_PERCENTILES)
+        return {
+            'count': self.count,
+            'mean_ms': self.total_ns / self.count / 1e6 if self.count else 0.0,
+            'p50_ms': values[50] / 1e6,
+            'p99_ms': values[99] / 1e6,
+            'p99_9_ms': values[99.9] / 1e6,
+            'max_ms': self.max_ns / 1e6
+        }
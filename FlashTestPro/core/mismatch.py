@@ -0,0 +1,111 @@
+"""
+Локализация расхождений между записанными и прочитанными данными.
+За один векторизованный проход находит все несовпадающие секторы блока,
+число и позиции изменённых бит и объединяет соседние секторы в диапазоны.
+"""
+from typing import Dict, List
+
+import numpy as np
+
+SECTOR_SIZE = 512
+# Порция сравнения: ограничивает временные массивы при разборе больших блоков
+SCAN_BLOCK = 1024 * 1024
+# Сколько позиций изменённых бит сохранять на диапазон
+MAX_BIT_POSITIONS = 8
+
+
+def find_mismatched_sectors(expected, actual, offset: int = 0, sector_size: int = SECTOR_SIZE,
+                            limit: int = 256) -> List[Dict]:
+    """
+    Сравнение буферов и поиск несовпадающих секторов.
+    offset — смещение начала буфера на устройстве (для абсолютных номеров секторов).
+    Возвращает не более limit диапазонов вида:
+    {'sector', 'count', 'bit_flips', 'flip_mask', 'bits': [[сектор, бит в секторе], ...]}.
+    flip_mask — объединение изменённых бит по всем байтам диапазона (например, 0x04
+    у всех байт указывает на «залипший» бит 2).
+    """
+    expected = np.frombuffer(expected, dtype=np.uint8)
+    actual = np.frombuffer(actual, dtype=np.uint8)
+    size = min(expected.size, actual.size)
+    base_sector, lead = divmod(offset, sector_size)
+    ranges: List[Dict] = []
+
+    # Порции выровнены по секторам устройства, чтобы сектор не делился между порциями
+    step = max(sector_size, SCAN_BLOCK // sector_size * sector_size)
+    bounds = [0] + list(range(step - lead, size, step)) + [size]
+    for block_start, block_end in zip(bounds, bounds[1:]):
+        if block_start >= block_end:
+            continue
+        diff = np.bitwise_xor(expected[block_start:block_end], actual[block_start:block_end])
+        # Дополнение до целых секторов: неполный первый и последний сектор буфера
+        head = lead if block_start == 0 else 0
+        tail = -(head + diff.size) % sector_size
+        if head or tail:
+            diff = np.pad(diff, (head, tail))
+        sectors = diff.reshape(-1, sector_size)
+        bad = np.flatnonzero(sectors.any(axis=1))
+        if bad.size == 0:
+            continue
+
+        bad_data = sectors[bad]
+        bit_counts = np.bitwise_count(bad_data).sum(axis=1, dtype=np.int64)
+        masks = np.bitwise_or.reduce(bad_data, axis=1)
+        first_sector = base_sector + (block_start + lead - head) // sector_size
+        # Серии подряд идущих несовпадающих секторов
+        run_starts = np.concatenate(([0], np.flatnonzero(np.diff(bad) > 1) + 1))
+        run_ends = np.concatenate((run_starts[1:], [bad.size]))
+        run_bits = np.add.reduceat(bit_counts, run_starts)
+        run_masks = np.bitwise_or.reduceat(masks, run_starts)
+
+        for run_start, run_end, bit_count, mask in zip(run_starts, run_ends, run_bits, run_masks):
+            ranges.append({
+                'sector': first_sector + int(bad[run_start]),
+                'count': int(bad[run_end - 1] - bad[run_start]) + 1,
+                'bit_flips': int(bit_count),
+                'flip_mask': int(mask),
+                'bits': _bit_positions(bad_data[run_start:run_end], first_sector + bad[run_start:run_end])
+            })
+        if len(ranges) > limit:
+            break
+
+    return _merge_ranges(ranges)[:limit]
+
+
+def _bit_positions(bad_data, sector_numbers) -> List[List[int]]:
+    """Первые позиции изменённых бит: [абсолютный сектор, номер бита внутри сектора]"""
+    positions = []
+    for sector_data, sector in zip(bad_data, sector_numbers):
+        for byte_index in np.flatnonzero(sector_data):
+            value = int(sector_data[byte_index])
+            for bit in range(8):
+                if value >> bit & 1:
+                    positions.append([int(sector), int(byte_index) * 8 + bit])
+                    if len(positions) >= MAX_BIT_POSITIONS:
+                        return positions
+    return positions
+
+
+def _merge_ranges(ranges: List[Dict]) -> List[Dict]:
+    """Объединение диапазонов, разрезанных границами порций сравнения"""
+    merged: List[Dict] = []
+    for item in ranges:
+        if merged and merged[-1]['sector'] + merged[-1]['count'] >= item['sector']:
+            last = merged[-1]
+            last['count'] = max(last['count'], item['sector'] + item['count'] - last['sector'])
+            last['bit_flips'] += item['bit_flips']
+            last['flip_mask'] |= item['flip_mask']
+            last['bits'] = (last['bits'] + item['bits'])[:MAX_BIT_POSITIONS]
+        else:
+            merged.append(item)
+    return merged
+
+
+def describe_mismatch(ranges: List[Dict]) -> str:
+    """Краткое описание расхождения для журнала и отчёта"""
+    sectors = sum(item['count'] for item in ranges)
+    bit_flips = sum(item['bit_flips'] for item in ranges)
+    mask = 0
+    for item in ranges:
+        mask |= item['flip_mask']
+    return (f"Ошибка верификации данных: {bit_flips} бит в {sectors} секторах "
+            f"({len(ranges)} диапазонов, маска бит 0x{mask:02X})")
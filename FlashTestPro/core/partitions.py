@@ -0,0 +1,257 @@
+"""
+Разбор таблиц разделов GPT и MBR (включая расширенные разделы) без внешних утилит.
+Один раз читает LBA 0–33 устройства или образа, определяет схему разметки
+и возвращает границы разделов в байтах. Результат кэшируется по содержимому
+всех прочитанных секторов (включая цепочку EBR), поэтому разбор дёшев даже
+при каждом обновлении списка устройств.
+"""
+import os
+import struct
+import threading
+import uuid
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Сколько секторов читается за один раз: MBR, заголовок GPT и 128 записей по 128 байт
+HEAD_SECTORS = 34
+DEFAULT_SECTOR_SIZE = 512
+
+GPT_SIGNATURE = b'EFI PART'
+MBR_SIGNATURE = b'\x55\xAA'
+# Защитный MBR диска с GPT
+MBR_TYPE_PROTECTIVE = 0xEE
+# Контейнеры логических разделов (CHS, LBA, Linux)
+MBR_EXTENDED_TYPES = (0x05, 0x0F, 0x85)
+# Защита от зацикленной цепочки EBR
+MAX_LOGICAL_PARTITIONS = 128
+# Защита от повреждённого заголовка GPT с огромным числом записей
+MAX_GPT_ENTRIES = 1024
+
+# Путь → (LBA 0–33, дочитанные вне них участки (смещение, размер, данные), таблица)
+_cache: Dict[str, Tuple[bytes, List[Tuple[int, int, bytes]], Dict]] = {}
+_cache_lock = threading.Lock()
+
+
+def parse_partition_table(head: bytes, read: Optional[Callable[[int, int], bytes]] = None,
+                          sector_size: int = DEFAULT_SECTOR_SIZE, disk_size: int = 0) -> Dict:
+    """
+    Разбор таблицы разделов по первым секторам устройства.
+    read(offset, size) дочитывает данные вне head (цепочка EBR, записи GPT за LBA 33).
+    Возвращает {'scheme': 'gpt' | 'mbr' | 'none', 'sector_size', 'partitions': [...]},
+    где каждый раздел — {'index', 'start', 'end', 'type', 'name'} (start/end в байтах, end не включается).
+    """
+    def read_at(offset: int, size: int) -> bytes:
+        if offset + size <= len(head):
+            return head[offset:offset + size]
+        return read(offset, size) if read is not None else b''
+
+    # На дисках с сектором 4096 заголовок GPT лежит по смещению 4096
+    for gpt_sector_size in dict.fromkeys((sector_size, DEFAULT_SECTOR_SIZE, 4096)):
+        header = read_at(gpt_sector_size, 92)
+        if header[:8] == GPT_SIGNATURE:
+            partitions = _parse_gpt(header, read_at, gpt_sector_size, disk_size)
+            if partitions is not None:
+                return {'scheme': 'gpt', 'sector_size': gpt_sector_size, 'partitions': partitions}
+
+    mbr = head[:512]
+    if len(mbr) < 512 or mbr[510:512] != MBR_SIGNATURE or _is_boot_sector(mbr):
+        return {'scheme': 'none', 'sector_size': sector_size, 'partitions': []}
+    partitions = _parse_mbr(mbr, read_at, sector_size, disk_size)
+    if partitions is None:
+        return {'scheme': 'none', 'sector_size': sector_size, 'partitions': []}
+    return {'scheme': 'mbr', 'sector_size': sector_size, 'partitions': partitions}
+
+
+def _parse_gpt(header: bytes, read_at: Callable, sector_size: int, disk_size: int) -> Optional[List[Dict]]:
+    """Записи GPT по заголовку; None, если заголовок повреждён"""
+    header_size = struct.unpack_from('<I', header, 12)[0]
+    if header_size < 92 or header_size > sector_size:
+        return None
+    header = read_at(sector_size, header_size)
+    crc = struct.unpack_from('<I', header, 16)[0]
+    if zlib.crc32(header[:16] + b'\x00' * 4 + header[20:]) != crc:
+        if disk_size and sector_size * 2 < disk_size:
+            # Основной заголовок повреждён — пробуем резервную копию в последнем секторе
+            backup = read_at(disk_size - sector_size, header_size)
+            if backup[:8] == GPT_SIGNATURE and zlib.crc32(backup[:16] + b'\x00' * 4 + backup[20:]) == \
+                    struct.unpack_from('<I', backup, 16)[0]:
+                header = backup
+            else:
+                return None
+        else:
+            return None
+
+    entries_lba, num_entries, entry_size, entries_crc = struct.unpack_from('<QIII', header, 72)
+    if entry_size < 128 or num_entries > MAX_GPT_ENTRIES:
+        return None
+    entries = read_at(entries_lba * sector_size, num_entries * entry_size)
+    if len(entries) < num_entries * entry_size or zlib.crc32(entries) != entries_crc:
+        return None
+
+    partitions = []
+    for index in range(num_entries):
+        entry = entries[index * entry_size:(index + 1) * entry_size]
+        type_guid = entry[:16]
+        if type_guid == b'\x00' * 16:
+            continue
+        first_lba, last_lba = struct.unpack_from('<QQ', entry, 32)
+        if last_lba < first_lba:
+            continue
+        name = entry[56:128].decode('utf-16-le', errors='replace').split('\x00', 1)[0]
+        partitions.append({
+            'index': index + 1,
+            'start': first_lba * sector_size,
+            'end': (last_lba + 1) * sector_size,
+            'type': str(uuid.UUID(bytes_le=type_guid)),
+            'name': name
+        })
+    return partitions
+
+
+def _is_boot_sector(sector: bytes) -> bool:
+    """Загрузочный сектор ФС без таблицы разделов («суперфлоппи», частый случай у карт памяти)"""
+    if sector[0] not in (0xEB, 0xE9):
+        return False
+    oem = sector[3:11]
+    if oem in (b'NTFS    ', b'EXFAT   '):
+        return True
+    # FAT: корректные байты на сектор и сигнатура типа ФС в BPB
+    bytes_per_sector = struct.unpack_from('<H', sector, 11)[0]
+    return bytes_per_sector in (512, 1024, 2048, 4096) and (sector[54:57] == b'FAT' or sector[82:87] == b'FAT32')
+
+
+def _mbr_entries(sector: bytes) -> List[Tuple[int, int, int, int]]:
+    """Непустые записи таблицы MBR/EBR: (номер, тип, начальный LBA, число секторов)"""
+    entries = []
+    for slot in range(4):
+        status, part_type, start_lba, num_sectors = struct.unpack_from('<B3xB3xII', sector, 446 + slot * 16)
+        if part_type == 0 or num_sectors == 0:
+            continue
+        if status not in (0x00, 0x80):
+            return []
+        entries.append((slot + 1, part_type, start_lba, num_sectors))
+    return entries
+
+
+def _parse_mbr(mbr: bytes, read_at: Callable, sector_size: int, disk_size: int) -> Optional[List[Dict]]:
+    """Основные разделы MBR и логические разделы в цепочке EBR; None, если таблица некорректна"""
+    entries = _mbr_entries(mbr)
+    if not entries:
+        return None
+    if any(part_type == MBR_TYPE_PROTECTIVE for _, part_type, _, _ in entries):
+        # Защитный MBR без читаемого GPT: границы разделов неизвестны
+        return None
+
+    partitions = []
+    for slot, part_type, start_lba, num_sectors in entries:
+        if part_type in MBR_EXTENDED_TYPES:
+            partitions.extend(_parse_ebr_chain(read_at, start_lba, sector_size))
+            continue
+        partitions.append({
+            'index': slot,
+            'start': start_lba * sector_size,
+            'end': (start_lba + num_sectors) * sector_size,
+            'type': f"0x{part_type:02X}",
+            'name': ''
+        })
+    if disk_size:
+        # Таблица с разделами, начинающимися за концом устройства, — мусор, а не разметка
+        if any(partition['start'] >= disk_size for partition in partitions):
+            return None
+    partitions.sort(key=lambda partition: partition['start'])
+    return partitions
+
+
+def _parse_ebr_chain(read_at: Callable, extended_lba: int, sector_size: int) -> List[Dict]:
+    """Логические разделы: каждый EBR описывает раздел и ссылку на следующий EBR"""
+    partitions = []
+    ebr_lba = extended_lba
+    seen = set()
+    # Логические разделы нумеруются с 5, как в Linux
+    index = 5
+    while ebr_lba not in seen and len(partitions) < MAX_LOGICAL_PARTITIONS:
+        seen.add(ebr_lba)
+        ebr = read_at(ebr_lba * sector_size, 512)
+        if len(ebr) < 512 or ebr[510:512] != MBR_SIGNATURE:
+            break
+        next_lba = None
+        for _, part_type, start_lba, num_sectors in _mbr_entries(ebr)[:2]:
+            if part_type in MBR_EXTENDED_TYPES:
+                # Ссылка на следующий EBR отсчитывается от начала расширенного раздела
+                next_lba = extended_lba + start_lba
+            else:
+                # Логический раздел отсчитывается от своего EBR
+                partitions.append({
+                    'index': index,
+                    'start': (ebr_lba + start_lba) * sector_size,
+                    'end': (ebr_lba + start_lba + num_sectors) * sector_size,
+                    'type': f"0x{part_type:02X}",
+                    'name': ''
+                })
+                index += 1
+        if next_lba is None:
+            break
+        ebr_lba = next_lba
+    return partitions
+
+
+def read_partition_table(path: str, sector_size: int = DEFAULT_SECTOR_SIZE) -> Dict:
+    """
+    Таблица разделов устройства или файла-образа.
+    Читает LBA 0–33 одним запросом; если эти секторы и дочитанные при разборе
+    участки (цепочка EBR, записи GPT за LBA 33) не изменились с прошлого вызова,
+    возвращает кэшированный результат без повторного разбора.
+    """
+    flags = os.O_RDONLY | getattr(os, 'O_BINARY', 0)
+    fd = os.open(path, flags)
+    try:
+        disk_size = os.lseek(fd, 0, os.SEEK_END)
+        head = _pread(fd, HEAD_SECTORS * max(sector_size, DEFAULT_SECTOR_SIZE), 0)
+        with _cache_lock:
+            cached = _cache.get(path)
+        # Логические разделы описаны в EBR вне LBA 0–33: их изменение не видно по началу диска
+        if cached is not None and cached[0] == head and all(
+                _pread(fd, size, offset) == data for offset, size, data in cached[1]):
+            return cached[2]
+        reads = []
+
+        def read(offset: int, size: int) -> bytes:
+            data = _pread(fd, size, offset)
+            reads.append((offset, size, data))
+            return data
+
+        table = parse_partition_table(head, read, sector_size, disk_size)
+        table['disk_size'] = disk_size
+    finally:
+        os.close(fd)
+    with _cache_lock:
+        _cache[path] = (head, reads, table)
+    return table
+
+
+def _pread(fd: int, size: int, offset: int) -> bytes:
+    if hasattr(os, 'pread'):
+        return os.pread(fd, size, offset)
+    os.lseek(fd, offset, os.SEEK_SET)
+    return os.read(fd, size)
+
+
+def invalidate_partition_cache(path: Optional[str] = None):
+    """Сброс кэша после записи на устройство (path=None — для всех устройств)"""
+    with _cache_lock:
+        if path is None:
+            _cache.clear()
+        else:
+            _cache.pop(path, None)
+
+
+def partition_intervals(table: Dict, disk_size: int = 0) -> List[Tuple[int, int]]:
+    """Интервалы (start, end) разделов в байтах по возрастанию, обрезанные по размеру устройства"""
+    intervals = []
+    for partition in table.get('partitions', []):
+        start, end = partition['start'], partition['end']
+        if disk_size:
+            end = min(end, disk_size)
+        if start < end:
+            intervals.append((start, end))
+    return sorted(intervals)
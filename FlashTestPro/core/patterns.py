@@ -0,0 +1,53 @@
+"""
+Детерминированный генератор тестовых данных.
+Содержимое любого участка однозначно задаётся ключом (seed, проход) и смещением
+на устройстве: генератор на основе счётчика (Philox4x64) позволяет получить
+ожидаемые байты для произвольного смещения без хранения записанных данных.
+"""
+import secrets
+
+import numpy as np
+
+# Philox4x64 выдаёт 32 байта на одно значение счётчика
+PHILOX_BLOCK = 32
+# Порция генерации: ограничивает временный массив numpy
+GENERATE_STEP = 1024 * 1024
+
+
+def fill_byte(buffer, value: int):
+    """Заполнение буфера одним байтом на месте, без промежуточных копий"""
+    np.frombuffer(buffer, dtype=np.uint8).fill(value)
+
+
+def new_seed() -> int:
+    """Случайный 64-битный seed для нового теста"""
+    return secrets.randbits(64)
+
+
+class PatternGenerator:
+    """Генератор псевдослучайных данных, адресуемый по (проход, смещение)"""
+
+    def __init__(self, seed: int):
+        self.seed = int(seed) & 0xFFFFFFFFFFFFFFFF
+
+    def fill(self, buffer, pass_num: int, offset: int):
+        """Заполнение буфера данными, соответствующими смещению offset в проходе pass_num"""
+        out = np.frombuffer(buffer, dtype=np.uint8)
+        bit_generator = np.random.Philox(key=[self.seed, pass_num],
+                                         counter=[offset // PHILOX_BLOCK, 0, 0, 0])
+        # Смещение может быть не кратно блоку Philox: начало первого блока отбрасывается
+        skip = offset % PHILOX_BLOCK
+        pos = 0
+        while pos < out.size:
+            words = min(GENERATE_STEP, out.size - pos + skip + 7) // 8
+            raw = bit_generator.random_raw(words).astype('<u8', copy=False).view(np.uint8)
+            take = min(raw.size - skip, out.size - pos)
+            out[pos:pos + take] = raw[skip:skip + take]
+            pos += take
+            skip = 0
+
+    def generate(self, pass_num: int, offset: int, length: int) -> bytes:
+        """Ожидаемые данные участка (для повторной проверки без хранения записанного)"""
+        buffer = bytearray(length)
+        self.fill(buffer, pass_num, offset)
+        return bytes(buffer)
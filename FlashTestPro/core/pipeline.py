@@ -0,0 +1,189 @@
+"""
+Конвейер записи и проверки блоков.
+Кольцо из нескольких заранее выделенных буферов позволяет одновременно
+готовить данные блока N+1, записывать блок N и проверять блок N-1,
+пряча работу процессора (генерация, сравнение) за задержкой устройства.
+"""
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+import numpy as np
+
+from core.mismatch import SECTOR_SIZE, find_mismatched_sectors, describe_mismatch
+
+# Этапы конвейера, по которым накапливается время
+STAGES = ('generate', 'write', 'sync', 'read', 'compare', 'write_stall')
+
+# Размер порции сравнения: ограничивает временный массив numpy
+COMPARE_BLOCK = 1024 * 1024
+
+
+def buffers_equal(a, b) -> bool:
+    """Быстрое сравнение двух буферов без копирования (сравнение memoryview поэлементно медленно)"""
+    a = np.frombuffer(a, dtype=np.uint8)
+    b = np.frombuffer(b, dtype=np.uint8)
+    if a.size != b.size:
+        return False
+    for pos in range(0, a.size, COMPARE_BLOCK):
+        if not np.array_equal(a[pos:pos + COMPARE_BLOCK], b[pos:pos + COMPARE_BLOCK]):
+            return False
+    return True
+
+
+class ChunkPipeline:
+    """Трёхступенчатый конвейер: подготовка → запись+sync → чтение+сравнение"""
+
+    # Глубина кольца: подготовка, запись и проверка работают с разными буферами
+    DEPTH = 3
+
+    def __init__(self, buffer_size: int, depth: int = DEPTH, allocate: Callable = bytearray):
+        self.buffer_size = buffer_size
+        self.depth = max(2, depth)
+        # allocate позволяет выделить выровненные буферы для прямого ввода-вывода
+        self.buffers = [allocate(buffer_size) for _ in range(self.depth)]
+        self.read_buffer = allocate(buffer_size)
+
+    def run(self, chunks: Iterable[Dict], fill: Callable, write: Callable, sync: Callable,
+            readinto: Optional[Callable], on_chunk: Callable, should_stop: Callable[[], bool],
+            record_latency: Optional[Callable[[str, int], None]] = None) -> Dict[str, float]:
+        """
+        Прогон блоков через конвейер.
+        chunks — итератор словарей с ключами 'offset' и 'length' (вычисляется лениво,
+        поэтому размер следующего блока может зависеть от результатов предыдущих).
+        fill(view, chunk) заполняет буфер, write(view, offset) и sync() выполняются
+        в вызывающем потоке, readinto(view, offset) — в потоке проверки (None — без проверки).
+        sync() возвращает False, если записанное ещё не сброшено на носитель (отложенный сброс
+        политики синхронизации): тогда chunk['durable'] = False и блок нельзя отмечать в журнале.
+        on_chunk(chunk) вызывается по завершении каждого блока в порядке записи до остановки;
+        при сбое chunk['error'] содержит исключение, chunk['stage'] — этап,
+        а при несовпадении данных chunk['mismatches'] — диапазоны несовпавших секторов.
+        Внутри on_chunk chunk['data'] и chunk['read_buffer'] ссылаются на буферы кольца
+        (например, для повторной проверки сбойного блока) и после возврата недействительны.
+        record_latency(op, ns) получает задержку каждой операции write/sync/read в наносекундах.
+        Возвращает накопленное время этапов в секундах.
+        """
+        timings = dict.fromkeys(STAGES, 0.0)
+        free_buffers = queue.Queue()
+        for buffer in self.buffers:
+            free_buffers.put(memoryview(buffer))
+        write_queue = queue.Queue()
+        verify_queue = queue.Queue()
+        failures = []
+
+        def prepare():
+            try:
+                for chunk in chunks:
+                    if should_stop() or failures:
+                        break
+                    view = free_buffers.get()
+                    start = time.perf_counter()
+                    fill(view[:chunk['length']], chunk)
+                    timings['generate'] += time.perf_counter() - start
+                    chunk['view'] = view
+                    write_queue.put(chunk)
+            except Exception as e:
+                failures.append(e)
+            finally:
+                write_queue.put(None)
+
+        def verify():
+            while True:
+                chunk = verify_queue.get()
+                if chunk is None:
+                    return
+                view = chunk['view']
+                try:
+                    # После остановки блоки, записанные раньше неё, не проверяются и не передаются
+                    # обработчику: блок, прервавший работу, мог остаться незавершённым
+                    if chunk.get('skipped') or failures or should_stop():
+                        continue
+                    if chunk.get('error') is None and readinto is not None:
+                        self._verify_chunk(chunk, view, readinto, timings, record_latency)
+                    # Данные блока и буфер проверки доступны обработчику для повторной проверки
+                    chunk['data'] = view[:chunk['length']]
+                    chunk['read_buffer'] = memoryview(self.read_buffer)[:chunk['length']]
+                    on_chunk(chunk)
+                except Exception as e:
+                    failures.append(e)
+                finally:
+                    for key in ('view', 'data', 'read_buffer'):
+                        chunk.pop(key, None)
+                    # Буфер возвращается в кольцо в любом случае, чтобы подготовка не зависла
+                    free_buffers.put(view)
+
+        preparer = threading.Thread(target=prepare, daemon=True)
+        verifier = threading.Thread(target=verify, daemon=True)
+        preparer.start()
+        verifier.start()
+
+        try:
+            while True:
+                stall_start = time.perf_counter()
+                chunk = write_queue.get()
+                timings['write_stall'] += time.perf_counter() - stall_start
+                if chunk is None:
+                    break
+                if should_stop() or failures:
+                    chunk['skipped'] = True
+                    verify_queue.put(chunk)
+                    continue
+
+                data = chunk['view'][:chunk['length']]
+                chunk['error'] = None
+                try:
+                    start = time.perf_counter_ns()
+                    write(data, chunk['offset'])
+                    written = time.perf_counter_ns()
+                    durable = sync()
+                    synced = time.perf_counter_ns()
+                    chunk['durable'] = durable is not False
+                    timings['write'] += (written - start) / 1e9
+                    timings['sync'] += (synced - written) / 1e9
+                    chunk['elapsed'] = (synced - start) / 1e9
+                    if record_latency is not None:
+                        record_latency('write', written - start)
+                        record_latency('sync', synced - written)
+                except Exception as e:
+                    chunk['error'] = e
+                    chunk['stage'] = 'write'
+                verify_queue.put(chunk)
+        finally:
+            verify_queue.put(None)
+            preparer.join()
+            verifier.join()
+
+        if failures:
+            raise failures[0]
+        return timings
+
+    def _verify_chunk(self, chunk: Dict, view: memoryview, readinto: Callable, timings: Dict[str, float],
+                      record_latency: Optional[Callable[[str, int], None]] = None):
+        """Чтение блока обратно в буфер проверки и сравнение с записанными данными"""
+        length = chunk['length']
+        try:
+            start = time.perf_counter_ns()
+            read_view = memoryview(self.read_buffer)[:length]
+            n = readinto(read_view, chunk['offset'])
+            read_done = time.perf_counter_ns()
+            if record_latency is not None:
+                record_latency('read', read_done - start)
+            matched = n == length and buffers_equal(read_view, view[:length])
+            compared = time.perf_counter_ns()
+            timings['read'] += (read_done - start) / 1e9
+            timings['compare'] += (compared - read_done) / 1e9
+            chunk['elapsed'] += (compared - start) / 1e9
+            if not matched:
+                # Точная локализация: секторы и позиции бит внутри блока
+                mismatches = find_mismatched_sectors(view[:n], read_view[:n], chunk['offset'])
+                if n < length:
+                    # Недочитанный хвост блока целиком считается несовпавшим
+                    mismatches.append({'sector': (chunk['offset'] + n) // SECTOR_SIZE,
+                                       'count': -(-(length - n) // SECTOR_SIZE),
+                                       'bit_flips': 0, 'flip_mask': 0, 'bits': []})
+                chunk['mismatches'] = mismatches
+                raise Exception(describe_mismatch(mismatches))
+        except Exception as e:
+            chunk['error'] = e
+            chunk['stage'] = 'verify'
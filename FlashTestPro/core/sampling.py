@@ -0,0 +1,83 @@
+"""
+Статистическая выборка для быстрого теста.
+Стратифицированный отбор смещений по интервалам данных и оценка доли дефектов.
+"""
+import math
+import random
+from typing import Dict, List, Tuple
+
+# Квантиль нормального распределения для двустороннего 95% интервала
+Z_95 = 1.96
+
+
+def stratified_samples(intervals: List[Tuple[int, int]], fraction: float, sample_size: int,
+                       seed: int) -> List[List[Tuple[int, int]]]:
+    """
+    Разбивает каждый интервал на равные страты и выбирает в каждой страте
+    один случайный участок размером sample_size (с выравниванием по sample_size).
+    Первая страта интервала всегда начинается с его начала, последняя — заканчивается
+    его концом, поэтому края устройства проверяются гарантированно.
+    Возвращает список участков для каждого интервала.
+    """
+    rng = random.Random(seed)
+    fraction = max(0.0, min(1.0, fraction))
+    plan = []
+
+    for start, end in intervals:
+        length = end - start
+        if length <= 0:
+            plan.append([])
+            continue
+        if length <= sample_size or fraction >= 1.0:
+            plan.append([(start, end)])
+            continue
+
+        count = max(1, math.ceil(length * fraction / sample_size))
+        count = min(count, length // sample_size)
+        stratum = length / count
+        samples = []
+        for i in range(count):
+            stratum_start = start + int(i * stratum)
+            stratum_end = start + int((i + 1) * stratum) if i < count - 1 else end
+            if i == 0:
+                offset = start
+            elif i == count - 1:
+                offset = end - sample_size
+            else:
+                # Случайная позиция внутри страты, выровненная относительно начала интервала
+                first_slot = -(-(stratum_start - start) // sample_size)
+                last_slot = (stratum_end - sample_size - start) // sample_size
+                slot = rng.randint(first_slot, last_slot) if last_slot > first_slot else first_slot
+                offset = start + slot * sample_size
+            offset = max(start, min(offset, end - sample_size))
+            sample = (offset, min(offset + sample_size, end))
+            if samples and sample[0] < samples[-1][1]:
+                # Соседние страты меньше участка: сдвигаем, чтобы не пересекаться
+                sample = (samples[-1][1], min(samples[-1][1] + sample_size, end))
+                if sample[0] >= sample[1]:
+                    continue
+            samples.append(sample)
+        plan.append(samples)
+    return plan
+
+
+def defect_rate_estimate(defective: int, total: int) -> Dict:
+    """
+    Оценка доли дефектных участков по выборке.
+    Верхняя граница — по интервалу Уилсона (при 0 дефектов близка к «правилу трёх»: 3/n).
+    """
+    if total <= 0:
+        return {'defect_rate': 0.0, 'defect_rate_low': 0.0, 'defect_rate_high': 1.0, 'confidence': 0.95}
+
+    p = defective / total
+    z = Z_95
+    z2 = z * z
+    denominator = 1 + z2 / total
+    center = (p + z2 / (2 * total)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / total + z2 / (4 * total * total)) / denominator
+    return {
+        'defect_rate': p,
+        'defect_rate_low': max(0.0, center - margin),
+        'defect_rate_high': min(1.0, center + margin),
+        'confidence': 0.95
+    }
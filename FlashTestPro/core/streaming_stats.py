@@ -0,0 +1,147 @@
+"""
+Потоковая статистика с фиксированным объёмом памяти.
+Многосуточные и многотерабайтные прогоны дают миллионы замеров скорости:
+вместо хранения всех значений накапливаются количество, среднее и дисперсия
+(алгоритм Уэлфорда), минимум, максимум, EWMA и логарифмическая гистограмма
+для приближённых перцентилей, а ряд для графика прореживается до заданного числа точек.
+"""
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Перцентили, включаемые в сводку
+SUMMARY_PERCENTILES = (1, 50, 99)
+
+
+class StreamingStats:
+    """Накопитель count/mean/variance/min/max/EWMA и приближённых перцентилей за O(1) на значение"""
+
+    # Относительная точность перцентилей: ширина корзины гистограммы — 1%
+    BUCKET_GROWTH = 1.01
+    # Диапазон гистограммы; значения за его пределами попадают в крайние корзины
+    MIN_VALUE = 1e-3
+    MAX_VALUE = 1e7
+    # Коэффициент сглаживания EWMA
+    EWMA_ALPHA = 0.1
+
+    def __init__(self, ewma_alpha: float = EWMA_ALPHA):
+        self.ewma_alpha = ewma_alpha
+        self._log_growth = math.log(self.BUCKET_GROWTH)
+        self._log_min = math.log(self.MIN_VALUE)
+        num_buckets = int(math.ceil((math.log(self.MAX_VALUE) - self._log_min) / self._log_growth)) + 1
+        self._buckets = [0] * num_buckets
+        # Нули и отрицательные значения не ложатся на логарифмическую шкалу
+        self._non_positive = 0
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = float('inf')
+        self.max = float('-inf')
+        self.ewma: Optional[float] = None
+        self._non_positive = 0
+        for i in range(len(self._buckets)):
+            self._buckets[i] = 0
+
+    def add(self, value: float):
+        """Учёт одного значения"""
+        value = float(value)
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.ewma = value if self.ewma is None else self.ewma + self.ewma_alpha * (value - self.ewma)
+
+        if value <= 0:
+            self._non_positive += 1
+        else:
+            self._buckets[self._bucket_index(value)] += 1
+
+    def _bucket_index(self, value: float) -> int:
+        index = int((math.log(value) - self._log_min) / self._log_growth)
+        return max(0, min(len(self._buckets) - 1, index))
+
+    @property
+    def variance(self) -> float:
+        """Выборочная дисперсия"""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+    def percentile(self, p: float) -> float:
+        """Приближённый перцентиль p (0–100) с относительной погрешностью порядка 1%"""
+        if self.count == 0:
+            return 0.0
+        rank = max(1, int(math.ceil(p / 100.0 * self.count)))
+        if rank <= self._non_positive:
+            return min(self.min, 0.0)
+        seen = self._non_positive
+        for index, bucket_count in enumerate(self._buckets):
+            seen += bucket_count
+            if seen >= rank:
+                # Середина корзины в логарифмической шкале, в пределах наблюдённых min/max
+                value = math.exp(self._log_min + (index + 0.5) * self._log_growth)
+                return max(self.min, min(self.max, value))
+        return self.max
+
+    def summary(self, percentiles: Sequence[float] = SUMMARY_PERCENTILES) -> Dict:
+        """Сводка для статистики теста и отчётов (без накопленных значений)"""
+        result = {
+            'count': self.count,
+            'mean': self.mean,
+            'stdev': self.stdev,
+            'min': self.min if self.count else 0.0,
+            'max': self.max if self.count else 0.0,
+            'ewma': self.ewma or 0.0
+        }
+        for p in percentiles:
+            result[f"p{p:g}"] = self.percentile(p)
+        return result
+
+
+class DownsampledSeries:
+    """
+    Временной ряд для графика с ограниченным числом точек.
+    При заполнении соседние точки попарно усредняются, а шаг прореживания
+    удваивается, так что ряд всегда покрывает весь прогон равномерно.
+    """
+
+    def __init__(self, max_points: int = 1000):
+        self.max_points = max(2, max_points - max_points % 2)
+        self.times: List[float] = []
+        self.values: List[float] = []
+        self._stride = 1
+        # Накопление текущей группы из stride исходных точек
+        self._pending: List[Tuple[float, float]] = []
+
+    def add(self, time_value: float, value: float):
+        self._pending.append((time_value, value))
+        if len(self._pending) < self._stride:
+            return
+        self.times.append(sum(t for t, _ in self._pending) / len(self._pending))
+        self.values.append(sum(v for _, v in self._pending) / len(self._pending))
+        self._pending = []
+        if len(self.values) >= self.max_points:
+            self._compact()
+
+    def _compact(self):
+        """Попарное усреднение точек и удвоение шага"""
+        self.times = [(self.times[i] + self.times[i + 1]) / 2 for i in range(0, len(self.times) - 1, 2)]
+        self.values = [(self.values[i] + self.values[i + 1]) / 2 for i in range(0, len(self.values) - 1, 2)]
+        self._stride *= 2
+
+    def snapshot(self) -> Tuple[List[float], List[float]]:
+        """Копии рядов (включая незавершённую группу) для передачи в UI и отчёты"""
+        times = list(self.times)
+        values = list(self.values)
+        if self._pending:
+            times.append(sum(t for t, _ in self._pending) / len(self._pending))
+            values.append(sum(v for _, v in self._pending) / len(self._pending))
+        return times, values
@@ -0,0 +1,133 @@
+"""
+Политика сброса записанных данных на носитель.
+Раньше устройство открывалось с O_SYNC и после каждого блока дополнительно вызывался
+fdatasync: каждая запись синхронизировалась дважды, а конвейер ждал носитель на каждом блоке.
+Политика задаёт, когда вызывается sync(), и измеряет его стоимость:
+- chunk — после каждого блока;
+- interval — после каждых interval_mb записанных мегабайт;
+- pass — только в конце прохода (flush);
+- direct — без явных sync: запись прямым вводом-выводом минует кэш ОС;
+  без прямого ввода-вывода политика работает как chunk.
+"""
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+SYNC_POLICIES = ('chunk', 'interval', 'pass', 'direct')
+DEFAULT_POLICY = 'chunk'
+DEFAULT_INTERVAL_MB = 256
+
+
+def normalize_policy(policy) -> str:
+    """Название политики; неизвестное значение заменяется политикой по умолчанию"""
+    policy = str(policy or DEFAULT_POLICY).lower()
+    return policy if policy in SYNC_POLICIES else DEFAULT_POLICY
+
+
+class SyncPolicy:
+    """Потокобезопасный учёт записанных байт и вызовов sync() по выбранной политике"""
+
+    def __init__(self, sync: Callable[[], None], policy: str = DEFAULT_POLICY,
+                 interval_mb: int = DEFAULT_INTERVAL_MB, direct: bool = False,
+                 record_latency: Optional[Callable[[int], None]] = None):
+        self._sync = sync
+        self.policy = normalize_policy(policy)
+        self.effective = 'chunk' if self.policy == 'direct' and not direct else self.policy
+        try:
+            interval_mb = int(interval_mb)
+        except (TypeError, ValueError):
+            interval_mb = DEFAULT_INTERVAL_MB
+        self.interval_bytes = max(1, interval_mb) * 1024 * 1024
+        self.record_latency = record_latency
+        self._lock = threading.Lock()
+        self._synced = threading.Condition(self._lock)
+        self._pending = 0
+        # Номер последней записи; sync, начатый после записи с номером N, покрывает записи 1..N
+        self._write_seq = 0
+        # Записи, покрытые завершённым sync и sync, который выполняется сейчас
+        self._synced_seq = 0
+        self._syncing_seq = 0
+        self.syncs = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+
+    def written(self, nbytes: int):
+        """Учёт записанных, но ещё не сброшенных байт"""
+        with self._lock:
+            self._pending += nbytes
+            self._write_seq += 1
+
+    def commit(self) -> bool:
+        """
+        Вызывается после записи блока: выполняет sync(), если этого требует политика.
+        Возвращает True, если всё записанное к этому моменту сохранено в соответствии
+        с политикой (для журнала контрольных точек).
+        """
+        if self.effective == 'direct':
+            return True
+        return self._sync_through(flush=False)
+
+    def flush(self):
+        """Сброс всего записанного (конец прохода или операции) при любой политике"""
+        self._sync_through(flush=True)
+
+    def _sync_through(self, flush: bool) -> bool:
+        """
+        Сброс записей, учтённых до вызова. Решение и обнуление счётчика атомарны, а sync,
+        начатый другим потоком после этих записей, дожидается завершения: иначе поток
+        счёл бы свои данные сброшенными, пока их fdatasync ещё выполняется.
+        """
+        with self._lock:
+            target = self._write_seq
+            while self._synced_seq < target <= self._syncing_seq:
+                self._synced.wait()
+            if self._synced_seq >= target:
+                return True
+            if not flush and (self.effective == 'pass' or
+                              (self.effective == 'interval' and self._pending < self.interval_bytes)):
+                return False
+            self._pending = 0
+            self._syncing_seq = target
+        self._do_sync(target)
+        return True
+
+    def _do_sync(self, target: int):
+        """Вызов sync() с учётом времени; записи до target уже сняты со счётчика"""
+        start = time.perf_counter_ns()
+        try:
+            self._sync()
+        except BaseException:
+            with self._lock:
+                # Ожидающие потоки не должны зависнуть: они решат заново и повторят sync сами
+                self._syncing_seq = self._synced_seq
+                self._synced.notify_all()
+            raise
+        elapsed = time.perf_counter_ns() - start
+        with self._lock:
+            self._synced_seq = max(self._synced_seq, target)
+            self._synced.notify_all()
+            self.syncs += 1
+            self.seconds += elapsed / 1e9
+            self.max_seconds = max(self.max_seconds, elapsed / 1e9)
+        if self.record_latency is not None:
+            self.record_latency(elapsed)
+
+    def summary(self) -> Dict:
+        with self._lock:
+            return {
+                'policy': self.policy,
+                'effective': self.effective,
+                'interval_mb': self.interval_bytes // (1024 * 1024),
+                'syncs': self.syncs,
+                'seconds': self.seconds,
+                'mean_ms': self.seconds / self.syncs * 1000 if self.syncs else 0.0,
+                'max_ms': self.max_seconds * 1000
+            }
+
+    def describe(self) -> str:
+        """Строка для журнала: политика и измеренная стоимость sync"""
+        summary = self.summary()
+        policy = summary['policy'] if summary['policy'] == summary['effective'] \
+            else f"{summary['policy']} → {summary['effective']}"
+        return (f"Синхронизация ({policy}): {summary['syncs']} вызовов, {summary['seconds']:.2f} с, "
+                f"в среднем {summary['mean_ms']:.1f} мс")
@@ -4,6 +4,7 @@
 - free: тестирование только свободного места (через временный файл)
 - full: полное тестирование всех секторов (прямой доступ к устройству) с защитой системных областей
 """
+import errno
 import os
 import time
 import random
@@ -13,7 +14,21 @@ import platform
 from datetime import datetime
 from typing import Dict, Optional, List, Tuple
 from utils.logger import get_logger
-import win32file
+from core.adaptive import AdaptiveChunkController
+from core.sampling import stratified_samples, defect_rate_estimate
+from core.pipeline import ChunkPipeline, STAGES
+from core.direct_io import ALIGNMENT, DeviceIO, aligned_buffer
+from core.io_queue import IOQueue, clamp_depth
+from core.patterns import PatternGenerator, fill_byte, new_seed
+from core.mismatch import describe_mismatch
+from core.bisection import ErrorLocalizer, DEFAULT_RETRIES
+from core.streaming_stats import StreamingStats, DownsampledSeries
+from core.latency import LatencyHistogram, LATENCY_OPS
+from core.heatmap import LBAHeatMap, DEFAULT_BINS
+from core.sync_policy import SyncPolicy, normalize_policy, DEFAULT_INTERVAL_MB
+from core.partitions import invalidate_partition_cache
+from core.block_devices import resolve_block_device, describe_block_device
+from core.journal import CheckpointJournal, journal_path, device_identity, plan_digest, subtract_intervals
 
 if platform.system() == "Windows":
     import wmi
@@ -23,6 +38,22 @@ class DiskTester:
 
     # Максимальное количество битых секторов, после которого тест останавливается
     MAX_BAD_SECTORS = 100
+    # Максимальное количество рабочих потоков параллельного теста
+    MAX_THREADS = 16
+    # Выравнивание границ регионов при разбиении интервала между потоками
+    REGION_ALIGN = 1024 * 1024
+    # Размер одного участка выборки в быстром тесте
+    QUICK_SAMPLE_SIZE = 4 * 1024 * 1024
+    # Доля устройства, проверяемая быстрым тестом по умолчанию
+    QUICK_TEST_FRACTION = 0.02
+    # Предел памяти под кольца буферов конвейеров всех рабочих потоков
+    PIPELINE_MEMORY_LIMIT = 1024 * 1024 * 1024
+    # Число точек ряда скорости в статистике и отчётах (ряд прореживается по мере роста)
+    SPEED_SERIES_POINTS = 1000
+    # Фазы двухфазного режима: сначала запись всего интервала, затем чтение с проверкой
+    PHASES = ('write', 'read')
+    # Поля заголовка журнала, которые должны совпасть для продолжения прерванного теста
+    JOURNAL_FIELDS = ('drive_path', 'mode', 'device', 'total_bytes', 'plan_digest', 'params')
 
     def __init__(self, app):
         self.app = app
@@ -30,12 +61,30 @@ class DiskTester:
         self.system = platform.system()
 
         self.test_thread = None
+        # Пул рабочих потоков, обрабатывающих регионы интервалов данных
+        self.test_threads: List[threading.Thread] = []
+        self.task_queue = queue.Queue()
+        self.num_threads = 1
+        self.stats_lock = threading.RLock()
         self.running = False
         self.paused = False
         self.stop_requested = False
 
         self.message_queue = queue.Queue(maxsize=100)
 
+        # Скорость за окна агрегации: накопитель сводки и прореженный ряд для графика
+        self.speed_stats = StreamingStats()
+        self.speed_series = DownsampledSeries(self.SPEED_SERIES_POINTS)
+        # Двухфазный режим: отдельные ряды скорости записи и чтения
+        self._phase: Optional[str] = None
+        self.phase_speed_stats = {phase: StreamingStats() for phase in self.PHASES}
+        self.phase_speed_series = {phase: DownsampledSeries(self.SPEED_SERIES_POINTS) for phase in self.PHASES}
+        self._cache_warning_logged = False
+        # Гистограммы задержек отдельных операций (общие для всех рабочих потоков)
+        self.latency = {op: LatencyHistogram() for op in LATENCY_OPS}
+        # Тепловая карта скорости и ошибок по LBA (создаётся, когда известен размер теста)
+        self.heatmap: Optional[LBAHeatMap] = None
+
         self.stats = self._init_stats()
         self.test_params = {}
         self.drive_path = ""
@@ -43,14 +92,43 @@ class DiskTester:
         self.last_update_time = 0
         self.update_interval = 0.1
 
-        self.test_handle = None
+        # Дескриптор устройства/файла теста (прямой ввод-вывод при возможности)
+        self.device_io: Optional[DeviceIO] = None
         self.device_path = None
+        # Очередь запросов к устройству: блоки делятся на queue_depth одновременных запросов
+        self.io_queue: Optional[IOQueue] = None
+        # Политика сброса записанных данных на носитель (создаётся после открытия устройства)
+        self.sync_policy: Optional[SyncPolicy] = None
+        # Отметки журнала для записанных, но ещё не сброшенных на носитель блоков
+        self._unsynced_marks: List[Tuple[Tuple, int, int]] = []
+
+        # Размер блока и его адаптивный контроллер (создаются при запуске теста)
+        self.chunk_size = 0
+        self.chunk_controller: Optional[AdaptiveChunkController] = None
+        # Размер буферов конвейера рабочего потока
+        self.pipeline_buffer_size = 0
+        # Генератор случайного паттерна: данные блока определяются (seed, проход, смещение)
+        self.pattern_generator: Optional[PatternGenerator] = None
+
+        # Окно агрегации скорости всех потоков
+        self._window_bytes = 0
+        self._window_start = 0
 
         self.unmounted = False
 
         # Интервалы для системных областей и данных
         self.system_intervals: List[Tuple[int, int]] = []
         self.data_intervals: List[Tuple[int, int]] = []
+        # План теста: для каждого интервала данных — список проверяемых участков
+        self.test_plan: List[List[Tuple[int, int]]] = []
+        # Участки выборки, на которых найдены ошибки (быстрый тест)
+        self._defective_samples = set()
+
+        # Журнал контрольных точек и журнал прерванного теста, загруженный для продолжения
+        self.journal: Optional[CheckpointJournal] = None
+        self._resume_journal: Optional[CheckpointJournal] = None
+        # Временный файл свободного режима
+        self.test_file_path: Optional[str] = None
 
     def _init_stats(self) -> Dict:
         return {
@@ -58,11 +136,18 @@ class DiskTester:
             'total_bytes': 0,
             'tested': 0,
             'tested_bytes': 0,
+            'processed_bytes': 0,
+            'plan_bytes': 0,
             'avg_speed': 0,
             'max_speed': 0,
             'min_speed': float('inf'),
             'speeds': [],
             'times': [],
+            'speed_stats': {},
+            'latency': {},
+            'heatmap': {},
+            'two_phase': False,
+            'phase_speeds': {},
             'start_time': None,
             'elapsed_time': "00:00:00",
             'elapsed_seconds': 0,
@@ -72,6 +157,21 @@ class DiskTester:
             'system_bad_sectors_list': [],
             'current_pass': 0,
             'total_passes': 1,
+            'pass_stats': [],
+            'num_threads': 1,
+            'chunk_size_mb': 0,
+            'adaptive_chunk': {},
+            'quick_test': {},
+            'pipeline': {},
+            'error_localization': {},
+            'resumed_bytes': 0,
+            'journal': None,
+            'io_method': 'buffered',
+            'queue_depth': 1,
+            'sync': {},
+            'cache_bypass': 'none',
+            'pattern_seed': None,
+            'regions': [],
             'test_paused': False,
             'drive_path': '',
             'mode': 'free',
@@ -91,17 +191,12 @@ class DiskTester:
         return None
 
     def _get_device_path_linux(self, mountpoint):
-        try:
-            with open('/proc/mounts') as f:
-                for line in f:
-                    parts = line.split()
-                    if len(parts) > 1 and parts[1] == mountpoint:
-                        dev = parts[0]
-                        base = ''.join(c for c in dev if not c.isdigit())
-                        return base
-        except Exception as e:
-            self.logger.error(f"Ошибка получения пути устройства: {e}")
-        return None
+        info = resolve_block_device(mountpoint)
+        if info is None:
+            self.logger.error(f"Не найдено блочное устройство для {mountpoint}")
+            return None
+        self.logger.info(f"Устройство: {describe_block_device(info)}")
+        return info['path']
 
     def _get_device_path(self, drive_path):
         if self.system == "Windows":
@@ -151,12 +246,33 @@ class DiskTester:
             return
 
         self.drive_path = drive_path
-        self.test_params = params
+        self.test_params = dict(params)
         self.running = True
         self.stop_requested = False
         self.paused = False
 
+        self.journal = None
+        self.test_file_path = None
+        self._resume_journal = None
+        if params.get('resume'):
+            self._resume_journal = CheckpointJournal.load(journal_path('test', drive_path))
+            if self._resume_journal is None:
+                self._send_message('log', "Журнал прерванного теста не найден, тест начинается заново", 'warning')
+            else:
+                # План восстанавливается по параметрам из журнала, иначе пропуск участков был бы неверным
+                self.test_params = dict(self._resume_journal.header.get('params', {}), resume=True)
+        params = self.test_params
+
         self.stats = self._init_stats()
+        self.speed_stats.reset()
+        self.speed_series = DownsampledSeries(self.SPEED_SERIES_POINTS)
+        for histogram in self.latency.values():
+            histogram.reset()
+        self._phase = None
+        for phase in self.PHASES:
+            self.phase_speed_stats[phase].reset()
+            self.phase_speed_series[phase] = DownsampledSeries(self.SPEED_SERIES_POINTS)
+        self._cache_warning_logged = False
         self.stats['total_passes'] = params.get('passes', 1)
         self.stats['drive_path'] = drive_path
         self.stats['mode'] = params.get('mode', 'free')
@@ -184,6 +300,12 @@ class DiskTester:
                 return
             # Размонтируем том перед открытием устройства
             self._unmount_drive(drive_path)
+        elif self._resume_test_file():
+            # Продолжение: файл прерванного теста уже занимает место, размер берётся из журнала
+            self.test_file_path = self._resume_test_file()
+            self.stats['total_bytes'] = int(self._resume_journal.header.get('total_bytes', 0))
+            self.logger.info(f"Свободный режим (продолжение): файл {self.test_file_path}")
+            self.device_path = None
         else:
             free_bytes = drive_info['free_bytes']
             if free_bytes <= 0:
@@ -194,7 +316,8 @@ class DiskTester:
             test_size = int(free_bytes * 0.1)
             max_test = 10 * 1024 * 1024 * 1024  # 10 GB
             min_test = 1 * 1024 * 1024          # 1 MB
-            test_size = min(test_size, max_test)
+            # Размер кратен странице: весь файл доступен прямому вводу-выводу без невыровненного хвоста
+            test_size = min(test_size, max_test) // ALIGNMENT * ALIGNMENT
             if test_size < min_test:
                 self._send_message('error', f"Недостаточно свободного места для теста (нужно минимум {min_test // (1024**2)} MB)")
                 self.running = False
@@ -204,19 +327,56 @@ class DiskTester:
             self.device_path = None
 
         self.stats['total_size'] = self.stats['total_bytes'] / (1024**3)
-
+        bins = self.app.config.get('testing', {}).get('heatmap_bins', DEFAULT_BINS)
+        self.heatmap = LBAHeatMap(self.stats['total_bytes'], bins)
+
+        # Пул рабочих потоков: при выключенном параллельном режиме — один поток
+        self.num_threads = self._get_num_threads(params)
+        self.stats['num_threads'] = self.num_threads
+        self.task_queue = queue.Queue()
+        self.test_threads = []
+        for worker_id in range(self.num_threads):
+            thread = threading.Thread(target=self._worker, args=(worker_id,), daemon=True)
+            self.test_threads.append(thread)
+            thread.start()
+
+        # Координатор: открывает устройство, строит интервалы и раздаёт регионы потокам
         self.test_thread = threading.Thread(target=self._test_worker, daemon=True)
         self.test_thread.start()
 
-        self.logger.info(f"Тестирование запущено для диска {drive_path} в режиме {self.stats['mode']}")
+        self.logger.info(f"Тестирование запущено для диска {drive_path} в режиме {self.stats['mode']}, "
+                         f"потоков: {self.num_threads}")
+
+    def _resume_test_file(self) -> Optional[str]:
+        """Файл прерванного теста свободного режима, если он сохранился"""
+        if self._resume_journal is None or self.stats['mode'] != 'free':
+            return None
+        test_file = self._resume_journal.header.get('test_file')
+        if test_file and os.path.isfile(test_file):
+            return test_file
+        return None
+
+    def _get_num_threads(self, params: Dict) -> int:
+        """Количество рабочих потоков с учётом параметров parallel_testing/num_threads"""
+        if not params.get('parallel_testing', False):
+            return 1
+        try:
+            num_threads = int(params.get('num_threads', 1))
+        except (TypeError, ValueError):
+            num_threads = 1
+        return max(1, min(num_threads, self.MAX_THREADS))
 
     def _test_worker(self):
-        """Рабочий поток тестирования"""
+        """Поток-координатор тестирования"""
         self.stats['start_time'] = time.time()
         self.last_update_time = time.time()
-        self.test_handle = None
+        self.device_io = None
+        completed = False
 
         try:
+            self._setup_chunk_controller()
+            self._setup_io_queue()
+
             if self.stats['mode'] == 'full':
                 device_path = self.device_path
                 if not device_path:
@@ -226,60 +386,358 @@ class DiskTester:
                 flags = os.O_RDWR
                 if hasattr(os, 'O_BINARY'):      # Windows
                     flags |= os.O_BINARY
-                if self.system != "Windows" and hasattr(os, 'O_SYNC'):   # Unix
-                    flags |= os.O_SYNC
-                fd = os.open(device_path, flags)
-                self.test_handle = os.fdopen(fd, 'rb+', buffering=0)
-
-                # Определяем системные и рабочие интервалы
+                # Без O_SYNC: момент сброса на носитель задаёт политика синхронизации
+                self.device_io = DeviceIO(device_path, flags, direct=self._use_direct_io())
+                self._log_io_method()
+                self._setup_sync_policy()
+
+                # Определяем системные и рабочие интервалы по свежей таблице разделов:
+                # разметку могли изменить вне программы
+                invalidate_partition_cache(device_path)
                 self._build_intervals(device_path)
 
-                # Проверяем системные интервалы (только чтение)
+                self._plan_test()
+                self._open_journal()
+
+                # Проверяем системные интервалы (только чтение), пропуская проверенные до прерывания
                 for start, end in self.system_intervals:
-                    self._check_system_interval(start, end)
+                    for part_start, part_end in self._skip_completed(('system',), [(start, end)]):
+                        self._check_system_interval(part_start, part_end)
                     if self.stop_requested:
                         break
 
                 # Основное тестирование на интервалах данных
-                for start, end in self.data_intervals:
-                    self._run_test_pass_on_interval(start, end)
-                    if self.stop_requested:
-                        break
+                self._run_passes()
 
             else:
-                test_file_path = os.path.join(self.drive_path, f"test_{datetime.now().strftime('%Y%m%d_%H%M%S')}.tmp")
-                self.logger.info(f"Создание тестового файла: {test_file_path}")
-                try:
-                    self.test_handle = open(test_file_path, 'wb+', buffering=-1)
-                except Exception as e:
-                    self.logger.warning(f"Не удалось открыть с buffering=-1: {e}, пробуем buffering=0")
-                    self.test_handle = open(test_file_path, 'wb+', buffering=0)
+                flags = os.O_RDWR | os.O_CREAT
+                if self.test_file_path is None:
+                    self.test_file_path = os.path.join(self.drive_path, f"test_{datetime.now().strftime('%Y%m%d_%H%M%S')}.tmp")
+                    self.logger.info(f"Создание тестового файла: {self.test_file_path}")
+                    flags |= os.O_TRUNC
+                if hasattr(os, 'O_BINARY'):
+                    flags |= os.O_BINARY
+                self.device_io = DeviceIO(self.test_file_path, flags, direct=self._use_direct_io())
+                self._preallocate_test_file()
+                self._log_io_method()
+                self._setup_sync_policy()
 
                 # В свободном режиме тестируем весь файл как один интервал
                 self.data_intervals = [(0, self.stats['total_bytes'])]
                 self.system_intervals = []
-                self._run_test_pass_on_interval(0, self.stats['total_bytes'])
+                self._plan_test()
+                self._open_journal()
+                self._run_passes()
 
             self._test_complete()
+            completed = not self.stop_requested
 
         except Exception as e:
             self.logger.error(f"Ошибка в потоке тестирования: {e}", exc_info=True)
             self._send_message('error', str(e))
         finally:
-            if self.test_handle:
-                try:
-                    self.device_handle.close()
-                except:
-                    pass
+            self._stop_workers()
+            if self.io_queue is not None:
+                self.io_queue.close()
+                self.io_queue = None
+            self._close_journal(completed)
+            if self._resume_journal is not None:
+                # Журнал не понадобился (ошибка до построения плана)
+                self._resume_journal.close()
+                self._resume_journal = None
+            if self.device_io is not None:
+                self.device_io.close()
+                if self.stats['mode'] == 'full':
+                    # Содержимое устройства перезаписано: таблица разделов в кэше устарела
+                    invalidate_partition_cache(self.device_path)
+                elif completed and self.test_file_path:
+                    # Тестовый файл больше не нужен; прерванный тест сохраняет его для продолжения
+                    try:
+                        os.remove(self.test_file_path)
+                    except OSError as e:
+                        self.logger.warning(f"Не удалось удалить тестовый файл: {e}")
             if self.unmounted:   # теперь переменная определена
                 self._send_message('unmount_notice', self.drive_path)
             self.running = False
-            self.device_handle = None
+            self.device_io = None
+
+    def _use_journal(self) -> bool:
+        """Журнал контрольных точек (параметр запуска, иначе конфигурация)"""
+        enabled = self.test_params.get('journal')
+        if enabled is None:
+            enabled = self.app.config.get('testing', {}).get('checkpoint_journal', True)
+        return bool(enabled)
+
+    def _open_journal(self):
+        """Продолжение по журналу прерванного теста, если он соответствует устройству и плану, иначе новый журнал"""
+        resume, self._resume_journal = self._resume_journal, None
+        if not self._use_journal():
+            if resume is not None:
+                resume.close()
+            return
+
+        # Seed фиксируются до записи заголовка: продолжение должно воспроизвести те же данные и выборку
+        if self.test_params.get('pattern_seed') is None:
+            self.test_params['pattern_seed'] = new_seed()
+        if self.stats['quick_test']:
+            self.test_params['quick_test_seed'] = self.stats['quick_test']['seed']
+        total = self.stats['total_bytes']
+        if self.stats['mode'] == 'full':
+            device = device_identity(self.device_path, total)
+        else:
+            device = {'path': self.test_file_path, 'size': total, 'serial': None}
+        header = {
+            'engine': 'test',
+            'drive_path': self.drive_path,
+            'mode': self.stats['mode'],
+            'device': device,
+            'total_bytes': total,
+            'test_file': self.test_file_path,
+            'plan_digest': plan_digest(self.test_plan, self.system_intervals),
+            'params': {key: value for key, value in self.test_params.items() if key != 'resume'},
+            'created': datetime.now().isoformat(timespec='seconds')
+        }
+
+        if resume is not None:
+            if resume.matches(header, self.JOURNAL_FIELDS):
+                self.journal = resume
+                self._restore_from_journal()
+            else:
+                resume.close()
+                self._send_message('log', "Журнал не соответствует устройству или плану теста, "
+                                          "тест начинается заново", 'warning')
+        if self.journal is None:
+            try:
+                self.journal = CheckpointJournal.create(journal_path('test', self.drive_path), header)
+            except OSError as e:
+                self.logger.warning(f"Не удалось создать журнал контрольных точек: {e}")
+                return
+        self.stats['journal'] = self.journal.path
+
+    def _restore_from_journal(self):
+        """Битые сектора, найденные до прерывания, возвращаются в статистику"""
+        with self.stats_lock:
+            for record in self.journal.bad_sectors:
+                if record.get('system'):
+                    self.stats['system_bad_sectors_list'].append(record)
+                else:
+                    self.stats['bad_sectors'].append(record)
+                    self.stats['bad_sectors_count'] += record.get('count', 1)
+                self.heatmap.add_error(record['sector'], record.get('count', 1))
+            self.stats['system_bad_sectors'] = len(self.stats['system_bad_sectors_list'])
+        self._send_message('log', f"Продолжение прерванного теста: выполнено "
+                                  f"{self.journal.completed_bytes() / (1024**3):.2f} GB, "
+                                  f"записей о битых секторах {len(self.journal.bad_sectors)}", 'info')
+
+    def _skip_completed(self, key: Tuple, ranges: List[Tuple[int, int]],
+                        count_tested: bool = True) -> List[Tuple[int, int]]:
+        """Участки без отметки о завершении в журнале; пропущенные байты засчитываются в прогресс"""
+        if self.journal is None:
+            return ranges
+        done = self.journal.completed(key)
+        if not done:
+            return ranges
+        remaining = subtract_intervals(ranges, done)
+        skipped = sum(end - start for start, end in ranges) - sum(end - start for start, end in remaining)
+        if skipped:
+            with self.stats_lock:
+                self.stats['processed_bytes'] += skipped
+                self.stats['resumed_bytes'] += skipped
+                if count_tested:
+                    self.stats['tested_bytes'] += skipped
+                    self.stats['tested'] = self.stats['tested_bytes'] / (1024**3)
+        return remaining
+
+    def _close_journal(self, completed: bool):
+        """Завершённый тест удаляет журнал, прерванный — сохраняет его для продолжения"""
+        journal, self.journal = self.journal, None
+        if journal is None:
+            return
+        try:
+            if completed:
+                journal.discard()
+            else:
+                journal.close()
+                self._send_message('log', "Прогресс сохранён: тест можно продолжить с места остановки", 'info')
+        except OSError as e:
+            self.logger.warning(f"Ошибка записи журнала контрольных точек: {e}")
+
+    def get_resumable_test(self, drive_path: str) -> Optional[Dict]:
+        """Сведения о прерванном тесте диска (заголовок журнала и выполненный объём) или None"""
+        journal = CheckpointJournal.load(journal_path('test', drive_path))
+        if journal is None:
+            return None
+        completed_bytes = journal.completed_bytes()
+        journal.close()
+        return dict(journal.header, completed_bytes=completed_bytes)
+
+    def _use_direct_io(self) -> bool:
+        """Прямой ввод-вывод (устройство или тестовый файл): параметр запуска, иначе конфигурация"""
+        direct = self.test_params.get('direct_io')
+        if direct is None:
+            direct = self.app.config.get('testing', {}).get('direct_io', True)
+        return bool(direct)
+
+    def _log_io_method(self):
+        """Фиксация способа доступа к устройству и обхода кэша при проверке в статистике и журнале"""
+        self.stats['io_method'] = self.device_io.method
+        if self.device_io.direct:
+            self.stats['cache_bypass'] = self.device_io.method
+            self._send_message('log', f"Прямой ввод-вывод ({self.device_io.method}): чтение идёт с носителя, "
+                                      f"минуя кэш", 'info')
+            return
+        if self._use_direct_io():
+            self._send_message('log', "Прямой ввод-вывод недоступен, используется обычный режим", 'warning')
+        if hasattr(os, 'posix_fadvise'):
+            self.stats['cache_bypass'] = 'fadvise'
+            self._send_message('log', "Перед проверкой каждый блок вытесняется из кэша ОС (posix_fadvise)", 'info')
+        else:
+            self.stats['cache_bypass'] = 'none'
+            self._send_message('log', "Обход кэша ОС недоступен: проверка может читать данные из памяти, "
+                                      "а не с носителя", 'warning')
+
+    def _preallocate_test_file(self):
+        """Резервирование места под тестовый файл: нехватка места выявляется до начала записи"""
+        try:
+            if not self.device_io.preallocate(self.stats['total_bytes']):
+                self.logger.info("Резервирование места не поддерживается файловой системой")
+        except OSError as e:
+            if e.errno == errno.ENOSPC:
+                raise Exception("Недостаточно свободного места для тестового файла") from e
+            raise
+
+    def _get_queue_depth(self) -> int:
+        """Глубина очереди запросов к устройству (параметр запуска, иначе конфигурация)"""
+        depth = self.test_params.get('queue_depth')
+        if depth is None:
+            depth = self.app.config.get('testing', {}).get('queue_depth', 1)
+        return clamp_depth(depth)
+
+    def _setup_io_queue(self):
+        """Пул запросов общий для всех рабочих потоков: глубина ограничивает число запросов к устройству"""
+        self.io_queue = IOQueue(self._get_queue_depth())
+        self.stats['queue_depth'] = self.io_queue.depth
+        if self.io_queue.depth > 1:
+            self._send_message('log', f"Глубина очереди запросов: {self.io_queue.depth}", 'info')
+
+    def _queued_write(self, view, offset: int):
+        """Запись блока через очередь запросов"""
+        self.io_queue.write_all(self.device_io.pwrite, view, offset)
+        self.sync_policy.written(len(view))
+
+    def _setup_sync_policy(self):
+        """
+        Политика синхронизации (параметр запуска, иначе конфигурация). Проверка чтением
+        в том же проходе без прямого ввода-вывода вытесняет блок из кэша ОС, а грязные
+        страницы не вытесняются, поэтому в этом случае блок сбрасывается сразу.
+        """
+        testing_config = self.app.config.get('testing', {})
+        policy = normalize_policy(self.test_params.get('sync_policy') or testing_config.get('sync_policy'))
+        verify_inline = self.test_params.get('test_verify', True) and not self._use_two_phase()
+        if policy != 'chunk' and verify_inline and not self.device_io.direct:
+            self._send_message('log', f"Политика синхронизации {policy} заменена на chunk: "
+                                      f"проверка без прямого ввода-вывода требует сброса каждого блока", 'warning')
+            policy = 'chunk'
+        self.sync_policy = SyncPolicy(
+            self.device_io.sync,
+            policy,
+            testing_config.get('sync_interval_mb', DEFAULT_INTERVAL_MB),
+            direct=self.device_io.direct,
+            record_latency=self.latency['sync'].record
+        )
+        self._unsynced_marks = []
+        self.stats['sync'] = self.sync_policy.summary()
+
+    def _flush_sync(self):
+        """Сброс всего записанного на носитель, после которого отложенные отметки попадают в журнал"""
+        self.sync_policy.flush()
+        with self.stats_lock:
+            marks, self._unsynced_marks = self._unsynced_marks, []
+        if self.journal is not None:
+            for key, start, end in marks:
+                self.journal.mark_done(key, start, end)
+
+    def _queued_readinto(self, view, offset: int) -> int:
+        """Чтение блока через очередь запросов"""
+        return self.io_queue.readinto_all(self.device_io.preadinto, view, offset)
+
+    def _verify_reader(self):
+        """Чтение для проверки: без прямого доступа участок сначала вытесняется из кэша ОС"""
+        device_io = self.device_io
+        if device_io.direct or self.stats['cache_bypass'] != 'fadvise':
+            return self._queued_readinto
+
+        def readinto(view, offset):
+            # Данные блока уже сброшены sync() конвейера, поэтому страницы чистые и вытесняются
+            device_io.evict(offset, len(view))
+            return self._queued_readinto(view, offset)
+        return readinto
+
+    def _setup_chunk_controller(self):
+        """Размер блока берётся из параметров запуска, границы адаптации — из конфигурации"""
+        testing_config = self.app.config.get('testing', {})
+        chunk_mb = self.test_params.get('chunk_size_mb') or testing_config.get('chunk_size_mb', 64)
+        min_size = int(testing_config.get('min_chunk_size_mb', 1)) * 1024 * 1024
+        max_size = int(testing_config.get('max_chunk_size_mb', 256)) * 1024 * 1024
+        # Каждый рабочий поток держит кольцо из DEPTH буферов наибольшего блока и буфер чтения
+        budget = self.PIPELINE_MEMORY_LIMIT // (self.num_threads * (ChunkPipeline.DEPTH + 1))
+        max_size = max(min_size, min(max_size, budget))
+        self.chunk_controller = AdaptiveChunkController(
+            int(chunk_mb) * 1024 * 1024,
+            min_size,
+            max_size,
+            enabled=bool(self.test_params.get('adaptive_chunk', False))
+        )
+        self.chunk_size = self.chunk_controller.size
+        if self.chunk_size < int(chunk_mb) * 1024 * 1024:
+            self._send_message('log', f"Размер блока ограничен до {self.chunk_size // (1024 * 1024)} MB "
+                                      f"(память буферов {self.num_threads} потоков)", 'warning')
+        if self.chunk_controller.enabled:
+            self.pipeline_buffer_size = self.chunk_controller.max_size
+        else:
+            self.pipeline_buffer_size = self.chunk_controller.size
+        self.stats['chunk_size_mb'] = self.chunk_size // (1024 * 1024)
+        self.stats['pipeline'] = {
+            'depth': ChunkPipeline.DEPTH,
+            'buffer_mb': self.pipeline_buffer_size // (1024 * 1024),
+            'stage_seconds': dict.fromkeys(STAGES, 0.0)
+        }
+
+    def _stop_workers(self):
+        """Завершение рабочих потоков: по одному маркеру None на поток"""
+        for _ in self.test_threads:
+            self.task_queue.put(None)
+        for thread in self.test_threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout=5)
+
+    def _worker(self, worker_id: int):
+        """Рабочий поток: берёт регионы из очереди и тестирует их через собственный конвейер"""
+        pipeline = None
+        while True:
+            task = self.task_queue.get()
+            try:
+                if task is None:
+                    return
+                if not self.stop_requested:
+                    # Кольцо буферов создаётся один раз на поток и переиспользуется всеми регионами
+                    if pipeline is None:
+                        # Для прямого ввода-вывода нужны буферы, выровненные по странице
+                        allocate = aligned_buffer if self.device_io.direct else bytearray
+                        pipeline = ChunkPipeline(self.pipeline_buffer_size, allocate=allocate)
+                    self._test_region(task, pipeline)
+            except Exception as e:
+                self.logger.error(f"Ошибка в рабочем потоке {worker_id}: {e}", exc_info=True)
+                self._send_message('log', f"Ошибка в потоке {worker_id}: {e}", 'error')
+            finally:
+                self.task_queue.task_done()
 
     def _build_intervals(self, device_path):
         """Построение интервалов системных областей и данных на основе разделов диска"""
         total = self.stats['total_bytes']
         partitions = self.app.drive_manager.get_partition_offsets(device_path)
+        # Разделы за пределами устройства (например, у карт с завышенным объёмом) обрезаются
+        partitions = [(start, min(end, total)) for start, end in partitions if start < total]
         if partitions:
             partitions.sort(key=lambda x: x[0])
             self.system_intervals = []
@@ -302,6 +760,8 @@ class DiskTester:
 
             # Интервалы данных — сами разделы
             self.data_intervals = partitions
+            self._send_message('log', f"Разделов: {len(partitions)}, служебных областей: "
+                                      f"{len(self.system_intervals)} (только чтение)", 'info')
         else:
             # Разделов нет — всё считается данными
             self.data_intervals = [(0, total)]
@@ -309,14 +769,17 @@ class DiskTester:
 
     def _check_system_interval(self, start: int, end: int):
         """Проверка системного интервала только чтением, без записи"""
-        chunk_size = self.app.config.get('testing', {}).get('chunk_size_mb', 64) * 1024 * 1024
+        chunk_size = self.chunk_size
+        buffer = aligned_buffer(chunk_size) if self.device_io.direct else bytearray(chunk_size)
+        view = memoryview(buffer)
         offset = start
         while offset < end and not self.stop_requested:
             current_chunk = min(chunk_size, end - offset)
             try:
-                self.test_handle.seek(offset)
-                data = self.test_handle.read(current_chunk)
-                # чтение успешно
+                read_start = time.perf_counter()
+                self._queued_readinto(view[:current_chunk], offset)
+                with self.stats_lock:
+                    self.heatmap.record(offset, current_chunk, time.perf_counter() - read_start)
             except OSError as e:
                 sector = offset // 512
                 self._add_bad_sector(sector, str(e), system=True)
@@ -331,16 +794,33 @@ class DiskTester:
                 sector = offset // 512
                 self._add_bad_sector(sector, str(e), system=True)
 
+            if self.journal is not None and not self.stop_requested:
+                self.journal.mark_done(('system',), start, offset + current_chunk)
             offset += current_chunk
             # Обновляем прогресс
-            self.stats['tested_bytes'] += current_chunk
-            self.stats['tested'] = self.stats['tested_bytes'] / (1024**3)
-            progress = (self.stats['tested_bytes'] / self.stats['total_bytes']) * 100
-            self._send_message('progress', progress)
+            with self.stats_lock:
+                self.stats['tested_bytes'] += current_chunk
+                self.stats['tested'] = self.stats['tested_bytes'] / (1024**3)
+                self.stats['processed_bytes'] += current_chunk
+            self._send_message('progress', self._get_progress())
             self.last_update_time = time.time()
 
-    def _run_test_pass_on_interval(self, start: int, end: int):
-        """Выполнение одного прохода теста с записью/чтением в заданном интервале"""
+    def _split_interval(self, start: int, end: int, parts: int) -> List[Tuple[int, int]]:
+        """Разбиение интервала на parts независимых регионов, выровненных по REGION_ALIGN"""
+        length = end - start
+        step = (length // max(parts, 1)) // self.REGION_ALIGN * self.REGION_ALIGN
+        step = max(step, self.REGION_ALIGN)
+        regions = []
+        pos = start
+        while pos < end and len(regions) < parts - 1:
+            regions.append((pos, min(pos + step, end)))
+            pos += step
+        if pos < end:
+            regions.append((pos, end))
+        return regions
+
+    def _get_patterns(self) -> List[Tuple[str, Optional[bytes]]]:
+        """Список паттернов теста в порядке выполнения"""
         patterns = []
 
         if self.test_params.get('test_ones', False):
@@ -352,126 +832,532 @@ class DiskTester:
 
         if not patterns:
             patterns = [('random', None)]
-
-        chunk_size = self.app.config.get('testing', {}).get('chunk_size_mb', 64) * 1024 * 1024
-        interval_bytes = end - start
-        total_chunks = max(1, interval_bytes // chunk_size)
-
-        for pattern_name, pattern_value in patterns:
+        return patterns
+
+    def _plan_test(self):
+        """Расчёт плана: проходы × паттерны × участки интервалов данных + системные области"""
+        passes = max(1, int(self.stats['total_passes'] or 1))
+        self._defective_samples = set()
+
+        if self.test_params.get('quick_test', False):
+            fraction = self._get_quick_test_fraction()
+            seed = self.test_params.get('quick_test_seed')
+            if seed is None:
+                seed = random.SystemRandom().randrange(2**32)
+            self.test_plan = stratified_samples(self.data_intervals, fraction, self.QUICK_SAMPLE_SIZE, seed)
+            data_bytes = sum(end - start for start, end in self.data_intervals)
+            sampled_bytes = sum(end - start for ranges in self.test_plan for start, end in ranges)
+            self.stats['quick_test'] = {
+                'enabled': True,
+                'fraction': fraction,
+                'seed': seed,
+                'samples': sum(len(ranges) for ranges in self.test_plan),
+                'sample_size': self.QUICK_SAMPLE_SIZE,
+                'coverage': sampled_bytes / data_bytes if data_bytes else 0.0
+            }
+            self._send_message('log', f"Быстрый тест: выборка {self.stats['quick_test']['samples']} участков, "
+                                      f"покрытие {self.stats['quick_test']['coverage'] * 100:.2f}%", 'info')
+        else:
+            self.test_plan = [[(start, end)] for start, end in self.data_intervals]
+
+        planned_bytes = sum(end - start for ranges in self.test_plan for start, end in ranges)
+        system_bytes = sum(end - start for start, end in self.system_intervals)
+        # В двухфазном режиме каждый участок проходится дважды: записью и чтением
+        phases = len(self.PHASES) if self._use_two_phase() else 1
+        self.stats['total_passes'] = passes
+        self.stats['two_phase'] = phases > 1
+        self.stats['plan_bytes'] = passes * len(self._get_patterns()) * planned_bytes * phases + system_bytes
+
+    def _get_quick_test_fraction(self) -> float:
+        """Доля устройства для быстрого теста (параметр запуска, иначе конфигурация)"""
+        fraction = self.test_params.get('quick_test_fraction')
+        if fraction is None:
+            fraction = self.app.config.get('testing', {}).get('quick_test_fraction', self.QUICK_TEST_FRACTION)
+        try:
+            fraction = float(fraction)
+        except (TypeError, ValueError):
+            fraction = self.QUICK_TEST_FRACTION
+        return max(0.0001, min(1.0, fraction))
+
+    def _finish_quick_test(self):
+        """Оценка доли дефектов по результатам выборки"""
+        quick = self.stats.get('quick_test')
+        if not quick:
+            return
+        with self.stats_lock:
+            defective = len(self._defective_samples)
+        quick['defective_samples'] = defective
+        quick.update(defect_rate_estimate(defective, quick['samples']))
+        self._send_message('log', f"Быстрый тест: покрытие {quick['coverage'] * 100:.2f}%, "
+                                  f"дефектных участков {defective}/{quick['samples']}, "
+                                  f"доля дефектов ≤ {quick['defect_rate_high'] * 100:.2f}% (95%)",
+                           'success' if defective == 0 else 'warning')
+
+    def _get_progress(self) -> float:
+        """Прогресс в процентах, нормированный на весь план теста"""
+        plan_bytes = self.stats.get('plan_bytes') or self.stats['total_bytes']
+        if not plan_bytes:
+            return 0.0
+        return min(100.0, self.stats['processed_bytes'] / plan_bytes * 100)
+
+    def _run_passes(self):
+        """Планировщик: проходы × паттерны по всем интервалам данных"""
+        # Данные пишутся прямо в кольцо буферов конвейера: постоянные паттерны — заливкой байта,
+        # случайный — генератором по (seed, проход, смещение)
+        patterns = self._get_patterns()
+        self._setup_pattern_generator()
+        total_passes = self.stats['total_passes']
+
+        for pass_num in range(1, total_passes + 1):
             if self.stop_requested:
                 break
 
-            while self.paused and not self.stop_requested:
-                time.sleep(0.1)
-
-            self._send_message('log', f"Паттерн: {pattern_name}", 'info')
+            self.stats['current_pass'] = pass_num
+            self._send_message('pass', pass_num, total_passes)
+            self._send_message('log', f"Проход {pass_num}/{total_passes}", 'info')
 
-            if pattern_name == 'ones':
-                data = pattern_value * chunk_size
-            elif pattern_name == 'zeros':
-                data = pattern_value * chunk_size
-            else:
-                data = os.urandom(chunk_size)
+            with self.stats_lock:
+                bytes_before = self.stats['tested_bytes']
+                errors_before = self.stats['bad_sectors_count']
+            pass_start = time.time()
 
-            for chunk_num in range(total_chunks):
+            for pattern_name, data in patterns:
                 if self.stop_requested:
                     break
+                self._send_message('log', f"Паттерн: {pattern_name}", 'info')
+                for ranges in self.test_plan:
+                    if self.stats['two_phase']:
+                        # Весь интервал записывается, затем читается после сброса кэша
+                        self._run_test_pass_on_interval(ranges, pattern_name, data, phase='write')
+                        if self.stop_requested:
+                            break
+                        self._flush_sync()
+                        self._drop_caches()
+                        self._run_test_pass_on_interval(ranges, pattern_name, data, phase='read')
+                    else:
+                        self._run_test_pass_on_interval(ranges, pattern_name, data)
+                    if self.stop_requested:
+                        break
 
-                while self.paused and not self.stop_requested:
-                    time.sleep(0.1)
+            self._flush_sync()
+            elapsed = time.time() - pass_start
+            with self.stats_lock:
+                pass_bytes = self.stats['tested_bytes'] - bytes_before
+                pass_errors = self.stats['bad_sectors_count'] - errors_before
+                pass_info = {
+                    'pass': pass_num,
+                    'tested_bytes': pass_bytes,
+                    'elapsed': elapsed,
+                    'avg_speed': (pass_bytes / 1024 / 1024) / max(elapsed, 0.001),
+                    'errors': pass_errors,
+                    'completed': not self.stop_requested
+                }
+                self.stats['pass_stats'].append(pass_info)
+            self.stats['adaptive_chunk'] = self.chunk_controller.get_summary()
+            self._send_message('log', f"Проход {pass_num}/{total_passes} завершён: "
+                                      f"{pass_info['avg_speed']:.1f} MB/s, ошибок: {pass_errors}",
+                               'success' if pass_errors == 0 else 'warning')
+
+        self._phase = None
+        self._finish_quick_test()
+        self._log_pipeline_stages()
+        self._send_message('log', self.sync_policy.describe(), 'info')
+        self._log_latency()
+        self._log_phase_speeds()
+
+    def _setup_pattern_generator(self):
+        """Seed случайного паттерна: из параметров (воспроизведение прогона) или новый"""
+        seed = self.test_params.get('pattern_seed')
+        if seed is None:
+            seed = new_seed()
+        self.pattern_generator = PatternGenerator(seed)
+        self.stats['pattern_seed'] = self.pattern_generator.seed
+        if any(value is None for _, value in self._get_patterns()):
+            self._send_message('log', f"Seed случайного паттерна: {self.pattern_generator.seed}", 'info')
+
+    def _log_pipeline_stages(self):
+        """Итоговое время этапов конвейера (суммарно по всем потокам)"""
+        stages = self.stats['pipeline'].get('stage_seconds', {})
+        if not stages:
+            return
+        self._send_message('log', "Этапы конвейера: " + ", ".join(
+            f"{name} {seconds:.1f} с" for name, seconds in stages.items()), 'debug')
 
-                offset = start + chunk_num * chunk_size
-                current_chunk = min(chunk_size, end - offset)
+    def _use_two_phase(self) -> bool:
+        """Двухфазный режим (значение по умолчанию в UI берётся из конфигурации); без проверки чтения не нужен"""
+        return bool(self.test_params.get('two_phase', False)) and bool(self.test_params.get('test_verify', True))
 
-                start_time = time.time()
-                try:
-                    self.test_handle.seek(offset)
-                    self.test_handle.write(data[:current_chunk])
-                    self.test_handle.flush()
-                    if hasattr(os, 'fdatasync'):
-                        os.fdatasync(self.test_handle.fileno())
-                    else:
-                        os.fsync(self.test_handle.fileno())
-
-                    if self.test_params.get('test_verify', True):
-                        self.test_handle.seek(offset)
-                        read_data = self.test_handle.read(current_chunk)
-                        if read_data != data[:current_chunk]:
-                            raise Exception("Ошибка верификации данных")
-
-                except OSError as e:
-                    if e.errno == 9:  # Bad file descriptor
-                        self._send_message('error',
-                            "Критическая ошибка: диск не доступен для записи.\n"
-                            "Возможные причины:\n"
-                            "• Диск защищён от записи\n"
-                            "• Недостаточно прав (запустите программу от администратора)\n"
-                            "• Диск является CD/DVD-ROM или другим устройством только для чтения\n"
-                            "Тест прерван.")
-                        self.stop_requested = True
-                        break
-                    else:
-                        sector = offset // 512
-                        self._add_bad_sector(sector, str(e), system=False)
-                        continue
-                except Exception as e:
-                    sector = offset // 512
-                    self._add_bad_sector(sector, str(e), system=False)
-                    continue
+    def _drop_caches(self):
+        """Вытеснение записанных данных из кэша ОС перед фазой чтения"""
+        if self.device_io.direct:
+            return
+        try:
+            dropped = self.device_io.drop_cache()
+        except OSError as e:
+            self.logger.warning(f"Не удалось сбросить кэш: {e}")
+            dropped = False
+        if not dropped and not self._cache_warning_logged:
+            self._cache_warning_logged = True
+            self._send_message('log', "Сброс кэша ОС недоступен: скорость чтения может быть завышена", 'warning')
+
+    def _log_phase_speeds(self):
+        """Итоговые скорости фаз записи и чтения"""
+        if not self.stats['two_phase']:
+            return
+        parts = [f"{phase} {self.phase_speed_stats[phase].mean:.1f} MB/s"
+                 for phase in self.PHASES if self.phase_speed_stats[phase].count]
+        if parts:
+            self._send_message('log', "Скорость по фазам: " + ", ".join(parts), 'info')
+
+    def _log_latency(self):
+        """Итоговые задержки операций: медиана и хвост распределения"""
+        for op, histogram in self.latency.items():
+            if not histogram.count:
+                continue
+            summary = histogram.summary()
+            self._send_message('log', f"Задержка {op}: p50 {summary['p50_ms']:.1f} мс, p99 {summary['p99_ms']:.1f} мс, "
+                                      f"p99.9 {summary['p99_9_ms']:.1f} мс, max {summary['max_ms']:.1f} мс", 'info')
+
+    def _run_test_pass_on_interval(self, ranges: List[Tuple[int, int]], pattern_name: str, data: Optional[bytes],
+                                   phase: Optional[str] = None):
+        """
+        Запись/чтение одного паттерна на участках интервала силами всех рабочих потоков.
+        phase: None — запись с немедленной проверкой каждого блока, 'write' — только запись,
+        'read' — только чтение и сравнение ранее записанных данных.
+        """
+        while self.paused and not self.stop_requested:
+            time.sleep(0.1)
+        # Участки, завершённые до прерывания теста, не повторяются
+        journal_key = ('data', self.stats['current_pass'], pattern_name, phase or 'rw')
+        ranges = self._skip_completed(journal_key, ranges, count_tested=phase != 'write')
+        if self.stop_requested or not ranges:
+            return
+        self._phase = phase
+
+        # Сплошной интервал делится на регионы, участки выборки распределяются между потоками
+        if len(ranges) == 1:
+            groups = [[region] for region in self._split_interval(ranges[0][0], ranges[0][1], self.num_threads)]
+        else:
+            groups = [ranges[i::self.num_threads] for i in range(min(self.num_threads, len(ranges)))]
+
+        # Раздаём регионы интервала рабочим потокам и ждём их завершения
+        with self.stats_lock:
+            self._window_bytes = 0
+            self._window_start = time.time()
+        for group in groups:
+            self.task_queue.put({
+                'ranges': group,
+                'pattern': pattern_name,
+                'pass': self.stats['current_pass'],
+                'data': data,
+                'phase': phase,
+                'journal_key': journal_key
+            })
+        self.task_queue.join()
+        self._flush_progress()
+        if self.journal is not None:
+            self.journal.flush()
+
+    def _test_region(self, task: Dict, pipeline: ChunkPipeline):
+        """Запись/чтение участков региона блоками через конвейер (выполняется в рабочем потоке)"""
+        ranges = task['ranges']
+        data = task['data']
+        quick_test = bool(self.stats.get('quick_test'))
+        region = {
+            'start': ranges[0][0],
+            'end': ranges[-1][1],
+            'ranges': len(ranges),
+            'pattern': task['pattern'],
+            'pass': task['pass'],
+            'tested_bytes': 0,
+            'errors': 0,
+            'elapsed': 0.0
+        }
+        region_start_time = time.time()
 
-                elapsed = time.time() - start_time
-                speed = (current_chunk / 1024 / 1024) / max(elapsed, 0.001)
+        def fill(view, chunk):
+            if data is not None:
+                fill_byte(view, data[0])
+            else:
+                self.pattern_generator.fill(view, task['pass'], chunk['offset'])
+
+        # Конец проверенной части участков, ещё не сброшенной на носитель: начало участка → конец
+        unsynced = {}
+        # После незавершённого блока отметка участка покрыла бы и его, поэтому журнал задачи не пополняется
+        journaling = self.journal is not None
+
+        def on_chunk(chunk):
+            nonlocal journaling
+            self._on_chunk_done(chunk)
+            if chunk.get('incomplete'):
+                journaling = False
+            if journaling:
+                # Участки внутри региона проходятся по порядку: отмечается конец проверенной части
+                unsynced[chunk['range_start']] = chunk['offset'] + chunk['length']
+                if chunk.get('durable', True):
+                    # sync() сбросил и все блоки, записанные до этого
+                    for start, end in unsynced.items():
+                        self.journal.mark_done(task['journal_key'], start, end)
+                    unsynced.clear()
+            if chunk['error'] is None:
+                region['tested_bytes'] += chunk['length']
+                return
+            # Исправные части сбойного блока засчитываются после повторной проверки
+            retested = chunk.get('retested_bytes', 0)
+            region['tested_bytes'] += retested
+            if retested < chunk['length']:
+                region['errors'] += 1
+                if quick_test:
+                    with self.stats_lock:
+                        self._defective_samples.add(chunk['range_start'])
+
+        verify = self.test_params.get('test_verify', True)
+        write, sync = self._queued_write, self.sync_policy.commit
+        readinto = self._verify_reader() if verify else None
+        record_latency = self._record_latency
+        if task.get('phase') == 'write':
+            readinto = None
+        elif task.get('phase') == 'read':
+            # Данные уже на носителе: конвейер только готовит ожидаемые данные, читает и сравнивает
+            write, sync = (lambda view, offset: None), (lambda: None)
+            record_latency = self._record_read_latency
+        timings = pipeline.run(
+            self._iter_chunks(ranges),
+            fill,
+            write,
+            sync,
+            readinto,
+            on_chunk,
+            lambda: self.stop_requested,
+            record_latency
+        )
+        if unsynced:
+            # Отметки попадут в журнал после сброса в конце фазы записи или прохода
+            with self.stats_lock:
+                self._unsynced_marks.extend((task['journal_key'], start, end) for start, end in unsynced.items())
+
+        region['elapsed'] = time.time() - region_start_time
+        region['avg_speed'] = (region['tested_bytes'] / 1024 / 1024) / max(region['elapsed'], 0.001)
+        with self.stats_lock:
+            self.stats['regions'].append(region)
+            stage_seconds = self.stats['pipeline']['stage_seconds']
+            for stage, seconds in timings.items():
+                stage_seconds[stage] += seconds
+
+    def _record_latency(self, op: str, value_ns: int):
+        """Учёт задержки одной операции ввода-вывода; задержки sync учитывает политика синхронизации"""
+        if op != 'sync':
+            self.latency[op].record(value_ns)
+
+    def _record_read_latency(self, op: str, value_ns: int):
+        """Фаза чтения: запись и sync в конвейере пустые и в гистограммы не попадают"""
+        if op == 'read':
+            self.latency[op].record(value_ns)
+
+    def _iter_chunks(self, ranges: List[Tuple[int, int]]):
+        """Ленивая нарезка участков на блоки размера, выбранного контроллером в момент подготовки"""
+        for start, end in ranges:
+            offset = start
+            while offset < end:
+                while self.paused and not self.stop_requested:
+                    time.sleep(0.1)
+                if self.stop_requested:
+                    return
+                length = min(self.chunk_controller.next_size(), end - offset)
+                yield {'offset': offset, 'length': length, 'range_start': start}
+                offset += length
+
+    def _on_chunk_done(self, chunk: Dict):
+        """Учёт завершённого блока: прогресс, адаптация размера, битые сектора"""
+        error = chunk['error']
+        if error is None:
+            with self.stats_lock:
+                self.heatmap.record(chunk['offset'], chunk['length'], chunk['elapsed'])
+            self._record_chunk(chunk['length'], chunk['elapsed'])
+            self._on_chunk_size_changed(self.chunk_controller.observe(chunk['length'], chunk['elapsed']))
+            return
 
-                self.stats['tested_bytes'] += current_chunk
-                self.stats['tested'] = self.stats['tested_bytes'] / (1024**3)
+        if isinstance(error, OSError) and error.errno == 9:  # Bad file descriptor
+            if not self.stop_requested:
+                self._send_message('error',
+                    "Критическая ошибка: диск не доступен для записи.\n"
+                    "Возможные причины:\n"
+                    "• Диск защищён от записи\n"
+                    "• Недостаточно прав (запустите программу от администратора)\n"
+                    "• Диск является CD/DVD-ROM или другим устройством только для чтения\n"
+                    "Тест прерван.")
+            self.stop_requested = True
+            chunk['incomplete'] = True
+            return
 
-                self.stats['speeds'].append(speed)
-                if self.stats['speeds']:
-                    self.stats['avg_speed'] = sum(self.stats['speeds']) / len(self.stats['speeds'])
+        retested = 0
+        if chunk.get('mismatches'):
+            # Несовпадение данных локализовано до секторов: записываем каждый диапазон
+            for mismatch in chunk['mismatches']:
+                self._add_bad_sector(mismatch['sector'], describe_mismatch([mismatch]), system=False,
+                                     count=mismatch['count'], details=mismatch)
+        elif isinstance(error, OSError) and self._use_error_bisection() and 'data' in chunk:
+            retested = self._localize_chunk_errors(chunk)
+        else:
+            sector = chunk['offset'] // 512
+            self._add_bad_sector(sector, str(error), system=False)
+        chunk['retested_bytes'] = retested
+        self._record_chunk(chunk['length'] - retested, 0, failed=True)
+        if retested:
+            # Исправные участки проверены медленно, поэтому не входят в окно скорости
+            with self.stats_lock:
+                self.stats['processed_bytes'] += retested
+                if self._phase != 'write':
+                    self.stats['tested_bytes'] += retested
+                    self.stats['tested'] = self.stats['tested_bytes'] / (1024**3)
+        self._on_chunk_size_changed(self.chunk_controller.on_error())
+
+    def _use_error_bisection(self) -> bool:
+        """Локализация ошибок ввода-вывода делением блока (параметр запуска, иначе конфигурация)"""
+        enabled = self.test_params.get('error_bisection')
+        if enabled is None:
+            enabled = self.app.config.get('testing', {}).get('error_bisection', True)
+        return bool(enabled)
+
+    def _localize_chunk_errors(self, chunk: Dict) -> int:
+        """
+        Повторная проверка блока с ошибкой ввода-вывода делением пополам до логического сектора.
+        Выполняется в потоке проверки конвейера; возвращает число байт, прошедших проверку.
+        """
+        retries = self.app.config.get('testing', {}).get('error_retries', DEFAULT_RETRIES)
+        verify = self.test_params.get('test_verify', True) and self._phase != 'write'
+        localizer = ErrorLocalizer(
+            self.device_io.pwrite,
+            self.device_io.sync,
+            self._verify_reader() if verify else None,
+            sector_size=self.device_io.sector_size,
+            retries=int(retries),
+            should_stop=lambda: self.stop_requested
+        )
+        start = time.perf_counter()
+        result = localizer.localize(chunk['offset'], chunk['data'], chunk['read_buffer'])
+        elapsed = time.perf_counter() - start
+        # Прерванная остановкой локализация не даёт права пропустить блок при продолжении
+        chunk['incomplete'] = not result['complete']
+
+        for bad in result['bad']:
+            if bad['stage'] == 'verify':
+                self._add_bad_sector(bad['sector'], describe_mismatch([bad]), system=False,
+                                     count=bad['count'], details=bad)
+            else:
+                self._add_bad_sector(bad['sector'], bad['error'], system=False, count=bad['count'])
+        if not result['bad'] and result['complete']:
+            self._send_message('log', f"Ошибка в блоке {chunk['offset'] // 512} не воспроизвелась "
+                                      f"при повторной проверке: {chunk['error']}", 'warning')
+
+        with self.stats_lock:
+            summary = self.stats['error_localization']
+            summary['chunks'] = summary.get('chunks', 0) + 1
+            summary['probes'] = summary.get('probes', 0) + result['probes']
+            summary['recovered_bytes'] = summary.get('recovered_bytes', 0) + result['recovered']
+            summary['retested_bytes'] = summary.get('retested_bytes', 0) + result['good_bytes']
+            summary['seconds'] = summary.get('seconds', 0.0) + elapsed
+        self._send_message('log', f"Локализация ошибки в блоке {chunk['offset'] // 512}: "
+                                  f"{result['probes']} проверок, исправно {result['good_bytes'] // 1024} KB, "
+                                  f"сбойных диапазонов {len(result['bad'])}", 'debug')
+        return result['good_bytes']
+
+    def _on_chunk_size_changed(self, new_size: Optional[int]):
+        """Фиксация нового размера блока, выбранного адаптивным контроллером"""
+        if new_size is None:
+            return
+        with self.stats_lock:
+            old_mb = self.stats['chunk_size_mb']
+            self.stats['chunk_size_mb'] = new_size // (1024 * 1024)
+        self._send_message('log', f"Размер блока: {old_mb} MB → {new_size // (1024 * 1024)} MB", 'debug')
+
+    def _record_chunk(self, nbytes: int, elapsed: float, failed: bool = False):
+        """Слияние результата блока из любого потока в общий поток прогресса"""
+        with self.stats_lock:
+            # Сбойные блоки продвигают прогресс плана, но не учитываются в скорости
+            self.stats['processed_bytes'] += nbytes
+            if not failed:
+                self._window_bytes += nbytes
+                # В двухфазном режиме участок считается проверенным после фазы чтения
+                if self._phase != 'write':
+                    self.stats['tested_bytes'] += nbytes
+                    self.stats['tested'] = self.stats['tested_bytes'] / (1024**3)
+
+            current_time = time.time()
+            if current_time - self.last_update_time >= self.update_interval:
+                self._flush_progress(current_time)
+
+    def _flush_progress(self, current_time: Optional[float] = None):
+        """Расчёт суммарной скорости всех потоков за окно и отправка прогресса в UI"""
+        with self.stats_lock:
+            if current_time is None:
+                current_time = time.time()
+            if self._window_bytes > 0:
+                window = max(current_time - self._window_start, 0.001)
+                speed = (self._window_bytes / 1024 / 1024) / window
 
-                if speed > self.stats['max_speed']:
-                    self.stats['max_speed'] = speed
-                if speed < self.stats['min_speed']:
-                    self.stats['min_speed'] = speed
+                # Накопитель обновляется за O(1): история скоростей не хранится
+                self.speed_stats.add(speed)
+                self.stats['avg_speed'] = self.speed_stats.mean
+                self.stats['max_speed'] = self.speed_stats.max
+                self.stats['min_speed'] = self.speed_stats.min
 
-                self.stats['elapsed_seconds'] = time.time() - self.stats['start_time']
+                self.stats['elapsed_seconds'] = current_time - self.stats['start_time']
                 hours = int(self.stats['elapsed_seconds'] // 3600)
                 minutes = int((self.stats['elapsed_seconds'] % 3600) // 60)
                 seconds = int(self.stats['elapsed_seconds'] % 60)
                 self.stats['elapsed_time'] = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
 
-                self.stats['times'].append(self.stats['elapsed_seconds'])
+                self.speed_series.add(self.stats['elapsed_seconds'], speed)
+                if self._phase is not None:
+                    self.phase_speed_stats[self._phase].add(speed)
+                    self.phase_speed_series[self._phase].add(self.stats['elapsed_seconds'], speed)
+                self._send_message('speed', speed, self.stats['elapsed_seconds'], self._phase)
 
-                current_time = time.time()
-                if current_time - self.last_update_time >= self.update_interval or chunk_num == total_chunks - 1:
-                    progress = (self.stats['tested_bytes'] / self.stats['total_bytes']) * 100
-                    self._send_message('progress', progress)
-                    self._send_message('speed', speed, self.stats['elapsed_seconds'])
-                    self.last_update_time = current_time
+            self._send_message('progress', self._get_progress())
+            self._window_bytes = 0
+            self._window_start = current_time
+            self.last_update_time = current_time
 
-    def _add_bad_sector(self, sector: int, error_type: str, system: bool = False):
+
+    def _add_bad_sector(self, sector: int, error_type: str, system: bool = False,
+                        count: int = 1, details: Optional[Dict] = None):
+        """Запись битого сектора или диапазона из count подряд идущих секторов"""
         bad_sector = {
             'sector': sector,
+            'count': count,
+            'end_sector': sector + count - 1,
             'error_type': error_type,
             'time': datetime.now().strftime("%H:%M:%S"),
             'attempts': 1,
             'system': system
         }
-        if system:
-            self.stats['system_bad_sectors_list'].append(bad_sector)
-            self.stats['system_bad_sectors'] = len(self.stats['system_bad_sectors_list'])
-            self._send_message('log', f"Найден битый системный сектор: {sector} - {error_type}", 'error')
-        else:
-            self.stats['bad_sectors'].append(bad_sector)
-            self.stats['bad_sectors_count'] = len(self.stats['bad_sectors'])
-            self._send_message('bad_sector', sector, error_type, 1)
-            self._send_message('log', f"Найден битый сектор: {sector} - {error_type}", 'error')
-
-        # Если общее количество битых секторов превысило лимит, останавливаем тест
-        total_bad = self.stats['bad_sectors_count'] + self.stats['system_bad_sectors']
-        if total_bad >= self.MAX_BAD_SECTORS:
-            self._send_message('log', f"Превышен лимит битых секторов ({self.MAX_BAD_SECTORS}). Тест остановлен.", 'error')
-            self.stop_requested = True
+        if details:
+            # Число и позиции изменённых бит для ошибок верификации
+            bad_sector['bit_flips'] = details.get('bit_flips', 0)
+            bad_sector['flip_mask'] = details.get('flip_mask', 0)
+            bad_sector['bits'] = details.get('bits', [])
+        location = f"{sector}" if count == 1 else f"{sector}–{sector + count - 1}"
+        # Сектора могут добавляться из нескольких рабочих потоков одновременно
+        with self.stats_lock:
+            self.heatmap.add_error(sector, count)
+            if system:
+                self.stats['system_bad_sectors_list'].append(bad_sector)
+                self.stats['system_bad_sectors'] = len(self.stats['system_bad_sectors_list'])
+                self._send_message('log', f"Найден битый системный сектор: {location} - {error_type}", 'error')
+            else:
+                self.stats['bad_sectors'].append(bad_sector)
+                self.stats['bad_sectors_count'] += count
+                self._send_message('bad_sector', location, error_type, 1)
+                self._send_message('log', f"Найден битый сектор: {location} - {error_type}", 'error')
+            if self.journal is not None:
+                self.journal.add_bad_sector(bad_sector)
+
+            # Если количество записей о битых секторах превысило лимит, останавливаем тест
+            total_bad = len(self.stats['bad_sectors']) + self.stats['system_bad_sectors']
+            if total_bad >= self.MAX_BAD_SECTORS:
+                self._send_message('log', f"Превышен лимит битых секторов ({self.MAX_BAD_SECTORS}). Тест остановлен.", 'error')
+                self.stop_requested = True
 
     def _test_complete(self):
         elapsed = self.stats['elapsed_time']
@@ -518,4 +1404,23 @@ class DiskTester:
         return self.running
 
     def get_statistics(self) -> Dict:
-        return self.stats.copy()
\ No newline at end of file
+        with self.stats_lock:
+            stats = self.stats.copy()
+            # Ряды и сводка формируются по запросу из накопителей фиксированного размера
+            stats['times'], stats['speeds'] = self.speed_series.snapshot()
+            stats['speed_stats'] = self.speed_stats.summary()
+            stats['latency'] = {op: histogram.summary() for op, histogram in self.latency.items()
+                                if histogram.count}
+            stats['heatmap'] = self.heatmap.summary() if self.heatmap is not None else {}
+            if self.sync_policy is not None:
+                stats['sync'] = self.sync_policy.summary()
+            stats['phase_speeds'] = {}
+            for phase in self.PHASES:
+                if self.phase_speed_stats[phase].count:
+                    times, speeds = self.phase_speed_series[phase].snapshot()
+                    stats['phase_speeds'][phase] = {
+                        'times': times,
+                        'speeds': speeds,
+                        'summary': self.phase_speed_stats[phase].summary()
+                    }
+            return stats
\ No newline at end of file
@@ -9,9 +9,18 @@ import random
 import threading
 import queue
 import platform
+from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 from utils.logger import get_logger
-import win32file
+from core.direct_io import DeviceIO, aligned_buffer
+from core.io_queue import IOQueue, clamp_depth
+from core.sync_policy import SyncPolicy, DEFAULT_INTERVAL_MB
+from core.pipeline import buffers_equal
+from core.mismatch import find_mismatched_sectors, describe_mismatch
+from core.patterns import fill_byte
+from core.partitions import read_partition_table, invalidate_partition_cache
+from core.block_devices import resolve_block_device, describe_block_device
+from core.journal import CheckpointJournal, journal_path, device_identity
 
 # Для работы с WMI на Windows
 if platform.system() == "Windows":
@@ -20,6 +29,13 @@ if platform.system() == "Windows":
 class DataWiper:
     """Класс для безопасного затирания данных на диске"""
 
+    # Размер блока записи и проверки
+    CHUNK_SIZE = 64 * 1024 * 1024
+    # Период отправки сообщений о скорости, секунды
+    SPEED_INTERVAL = 0.5
+    # Поля заголовка журнала, которые должны совпасть для продолжения прерванного затирания
+    JOURNAL_FIELDS = ('drive_path', 'device', 'total_bytes', 'method', 'passes', 'verify')
+
     def __init__(self, app):
         self.app = app
         self.logger = get_logger(__name__)
@@ -30,15 +46,31 @@ class DataWiper:
         self.stop_requested = False
 
         self.message_queue = queue.Queue(maxsize=100)
+        # Окно измерения скорости записи/проверки
+        self._start_time = 0.0
+        self._speed_bytes = 0
+        self._speed_start = 0.0
 
         # Параметры затирания
         self.drive_path = ""
         self.method = ""
         self.passes = 0
         self.verify = False
-        self.device_handle = None
+        self.device_io: Optional[DeviceIO] = None
+        # Очередь запросов: блок записывается и читается queue_depth одновременными запросами
+        self.queue_depth = 1
+        # Политика сброса записанных данных на носитель
+        self.sync_policy_name: Optional[str] = None
+        self.sync_policy: Optional[SyncPolicy] = None
+        self.io_queue: Optional[IOQueue] = None
+        # Буферы блока записи и чтения, выделяются один раз на всё затирание
+        self._write_buffer = None
+        self._read_buffer = None
         self.device_path = None
         self.unmounted = False  # Флаг размонтирования
+        # Журнал контрольных точек и журнал прерванного затирания, загруженный для продолжения
+        self.journal: Optional[CheckpointJournal] = None
+        self._resume_journal: Optional[CheckpointJournal] = None
 
         # Статистика
         self.stats = {
@@ -46,7 +78,10 @@ class DataWiper:
             'total_size_gb': 0,
             'current_pass': 0,
             'bad_sectors': 0,
-            'errors': []
+            'errors': [],
+            'io_method': 'buffered',
+            'queue_depth': 1,
+            'sync': {}
         }
 
     def _get_device_path_windows(self, drive_path: str) -> Optional[str]:
@@ -65,18 +100,12 @@ class DataWiper:
 
     def _get_device_path_linux(self, mountpoint: str) -> Optional[str]:
         """Определение пути к физическому диску для Linux"""
-        try:
-            with open('/proc/mounts') as f:
-                for line in f:
-                    parts = line.split()
-                    if len(parts) > 1 and parts[1] == mountpoint:
-                        dev = parts[0]
-                        # Убираем цифры в конце (номер раздела)
-                        base = ''.join(c for c in dev if not c.isdigit())
-                        return base
-        except Exception as e:
-            self.logger.error(f"Ошибка получения пути устройства (Linux): {e}")
-        return None
+        info = resolve_block_device(mountpoint)
+        if info is None:
+            self.logger.error(f"Не найдено блочное устройство для {mountpoint}")
+            return None
+        self.logger.info(f"Устройство: {describe_block_device(info)}")
+        return info['path']
 
     def _get_device_path_macos(self, mountpoint: str) -> Optional[str]:
         """Определение пути к физическому диску для macOS"""
@@ -156,16 +185,37 @@ class DataWiper:
             self.logger.error(f"Не удалось определить размер устройства: {e}")
             return 0
 
-    def wipe_disk(self, drive_path: str, method: str = "dod", passes: int = 3, verify: bool = True) -> bool:
-        """Запуск затирания диска"""
+    def wipe_disk(self, drive_path: str, method: str = "dod", passes: int = 3, verify: bool = True,
+                  resume: bool = False, queue_depth: Optional[int] = None,
+                  sync_policy: Optional[str] = None) -> bool:
+        """
+        Запуск затирания диска (resume — продолжение прерванного затирания по журналу,
+        queue_depth — число одновременных запросов к устройству, sync_policy — политика
+        сброса на носитель; по умолчанию оба значения из конфигурации)
+        """
         if self.running:
             self.logger.warning("Затирание уже выполняется")
             return False
 
+        self.journal = None
+        self._resume_journal = None
+        if resume:
+            self._resume_journal = CheckpointJournal.load(journal_path('wipe', drive_path))
+            if self._resume_journal is None:
+                self._send_message('log', "Журнал прерванного затирания не найден, затирание начинается заново",
+                                   'warning')
+            else:
+                header = self._resume_journal.header
+                method, passes, verify = header['method'], header['passes'], header['verify']
+
         self.drive_path = drive_path
         self.method = method
         self.passes = passes
         self.verify = verify
+        if queue_depth is None:
+            queue_depth = self.app.config.get('wiping', {}).get('queue_depth', 1)
+        self.queue_depth = clamp_depth(queue_depth)
+        self.sync_policy_name = sync_policy or self.app.config.get('wiping', {}).get('sync_policy')
         self.stop_requested = False
         self.unmounted = False
 
@@ -183,7 +233,10 @@ class DataWiper:
             'total_size_gb': 0,
             'current_pass': 0,
             'bad_sectors': 0,
-            'errors': []
+            'errors': [],
+            'io_method': 'buffered',
+            'queue_depth': 1,
+            'sync': {}
         }
 
         self.wipe_thread = threading.Thread(target=self._wipe_worker, daemon=True)
@@ -207,15 +260,39 @@ class DataWiper:
             self.stats['total_size_gb'] = total_bytes / (1024**3)
 
             self._send_message('log', f"Устройство: {device_path}, размер: {self.stats['total_size_gb']:.2f} GB", 'info')
+            self._log_partition_table(device_path)
 
+            # Без O_SYNC: момент сброса на носитель задаёт политика синхронизации
             flags = os.O_RDWR | os.O_BINARY if hasattr(os, 'O_BINARY') else os.O_RDWR
-            if self.system != "Windows":
-                flags |= os.O_SYNC
 
-            fd = os.open(device_path, flags)
-            self.device_handle = os.fdopen(fd, 'rb+', buffering=0)
+            direct = self.app.config.get('wiping', {}).get('direct_io', True)
+            self.device_io = DeviceIO(device_path, flags, direct=direct)
+            self.stats['io_method'] = self.device_io.method
+            if self.device_io.direct:
+                self._send_message('log', f"Прямой ввод-вывод ({self.device_io.method}): запись и проверка минуя кэш", 'info')
+            elif direct:
+                self._send_message('log', "Прямой ввод-вывод недоступен, используется обычный режим", 'warning')
+            self.io_queue = IOQueue(self.queue_depth)
+            self.stats['queue_depth'] = self.io_queue.depth
+            if self.io_queue.depth > 1:
+                self._send_message('log', f"Глубина очереди запросов: {self.io_queue.depth}", 'info')
+            self.sync_policy = SyncPolicy(
+                self.device_io.sync,
+                self.sync_policy_name,
+                self.app.config.get('wiping', {}).get('sync_interval_mb', DEFAULT_INTERVAL_MB),
+                direct=self.device_io.direct
+            )
+
+            self._write_buffer = self._allocate_buffer(self.CHUNK_SIZE)
+            self._start_time = time.time()
+            self._speed_bytes = 0
+            self._speed_start = time.time()
+            if self.verify:
+                self._read_buffer = self._allocate_buffer(self.CHUNK_SIZE)
 
             passes_to_do, patterns = self._get_patterns_for_method(self.method, self.passes)
+            patterns = self._open_journal(patterns)
+            passes_to_do = len(patterns)
 
             for pass_num in range(1, passes_to_do + 1):
                 if self.stop_requested:
@@ -224,7 +301,7 @@ class DataWiper:
                 self.stats['current_pass'] = pass_num
                 pattern = patterns[pass_num - 1]
                 self._send_message('log', f"Проход {pass_num}/{passes_to_do} - паттерн: {pattern:02X}", 'info')
-                self._write_pattern(pattern)
+                self._write_pattern(pattern, ('pass', pass_num))
 
                 if self.stop_requested:
                     break
@@ -234,6 +311,10 @@ class DataWiper:
                 last_pattern = patterns[-1]
                 self._verify_pattern(last_pattern)
 
+            self.stats['sync'] = self.sync_policy.summary()
+            self._send_message('log', self.sync_policy.describe(), 'info')
+            completed = not self.stop_requested
+            self._close_journal(completed)
             if self.stop_requested:
                 self._send_message('log', "Затирание прервано пользователем", 'warning')
                 self._send_message('complete', "Затирание прервано")
@@ -245,15 +326,25 @@ class DataWiper:
             self.logger.error(f"Ошибка при затирании: {e}", exc_info=True)
             self._send_message('error', str(e))
         finally:
-            if self.device_handle:
+            self._close_journal(False)
+            if self._resume_journal is not None:
+                self._resume_journal.close()
+                self._resume_journal = None
+            if self.io_queue is not None:
+                self.io_queue.close()
+                self.io_queue = None
+            if self.device_io:
                 try:
-                    self.device_handle.close()
+                    self.device_io.close()
                 except:
                     pass
+                invalidate_partition_cache(self.device_path)
             if self.unmounted:
                 self._send_message('unmount_notice', self.drive_path)
             self.running = False
-            self.device_handle = None
+            self.device_io = None
+            self._write_buffer = None
+            self._read_buffer = None
 
     def _get_patterns_for_method(self, method: str, passes: int) -> Tuple[int, List[int]]:
         """Возвращает количество проходов и список байтовых паттернов для метода"""
@@ -283,13 +374,19 @@ class DataWiper:
             patterns.append(random.randint(0, 255))
         return patterns[:35]
 
-    def _write_pattern(self, pattern: int):
+    def _allocate_buffer(self, chunk_size: int):
+        """Буфер блока: выровненный по странице при прямом вводе-выводе"""
+        return aligned_buffer(chunk_size) if self.device_io.direct else bytearray(chunk_size)
+
+    def _write_pattern(self, pattern: int, journal_key: Tuple = ('pass', 1)):
         """Запись одного байтового паттерна на весь диск блоками"""
-        chunk_size = 64 * 1024 * 1024
-        data = bytes([pattern]) * chunk_size
+        chunk_size = self.CHUNK_SIZE
+        view = memoryview(self._write_buffer)[:chunk_size]
+        fill_byte(view, pattern)
         total_chunks = (self.stats['total_bytes'] + chunk_size - 1) // chunk_size
 
-        for chunk_num in range(total_chunks):
+        written_end = 0
+        for chunk_num in range(self._resume_chunk(journal_key, chunk_size), total_chunks):
             if self.stop_requested:
                 break
 
@@ -299,32 +396,42 @@ class DataWiper:
                 break
 
             try:
-                self.device_handle.seek(offset)
-                self.device_handle.write(data[:current_chunk_size])
-                self.device_handle.flush()
-                if hasattr(os, 'fdatasync'):
-                    os.fdatasync(self.device_handle.fileno())
-                else:
-                    os.fsync(self.device_handle.fileno())
+                self.io_queue.write_all(self.device_io.pwrite, view[:current_chunk_size], offset)
+                self.sync_policy.written(current_chunk_size)
+                durable = self.sync_policy.commit()
             except OSError as e:
+                durable = False
                 self.stats['bad_sectors'] += 1
-                self.stats['errors'].append({
+                self._add_error({
                     'offset': offset,
-                    'error': str(e)
+                    'error': str(e),
+                    'stage': 'write'
                 })
                 self._send_message('log', f"Ошибка записи в секторе {offset//512}: {e}", 'error')
 
+            written_end = offset + current_chunk_size
+            # В журнал попадает только сброшенная на носитель часть прохода
+            if self.journal is not None and durable:
+                self.journal.mark_done(journal_key, 0, written_end)
+            self._report_speed(current_chunk_size, 'write')
             progress = ((chunk_num + 1) / total_chunks) * 100
             self._send_message('progress', progress)
 
+        self.sync_policy.flush()
+        if self.journal is not None and written_end:
+            self.journal.mark_done(journal_key, 0, written_end)
+
     def _verify_pattern(self, pattern: int):
         """Верификация последнего записанного паттерна чтением и сравнением"""
-        chunk_size = 64 * 1024 * 1024
-        data_expected = bytes([pattern]) * chunk_size
+        chunk_size = self.CHUNK_SIZE
+        # Ожидаемые данные — в буфере записи, чтение — в отдельный постоянный буфер
+        expected_view = memoryview(self._write_buffer)[:chunk_size]
+        fill_byte(expected_view, pattern)
+        read_view = memoryview(self._read_buffer)[:chunk_size]
         total_chunks = (self.stats['total_bytes'] + chunk_size - 1) // chunk_size
 
         errors = 0
-        for chunk_num in range(total_chunks):
+        for chunk_num in range(self._resume_chunk(('verify',), chunk_size), total_chunks):
             if self.stop_requested:
                 break
 
@@ -332,20 +439,146 @@ class DataWiper:
             current_chunk_size = min(chunk_size, self.stats['total_bytes'] - offset)
 
             try:
-                self.device_handle.seek(offset)
-                read_data = self.device_handle.read(current_chunk_size)
-                if read_data != data_expected[:current_chunk_size]:
+                n = self.io_queue.readinto_all(self.device_io.preadinto, read_view[:current_chunk_size], offset)
+                if n != current_chunk_size:
                     errors += 1
-                    self._send_message('log', f"Ошибка верификации в секторе {offset//512}", 'error')
+                    self._send_message('log', f"Неполное чтение в секторе {(offset + n)//512}", 'error')
+                elif not buffers_equal(read_view[:current_chunk_size], expected_view[:current_chunk_size]):
+                    errors += 1
+                    # Точные секторы с остатками данных внутри блока
+                    mismatches = find_mismatched_sectors(expected_view[:current_chunk_size],
+                                                         read_view[:current_chunk_size], offset)
+                    for mismatch in mismatches:
+                        self._add_error({
+                            'offset': mismatch['sector'] * 512,
+                            'sectors': mismatch['count'],
+                            'error': describe_mismatch([mismatch]),
+                            'stage': 'verify'
+                        })
+                    first = mismatches[0]['sector'] if mismatches else offset // 512
+                    self._send_message('log', f"Ошибка верификации в секторе {first}: "
+                                              f"{describe_mismatch(mismatches)}", 'error')
             except OSError as e:
                 errors += 1
                 self._send_message('log', f"Ошибка чтения в секторе {offset//512}: {e}", 'error')
 
+            if self.journal is not None:
+                self.journal.mark_done(('verify',), 0, offset + current_chunk_size)
+            self._report_speed(current_chunk_size, 'read')
+
         if errors == 0:
             self._send_message('log', "Верификация пройдена успешно", 'success')
         else:
             self._send_message('log', f"Верификация завершена с {errors} ошибками", 'warning')
 
+    def _report_speed(self, nbytes: int, phase: str):
+        """Скорость за окно SPEED_INTERVAL: ('speed', MB/s, секунд с начала, фаза) — как у DiskTester"""
+        self._speed_bytes += nbytes
+        now = time.time()
+        elapsed = now - self._speed_start
+        if elapsed < self.SPEED_INTERVAL:
+            return
+        self._send_message('speed', self._speed_bytes / (1024 * 1024) / elapsed, now - self._start_time, phase)
+        self._speed_bytes = 0
+        self._speed_start = now
+
+    def _add_error(self, error: Dict):
+        """Ошибка записи или верификации: в статистику и в журнал контрольных точек"""
+        self.stats['errors'].append(error)
+        if self.journal is not None:
+            self.journal.add_bad_sector(error)
+
+    def _open_journal(self, patterns: List[int]) -> List[int]:
+        """
+        Продолжение по журналу прерванного затирания или новый журнал.
+        Возвращает паттерны проходов: при продолжении — случайные байты из журнала.
+        """
+        resume, self._resume_journal = self._resume_journal, None
+        if not self.app.config.get('wiping', {}).get('checkpoint_journal', True):
+            if resume is not None:
+                resume.close()
+            return patterns
+
+        header = {
+            'engine': 'wipe',
+            'drive_path': self.drive_path,
+            'device': device_identity(self.device_path, self.stats['total_bytes']),
+            'total_bytes': self.stats['total_bytes'],
+            'method': self.method,
+            'passes': self.passes,
+            'verify': self.verify,
+            'patterns': patterns,
+            'created': datetime.now().isoformat(timespec='seconds')
+        }
+        if resume is not None:
+            if resume.matches(header, self.JOURNAL_FIELDS):
+                self.journal = resume
+                patterns = list(resume.header.get('patterns', patterns))
+                for error in resume.bad_sectors:
+                    self.stats['errors'].append(error)
+                    if error.get('stage') == 'write':
+                        self.stats['bad_sectors'] += 1
+                self._send_message('log', f"Продолжение прерванного затирания: выполнено "
+                                          f"{resume.completed_bytes() / (1024**3):.2f} GB", 'info')
+                return patterns
+            resume.close()
+            self._send_message('log', "Журнал не соответствует устройству, затирание начинается заново", 'warning')
+        try:
+            self.journal = CheckpointJournal.create(journal_path('wipe', self.drive_path), header)
+        except OSError as e:
+            self.logger.warning(f"Не удалось создать журнал контрольных точек: {e}")
+        return patterns
+
+    def _resume_chunk(self, journal_key: Tuple, chunk_size: int) -> int:
+        """Номер первого блока прохода, не отмеченного в журнале (проходы идут от начала устройства)"""
+        if self.journal is None:
+            return 0
+        done = self.journal.completed(journal_key)
+        if not done or done[0][0] != 0:
+            return 0
+        return done[0][1] // chunk_size
+
+    def _close_journal(self, completed: bool):
+        """Завершённое затирание удаляет журнал, прерванное — сохраняет его для продолжения"""
+        journal, self.journal = self.journal, None
+        if journal is None:
+            return
+        try:
+            if completed:
+                journal.discard()
+            else:
+                journal.close()
+                self._send_message('log', "Прогресс сохранён: затирание можно продолжить с места остановки", 'info')
+        except OSError as e:
+            self.logger.warning(f"Ошибка записи журнала контрольных точек: {e}")
+
+    def get_resumable_wipe(self, drive_path: str) -> Optional[Dict]:
+        """Сведения о прерванном затирании диска (заголовок журнала и выполненный объём) или None"""
+        journal = CheckpointJournal.load(journal_path('wipe', drive_path))
+        if journal is None:
+            return None
+        completed_bytes = journal.completed_bytes()
+        journal.close()
+        return dict(journal.header, completed_bytes=completed_bytes)
+
+    def _log_partition_table(self, device_path: str):
+        """Журнал разделов, которые будут уничтожены затиранием"""
+        try:
+            table = read_partition_table(device_path)
+        except OSError as e:
+            self.logger.debug(f"Не удалось прочитать таблицу разделов: {e}")
+            return
+        partitions = table['partitions']
+        if not partitions:
+            return
+        self._send_message('log', f"Таблица разделов {table['scheme'].upper()}: {len(partitions)} разделов "
+                                  f"будут уничтожены", 'warning')
+        for partition in partitions:
+            name = f" «{partition['name']}»" if partition.get('name') else ""
+            self._send_message('log', f"  Раздел {partition['index']}{name}: "
+                                      f"{(partition['end'] - partition['start']) / (1024**3):.2f} GB, "
+                                      f"тип {partition['type']}", 'info')
+
     def _send_message(self, msg_type: str, *args):
         """Отправка сообщения в очередь"""
         try:
@@ -12,6 +12,8 @@ from ui.tabs.wipe_tab import WipeTab
 from ui.tabs.results_tab import ResultsTab
 from ui.tabs.info_tab import InfoTab
 from ui.tabs.capacity_tab import CapacityTab
+from ui.tabs.jobs_tab import JobsTab
+from ui.tabs.benchmark_tab import BenchmarkTab
 from ui.widgets.drive_list import DriveListWidget
 from utils.logger import get_logger
 
@@ -199,6 +201,12 @@ class MainWindow:
         self.wipe_tab = WipeTab(self.notebook, self.app)
         self.notebook.add(self.wipe_tab, text=self.app.i18n.get("tab_wipe", "🧹 Затирание"))
 
+        self.jobs_tab = JobsTab(self.notebook, self.app)
+        self.notebook.add(self.jobs_tab, text=self.app.i18n.get("tab_jobs", "🗂 Задания"))
+
+        self.benchmark_tab = BenchmarkTab(self.notebook, self.app)
+        self.notebook.add(self.benchmark_tab, text=self.app.i18n.get("tab_benchmark", "⚡ Бенчмарк"))
+
         self.results_tab = ResultsTab(self.notebook, self.app)
         self.notebook.add(self.results_tab, text=self.app.i18n.get("tab_results", "📊 Результаты"))
 
@@ -233,6 +241,7 @@ class MainWindow:
     def update_drive_list(self, drives):
         """Обновление списка дисков"""
         self.drive_list.update_drives(drives)
+        self.jobs_tab.update_drives(drives)
         self.update_status(f"Найдено дисков: {len(drives)}")
 
     def update_selected_drive(self, drive_info):
@@ -254,6 +263,7 @@ class MainWindow:
             self.capacity_tab.on_drive_selected(drive_info)
             self.format_tab.on_drive_selected(drive_info)
             self.wipe_tab.on_drive_selected(drive_info)
+            self.benchmark_tab.on_drive_selected(drive_info)
             self.results_tab.on_drive_selected(drive_info)
             self.info_tab.on_drive_selected(drive_info)
 
@@ -284,16 +294,22 @@ class MainWindow:
     def update_ui_language(self):
         """Обновление языка интерфейса при смене локализации"""
         # Обновление заголовков вкладок
-        self.notebook.tab(0, text=self.app.i18n.get("tab_test", "🔍 Тестирование"))
-        self.notebook.tab(1, text=self.app.i18n.get("tab_format", "💾 Форматирование"))
-        self.notebook.tab(2, text=self.app.i18n.get("tab_wipe", "🧹 Затирание"))
-        self.notebook.tab(3, text=self.app.i18n.get("tab_results", "📊 Результаты"))
-        self.notebook.tab(4, text=self.app.i18n.get("tab_info", "ℹ️ Информация"))
+        self.notebook.tab(self.test_tab, text=self.app.i18n.get("tab_test", "🔍 Тестирование"))
+        self.notebook.tab(self.capacity_tab, text=self.app.i18n.get("tab_capacity", "📏 Ёмкость"))
+        self.notebook.tab(self.format_tab, text=self.app.i18n.get("tab_format", "💾 Форматирование"))
+        self.notebook.tab(self.wipe_tab, text=self.app.i18n.get("tab_wipe", "🧹 Затирание"))
+        self.notebook.tab(self.jobs_tab, text=self.app.i18n.get("tab_jobs", "🗂 Задания"))
+        self.notebook.tab(self.benchmark_tab, text=self.app.i18n.get("tab_benchmark", "⚡ Бенчмарк"))
+        self.notebook.tab(self.results_tab, text=self.app.i18n.get("tab_results", "📊 Результаты"))
+        self.notebook.tab(self.info_tab, text=self.app.i18n.get("tab_info", "ℹ️ Информация"))
 
         # Обновление содержимого вкладок
         self.test_tab.update_language()
+        self.capacity_tab.update_language()
         self.format_tab.update_language()
         self.wipe_tab.update_language()
+        self.jobs_tab.update_language()
+        self.benchmark_tab.update_language()
         self.results_tab.update_language()
         self.info_tab.update_language()
 
@@ -320,6 +336,8 @@ class MainWindow:
         self.test_tab.update_theme()
         self.format_tab.update_theme()
         self.wipe_tab.update_theme()
+        self.jobs_tab.update_theme()
+        self.benchmark_tab.update_theme()
         self.results_tab.update_theme()
         self.info_tab.update_theme()
 
@@ -350,9 +368,9 @@ class MainWindow:
             )
             return
 
-        # Переключение на вкладку тестирования и запуск бенчмарка
-        self.notebook.select(0)
-        self.test_tab.run_benchmark()
+        # Переключение на вкладку бенчмарка и запуск замеров на выбранном диске
+        self.notebook.select(self.benchmark_tab)
+        self.benchmark_tab.start_benchmark()
 
     def _show_error_log(self):
         """Отображение журнала ошибок в отдельном окне"""
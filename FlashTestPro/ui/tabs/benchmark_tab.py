@@ -0,0 +1,307 @@
+"""
+Вкладка бенчмарка: последовательная скорость, IOPS случайного доступа 4K на QD1/QD32
+и серия замеров по размеру блока; по запросу — проверка классов скорости SD
+"""
+import json
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+from datetime import datetime
+
+
+class BenchmarkTab(ttk.Frame):
+    COLUMNS = ('test', 'block', 'qd', 'iops', 'speed', 'p99')
+    COLUMN_DEFAULTS = {
+        'test': "Замер",
+        'block': "Блок",
+        'qd': "QD",
+        'iops': "IOPS",
+        'speed': "Скорость",
+        'p99': "p99, мс"
+    }
+    STEP_DEFAULTS = {
+        'seq_write': "Последовательная запись",
+        'seq_read': "Последовательное чтение",
+        'write': "Случайная запись",
+        'read': "Случайное чтение",
+        'sustained_write': "Устойчивая запись (AU)"
+    }
+    COMPLIANCE_COLUMNS = ('class', 'required', 'measured', 'result')
+    COMPLIANCE_DEFAULTS = {
+        'class': "Класс",
+        'required': "Требуется",
+        'measured': "Измерено",
+        'result': "Результат"
+    }
+
+    def __init__(self, parent, app):
+        super().__init__(parent)
+        self.app = app
+        self.current_drive = None
+        self.results = None
+        self.create_widgets()
+        self.after(100, self.process_messages)
+
+    def create_widgets(self):
+        main_frame = ttk.Frame(self)
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        # Настройки
+        self.settings_frame = ttk.LabelFrame(main_frame, text=self.app.i18n.get("benchmark_settings", "Настройки бенчмарка"))
+        self.settings_frame.pack(fill=tk.X, pady=(0, 10))
+
+        config = self.app.config.get('benchmark', {})
+        self.mode_var = tk.StringVar(value='free')
+        self.mode_free_rb = ttk.Radiobutton(self.settings_frame, variable=self.mode_var, value='free',
+                                            text=self.app.i18n.get("benchmark_mode_free", "Временный файл (без потери данных)"))
+        self.mode_free_rb.grid(row=0, column=0, columnspan=2, sticky=tk.W, padx=5, pady=2)
+        self.mode_full_rb = ttk.Radiobutton(self.settings_frame, variable=self.mode_var, value='full',
+                                            text=self.app.i18n.get("benchmark_mode_full", "Устройство (данные будут уничтожены)"))
+        self.mode_full_rb.grid(row=1, column=0, columnspan=2, sticky=tk.W, padx=5, pady=2)
+
+        self.size_label = ttk.Label(self.settings_frame, text=self.app.i18n.get("benchmark_size", "Область теста, MB:"))
+        self.size_label.grid(row=0, column=2, sticky=tk.W, padx=5)
+        self.size_var = tk.IntVar(value=config.get('size_mb', 1024))
+        ttk.Spinbox(self.settings_frame, from_=64, to=65536, increment=64, textvariable=self.size_var,
+                    width=8).grid(row=0, column=3, padx=5)
+
+        self.duration_label = ttk.Label(self.settings_frame, text=self.app.i18n.get("benchmark_duration", "Длительность замера, с:"))
+        self.duration_label.grid(row=1, column=2, sticky=tk.W, padx=5)
+        self.duration_var = tk.DoubleVar(value=config.get('duration', 3.0))
+        ttk.Spinbox(self.settings_frame, from_=1, to=60, increment=1, textvariable=self.duration_var,
+                    width=8).grid(row=1, column=3, padx=5)
+
+        self.compliance_var = tk.BooleanVar(value=False)
+        self.compliance_cb = ttk.Checkbutton(self.settings_frame, variable=self.compliance_var,
+                                             text=self.app.i18n.get("benchmark_compliance",
+                                                                    "Проверка классов скорости SD (C/U/V/A)"))
+        self.compliance_cb.grid(row=2, column=0, columnspan=2, sticky=tk.W, padx=5, pady=2)
+        self.claim_label = ttk.Label(self.settings_frame, text=self.app.i18n.get("benchmark_claim", "Заявленные классы:"))
+        self.claim_label.grid(row=2, column=2, sticky=tk.W, padx=5)
+        self.claim_var = tk.StringVar(value="")
+        ttk.Entry(self.settings_frame, textvariable=self.claim_var, width=16).grid(row=2, column=3, padx=5)
+
+        # Кнопки
+        buttons_frame = ttk.Frame(main_frame)
+        buttons_frame.pack(fill=tk.X, pady=(0, 10))
+
+        self.start_btn = ttk.Button(buttons_frame, text=self.app.i18n.get("benchmark_start", "▶ Запустить бенчмарк"),
+                                    command=self.start_benchmark, state=tk.DISABLED)
+        self.start_btn.pack(side=tk.LEFT, padx=5)
+        self.stop_btn = ttk.Button(buttons_frame, text=self.app.i18n.get("stop", "⏹ Стоп"),
+                                   command=self.stop_benchmark, state=tk.DISABLED)
+        self.stop_btn.pack(side=tk.LEFT, padx=5)
+        self.save_btn = ttk.Button(buttons_frame, text=self.app.i18n.get("benchmark_save", "💾 Сохранить JSON"),
+                                   command=self.save_results, state=tk.DISABLED)
+        self.save_btn.pack(side=tk.LEFT, padx=5)
+
+        self.progress_bar = ttk.Progressbar(buttons_frame, mode='determinate', length=200)
+        self.progress_bar.pack(side=tk.RIGHT, padx=5)
+
+        # Результаты
+        self.results_frame = ttk.LabelFrame(main_frame, text=self.app.i18n.get("benchmark_results", "Результаты"))
+        self.results_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
+
+        self.results_tree = ttk.Treeview(self.results_frame, columns=self.COLUMNS, show='headings', height=10)
+        for column in self.COLUMNS:
+            self.results_tree.column(column, width=180 if column == 'test' else 80)
+        self._update_headings()
+        self.results_tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        # Соответствие классам скорости
+        self.compliance_frame = ttk.LabelFrame(main_frame, text=self.app.i18n.get("compliance_results",
+                                                                                  "Соответствие классам скорости"))
+        self.compliance_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
+
+        self.compliance_tree = ttk.Treeview(self.compliance_frame, columns=self.COMPLIANCE_COLUMNS,
+                                            show='headings', height=6)
+        for column in self.COMPLIANCE_COLUMNS:
+            self.compliance_tree.column(column, width=80 if column == 'class' else 200)
+        self.compliance_tree.tag_configure('failed', foreground='red')
+        self.compliance_tree.tag_configure('passed', foreground='green')
+        self.compliance_tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=(5, 0))
+        self.worst_label = ttk.Label(self.compliance_frame, text="")
+        self.worst_label.pack(anchor=tk.W, padx=5, pady=(0, 5))
+
+        # Лог
+        self.log_frame = ttk.LabelFrame(main_frame, text=self.app.i18n.get("log", "Лог"))
+        self.log_frame.pack(fill=tk.BOTH, expand=True)
+
+        self.log_text = tk.Text(self.log_frame, wrap=tk.WORD, height=6, state=tk.DISABLED)
+        self.log_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+    def _update_headings(self):
+        for column in self.COLUMNS:
+            self.results_tree.heading(column, text=self.app.i18n.get(f"benchmark_col_{column}",
+                                                                     self.COLUMN_DEFAULTS[column]))
+        for column in self.COMPLIANCE_COLUMNS:
+            self.compliance_tree.heading(column, text=self.app.i18n.get(f"compliance_col_{column}",
+                                                                        self.COMPLIANCE_DEFAULTS[column]))
+
+    def on_drive_selected(self, drive_info):
+        self.current_drive = drive_info
+        if drive_info and not drive_info.get('is_system', False) and not self.app.benchmark.is_running():
+            self.start_btn.config(state=tk.NORMAL)
+        else:
+            self.start_btn.config(state=tk.DISABLED)
+
+    def start_benchmark(self):
+        if not self.current_drive or self.app.benchmark.is_running():
+            return
+        mode = self.mode_var.get()
+        if mode == 'full' and not messagebox.askyesno(
+            self.app.i18n.get("confirm", "Подтверждение"),
+            self.app.i18n.get("confirm_benchmark_full",
+                              "Данные в начале диска будут уничтожены!\nПродолжить?")
+        ):
+            return
+        self.results = None
+        self.results_tree.delete(*self.results_tree.get_children())
+        self.compliance_tree.delete(*self.compliance_tree.get_children())
+        self.worst_label.config(text="")
+        self.progress_bar['value'] = 0
+        self.save_btn.config(state=tk.DISABLED)
+        self.start_btn.config(state=tk.DISABLED)
+        self.stop_btn.config(state=tk.NORMAL)
+        self.app.benchmark.start_test(self.current_drive['path'], {
+            'mode': mode,
+            'size_mb': self.size_var.get(),
+            'duration': self.duration_var.get(),
+            'compliance': self.compliance_var.get(),
+            'claim': [name.strip() for name in self.claim_var.get().split(',') if name.strip()]
+        })
+        self._log(self.app.i18n.get("benchmark_started", "Запуск бенчмарка..."))
+
+    def stop_benchmark(self):
+        self.app.benchmark.stop()
+
+    def process_messages(self):
+        engine = getattr(self.app, 'benchmark', None)
+        msg = engine.get_message() if engine is not None else None
+        while msg:
+            msg_type = msg[0]
+            if msg_type == "log":
+                self._log(msg[1], msg[2] if len(msg) > 2 else "info")
+            elif msg_type == "progress":
+                self.progress_bar['value'] = msg[1]
+            elif msg_type == "benchmark_step":
+                self._add_step(msg[1])
+            elif msg_type == "result":
+                self.results = msg[1]
+                self.save_btn.config(state=tk.NORMAL)
+                self._show_compliance(self.results.get('compliance'))
+            elif msg_type in ("complete", "error"):
+                self._log(msg[1], "success" if msg_type == "complete" else "error")
+                self.stop_btn.config(state=tk.DISABLED)
+                # Поток ещё завершается: кнопка запуска включается после остановки движка
+                self.after(500, lambda: self.on_drive_selected(self.current_drive))
+            elif msg_type == "unmount_notice":
+                self._log(self.app.i18n.get("unmount_notice_message", "Диск {} был размонтирован.").format(msg[1]), "warning")
+            msg = engine.get_message()
+        self.after(100, self.process_messages)
+
+    def _add_step(self, step):
+        name = self.app.i18n.get(f"benchmark_{step['op']}", self.STEP_DEFAULTS[step['op']])
+        block = step['block_size']
+        block_text = f"{block // (1024 * 1024)}M" if block >= 1024 * 1024 else f"{block // 1024}K"
+        latency = step.get('latency')
+        self.results_tree.insert('', tk.END, values=(
+            name,
+            block_text,
+            step['queue_depth'],
+            f"{step['iops']:.0f}" if 'iops' in step else "---",
+            f"{step['mbps']:.1f} MB/s",
+            f"{latency['p99_ms']:.2f}" if latency else "---"
+        ))
+
+    @staticmethod
+    def _format_values(values):
+        parts = []
+        for key, value in values.items():
+            if value is None:
+                parts.append("—")
+            elif key == 'write_mbps':
+                parts.append(f"{value:.1f} MB/s")
+            else:
+                parts.append(f"{value:.0f} {'R' if key == 'read_iops' else 'W'} IOPS")
+        return ", ".join(parts)
+
+    def _show_compliance(self, compliance):
+        if not compliance or not compliance.get('classes'):
+            return
+        i = self.app.i18n
+        for item in compliance['classes']:
+            if item['passed'] is None:
+                result, tags = i.get("compliance_na", "— нет замера"), ()
+            elif item['passed']:
+                result, tags = i.get("compliance_pass", "✅ Соответствует"), ('passed',)
+            else:
+                result, tags = i.get("compliance_fail", "❌ Не соответствует"), ('failed',)
+            self.compliance_tree.insert('', tk.END, tags=tags, values=(
+                item['class'],
+                self._format_values(item['required']),
+                self._format_values(item['measured']),
+                result
+            ))
+        worst = compliance.get('worst_window')
+        lines = []
+        if worst:
+            lines.append(i.get("compliance_worst", "Худшее окно {:.0f} с: {:.1f} MB/s на {:.1f} с (смещение {} MB)").format(
+                compliance['window'], worst['mbps'], worst['start'], worst['offset'] // (1024 * 1024)))
+        if compliance.get('claimed_pass') is not None:
+            claim_key = "compliance_claimed_pass" if compliance['claimed_pass'] else "compliance_claimed_fail"
+            claim_text = i.get(claim_key, "Заявленные классы подтверждены" if compliance['claimed_pass']
+                               else "Заявленные классы НЕ подтверждены")
+            lines.append(f"{claim_text}: {', '.join(compliance['claimed'])}")
+        self.worst_label.config(text="\n".join(lines))
+
+    def save_results(self):
+        if not self.results:
+            return
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("JSON", "*.json")],
+            initialfile=f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        )
+        if not filename:
+            return
+        try:
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(self.results, f, ensure_ascii=False, indent=2)
+            self._log(self.app.i18n.get("benchmark_saved", "Результаты сохранены: {}").format(filename), "success")
+        except OSError as e:
+            messagebox.showerror(self.app.i18n.get("error", "Ошибка"), str(e))
+
+    def _log(self, message, level="info"):
+        self.log_text.config(state=tk.NORMAL)
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        self.log_text.insert(tk.END, f"[{timestamp}] {message}\n")
+        if level in ("error", "success", "warning"):
+            self.log_text.tag_add(level, "end-2l", "end-1l")
+            self.log_text.tag_config(level, foreground={"error": "red", "success": "green",
+                                                        "warning": "orange"}[level])
+        self.log_text.see(tk.END)
+        self.log_text.config(state=tk.DISABLED)
+
+    def update_language(self):
+        i = self.app.i18n
+        self.settings_frame.config(text=i.get("benchmark_settings", "Настройки бенчмарка"))
+        self.mode_free_rb.config(text=i.get("benchmark_mode_free", "Временный файл (без потери данных)"))
+        self.mode_full_rb.config(text=i.get("benchmark_mode_full", "Устройство (данные будут уничтожены)"))
+        self.size_label.config(text=i.get("benchmark_size", "Область теста, MB:"))
+        self.duration_label.config(text=i.get("benchmark_duration", "Длительность замера, с:"))
+        self.compliance_cb.config(text=i.get("benchmark_compliance", "Проверка классов скорости SD (C/U/V/A)"))
+        self.claim_label.config(text=i.get("benchmark_claim", "Заявленные классы:"))
+        self.compliance_frame.config(text=i.get("compliance_results", "Соответствие классам скорости"))
+        self.start_btn.config(text=i.get("benchmark_start", "▶ Запустить бенчмарк"))
+        self.stop_btn.config(text=i.get("stop", "⏹ Стоп"))
+        self.save_btn.config(text=i.get("benchmark_save", "💾 Сохранить JSON"))
+        self.results_frame.config(text=i.get("benchmark_results", "Результаты"))
+        self.log_frame.config(text=i.get("log", "Лог"))
+        self._update_headings()
+
+    def update_theme(self):
+        colors = self.app.theme_manager.colors
+        self.log_text.config(
+            bg=colors.get("entry_bg", "#ffffff"),
+            fg=colors.get("entry_fg", "#000000")
+        )
@@ -1,6 +1,7 @@
 """
 Вкладка проверки реальной ёмкости диска
 """
+import os
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
@@ -17,14 +18,26 @@ class CapacityTab(ttk.Frame):
         main_frame = ttk.Frame(self)
         main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
-        # Кнопка запуска
+        # Кнопки запуска
+        buttons_frame = ttk.Frame(main_frame)
+        buttons_frame.pack(pady=10)
+
         self.start_btn = ttk.Button(
-            main_frame,
+            buttons_frame,
             text=self.app.i18n.get("start_capacity_test", "📏 Проверить ёмкость"),
             command=self.start_test,
             state=tk.DISABLED
         )
-        self.start_btn.pack(pady=10)
+        self.start_btn.pack(side=tk.LEFT, padx=5)
+
+        # Проверка без прямого доступа: заполнение свободного места файлами
+        self.fill_btn = ttk.Button(
+            buttons_frame,
+            text=self.app.i18n.get("start_fill_test", "📁 Заполнить свободное место"),
+            command=self.start_fill_test,
+            state=tk.DISABLED
+        )
+        self.fill_btn.pack(side=tk.LEFT, padx=5)
 
         # Прогресс
         self.progress_frame = ttk.LabelFrame(main_frame, text=self.app.i18n.get("progress", "Прогресс"))
@@ -49,6 +62,11 @@ class CapacityTab(ttk.Frame):
             self.start_btn.config(state=tk.NORMAL)
         else:
             self.start_btn.config(state=tk.DISABLED)
+        # Заполнение работает только со смонтированным томом и не разрушает данные
+        if drive_info and os.path.isdir(drive_info['path']):
+            self.fill_btn.config(state=tk.NORMAL)
+        else:
+            self.fill_btn.config(state=tk.DISABLED)
 
     def start_test(self):
         if not self.current_drive:
@@ -65,32 +83,54 @@ class CapacityTab(ttk.Frame):
             self.app.capacity_tester.start_test(self.current_drive['path'])
             self._log(self.app.i18n.get("capacity_test_started", "Запуск проверки ёмкости..."))
 
+    def start_fill_test(self):
+        if not self.current_drive:
+            return
+        if messagebox.askyesno(
+            self.app.i18n.get("confirm", "Подтверждение"),
+            self.app.i18n.get("confirm_fill_test",
+                             "Свободное место диска будет заполнено проверочными файлами, "
+                             "затем файлы будут прочитаны и удалены.\nСуществующие данные не затрагиваются. Продолжить?")
+        ):
+            self.progress_bar['value'] = 0
+            self.progress_label.config(text="0%")
+            self._clear_log()
+            self.start_btn.config(state=tk.DISABLED)
+            self.fill_btn.config(state=tk.DISABLED)
+            writers = self.app.config.get('testing', {}).get('fill_writers', 1)
+            self.app.fill_tester.start_test(self.current_drive['path'], {'writers': writers})
+            self._log(self.app.i18n.get("fill_test_started", "Запуск проверки заполнением свободного места..."))
+
     def process_messages(self):
-        if hasattr(self.app, 'capacity_tester'):
-            msg = self.app.capacity_tester.get_message()
-            while msg:
-                msg_type = msg[0]
-                if msg_type == "log":
-                    self._log(msg[1], msg[2] if len(msg) > 2 else "info")
-                elif msg_type == "progress":
-                    self.progress_bar['value'] = msg[1]
-                    self.progress_label.config(text=f"{msg[1]:.1f}%")
-                elif msg_type == "result":
-                    result = msg[1]
-                    self._log(f"Заявлено: {result['claimed']:.2f} GB", "info")
-                    self._log(f"Реально: {result['real']:.2f} GB", "info")
-                    self._log(f"Статус: {result['status']}", "success" if "✅" in result['status'] else "error")
-                elif msg_type == "complete":
-                    self._log(msg[1], "success")
-                    self.start_btn.config(state=tk.NORMAL)
-                elif msg_type == "error":
-                    self._log(f"Ошибка: {msg[1]}", "error")
-                    self.start_btn.config(state=tk.NORMAL)
-                elif msg_type == "unmount_notice":
-                    self._log(self.app.i18n.get("unmount_notice_message", "Диск {} был размонтирован.").format(msg[1]), "warning")
-                msg = self.app.capacity_tester.get_message()
+        for tester in (getattr(self.app, 'capacity_tester', None), getattr(self.app, 'fill_tester', None)):
+            if tester is not None:
+                self._process_tester_messages(tester)
         self.after(100, self.process_messages)
 
+    def _process_tester_messages(self, tester):
+        msg = tester.get_message()
+        while msg:
+            msg_type = msg[0]
+            if msg_type == "log":
+                self._log(msg[1], msg[2] if len(msg) > 2 else "info")
+            elif msg_type == "progress":
+                self.progress_bar['value'] = msg[1]
+                self.progress_label.config(text=f"{msg[1]:.1f}%")
+            elif msg_type == "result":
+                result = msg[1]
+                self._log(f"Заявлено: {result['claimed']:.2f} GB", "info")
+                self._log(f"Реально: {result['real']:.2f} GB", "info")
+                self._log(f"Статус: {result['status']}", "success" if "✅" in result['status'] else "error")
+            elif msg_type == "complete":
+                self._log(msg[1], "success")
+                self.on_drive_selected(self.current_drive)
+            elif msg_type == "error":
+                self._log(f"Ошибка: {msg[1]}", "error")
+                self.on_drive_selected(self.current_drive)
+            elif msg_type == "unmount_notice":
+                self._log(self.app.i18n.get("unmount_notice_message", "Диск {} был размонтирован.").format(msg[1]), "warning")
+            msg = tester.get_message()
+
     def _log(self, message, level="info"):
         self.log_text.config(state=tk.NORMAL)
         timestamp = datetime.now().strftime("%H:%M:%S")
@@ -115,6 +155,7 @@ class CapacityTab(ttk.Frame):
 
     def update_language(self):
         self.start_btn.config(text=self.app.i18n.get("start_capacity_test", "📏 Проверить ёмкость"))
+        self.fill_btn.config(text=self.app.i18n.get("start_fill_test", "📁 Заполнить свободное место"))
         self.progress_frame.config(text=self.app.i18n.get("progress", "Прогресс"))
         self.log_frame.config(text=self.app.i18n.get("log", "Лог"))
 
@@ -0,0 +1,275 @@
+"""
+Вкладка параллельных заданий: тест, затирание, проверка ёмкости и заполнение
+на нескольких дисках одновременно с таблицей состояния по устройствам
+"""
+import tkinter as tk
+from tkinter import ttk, messagebox
+from datetime import datetime
+
+from core.jobs import DESTRUCTIVE_KINDS
+
+
+class JobsTab(ttk.Frame):
+    # Вид задания в списке -> (тип задания JobManager, режим теста)
+    JOB_CHOICES = {
+        "job_kind_test_free": ('test', 'free'),
+        "job_kind_test_full": ('test', 'full'),
+        "job_kind_wipe": ('wipe', None),
+        "job_kind_capacity": ('capacity', None),
+        "job_kind_fill": ('fill', None)
+    }
+    JOB_CHOICE_DEFAULTS = {
+        "job_kind_test_free": "🔍 Тест свободного места",
+        "job_kind_test_full": "🔍 Полный тест",
+        "job_kind_wipe": "🧹 Затирание",
+        "job_kind_capacity": "📏 Проверка ёмкости",
+        "job_kind_fill": "📁 Заполнение свободного места"
+    }
+    STATUS_DEFAULTS = {
+        'queued': "В очереди",
+        'running': "Выполняется",
+        'passed': "✅ Успешно",
+        'defects': "⚠️ Дефекты",
+        'failed': "❌ Ошибка",
+        'stopped': "⏹ Остановлено"
+    }
+    COLUMNS = ('drive', 'job', 'status', 'progress', 'speed', 'elapsed')
+    COLUMN_DEFAULTS = {
+        'drive': "Диск",
+        'job': "Задание",
+        'status': "Состояние",
+        'progress': "Прогресс",
+        'speed': "Скорость",
+        'elapsed': "Время"
+    }
+
+    def __init__(self, parent, app):
+        super().__init__(parent)
+        self.app = app
+        self.drives = []
+        self.choice_ids = list(self.JOB_CHOICES.keys())
+        self.create_widgets()
+        self.after(200, self.process_messages)
+
+    def create_widgets(self):
+        main_frame = ttk.Frame(self)
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        # Выбор дисков: несколько строк через Ctrl/Shift
+        self.drives_frame = ttk.LabelFrame(main_frame, text=self.app.i18n.get("jobs_drives", "Диски (Ctrl/Shift — несколько)"))
+        self.drives_frame.pack(fill=tk.X, pady=(0, 10))
+
+        self.drives_tree = ttk.Treeview(self.drives_frame, columns=('size', 'fs'), height=5, selectmode='extended')
+        self.drives_tree.column('#0', width=200)
+        self.drives_tree.column('size', width=100)
+        self.drives_tree.column('fs', width=80)
+        self.drives_tree.pack(fill=tk.X, padx=5, pady=5)
+
+        # Вид задания и кнопки
+        controls = ttk.Frame(main_frame)
+        controls.pack(fill=tk.X, pady=(0, 10))
+
+        self.kind_combo = ttk.Combobox(controls, values=self._get_localized_choices(), state="readonly", width=30)
+        self.kind_combo.current(0)
+        self.kind_combo.pack(side=tk.LEFT)
+
+        self.start_btn = ttk.Button(controls, text=self.app.i18n.get("jobs_start", "▶ Запустить на выбранных"),
+                                    command=self.start_jobs)
+        self.start_btn.pack(side=tk.LEFT, padx=5)
+
+        self.stop_btn = ttk.Button(controls, text=self.app.i18n.get("jobs_stop_selected", "⏹ Остановить выбранные"),
+                                   command=self.stop_selected)
+        self.stop_btn.pack(side=tk.LEFT, padx=5)
+
+        self.stop_all_btn = ttk.Button(controls, text=self.app.i18n.get("jobs_stop_all", "⏹ Остановить все"),
+                                       command=self.stop_all)
+        self.stop_all_btn.pack(side=tk.LEFT, padx=5)
+
+        self.clear_btn = ttk.Button(controls, text=self.app.i18n.get("jobs_clear", "🗑 Убрать завершённые"),
+                                    command=self.clear_finished)
+        self.clear_btn.pack(side=tk.LEFT, padx=5)
+
+        # Таблица состояния по устройствам
+        self.grid_frame = ttk.LabelFrame(main_frame, text=self.app.i18n.get("jobs_grid", "Задания"))
+        self.grid_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
+
+        self.jobs_tree = ttk.Treeview(self.grid_frame, columns=self.COLUMNS, show='headings', height=8)
+        for column in self.COLUMNS:
+            self.jobs_tree.column(column, width=150 if column == 'drive' else 90)
+        self._update_headings()
+        self.jobs_tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        self.summary_label = ttk.Label(self.grid_frame, text="")
+        self.summary_label.pack(anchor=tk.W, padx=5, pady=(0, 5))
+
+        # Лог всех заданий
+        self.log_frame = ttk.LabelFrame(main_frame, text=self.app.i18n.get("log", "Лог"))
+        self.log_frame.pack(fill=tk.BOTH, expand=True)
+
+        self.log_text = tk.Text(self.log_frame, wrap=tk.WORD, height=8, state=tk.DISABLED)
+        self.log_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+    def _get_localized_choices(self):
+        return [self.app.i18n.get(choice, self.JOB_CHOICE_DEFAULTS[choice]) for choice in self.choice_ids]
+
+    def _update_headings(self):
+        for column in self.COLUMNS:
+            self.jobs_tree.heading(column, text=self.app.i18n.get(f"jobs_col_{column}", self.COLUMN_DEFAULTS[column]))
+        self.drives_tree.heading('#0', text=self.app.i18n.get("jobs_col_drive", "Диск"))
+        self.drives_tree.heading('size', text=self.app.i18n.get("total_size", "Общий размер"))
+        self.drives_tree.heading('fs', text=self.app.i18n.get("filesystem", "ФС"))
+
+    def update_drives(self, drives):
+        """Список дисков для выбора (системные исключены)"""
+        self.drives = [drive for drive in drives if not drive.get('is_system', False)]
+        selected = set(self.drives_tree.selection())
+        self.drives_tree.delete(*self.drives_tree.get_children())
+        for drive in self.drives:
+            self.drives_tree.insert('', tk.END, iid=drive['path'], text=drive['path'],
+                                    values=(drive.get('total_size', ''), drive.get('fs', '')))
+        keep = [path for path in selected if self.drives_tree.exists(path)]
+        if keep:
+            self.drives_tree.selection_set(keep)
+
+    def on_drive_selected(self, drive_info):
+        pass
+
+    def _job_params(self, kind, mode):
+        """Параметры задания по умолчанию из конфигурации (как у соответствующих вкладок)"""
+        if kind == 'test':
+            testing = self.app.config.get('testing', {})
+            patterns = testing.get('patterns', ['ones', 'zeros', 'random'])
+            return {
+                'passes': testing.get('default_passes', 1),
+                'test_ones': 'ones' in patterns,
+                'test_zeros': 'zeros' in patterns,
+                'test_random': 'random' in patterns,
+                'test_verify': testing.get('verify_read', True),
+                'auto_format': False,
+                'mode': mode,
+                'filesystem': 'FAT32',
+                'chunk_size_mb': testing.get('chunk_size_mb', 32),
+                'adaptive_chunk': testing.get('adaptive_chunk', True),
+                'parallel_testing': False,
+                'num_threads': 1,
+                'quick_test': False,
+                'two_phase': testing.get('two_phase', False)
+            }
+        if kind == 'wipe':
+            wiping = self.app.config.get('wiping', {})
+            return {'method': wiping.get('default_method', 'dod'), 'passes': wiping.get('default_passes', 3),
+                    'verify': wiping.get('verify_after_wipe', True)}
+        if kind == 'fill':
+            return {'writers': self.app.config.get('testing', {}).get('fill_writers', 1)}
+        return {}
+
+    def start_jobs(self):
+        paths = list(self.drives_tree.selection())
+        if not paths:
+            messagebox.showwarning(self.app.i18n.get("warning", "Предупреждение"),
+                                   self.app.i18n.get("jobs_select_drives", "Выберите диски в списке"))
+            return
+        kind, mode = self.JOB_CHOICES[self.choice_ids[self.kind_combo.current()]]
+        if kind in DESTRUCTIVE_KINDS or mode == 'full':
+            if not messagebox.askyesno(
+                self.app.i18n.get("confirm", "Подтверждение"),
+                self.app.i18n.get("confirm_jobs_destructive",
+                                  "Все данные на дисках ({}) будут уничтожены!\nПродолжить?").format(", ".join(paths))
+            ):
+                return
+        params = self._job_params(kind, mode)
+        for path in paths:
+            try:
+                self.app.job_manager.submit(kind, path, params)
+            except ValueError as e:
+                self._log(str(e), "error")
+        self._refresh_grid()
+
+    def stop_selected(self):
+        for item in self.jobs_tree.selection():
+            self.app.job_manager.stop(int(item))
+
+    def stop_all(self):
+        if self.app.job_manager.is_active() and messagebox.askyesno(
+            self.app.i18n.get("confirm", "Подтверждение"),
+            self.app.i18n.get("jobs_confirm_stop_all", "Остановить все задания?")
+        ):
+            self.app.job_manager.stop()
+
+    def clear_finished(self):
+        self.app.job_manager.clear_finished()
+        self._refresh_grid()
+
+    def process_messages(self):
+        if hasattr(self.app, 'job_manager'):
+            for job, msg in self.app.job_manager.poll():
+                if msg[0] == 'log' and msg[2:3] in (('error',), ('success',)):
+                    self._log(f"{job.drive_path}: {msg[1]}", msg[2])
+                elif msg[0] == 'error':
+                    self._log(f"{job.drive_path}: {msg[1]}", "error")
+                elif msg[0] == 'complete':
+                    self._log(f"{job.drive_path}: {msg[1]}", "success")
+            self._refresh_grid()
+        self.after(200, self.process_messages)
+
+    def _refresh_grid(self):
+        """Таблица состояния по устройствам и суммарная скорость"""
+        manager = self.app.job_manager
+        jobs = manager.jobs()
+        ids = {str(job.id) for job in jobs}
+        for item in self.jobs_tree.get_children():
+            if item not in ids:
+                self.jobs_tree.delete(item)
+        kind_names = {kind: self.app.i18n.get(choice, self.JOB_CHOICE_DEFAULTS[choice])
+                      for choice, (kind, mode) in self.JOB_CHOICES.items() if mode != 'full'}
+        for job in jobs:
+            info = job.snapshot()
+            elapsed = int(info['elapsed'])
+            values = (
+                info['drive_path'],
+                kind_names.get(info['kind'], info['kind']),
+                self.app.i18n.get(f"job_status_{info['status']}", self.STATUS_DEFAULTS[info['status']]),
+                f"{info['progress']:.1f}%",
+                f"{info['speed']:.1f} MB/s" if info['speed'] else "---",
+                f"{elapsed // 3600:02d}:{elapsed % 3600 // 60:02d}:{elapsed % 60:02d}"
+            )
+            if self.jobs_tree.exists(str(job.id)):
+                self.jobs_tree.item(str(job.id), values=values)
+            else:
+                self.jobs_tree.insert('', tk.END, iid=str(job.id), values=values)
+
+        summary = manager.aggregate()
+        self.summary_label.config(text=self.app.i18n.get(
+            "jobs_summary", "Выполняется: {0}, в очереди: {1}, суммарная скорость: {2:.1f} MB/s"
+        ).format(summary['running'], summary['queued'], summary['throughput']))
+
+    def _log(self, message, level="info"):
+        self.log_text.config(state=tk.NORMAL)
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        self.log_text.insert(tk.END, f"[{timestamp}] {message}\n")
+        if level in ("error", "success"):
+            self.log_text.tag_add(level, "end-2l", "end-1l")
+            self.log_text.tag_config(level, foreground="red" if level == "error" else "green")
+        self.log_text.see(tk.END)
+        self.log_text.config(state=tk.DISABLED)
+
+    def update_language(self):
+        self.drives_frame.config(text=self.app.i18n.get("jobs_drives", "Диски (Ctrl/Shift — несколько)"))
+        self.grid_frame.config(text=self.app.i18n.get("jobs_grid", "Задания"))
+        self.log_frame.config(text=self.app.i18n.get("log", "Лог"))
+        self.start_btn.config(text=self.app.i18n.get("jobs_start", "▶ Запустить на выбранных"))
+        self.stop_btn.config(text=self.app.i18n.get("jobs_stop_selected", "⏹ Остановить выбранные"))
+        self.stop_all_btn.config(text=self.app.i18n.get("jobs_stop_all", "⏹ Остановить все"))
+        self.clear_btn.config(text=self.app.i18n.get("jobs_clear", "🗑 Убрать завершённые"))
+        current = self.kind_combo.current()
+        self.kind_combo['values'] = self._get_localized_choices()
+        self.kind_combo.current(current)
+        self._update_headings()
+        self._refresh_grid()
+
+    def update_theme(self):
+        colors = self.app.theme_manager.colors
+        self.log_text.config(
+            bg=colors.get("entry_bg", "#ffffff"),
+            fg=colors.get("entry_fg", "#000000")
+        )
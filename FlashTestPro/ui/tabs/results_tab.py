@@ -9,6 +9,10 @@ import base64
 from datetime import datetime
 
 import matplotlib.pyplot as plt
+import numpy as np
+
+from core.heatmap import grid_shape
+from ui.widgets.heatmap_widget import HeatMapWidget
 
 class ResultsTab(ttk.Frame):
     """Вкладка результатов"""
@@ -69,6 +73,12 @@ class ResultsTab(ttk.Frame):
         self.notebook.add(self.bad_sectors_tab, text=self.app.i18n.get("bad_sectors", "Битые сектора"))
         self._create_bad_sectors_tab()
 
+        # Вкладка с тепловой картой по LBA
+        self.heatmap_tab = ttk.Frame(self.notebook)
+        self.notebook.add(self.heatmap_tab, text=self.app.i18n.get("heatmap", "Карта скорости"))
+        self.heatmap_widget = HeatMapWidget(self.heatmap_tab, self.app)
+        self.heatmap_widget.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
         # Вкладка с детальным отчетом
         self.detail_tab = ttk.Frame(self.notebook)
         self.notebook.add(self.detail_tab, text=self.app.i18n.get("detailed", "Детальный отчет"))
@@ -89,9 +99,12 @@ class ResultsTab(ttk.Frame):
             ("mode", "test_mode"),
             ("total_size", "total_size"),
             ("tested", "tested"),
+            ("resumed", "resumed_bytes"),
             ("avg_speed", "avg_speed"),
             ("max_speed", "max_speed"),
             ("min_speed", "min_speed"),
+            ("write_speed", "write_speed"),
+            ("read_speed", "read_speed"),
             ("test_time", "test_time"),
             ("bad_sectors", "bad_sectors"),
             ("passes", "passes"),
@@ -143,6 +156,15 @@ class ResultsTab(ttk.Frame):
         self.bad_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
+    @staticmethod
+    def _format_sector_range(bad_sector) -> str:
+        """Номер сектора или диапазон «начало–конец» для записей из нескольких секторов"""
+        sector = bad_sector.get('sector', '')
+        count = bad_sector.get('count', 1)
+        if count > 1:
+            return f"{sector}–{bad_sector.get('end_sector', sector + count - 1)}"
+        return str(sector)
+
     def _create_detail_tab(self):
         """Создание вкладки с детальным отчетом"""
         frame = ttk.Frame(self.detail_tab)
@@ -172,9 +194,15 @@ class ResultsTab(ttk.Frame):
             self.summary_labels["mode"].config(text=mode_text)
             self.summary_labels["total_size"].config(text=f"{stats.get('total_size', 0):.2f} GB")
             self.summary_labels["tested"].config(text=f"{stats.get('tested', 0):.2f} GB")
+            resumed = stats.get('resumed_bytes', 0)
+            self.summary_labels["resumed"].config(text=f"{resumed / (1024**3):.2f} GB" if resumed else "---")
             self.summary_labels["avg_speed"].config(text=f"{stats.get('avg_speed', 0):.1f} MB/s")
             self.summary_labels["max_speed"].config(text=f"{stats.get('max_speed', 0):.1f} MB/s")
             self.summary_labels["min_speed"].config(text=f"{stats.get('min_speed', 0):.1f} MB/s")
+            for phase in ('write', 'read'):
+                phase_stats = (stats.get('phase_speeds') or {}).get(phase)
+                text = f"{phase_stats['summary']['mean']:.1f} MB/s" if phase_stats else "---"
+                self.summary_labels[f"{phase}_speed"].config(text=text)
             self.summary_labels["test_time"].config(text=stats.get('elapsed_time', '00:00:00'))
             self.summary_labels["bad_sectors"].config(text=str(stats.get('bad_sectors_count', 0)))
             self.summary_labels["passes"].config(text=f"{stats.get('current_pass', 0)}/{stats.get('total_passes', 1)}")
@@ -187,12 +215,14 @@ class ResultsTab(ttk.Frame):
         if stats and 'bad_sectors' in stats:
             for sector in stats['bad_sectors']:
                 self.bad_tree.insert("", tk.END, values=(
-                    sector.get('sector', ''),
+                    self._format_sector_range(sector),
                     sector.get('error_type', ''),
                     sector.get('time', ''),
                     sector.get('attempts', 1)
                 ))
 
+        self.heatmap_widget.update_data(stats.get('heatmap') if stats else None)
+
         # Обновление детального отчета
         self.detail_text.delete(1.0, tk.END)
         if stats:
@@ -275,10 +305,19 @@ class ResultsTab(ttk.Frame):
         # Создаём график скорости
         times = stats.get('times', [])
         speeds = stats.get('speeds', [])
+        phase_speeds = stats.get('phase_speeds') or {}
         img_base64 = ""
         if times and speeds:
             fig, ax = plt.subplots(figsize=(10, 5))
-            ax.plot(times, speeds, 'b-', linewidth=1)
+            if phase_speeds:
+                # Двухфазный режим: отдельные ряды скорости записи и чтения
+                phase_colors = {'write': 'tab:orange', 'read': 'tab:green'}
+                for phase, series in phase_speeds.items():
+                    ax.plot(series['times'], series['speeds'], '.', color=phase_colors.get(phase, 'b'),
+                            label=self.app.i18n.get(f"{phase}_speed", phase))
+                ax.legend()
+            else:
+                ax.plot(times, speeds, 'b-', linewidth=1)
             ax.set_xlabel(self.app.i18n.get("time_sec", "Время (с)"))
             ax.set_ylabel(self.app.i18n.get("speed_mbs", "Скорость (MB/s)"))
             ax.set_title(self.app.i18n.get("speed_chart", "График скорости"))
@@ -290,10 +329,94 @@ class ResultsTab(ttk.Frame):
             img_base64 = base64.b64encode(buf.read()).decode('utf-8')
             plt.close(fig)
 
+        heatmap_section = self._heatmap_html(stats.get('heatmap'))
+
         # Таблица битых секторов
         bad_rows = ""
         for bs in stats.get('bad_sectors', []):
-            bad_rows += f"<tr><td>{bs.get('sector')}</td><td>{bs.get('error_type')}</td><td>{bs.get('time')}</td><td>{bs.get('attempts')}</td></tr>"
+            bad_rows += f"<tr><td>{self._format_sector_range(bs)}</td><td>{bs.get('error_type')}</td><td>{bs.get('time')}</td><td>{bs.get('attempts')}</td></tr>"
+
+        # Таблица по проходам
+        pass_rows = ""
+        for ps in stats.get('pass_stats', []):
+            pass_rows += (f"<tr><td>{ps.get('pass')}</td><td>{ps.get('tested_bytes', 0) / (1024**3):.2f} GB</td>"
+                          f"<td>{ps.get('avg_speed', 0):.1f} MB/s</td><td>{ps.get('errors', 0)}</td></tr>")
+
+        # Итоги быстрого теста (выборка)
+        quick_section = ""
+        quick = stats.get('quick_test') or {}
+        if quick.get('enabled'):
+            quick_section = f"""
+    <h2>{self.app.i18n.get("quick_test_report", "Быстрый тест (выборка)")}</h2>
+    <div class="summary">
+        <p><strong>{self.app.i18n.get("coverage", "Покрытие")}:</strong> {quick.get('coverage', 0) * 100:.2f}%</p>
+        <p><strong>{self.app.i18n.get("samples", "Участков проверено")}:</strong> {quick.get('samples', 0)} × {quick.get('sample_size', 0) // (1024 * 1024)} MB</p>
+        <p><strong>{self.app.i18n.get("defective_samples", "Дефектных участков")}:</strong> {quick.get('defective_samples', 0)}</p>
+        <p><strong>{self.app.i18n.get("defect_rate_estimate", "Оценка доли дефектов (95%)")}:</strong> {quick.get('defect_rate_low', 0) * 100:.2f}% – {quick.get('defect_rate_high', 0) * 100:.2f}%</p>
+        <p><strong>{self.app.i18n.get("sample_seed", "Seed выборки")}:</strong> {quick.get('seed', '')}</p>
+    </div>
+"""
+
+        # Время этапов конвейера записи/проверки
+        stage_rows = ""
+        for stage, seconds in (stats.get('pipeline') or {}).get('stage_seconds', {}).items():
+            stage_name = self.app.i18n.get(f"stage_{stage}", stage)
+            stage_rows += f"<tr><td>{stage_name}</td><td>{seconds:.2f} s</td></tr>"
+        stage_section = ""
+        if stage_rows:
+            stage_section = f"""
+    <h2>{self.app.i18n.get("pipeline_stages", "Этапы конвейера")}</h2>
+    <table>
+        {stage_rows}
+    </table>
+"""
+
+        # Распределение скорости по окнам агрегации (приближённые перцентили)
+        speed_percentiles_line = ""
+        speed_stats = stats.get('speed_stats') or {}
+        if speed_stats.get('count'):
+            speed_percentiles_line = (f"<p><strong>{self.app.i18n.get('speed_percentiles', 'Скорость p1 / p50 / p99')}:</strong> "
+                                      f"{speed_stats.get('p1', 0):.1f} / {speed_stats.get('p50', 0):.1f} / "
+                                      f"{speed_stats.get('p99', 0):.1f} MB/s (σ {speed_stats.get('stdev', 0):.1f})</p>")
+
+        # Средние скорости фаз записи и чтения
+        phase_lines = ""
+        for phase, series in phase_speeds.items():
+            phase_lines += (f"<p><strong>{self.app.i18n.get(f'{phase}_speed', phase)}:</strong> "
+                            f"{series['summary']['mean']:.1f} MB/s "
+                            f"(p1 {series['summary'].get('p1', 0):.1f} / p99 {series['summary'].get('p99', 0):.1f})</p>")
+
+        # Политика синхронизации и измеренная стоимость sync
+        sync_line = ""
+        sync = stats.get('sync') or {}
+        if sync:
+            policy = sync['policy'] if sync['policy'] == sync['effective'] else f"{sync['policy']} → {sync['effective']}"
+            sync_line = (f"<p><strong>{self.app.i18n.get('sync_policy', 'Синхронизация')}:</strong> {policy}, "
+                         f"{sync.get('syncs', 0)} × {sync.get('mean_ms', 0):.1f} ms = {sync.get('seconds', 0):.2f} s</p>")
+
+        # Повторная проверка блоков с ошибками ввода-вывода
+        localization_line = ""
+        localization = stats.get('error_localization') or {}
+        if localization.get('chunks'):
+            localization_line = (f"<p><strong>{self.app.i18n.get('error_localization', 'Локализация ошибок')}:</strong> "
+                                 f"{localization['chunks']} / {localization.get('probes', 0)} / "
+                                 f"{localization.get('retested_bytes', 0) / (1024**2):.1f} MB</p>")
+
+        # Задержки отдельных операций ввода-вывода
+        latency_rows = ""
+        for op, values in (stats.get('latency') or {}).items():
+            latency_rows += (f"<tr><td>{self.app.i18n.get(f'stage_{op}', op)}</td><td>{values.get('count', 0)}</td>"
+                             f"<td>{values.get('p50_ms', 0):.2f}</td><td>{values.get('p99_ms', 0):.2f}</td>"
+                             f"<td>{values.get('p99_9_ms', 0):.2f}</td><td>{values.get('max_ms', 0):.2f}</td></tr>")
+        latency_section = ""
+        if latency_rows:
+            latency_section = f"""
+    <h2>{self.app.i18n.get("latency_report", "Задержки операций (мс)")}</h2>
+    <table>
+        <tr><th></th><th>N</th><th>p50</th><th>p99</th><th>p99.9</th><th>max</th></tr>
+        {latency_rows}
+    </table>
+"""
 
         html = f"""<!DOCTYPE html>
 <html>
@@ -321,8 +444,16 @@ class ResultsTab(ttk.Frame):
         <p><strong>{self.app.i18n.get("avg_speed", "Средняя скорость")}:</strong> {stats.get('avg_speed', 0):.1f} MB/s</p>
         <p><strong>{self.app.i18n.get("max_speed", "Макс. скорость")}:</strong> {stats.get('max_speed', 0):.1f} MB/s</p>
         <p><strong>{self.app.i18n.get("min_speed", "Мин. скорость")}:</strong> {stats.get('min_speed', 0):.1f} MB/s</p>
+        {speed_percentiles_line}
+        {phase_lines}
         <p><strong>{self.app.i18n.get("test_time", "Время теста")}:</strong> {stats.get('elapsed_time', '00:00:00')}</p>
+        <p><strong>{self.app.i18n.get("io_method", "Метод ввода-вывода")}:</strong> {stats.get('io_method', 'buffered')}</p>
+        <p><strong>{self.app.i18n.get("queue_depth", "Глубина очереди")}:</strong> {stats.get('queue_depth', 1)}</p>
+        {sync_line}
+        <p><strong>{self.app.i18n.get("cache_bypass", "Обход кэша при проверке")}:</strong> {stats.get('cache_bypass', 'none')}</p>
+        <p><strong>{self.app.i18n.get("pattern_seed", "Seed случайного паттерна")}:</strong> {stats.get('pattern_seed', '')}</p>
         <p><strong>{self.app.i18n.get("bad_sectors", "Битые сектора")}:</strong> {stats.get('bad_sectors_count', 0)}</p>
+        {localization_line}
     </div>
     
     <h2>{self.app.i18n.get("speed_chart", "График скорости")}</h2>
@@ -330,6 +461,17 @@ class ResultsTab(ttk.Frame):
         <img src="data:image/png;base64,{img_base64}" alt="{self.app.i18n.get("speed_chart", "График скорости")}" style="max-width:100%;">
     </div>
     
+    <h2>{self.app.i18n.get("pass_stats", "Статистика по проходам")}</h2>
+    <table>
+        <tr>
+            <th>{self.app.i18n.get("pass", "Проход")}</th>
+            <th>{self.app.i18n.get("tested", "Протестировано")}</th>
+            <th>{self.app.i18n.get("avg_speed", "Средняя скорость")}</th>
+            <th>{self.app.i18n.get("errors", "Ошибки")}</th>
+        </tr>
+        {pass_rows}
+    </table>
+{heatmap_section}{quick_section}{stage_section}{latency_section}
     <h2>{self.app.i18n.get("bad_sectors", "Битые сектора")}</h2>
     <table>
         <tr>
@@ -347,6 +489,57 @@ class ResultsTab(ttk.Frame):
 """
         return html
 
+    def _heatmap_html(self, heatmap) -> str:
+        """Раздел отчёта с тепловой картой скорости по LBA и положением битых секторов"""
+        if not heatmap or not heatmap.get('tested_bins'):
+            return ""
+        rows, columns = grid_shape(heatmap['bins'])
+        grid = np.full(rows * columns, np.nan)
+        grid[:heatmap['bins']] = [np.nan if speed is None else speed for speed in heatmap['speeds']]
+        grid = np.ma.masked_invalid(grid.reshape(rows, columns))
+        cmap = plt.get_cmap('RdYlGn').copy()
+        cmap.set_bad('#808080')
+
+        fig, ax = plt.subplots(figsize=(7, 6))
+        image = ax.imshow(grid, cmap=cmap, vmin=0, vmax=max(heatmap['max_speed'], 1e-9), interpolation='nearest')
+        fig.colorbar(image, ax=ax, label=self.app.i18n.get("speed_mbs", "Скорость (MB/s)"))
+        if heatmap['error_bins']:
+            ax.scatter([index % columns for index in heatmap['error_bins']],
+                       [index // columns for index in heatmap['error_bins']],
+                       marker='x', color='black', s=30, linewidths=1.5,
+                       label=self.app.i18n.get("bad_sectors", "Битые сектора"))
+            ax.legend(loc='upper right')
+        ax.set_xticks([])
+        ax.set_yticks([])
+        ax.set_title(self.app.i18n.get("heatmap_title", "Скорость по LBA (слева направо, сверху вниз)"))
+        buf = io.BytesIO()
+        fig.savefig(buf, format='png', dpi=100)
+        plt.close(fig)
+        img_base64 = base64.b64encode(buf.getvalue()).decode('utf-8')
+
+        # Медленные зоны: ниже половины медианы — типичный признак поддельной или изношенной памяти
+        bin_bytes = heatmap['bin_bytes']
+        slow_rows = ""
+        for zone in heatmap.get('slow_zones', []):
+            slow_rows += (f"<tr><td>{zone['start'] / (1024**2):.1f}–{zone['end'] / (1024**2):.1f} MB</td>"
+                          f"<td>{zone['min_speed']:.1f} MB/s</td><td>{zone['errors']}</td></tr>")
+        slow_table = ""
+        if slow_rows:
+            slow_table = f"""
+    <table>
+        <tr><th>{self.app.i18n.get("heatmap_zone", "Зона")}</th><th>{self.app.i18n.get("min_speed", "Мин. скорость")}</th><th>{self.app.i18n.get("bad_sectors", "Битые сектора")}</th></tr>
+        {slow_rows}
+    </table>
+"""
+        return f"""
+    <h2>{self.app.i18n.get("heatmap", "Карта скорости")}</h2>
+    <p>{self.app.i18n.get("heatmap_summary", "Корзин: {} × {:.1f} MB, медиана {:.1f} MB/s, медленных зон: {}, с битыми секторами: {}").format(
+            heatmap['bins'], bin_bytes / (1024**2), heatmap['median_speed'], len(heatmap['slow_bins']), len(heatmap['error_bins']))}</p>
+    <div class="chart">
+        <img src="data:image/png;base64,{img_base64}" alt="{self.app.i18n.get("heatmap", "Карта скорости")}" style="max-width:100%;">
+    </div>{slow_table}
+"""
+
     def clear_results(self):
         """Очистка результатов"""
         if messagebox.askyesno(
@@ -363,6 +556,8 @@ class ResultsTab(ttk.Frame):
             for item in self.bad_tree.get_children():
                 self.bad_tree.delete(item)
 
+            self.heatmap_widget.clear()
+
             # Очистка текста
             self.detail_text.delete(1.0, tk.END)
 
@@ -381,7 +576,8 @@ class ResultsTab(ttk.Frame):
         # Обновление заголовков вкладок
         self.notebook.tab(0, text=self.app.i18n.get("summary", "Общая статистика"))
         self.notebook.tab(1, text=self.app.i18n.get("bad_sectors", "Битые сектора"))
-        self.notebook.tab(2, text=self.app.i18n.get("detailed", "Детальный отчет"))
+        self.notebook.tab(2, text=self.app.i18n.get("heatmap", "Карта скорости"))
+        self.notebook.tab(3, text=self.app.i18n.get("detailed", "Детальный отчет"))
 
         # Обновление заголовков столбцов таблицы
         self.bad_tree.heading("sector", text=self.app.i18n.get("sector", "Сектор"))
@@ -404,6 +600,8 @@ class ResultsTab(ttk.Frame):
         """Обновление темы оформления"""
         colors = self.app.theme_manager.colors
 
+        self.heatmap_widget.update_theme()
+
         # Применяем цвета к текстовому виджету детального отчёта
         self.detail_text.config(
             bg=colors.get("entry_bg", "#ffffff"),
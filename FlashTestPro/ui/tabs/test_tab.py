@@ -5,7 +5,6 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
 import threading
-import os
 
 from ui.widgets.progress_panel import ProgressPanel
 from ui.widgets.log_viewer import LogViewer
@@ -395,6 +394,37 @@ class TestTab(ttk.Frame):
         self.quick_info_btn.bind("<Enter>", self._show_quick_tooltip)
         self.quick_info_btn.bind("<Leave>", self._hide_tooltip)
 
+        # Доля устройства, проверяемая выборкой
+        self.quick_fraction_label = ttk.Label(
+            quick_check_frame,
+            text=self.app.i18n.get("quick_fraction", "Покрытие (%):")
+        )
+        self.quick_fraction_label.pack(side=tk.LEFT, padx=(15, 0))
+
+        fraction = self.app.config.get('testing', {}).get('quick_test_fraction', 0.02)
+        self.quick_fraction_var = tk.StringVar(value=f"{fraction * 100:g}")
+        self.quick_fraction_combo = ttk.Combobox(
+            quick_check_frame,
+            textvariable=self.quick_fraction_var,
+            values=["1", "2", "5", "10", "25"],
+            width=5
+        )
+        self.quick_fraction_combo.pack(side=tk.LEFT, padx=(5, 0))
+
+        # Раздельные фазы: запись всего интервала, затем чтение с проверкой
+        two_phase_frame = ttk.Frame(self.perf_frame)
+        two_phase_frame.pack(fill=tk.X, padx=10, pady=5)
+
+        self.two_phase_var = tk.BooleanVar(
+            value=self.app.config.get("testing", {}).get("two_phase", False)
+        )
+        self.two_phase_cb = ttk.Checkbutton(
+            two_phase_frame,
+            text=self.app.i18n.get("two_phase", "↔ Раздельные фазы записи и чтения"),
+            variable=self.two_phase_var
+        )
+        self.two_phase_cb.pack(anchor=tk.W)
+
         # Кнопки управления
         self._create_control_buttons()
 
@@ -414,6 +444,15 @@ class TestTab(ttk.Frame):
         )
         self.start_btn.pack(fill=tk.X, pady=2)
 
+        self.resume_btn = ttk.Button(
+            buttons_frame,
+            text=self.app.i18n.get("resume_test", "⏯ Продолжить прерванный"),
+            command=self.resume_test,
+            state=tk.DISABLED,
+            width=20
+        )
+        self.resume_btn.pack(fill=tk.X, pady=2)
+
         self.pause_btn = ttk.Button(
             buttons_frame,
             text=self.app.i18n.get("pause", "⏸ Пауза"),
@@ -562,18 +601,17 @@ class TestTab(ttk.Frame):
     def _show_quick_tooltip(self, event):
         tooltip_text = self.app.i18n.get(
             "quick_tooltip",
-            "Быстрый тест проверяет только ключевые области диска:\n\n"
-            "• Начало диска (загрузочный сектор)\n"
-            "• Середина диска\n"
-            "• Конец диска\n"
-            "• Несколько случайных позиций\n\n"
+            "Быстрый тест проверяет случайную выборку участков по всему диску:\n\n"
+            "• Диск делится на равные страты, в каждой проверяется один участок\n"
+            "• Начало и конец диска проверяются всегда\n"
+            "• Доля проверяемого объёма задаётся полем «Покрытие»\n\n"
             "Преимущества:\n"
-            "• Занимает 1-2 минуты\n"
-            "• Выявляет очевидные проблемы\n"
-            "• Безопасен для данных\n\n"
+            "• Время теста пропорционально покрытию\n"
+            "• Равномерно охватывает весь диск\n"
+            "• В отчёте — оценка доли дефектов с 95% доверием\n\n"
             "Ограничения:\n"
             "• Не заменяет полное тестирование\n"
-            "• Может пропустить скрытые дефекты"
+            "• Может пропустить единичные дефекты"
         )
         self._show_tooltip(event, tooltip_text)
 
@@ -622,6 +660,42 @@ class TestTab(ttk.Frame):
             self.start_btn.config(state=tk.NORMAL)
         else:
             self.start_btn.config(state=tk.DISABLED)
+        self._update_resume_button()
+
+    def _update_resume_button(self):
+        """Кнопка продолжения доступна, если для диска сохранён журнал прерванного теста"""
+        resumable = (self.current_drive and not self.current_drive.get('is_system', False)
+                     and not self.app.disk_tester.is_running()
+                     and self.app.disk_tester.get_resumable_test(self.current_drive['path']))
+        self.resume_btn.config(state=tk.NORMAL if resumable else tk.DISABLED)
+
+    def resume_test(self):
+        """Продолжение прерванного теста: параметры и план берутся из журнала"""
+        if not self.current_drive:
+            return
+        job = self.app.disk_tester.get_resumable_test(self.current_drive['path'])
+        if not job:
+            self._update_resume_button()
+            return
+        i = self.app.i18n
+        if not messagebox.askyesno(
+                i.get("confirm", "Подтверждение"),
+                i.get("confirm_resume", "Продолжить прерванную операцию на диске {}?\nВыполнено: {:.2f} GB").format(
+                    self.current_drive['path'], job['completed_bytes'] / (1024**3))
+        ):
+            return
+
+        self.chart_widget.clear()
+        self.progress_panel.reset()
+        self.log_viewer.clear()
+
+        self.app.disk_tester.start_test(self.current_drive['path'], {'resume': True})
+
+        self.start_btn.config(state=tk.DISABLED)
+        self.resume_btn.config(state=tk.DISABLED)
+        self.pause_btn.config(state=tk.NORMAL, text=i.get("pause", "⏸ Пауза"))
+        self.stop_btn.config(state=tk.NORMAL)
+        self.app.main_window.update_status(i.get("testing", "Тестирование..."))
 
     def start_test(self):
         if not self.current_drive:
@@ -670,7 +744,9 @@ class TestTab(ttk.Frame):
             'adaptive_chunk': self.adaptive_chunk_var.get(),
             'parallel_testing': self.parallel_test_var.get(),
             'num_threads': self.threads_var.get() if self.parallel_test_var.get() else 1,
-            'quick_test': self.quick_test_var.get()
+            'quick_test': self.quick_test_var.get(),
+            'quick_test_fraction': self._get_quick_fraction(),
+            'two_phase': self.two_phase_var.get()
         }
 
         i = self.app.i18n
@@ -688,6 +764,11 @@ class TestTab(ttk.Frame):
             self.log_viewer.log(i.get("log_threads", "🧵 Потоков: {}").format(params['num_threads']), "info")
         yes_no = i.get("yes") if params['quick_test'] else i.get("no")
         self.log_viewer.log(i.get("log_quick", "⚡ Быстрый тест: {}").format(yes_no), "info")
+        if params['quick_test']:
+            self.log_viewer.log(i.get("log_quick_fraction", "🎯 Покрытие выборки: {:g}%").format(
+                params['quick_test_fraction'] * 100), "info")
+        yes_no = i.get("yes") if params['two_phase'] else i.get("no")
+        self.log_viewer.log(i.get("log_two_phase", "↔ Раздельные фазы записи и чтения: {}").format(yes_no), "info")
         self.log_viewer.log("=" * 50, "info")
 
         self.chart_widget.clear()
@@ -697,6 +778,7 @@ class TestTab(ttk.Frame):
         self.app.disk_tester.start_test(self.current_drive['path'], params)
 
         self.start_btn.config(state=tk.DISABLED)
+        self.resume_btn.config(state=tk.DISABLED)
         self.pause_btn.config(state=tk.NORMAL, text=i.get("pause", "⏸ Пауза"))
         self.stop_btn.config(state=tk.NORMAL)
 
@@ -705,6 +787,14 @@ class TestTab(ttk.Frame):
         )
         self.app.main_window.update_status(i.get("testing", "Тестирование..."))
 
+    def _get_quick_fraction(self) -> float:
+        """Доля устройства для быстрого теста из поля ввода (в процентах)"""
+        try:
+            percent = float(self.quick_fraction_var.get().replace(',', '.'))
+        except ValueError:
+            percent = self.app.config.get('testing', {}).get('quick_test_fraction', 0.02) * 100
+        return max(0.01, min(100.0, percent)) / 100
+
     def _confirm_test_start(self):
         i = self.app.i18n
         mode_text = i.get("mode_full") if self.test_mode.get() == 'full' else i.get("mode_free")
@@ -761,6 +851,8 @@ class TestTab(ttk.Frame):
             self.start_btn.config(state=tk.NORMAL)
             self.pause_btn.config(state=tk.DISABLED)
             self.stop_btn.config(state=tk.DISABLED)
+            # Журнал сохраняется после завершения рабочих потоков
+            self.after(1000, self._update_resume_button)
 
     def process_messages(self):
         try:
@@ -777,11 +869,17 @@ class TestTab(ttk.Frame):
                         self.progress_panel.update_progress(msg[1])
 
                     elif msg_type == "speed" and len(msg) >= 3:
-                        self.chart_widget.add_data_point(msg[2], msg[1])
+                        self.chart_widget.add_data_point(msg[2], msg[1], msg[3] if len(msg) >= 4 else None)
                         self.progress_panel.update_speed(msg[1])
 
                         stats = self.app.disk_tester.get_statistics()
                         self.progress_panel.update_time(stats.get('elapsed_time', '00:00:00'))
+                        self.progress_panel.update_latency(stats.get('latency'))
+
+                    elif msg_type == "pass" and len(msg) >= 3:
+                        self.progress_panel.update_detail(
+                            self.app.i18n.get("pass_progress", "Проход {}/{}").format(msg[1], msg[2])
+                        )
 
                     elif msg_type == "bad_sector" and len(msg) >= 4:
                         self.log_viewer.log(
@@ -816,12 +914,13 @@ class TestTab(ttk.Frame):
         self.start_btn.config(state=tk.NORMAL)
         self.pause_btn.config(state=tk.DISABLED)
         self.stop_btn.config(state=tk.DISABLED)
+        self.after(1000, self._update_resume_button)
 
         self.progress_panel.update_progress(100)
         self.app.main_window.update_status(self.app.i18n.get("ready", "Готов"))
 
         self.app.main_window.results_tab.update_results(stats)
-        self.app.main_window.notebook.select(3)
+        self.app.main_window.notebook.select(self.app.main_window.results_tab)
 
     def _on_test_error(self, error_msg):
         self.log_viewer.log(f"{self.app.i18n.get('error', 'Ошибка')}: {error_msg}", "error")
@@ -829,39 +928,10 @@ class TestTab(ttk.Frame):
         self.start_btn.config(state=tk.NORMAL)
         self.pause_btn.config(state=tk.DISABLED)
         self.stop_btn.config(state=tk.DISABLED)
+        self.after(1000, self._update_resume_button)
 
         self.app.main_window.update_status(self.app.i18n.get("error", "Ошибка"), "error")
 
-    def run_benchmark(self):
-        if not self.current_drive:
-            return
-
-        drive_size = self.current_drive.get('total_bytes', 0) / (1024**3)
-
-        if drive_size < 16:
-            optimal_chunk = 16
-        elif drive_size < 64:
-            optimal_chunk = 32
-        elif drive_size < 256:
-            optimal_chunk = 64
-        else:
-            optimal_chunk = 128
-
-        self.passes_var.set(1)
-        self.test_ones.set(True)
-        self.test_zeros.set(True)
-        self.test_random.set(True)
-        self.verify_read.set(True)
-        self.auto_format.set(False)
-        self.test_mode.set('free')
-        self.chunk_size_var.set(optimal_chunk)
-        self.adaptive_chunk_var.set(True)
-        self.parallel_test_var.set(True)
-        self.threads_var.set(min(8, os.cpu_count() or 4))
-        self.quick_test_var.set(False)
-
-        self.start_test()
-
     def update_language(self):
         i = self.app.i18n
 
@@ -887,8 +957,11 @@ class TestTab(ttk.Frame):
         self.parallel_test_cb.config(text=i.get("parallel_test", "⚡ Параллельное тестирование"))
         self.threads_label.config(text=i.get("threads", "Потоки:"))
         self.quick_test_cb.config(text=i.get("quick_test", "⚡ Быстрый тест"))
+        self.quick_fraction_label.config(text=i.get("quick_fraction", "Покрытие (%):"))
+        self.two_phase_cb.config(text=i.get("two_phase", "↔ Раздельные фазы записи и чтения"))
 
         self.start_btn.config(text=i.get("start_test", "🚀 Начать тест"))
+        self.resume_btn.config(text=i.get("resume_test", "⏯ Продолжить прерванный"))
         if self.pause_btn['state'] == tk.NORMAL:
             if hasattr(self.app.disk_tester, 'paused') and self.app.disk_tester.paused:
                 self.pause_btn.config(text=i.get("resume", "▶ Продолжить"))
@@ -95,6 +95,15 @@ class WipeTab(ttk.Frame):
         )
         self.start_btn.pack(side=tk.LEFT, padx=(0, 5))
 
+        self.resume_btn = ttk.Button(
+            buttons_frame,
+            text=self.app.i18n.get("resume_wipe", "⏯ Продолжить прерванное"),
+            command=self.resume_wipe,
+            state=tk.DISABLED,
+            width=25
+        )
+        self.resume_btn.pack(side=tk.LEFT, padx=(0, 5))
+
         self.stop_btn = ttk.Button(
             buttons_frame,
             text=self.app.i18n.get("stop", "⏹ Стоп"),
@@ -151,6 +160,40 @@ class WipeTab(ttk.Frame):
             self.start_btn.config(state=tk.NORMAL)
         else:
             self.start_btn.config(state=tk.DISABLED)
+        self._update_resume_button()
+
+    def _update_resume_button(self):
+        """Кнопка продолжения доступна, если для диска сохранён журнал прерванного затирания"""
+        resumable = (self.current_drive and not self.current_drive.get('is_system', False)
+                     and not self.app.data_wiper.is_running()
+                     and self.app.data_wiper.get_resumable_wipe(self.current_drive['path']))
+        self.resume_btn.config(state=tk.NORMAL if resumable else tk.DISABLED)
+
+    def resume_wipe(self):
+        """Продолжение прерванного затирания с места остановки"""
+        if not self.current_drive:
+            return
+        job = self.app.data_wiper.get_resumable_wipe(self.current_drive['path'])
+        if not job:
+            self._update_resume_button()
+            return
+        if not messagebox.askyesno(
+            self.app.i18n.get("confirm", "Подтверждение"),
+            self.app.i18n.get("confirm_resume",
+                              "Продолжить прерванную операцию на диске {}?\nВыполнено: {:.2f} GB").format(
+                self.current_drive['path'], job['completed_bytes'] / (1024**3))
+        ):
+            return
+
+        self.progress_bar['value'] = 0
+        self.progress_label.config(text="0%")
+        self.start_btn.config(state=tk.DISABLED)
+        self.resume_btn.config(state=tk.DISABLED)
+        self.stop_btn.config(state=tk.NORMAL)
+
+        self.app.data_wiper.wipe_disk(self.current_drive['path'], job['method'], job['passes'], job['verify'],
+                                      resume=True)
+        self._log(self.app.i18n.get("wipe_started", f"Затирание запущено для диска {self.current_drive['path']}"))
 
     def start_wipe(self):
         """Запуск затирания"""
@@ -187,6 +230,7 @@ class WipeTab(ttk.Frame):
 
         # Запуск затирания
         self.start_btn.config(state=tk.DISABLED)
+        self.resume_btn.config(state=tk.DISABLED)
         self.stop_btn.config(state=tk.NORMAL)
 
         self.app.data_wiper.wipe_disk(
@@ -226,6 +270,7 @@ class WipeTab(ttk.Frame):
                     self._log(msg[1])
                     self.start_btn.config(state=tk.NORMAL)
                     self.stop_btn.config(state=tk.DISABLED)
+                    self.after(500, self._update_resume_button)
                     messagebox.showinfo(
                         self.app.i18n.get("success", "Успех"),
                         msg[1]
@@ -237,6 +282,7 @@ class WipeTab(ttk.Frame):
                     self._log(error_msg, is_error=True)
                     self.start_btn.config(state=tk.NORMAL)
                     self.stop_btn.config(state=tk.DISABLED)
+                    self.after(500, self._update_resume_button)
                     messagebox.showerror(
                         self.app.i18n.get("error", "Ошибка"),
                         msg[1]
@@ -272,6 +318,7 @@ class WipeTab(ttk.Frame):
         self.passes_label.config(text=self.app.i18n.get("wipe_passes", "Количество проходов:"))
         self.verify_cb.config(text=self.app.i18n.get("verify_wipe", "Проверить после затирания"))
         self.start_btn.config(text=self.app.i18n.get("start_wipe", "🧹 Начать затирание"))
+        self.resume_btn.config(text=self.app.i18n.get("resume_wipe", "⏯ Продолжить прерванное"))
         self.stop_btn.config(text=self.app.i18n.get("stop", "⏹ Стоп"))
 
         # Обновляем список методов в комбобоксе
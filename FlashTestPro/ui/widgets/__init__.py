@@ -5,5 +5,6 @@ from .drive_list import DriveListWidget
 from .progress_panel import ProgressPanel
 from .log_viewer import LogViewer
 from .chart_widget import SpeedChart
+from .heatmap_widget import HeatMapWidget
 
-__all__ = ['DriveListWidget', 'ProgressPanel', 'LogViewer', 'SpeedChart']
\ No newline at end of file
+__all__ = ['DriveListWidget', 'ProgressPanel', 'LogViewer', 'SpeedChart', 'HeatMapWidget']
\ No newline at end of file
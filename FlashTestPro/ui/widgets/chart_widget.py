@@ -20,6 +20,8 @@ class SpeedChart(ttk.Frame):
         
         self.speed_data = []
         self.time_data = []
+        # Отдельные ряды фаз записи и чтения (двухфазный режим)
+        self.phase_data = {}
         
         # Настройка шрифтов для matplotlib
         self._setup_matplotlib_fonts()
@@ -87,13 +89,23 @@ class SpeedChart(ttk.Frame):
         for spine in self.ax.spines.values():
             spine.set_color(colors["fg"])
     
-    def add_data_point(self, time_sec, speed_mb):
-        """Добавление точки данных"""
+    def add_data_point(self, time_sec, speed_mb, phase=None):
+        """Добавление точки данных; phase ('write'/'read') относит точку к ряду фазы"""
+        max_points = self.app.config.get("testing", {}).get("speed_chart_points", 100)
+        if phase is not None:
+            times, speeds = self.phase_data.setdefault(phase, ([], []))
+            times.append(time_sec)
+            speeds.append(speed_mb)
+            if len(times) > max_points:
+                del times[:-max_points]
+                del speeds[:-max_points]
+            self._redraw()
+            return
+
         self.time_data.append(time_sec)
         self.speed_data.append(speed_mb)
         
         # Ограничиваем количество точек
-        max_points = self.app.config.get("testing", {}).get("speed_chart_points", 100)
         if len(self.time_data) > max_points:
             self.time_data = self.time_data[-max_points:]
             self.speed_data = self.speed_data[-max_points:]
@@ -113,6 +125,14 @@ class SpeedChart(ttk.Frame):
             if len(self.speed_data) > 0:
                 avg_speed = sum(self.speed_data) / len(self.speed_data)
                 self.ax.axhline(y=avg_speed, color='r', linestyle='--', alpha=0.7)
+
+        # Ряды фаз: запись и чтение разными цветами
+        phase_colors = {'write': 'tab:orange', 'read': 'tab:green'}
+        for phase, (times, speeds) in self.phase_data.items():
+            label = self.app.i18n.get(f"{phase}_speed", phase)
+            self.ax.plot(times, speeds, '.', color=phase_colors.get(phase, 'b'), label=label)
+        if self.phase_data:
+            self.ax.legend(loc='lower right', fontsize=7)
         
         # Локализация надписей с проверкой наличия перевода
         xlabel = self.app.i18n.get("time_sec", "Время (с)")
@@ -135,6 +155,7 @@ class SpeedChart(ttk.Frame):
         """Очистка графика"""
         self.time_data = []
         self.speed_data = []
+        self.phase_data = {}
         self._redraw()
     
     def update_theme(self):
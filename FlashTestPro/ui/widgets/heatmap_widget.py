@@ -0,0 +1,113 @@
+"""
+Виджет тепловой карты скорости по LBA: сетка корзин от начала устройства к концу,
+цвет — скорость относительно максимальной, рамка — корзины с битыми секторами
+"""
+import tkinter as tk
+from tkinter import ttk
+
+from core.heatmap import grid_shape
+
+# Цвет непроверенных корзин
+UNTESTED_COLOR = "#808080"
+# Рамка корзин с битыми секторами
+ERROR_OUTLINE = "#000000"
+
+
+def speed_color(ratio: float) -> str:
+    """Цвет от красного (медленно) через жёлтый к зелёному (быстро) для доли от максимума"""
+    ratio = max(0.0, min(1.0, ratio))
+    if ratio < 0.5:
+        red, green = 255, int(510 * ratio)
+    else:
+        red, green = int(510 * (1 - ratio)), 255
+    return f"#{red:02x}{green:02x}00"
+
+
+class HeatMapWidget(ttk.Frame):
+    """Тепловая карта скорости и ошибок по корзинам LBA"""
+
+    CELL_SIZE = 12
+
+    def __init__(self, parent, app):
+        super().__init__(parent)
+        self.app = app
+        self.heatmap = None
+        self._shape = (0, 0)
+
+        self.canvas = tk.Canvas(self, highlightthickness=0)
+        self.canvas.pack(fill=tk.BOTH, expand=True)
+        self.info_label = ttk.Label(self, text="")
+        self.info_label.pack(fill=tk.X, pady=(5, 0))
+
+        self.canvas.bind("<Configure>", lambda event: self._redraw())
+        self.canvas.bind("<Motion>", self._on_motion)
+        self.canvas.bind("<Leave>", lambda event: self._show_summary())
+
+    def update_data(self, heatmap):
+        """heatmap — сводка LBAHeatMap.summary() из статистики теста"""
+        self.heatmap = heatmap if heatmap and heatmap.get('bins') else None
+        self._redraw()
+        self._show_summary()
+
+    def clear(self):
+        self.update_data(None)
+
+    def _cell_size(self):
+        rows, columns = self._shape
+        width = max(self.canvas.winfo_width(), 1)
+        height = max(self.canvas.winfo_height(), 1)
+        return max(2, min(width // max(columns, 1), height // max(rows, 1), self.CELL_SIZE * 3))
+
+    def _redraw(self):
+        self.canvas.delete("all")
+        if not self.heatmap:
+            return
+        speeds = self.heatmap['speeds']
+        errors = self.heatmap['errors']
+        self._shape = grid_shape(self.heatmap['bins'])
+        columns = self._shape[1]
+        cell = self._cell_size()
+        top = max(self.heatmap.get('max_speed') or 0.0, 1e-9)
+
+        for index, speed in enumerate(speeds):
+            x = (index % columns) * cell
+            y = (index // columns) * cell
+            fill = UNTESTED_COLOR if speed is None else speed_color(speed / top)
+            if errors[index]:
+                # Битые сектора: тёмная рамка и крест поверх цвета скорости
+                self.canvas.create_rectangle(x, y, x + cell, y + cell, fill=fill, outline=ERROR_OUTLINE, width=2)
+                self.canvas.create_line(x + 2, y + 2, x + cell - 2, y + cell - 2, fill=ERROR_OUTLINE)
+                self.canvas.create_line(x + 2, y + cell - 2, x + cell - 2, y + 2, fill=ERROR_OUTLINE)
+            else:
+                self.canvas.create_rectangle(x, y, x + cell, y + cell, fill=fill, outline="")
+
+    def _on_motion(self, event):
+        if not self.heatmap:
+            return
+        rows, columns = self._shape
+        cell = self._cell_size()
+        column, row = event.x // cell, event.y // cell
+        index = row * columns + column
+        if column >= columns or index >= self.heatmap['bins']:
+            self._show_summary()
+            return
+        bin_bytes = self.heatmap['bin_bytes']
+        start = index * bin_bytes
+        end = min(start + bin_bytes, self.heatmap['total_bytes'])
+        speed = self.heatmap['speeds'][index]
+        speed_text = f"{speed:.1f} MB/s" if speed is not None else self.app.i18n.get("heatmap_untested", "не проверялась")
+        self.info_label.config(text=self.app.i18n.get("heatmap_bin_info", "{:.2f}–{:.2f} GB: {}, битых секторов: {}").format(
+            start / (1024**3), end / (1024**3), speed_text, self.heatmap['errors'][index]))
+
+    def _show_summary(self):
+        if not self.heatmap:
+            self.info_label.config(text="")
+            return
+        self.info_label.config(text=self.app.i18n.get(
+            "heatmap_summary", "Корзин: {} × {:.1f} MB, медиана {:.1f} MB/s, медленных зон: {}, с битыми секторами: {}"
+        ).format(self.heatmap['bins'], self.heatmap['bin_bytes'] / (1024**2), self.heatmap['median_speed'],
+                 len(self.heatmap['slow_bins']), len(self.heatmap['error_bins'])))
+
+    def update_theme(self):
+        colors = self.app.theme_manager.colors
+        self.canvas.config(bg=colors.get("bg", "#ffffff"))
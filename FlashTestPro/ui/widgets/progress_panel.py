@@ -33,6 +33,13 @@ class ProgressPanel(ttk.Frame):
         self.speed_label = ttk.Label(self.speed_frame, text="0 MB/s")
         self.speed_label.pack(padx=5, pady=5)
 
+        # Задержки операций: медиана и «хвост» распределения
+        self.latency_frame = ttk.LabelFrame(self, text=self.app.i18n.get("latency", "Задержка (p50 / p99 / p99.9 / max)"))
+        self.latency_frame.pack(fill=tk.X, padx=5, pady=5)
+
+        self.latency_label = ttk.Label(self.latency_frame, text="—", font=("Consolas", 8), justify=tk.LEFT)
+        self.latency_label.pack(padx=5, pady=5, anchor=tk.W)
+
         # Информация о битых секторах
         self.bad_frame = ttk.LabelFrame(self, text=self.app.i18n.get("bad_sectors", "Битые сектора"))
         self.bad_frame.pack(fill=tk.X, padx=5, pady=5)
@@ -71,6 +78,16 @@ class ProgressPanel(ttk.Frame):
         self.speed_label.config(text=f"{speed:.1f} MB/s")
         self.update_idletasks()
     
+    def update_latency(self, latency):
+        """Обновление задержек: {операция: {'p50_ms', 'p99_ms', 'p99_9_ms', 'max_ms'}}"""
+        lines = []
+        for op, values in (latency or {}).items():
+            name = self.app.i18n.get(f"stage_{op}", op)
+            lines.append(f"{name}: {values.get('p50_ms', 0):.1f} / {values.get('p99_ms', 0):.1f} / "
+                         f"{values.get('p99_9_ms', 0):.1f} / {values.get('max_ms', 0):.1f} ms")
+        self.latency_label.config(text="\n".join(lines) if lines else "—")
+        self.update_idletasks()
+
     def update_time(self, time_str):
         """Обновление времени"""
         self.time_label.config(text=time_str)
@@ -92,6 +109,7 @@ class ProgressPanel(ttk.Frame):
         self.progress_bar['value'] = 0
         self.progress_label.config(text="0%")
         self.speed_label.config(text="0 MB/s")
+        self.latency_label.config(text="—")
         self.bad_label.config(text="0")
         self.time_label.config(text="00:00:00")
         self.detail_label.config(text="")
@@ -107,5 +125,6 @@ class ProgressPanel(ttk.Frame):
         # Обновление заголовков фреймов
         self.progress_frame.config(text=self.app.i18n.get("progress", "Прогресс"))
         self.speed_frame.config(text=self.app.i18n.get("speed", "Скорость"))
+        self.latency_frame.config(text=self.app.i18n.get("latency", "Задержка (p50 / p99 / p99.9 / max)"))
         self.bad_frame.config(text=self.app.i18n.get("bad_sectors", "Битые сектора"))
         self.time_frame.config(text=self.app.i18n.get("time", "Время"))
\ No newline at end of file
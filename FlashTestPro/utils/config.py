@@ -32,7 +32,21 @@ class ConfigManager:
             "verify_read": True,
             "patterns": ["ones", "zeros", "random"],
             "bad_sector_threshold": 5,
-            "speed_chart_points": 100
+            "speed_chart_points": 100,
+            "min_chunk_size_mb": 1,
+            "max_chunk_size_mb": 256,
+            "adaptive_chunk": True,
+            "quick_test_fraction": 0.02,
+            "direct_io": True,
+            "error_bisection": True,
+            "error_retries": 2,
+            "two_phase": False,
+            "checkpoint_journal": True,
+            "fill_writers": 1,
+            "queue_depth": 1,
+            "heatmap_bins": 1024,
+            "sync_policy": "chunk",
+            "sync_interval_mb": 256
         },
         "formatting": {
             "default_filesystem": "FAT32",
@@ -43,7 +57,28 @@ class ConfigManager:
             "default_passes": 3,
             "verify_after_wipe": True,
             "methods": ["simple", "dod", "gutmann"],
-            "default_method": "dod"
+            "default_method": "dod",
+            "direct_io": True,
+            "checkpoint_journal": True,
+            "queue_depth": 1,
+            "sync_policy": "interval",
+            "sync_interval_mb": 256
+        },
+        "jobs": {
+            "max_concurrent": 8,
+            "memory_limit_mb": 2048
+        },
+        "benchmark": {
+            "size_mb": 1024,
+            "duration": 3.0,
+            "sweep_queue_depth": 1,
+            "direct_io": True
+        },
+        "compliance": {
+            "au_size_mb": 4,
+            "ru_size_kb": 512,
+            "duration": 30.0,
+            "window": 1.0
         }
     }
     
@@ -12,8 +12,8 @@ from typing import Optional
 # Глобальный логгер
 _logger = None
 
-def setup_global_logger(log_dir="logs", log_level=logging.INFO):
-    """Настройка глобального логгера"""
+def setup_global_logger(log_dir="logs", log_level=logging.INFO, stream=None):
+    """Настройка глобального логгера (stream — поток консольного вывода, по умолчанию stdout)"""
     global _logger
     
     # Создание директории для логов
@@ -41,7 +41,7 @@ def setup_global_logger(log_dir="logs", log_level=logging.INFO):
     file_handler.setFormatter(formatter)
     
     # Консольный handler
-    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler = logging.StreamHandler(stream or sys.stdout)
     console_handler.setFormatter(formatter)
     
     # Добавление handlers
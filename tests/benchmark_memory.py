@@ -0,0 +1,119 @@
+"""
+Бенчмарк памяти горячего цикла DiskTester и DataWiper.
+Прогоняет тест и затирание на временном файле-образе, снимая RSS процесса
+каждые 50 мс, и проверяет, что после выделения постоянных буферов RSS не растёт.
+
+Запуск: python tests/benchmark_memory.py [размер_образа_MB] [размер_блока_MB]
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+from unittest.mock import Mock
+
+import psutil
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'FlashTestPro'))
+
+from core.tester import DiskTester  # noqa: E402
+from core.wiper import DataWiper  # noqa: E402
+
+MB = 1024 * 1024
+# Допустимый рост RSS сверх постоянных буферов (временные массивы numpy, очереди)
+TOLERANCE = 32 * MB
+
+
+class RssSampler:
+    """Фоновый замер RSS процесса"""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.samples = []
+        self._process = psutil.Process()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        start = time.perf_counter()
+        while not self._stop.is_set():
+            self.samples.append((time.perf_counter() - start, self._process.memory_info().rss))
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self._stop.set()
+        self._thread.join()
+
+
+def _report(name: str, baseline: int, samples, expected_buffers: int) -> bool:
+    peak = max(rss for _, rss in samples)
+    # Установившийся режим: середина прогона, когда буферы уже выделены и ещё не освобождены
+    duration = samples[-1][0]
+    steady = [rss for t, rss in samples if duration * 0.25 <= t <= duration * 0.75] or [peak]
+    growth = peak - baseline
+    ok = growth <= expected_buffers + TOLERANCE
+    print(f"{name}: базовый RSS {baseline / MB:.0f} MB, пик {peak / MB:.0f} MB "
+          f"(+{growth / MB:.0f} MB, буферы {expected_buffers / MB:.0f} MB), "
+          f"разброс в установившемся режиме {(max(steady) - min(steady)) / MB:.1f} MB — "
+          f"{'OK' if ok else 'ПРЕВЫШЕНИЕ'}")
+    return ok
+
+
+def _wait(thread):
+    while thread is None or thread.is_alive():
+        time.sleep(0.05)
+
+
+def bench_tester(image: str, size: int, chunk_mb: int) -> bool:
+    app = Mock()
+    app.config = {'testing': {'min_chunk_size_mb': 1, 'max_chunk_size_mb': chunk_mb}}
+    app.drive_manager.get_drives_list.return_value = [{'path': 'bench', 'total_bytes': size, 'free_bytes': size}]
+    app.drive_manager.get_partition_offsets.return_value = []
+
+    tester = DiskTester(app)
+    tester._get_device_path = lambda path: image
+    tester._unmount_drive = lambda path: None
+    params = {'passes': 1, 'test_ones': True, 'test_zeros': True, 'test_random': True, 'test_verify': True,
+              'mode': 'full', 'chunk_size_mb': chunk_mb, 'adaptive_chunk': False}
+
+    baseline = psutil.Process().memory_info().rss
+    with RssSampler() as sampler:
+        tester.start_test('bench', params)
+        _wait(tester.test_thread)
+    # Кольцо конвейера и буфер чтения одного рабочего потока
+    return _report("DiskTester", baseline, sampler.samples, 4 * chunk_mb * MB)
+
+
+def bench_wiper(image: str) -> bool:
+    app = Mock()
+    app.config = {'wiping': {}}
+    wiper = DataWiper(app)
+    wiper._get_device_path = lambda path: image
+    wiper._unmount_drive = lambda path: None
+
+    baseline = psutil.Process().memory_info().rss
+    with RssSampler() as sampler:
+        wiper.wipe_disk('bench', 'dod', 3, True)
+        _wait(wiper.wipe_thread)
+    # Буферы записи и чтения
+    return _report("DataWiper", baseline, sampler.samples, 2 * DataWiper.CHUNK_SIZE)
+
+
+def main():
+    size = int(sys.argv[1]) * MB if len(sys.argv) > 1 else 512 * MB
+    chunk_mb = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    directory = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.NamedTemporaryFile(dir=directory, suffix='.img') as image:
+        image.truncate(size)
+        image.flush()
+        ok = bench_tester(image.name, size, chunk_mb)
+        ok = bench_wiper(image.name) and ok
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
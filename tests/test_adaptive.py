@@ -0,0 +1,38 @@
+import pytest
+from core.adaptive import AdaptiveChunkController, MB
+
+
+class TestAdaptiveChunkController:
+    def _feed(self, controller, speed_for_size, chunks):
+        """Подаёт контроллеру блоки с заданной зависимостью скорости от размера"""
+        for _ in range(chunks):
+            size = controller.next_size()
+            speed = speed_for_size(size // MB)
+            controller.observe(size, (size / MB) / speed)
+
+    def test_grows_until_knee(self):
+        controller = AdaptiveChunkController(4 * MB, 1 * MB, 256 * MB)
+        # Скорость растёт до 32 MB, дальше насыщается
+        self._feed(controller, lambda mb: min(mb, 32) * 10.0, 30)
+        assert controller.next_size() == 32 * MB
+
+    def test_shrinks_when_larger_blocks_do_not_help(self):
+        controller = AdaptiveChunkController(64 * MB, 1 * MB, 256 * MB)
+        # Скорость одинакова для любого размера — выбирается минимальный
+        self._feed(controller, lambda mb: 20.0, 60)
+        assert controller.next_size() == 1 * MB
+
+    def test_backs_off_on_latency_spike(self):
+        controller = AdaptiveChunkController(32 * MB, 1 * MB, 256 * MB, enabled=True)
+        controller.observe(32 * MB, 1.0)
+        controller.observe(32 * MB, 1.0)
+        # Задержка в 10 раз выше ожидаемой — сборка мусора на карте
+        new_size = controller.observe(32 * MB, 10.0)
+        assert new_size == 16 * MB
+        assert controller.get_summary()['latency_spikes'] == 1
+
+    def test_disabled_keeps_size(self):
+        controller = AdaptiveChunkController(32 * MB, 1 * MB, 256 * MB, enabled=False)
+        self._feed(controller, lambda mb: mb * 10.0, 30)
+        assert controller.on_error() is None
+        assert controller.next_size() == 32 * MB
@@ -0,0 +1,97 @@
+import os
+from unittest.mock import Mock, patch
+
+import pytest
+
+from core.benchmark import BenchmarkEngine
+from core.direct_io import DeviceIO
+
+MB = 1024 * 1024
+
+
+def run_benchmark(engine, drive_path, params=None):
+    engine.start_test(str(drive_path), params)
+    engine.test_thread.join(timeout=60)
+    messages = []
+    msg = engine.get_message()
+    while msg:
+        messages.append(msg)
+        msg = engine.get_message()
+    return messages
+
+
+class TestBenchmarkEngine:
+    @pytest.fixture
+    def engine(self, tmp_path):
+        app = Mock()
+        app.config = {'benchmark': {'direct_io': False}}
+        app.drive_manager.get_drives_list.return_value = [{'path': str(tmp_path), 'free_bytes': 1024 * MB}]
+        engine = BenchmarkEngine(app)
+        engine.SEQ_BLOCK = MB
+        engine.SWEEP_SIZES = (4096, 64 * 1024)
+        engine.PROGRESS_INTERVAL = 1.0
+        return engine
+
+    def test_free_mode_results(self, engine, tmp_path):
+        messages = run_benchmark(engine, tmp_path, {'size_mb': 64, 'duration': 0.1})
+        stats = engine.get_statistics()
+
+        assert stats['status'] == 'ok'
+        assert stats['area_bytes'] == 64 * MB
+        assert stats['sequential']['write_mbps'] > 0 and stats['sequential']['read_mbps'] > 0
+        assert [(r['op'], r['block_size'], r['queue_depth']) for r in stats['random']] == [
+            ('read', 4096, 1), ('write', 4096, 1), ('read', 4096, 32), ('write', 4096, 32)]
+        assert [(r['op'], r['block_size']) for r in stats['sweep']] == [
+            ('read', 4096), ('write', 4096), ('read', 64 * 1024), ('write', 64 * 1024)]
+        assert all(r['ops'] > 0 and r['iops'] > 0 and r['latency']['count'] == r['ops']
+                   for r in stats['random'] + stats['sweep'])
+        steps = [m[1] for m in messages if m[0] == 'benchmark_step']
+        assert len(steps) == 2 + len(stats['random']) + len(stats['sweep'])
+        assert next(m[1] for m in messages if m[0] == 'result')['status'] == 'ok'
+        assert messages[-1][0] == 'complete'
+        # Временный файл удалён
+        assert os.listdir(tmp_path) == []
+
+    def test_not_enough_space(self, engine, tmp_path):
+        engine.app.drive_manager.get_drives_list.return_value = [{'path': str(tmp_path), 'free_bytes': 16 * MB}]
+        messages = run_benchmark(engine, tmp_path)
+        assert any(m[0] == 'error' for m in messages)
+        assert engine.get_statistics()['status'] == 'error'
+        assert not engine.is_running()
+
+    def test_compliance_claims(self, engine, tmp_path):
+        engine.app.config['compliance'] = {'au_size_mb': 4, 'ru_size_kb': 512, 'window': 0.1}
+        messages = run_benchmark(engine, tmp_path, {'size_mb': 64, 'duration': 0.1,
+                                                     'sustained_duration': 0.3, 'claim': ['c2', 'V90']})
+        compliance = engine.get_statistics()['compliance']
+
+        assert compliance['au_size'] == 4 * MB and compliance['written_bytes'] > 0
+        assert compliance['sustained_mbps'] == compliance['worst_window']['mbps']
+        assert compliance['claimed'] == ['C2', 'V90']
+        verdicts = {item['class']: item['passed'] for item in compliance['classes']}
+        assert verdicts['V90'] is (compliance['sustained_mbps'] >= 90)
+        assert compliance['claimed_pass'] is (verdicts['C2'] and verdicts['V90'])
+        assert any(m[0] == 'benchmark_step' and m[1]['op'] == 'sustained_write' for m in messages)
+
+    def test_unknown_claim_rejected(self, engine, tmp_path):
+        engine.start_test(str(tmp_path), {'claim': ['U9']})
+        assert engine.get_message()[0] == 'error'
+        assert not engine.is_running()
+
+    def test_write_phases_sync_once_without_o_sync(self, engine, tmp_path):
+        opened = []
+        syncs = []
+
+        def device_io(path, flags, direct=True):
+            opened.append(flags)
+            return DeviceIO(path, flags, direct=direct)
+
+        with patch('core.benchmark.DeviceIO', side_effect=device_io), \
+                patch.object(DeviceIO, 'sync', lambda io: syncs.append(1)), \
+                patch.object(DeviceIO, 'drop_cache', lambda io: True):
+            run_benchmark(engine, tmp_path, {'size_mb': 64, 'duration': 0.1})
+
+        assert engine.get_statistics()['status'] == 'ok'
+        assert not opened[0] & getattr(os, 'O_SYNC', 0)
+        # Один sync на этап записи: последовательный, два случайных и два этапа развёртки
+        assert len(syncs) == 5
@@ -0,0 +1,59 @@
+import errno
+
+import pytest
+from core.bisection import ErrorLocalizer
+
+
+class FakeDevice:
+    """Образ в памяти: запись или чтение участков с плохими секторами завершается EIO"""
+
+    def __init__(self, size, bad_write=(), bad_read=(), flaky=()):
+        self.storage = bytearray(size)
+        self.bad_write = set(bad_write)
+        self.bad_read = set(bad_read)
+        self.flaky = dict.fromkeys(flaky, 1)
+
+    def _check(self, bad, offset, length):
+        sectors = set(range(offset // 512, (offset + length - 1) // 512 + 1))
+        for sector in sectors & set(self.flaky):
+            if self.flaky[sector]:
+                self.flaky[sector] -= 1
+                raise OSError(errno.EIO, "Input/output error")
+        if sectors & bad:
+            raise OSError(errno.EIO, "Input/output error")
+
+    def write(self, data, offset):
+        self._check(self.bad_write, offset, len(data))
+        self.storage[offset:offset + len(data)] = data
+
+    def readinto(self, view, offset):
+        self._check(self.bad_read, offset, len(view))
+        view[:] = self.storage[offset:offset + len(view)]
+        return len(view)
+
+
+class TestErrorLocalizer:
+    def _localize(self, device, size=64 * 512, **kwargs):
+        localizer = ErrorLocalizer(device.write, lambda: None, device.readinto, **kwargs)
+        return localizer.localize(0, bytes(range(256)) * (size // 256), bytearray(size))
+
+    def test_exact_unwritable_and_unreadable_sectors(self):
+        device = FakeDevice(64 * 512, bad_write=[5], bad_read=[20, 21, 22])
+        result = self._localize(device)
+        assert [(bad['sector'], bad['count'], bad['stage']) for bad in result['bad']] == \
+            [(5, 1, 'write'), (20, 3, 'read')]
+        assert result['good_bytes'] == 60 * 512
+        assert result['complete']
+
+    def test_transient_error_recovered_by_retry(self):
+        device = FakeDevice(8 * 512, flaky=[3])
+        result = self._localize(device, size=8 * 512)
+        assert result['bad'] == []
+        assert result['good_bytes'] == 8 * 512
+
+    def test_probe_limit_marks_rest_unlocalized(self):
+        device = FakeDevice(64 * 512, bad_read=range(64))
+        result = self._localize(device, max_probes=10)
+        assert result['probes'] <= 10
+        assert sum(bad['count'] for bad in result['bad']) == 64
+        assert result['good_bytes'] == 0
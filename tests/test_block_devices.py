@@ -0,0 +1,60 @@
+import os
+
+from core.block_devices import block_device_info, describe_block_device, invalidate_block_device_cache
+
+
+def _make_disk(root, name, sectors, removable='1', logical=512, physical=4096):
+    disk = root / 'devices' / 'platform' / 'mmc' / 'block' / name
+    (disk / 'queue').mkdir(parents=True)
+    (disk / 'size').write_text(f"{sectors}\n")
+    (disk / 'removable').write_text(f"{removable}\n")
+    (disk / 'uevent').write_text(f"MAJOR=179\nMINOR=0\nDEVNAME={name}\nDEVTYPE=disk\n")
+    (disk / 'queue' / 'logical_block_size').write_text(f"{logical}\n")
+    (disk / 'queue' / 'physical_block_size').write_text(f"{physical}\n")
+    return disk
+
+
+def _make_partition(disk, name, number, dev_block, dev):
+    part = disk / name
+    part.mkdir()
+    (part / 'partition').write_text(f"{number}\n")
+    (part / 'uevent').write_text(f"DEVNAME={name}\nDEVTYPE=partition\n")
+    os.symlink(part, dev_block / dev)
+    return part
+
+
+class TestBlockDevices:
+    def setup_method(self):
+        invalidate_block_device_cache()
+
+    def test_partition_resolves_to_parent_disk(self, tmp_path):
+        dev_block = tmp_path / 'dev' / 'block'
+        dev_block.mkdir(parents=True)
+        disk = _make_disk(tmp_path, 'mmcblk0', 62333952)
+        _make_partition(disk, 'mmcblk0p1', 1, dev_block, '179:1')
+
+        info = block_device_info(179, 1, str(dev_block))
+        assert info['path'] == '/dev/mmcblk0'
+        assert info['partition'] == '/dev/mmcblk0p1'
+        assert info['partition_number'] == 1
+        assert info['size'] == 62333952 * 512
+        assert (info['logical_sector_size'], info['physical_sector_size']) == (512, 4096)
+        assert info['removable']
+        assert 'раздел /dev/mmcblk0p1' in describe_block_device(info)
+
+    def test_whole_disk_and_cache_invalidation(self, tmp_path):
+        dev_block = tmp_path / 'dev' / 'block'
+        dev_block.mkdir(parents=True)
+        disk = _make_disk(tmp_path, 'nvme0n1', 1000, removable='0')
+        os.symlink(disk, dev_block / '259:0')
+
+        info = block_device_info(259, 0, str(dev_block))
+        assert info['path'] == '/dev/nvme0n1' and info['partition'] is None and not info['removable']
+        assert block_device_info(259, 0, str(dev_block)) is info
+
+        # Другой носитель с тем же номером устройства: размер изменился — кэш устарел
+        (disk / 'size').write_text("2000\n")
+        assert block_device_info(259, 0, str(dev_block))['size'] == 2000 * 512
+
+    def test_unknown_device(self, tmp_path):
+        assert block_device_info(8, 99, str(tmp_path)) is None
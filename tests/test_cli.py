@@ -0,0 +1,48 @@
+import io
+import json
+import os
+import subprocess
+import sys
+
+import cli
+from cli import EventWriter, message_fields, overall_exit_code, EXIT_OK, EXIT_DEFECTS, EXIT_ERROR, EXIT_USAGE, \
+    EXIT_INTERRUPTED
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestCli:
+    def test_events(self):
+        out = io.StringIO()
+        events = EventWriter('test', out)
+        events.emit('speed', drive='/media/card', **message_fields(('speed', 12.5, 3, None)))
+        events.emit('summary', stats={'min_speed': float('inf'), 'regions': ({'pass': 1},)})
+        first, second = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert first == {'event': 'speed', 'job': 'test', 'time': first['time'], 'drive': '/media/card',
+                         'speed': 12.5, 'elapsed': 3, 'phase': None}
+        assert second['stats'] == {'min_speed': None, 'regions': [{'pass': 1}]}
+
+    def test_exit_codes(self):
+        assert overall_exit_code(['passed', 'passed']) == EXIT_OK
+        assert overall_exit_code(['passed', 'defects']) == EXIT_DEFECTS
+        assert overall_exit_code(['defects', 'failed']) == EXIT_ERROR
+        assert overall_exit_code(['failed', 'stopped']) == EXIT_INTERRUPTED
+
+    def test_destructive_job_requires_confirmation(self, tmp_path):
+        out = io.StringIO()
+        code = cli.main(['--log-dir', str(tmp_path / 'logs'), '--config', str(tmp_path / 'config.json'),
+                         'wipe', '/dev/null'], stdout=out)
+        assert code == EXIT_USAGE
+        assert json.loads(out.getvalue())['event'] == 'error'
+
+    def test_no_gui_imports(self, tmp_path):
+        script = ("import sys, runpy; sys.argv = ['cli', '--log-dir', sys.argv[1], '--config', sys.argv[2], "
+                  "'capacity', '/dev/null']\n"
+                  "try:\n    runpy.run_module('FlashTestPro.cli', run_name='__main__')\n"
+                  "except SystemExit as e:\n    code = e.code\n"
+                  "assert not {'tkinter', 'matplotlib'} & set(sys.modules), sys.modules.keys()\n"
+                  "sys.exit(code)\n")
+        result = subprocess.run([sys.executable, '-c', script, str(tmp_path / 'logs'), str(tmp_path / 'c.json')],
+                                cwd=REPO_ROOT, capture_output=True, text=True)
+        assert result.returncode == EXIT_USAGE, result.stderr
+        assert json.loads(result.stdout)['event'] == 'error'
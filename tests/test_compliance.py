@@ -0,0 +1,50 @@
+import pytest
+
+from core.compliance import CLASS_NAMES, SD_MB, sliding_windows, worst_window, evaluate_classes, check_claims
+
+
+def verdicts(classes):
+    return {item['class']: item['passed'] for item in classes}
+
+
+class TestCompliance:
+    def test_sliding_windows_find_slowdown(self):
+        # 10 MB/s по 1 MB каждые 0.1 с, затем провал: 1 MB за 1 с
+        samples = [(0.1 * (i + 1), SD_MB, i * SD_MB) for i in range(20)]
+        samples.append((3.0, SD_MB, 20 * SD_MB))
+        samples += [(3.0 + 0.1 * (i + 1), SD_MB, (21 + i) * SD_MB) for i in range(10)]
+        windows = sliding_windows(samples, 1.0)
+
+        assert windows[0]['mbps'] == pytest.approx(10.0)
+        worst = worst_window(windows)
+        assert worst['mbps'] == pytest.approx(1.0)
+        assert worst['start'] == pytest.approx(2.0)
+        assert worst['offset'] == 20 * SD_MB
+
+    def test_short_run_single_window(self):
+        windows = sliding_windows([(0.25, SD_MB, 0), (0.5, SD_MB, SD_MB)], 1.0)
+        assert len(windows) == 1
+        assert windows[0]['mbps'] == pytest.approx(4.0)
+        assert sliding_windows([], 1.0) == []
+        assert worst_window([]) is None
+
+    def test_speed_classes(self):
+        result = verdicts(evaluate_classes(35.0))
+        assert result['C10'] and result['U3'] and result['V30']
+        assert result['V60'] is False and result['V90'] is False
+        # Без замеров IOPS классы приложений не оцениваются
+        assert result['A1'] is None
+
+    def test_app_classes(self):
+        result = verdicts(evaluate_classes(20.0, read_iops=2500, write_iops=900))
+        assert result['A1'] is True
+        assert result['A2'] is False
+
+    def test_check_claims(self):
+        classes = evaluate_classes(12.0, read_iops=2000, write_iops=600)
+        assert check_claims(classes, []) is None
+        assert check_claims(classes, ['c10', 'U1', 'A1']) is True
+        assert check_claims(classes, ['U1', 'U3']) is False
+        with pytest.raises(ValueError):
+            check_claims(classes, ['X5'])
+        assert set(verdicts(classes)) == set(CLASS_NAMES)
@@ -0,0 +1,54 @@
+import os
+import pytest
+from core.direct_io import DeviceIO, aligned_buffer, ALIGNMENT
+
+
+class TestDeviceIO:
+    @pytest.fixture
+    def path(self, tmp_path):
+        return str(tmp_path / "device.img")
+
+    def test_aligned_buffer(self):
+        buffer = aligned_buffer(1000)
+        assert len(buffer) == ALIGNMENT
+
+    def test_buffered_roundtrip(self, path):
+        io = DeviceIO(path, os.O_RDWR | os.O_CREAT)
+        try:
+            assert io.method == 'buffered'
+            io.pwrite(b'abc' * 100, 10)
+            io.sync()
+            assert io.pread(300, 10) == b'abc' * 100
+        finally:
+            io.close()
+
+    def test_direct_handles_unaligned_data(self, path):
+        io = DeviceIO(path, os.O_RDWR | os.O_CREAT, direct=True)
+        try:
+            data = aligned_buffer(2 * ALIGNMENT)
+            data[:] = os.urandom(2 * ALIGNMENT)
+            io.pwrite(memoryview(data), 0)
+            # Невыровненные смещение и длина, данные только для чтения
+            io.pwrite(b'tail' * 100, 2 * ALIGNMENT + 7)
+            io.sync()
+
+            target = bytearray(2 * ALIGNMENT)
+            assert io.preadinto(target, 0) == 2 * ALIGNMENT
+            assert bytes(target) == data[:]
+            assert io.pread(400, 2 * ALIGNMENT + 7) == b'tail' * 100
+        finally:
+            io.close()
+
+    def test_preallocate_and_evict(self, path):
+        io = DeviceIO(path, os.O_RDWR | os.O_CREAT)
+        try:
+            if not io.preallocate(3 * ALIGNMENT):
+                pytest.skip("posix_fallocate не поддерживается")
+            assert os.path.getsize(path) == 3 * ALIGNMENT
+            io.pwrite(b'x' * ALIGNMENT, ALIGNMENT)
+            io.sync()
+            # Вытеснение не меняет данные: чтение идёт с носителя
+            assert io.evict(ALIGNMENT, ALIGNMENT)
+            assert io.pread(ALIGNMENT, ALIGNMENT) == b'x' * ALIGNMENT
+        finally:
+            io.close()
@@ -0,0 +1,106 @@
+import errno
+import os
+import shutil
+from collections import namedtuple
+from unittest.mock import Mock
+
+import pytest
+
+from core.direct_io import DeviceIO
+from core.fill import FillTester
+
+MB = 1024 * 1024
+Usage = namedtuple('Usage', 'total used free')
+
+
+def run_fill(tester, drive_path, params=None):
+    tester.start_test(str(drive_path), params)
+    tester.test_thread.join(timeout=30)
+    messages = []
+    msg = tester.get_message()
+    while msg:
+        messages.append(msg)
+        msg = tester.get_message()
+    return messages
+
+
+class TestFillTester:
+    @pytest.fixture
+    def tester(self, monkeypatch):
+        # Том 16 MB, из них свободно 9 MB + резерв: файлы 4 + 4 + 1 MB
+        monkeypatch.setattr('core.fill.shutil.disk_usage',
+                            lambda path: Usage(16 * MB, 7 * MB - FillTester.RESERVE_BYTES,
+                                               9 * MB + FillTester.RESERVE_BYTES))
+        tester = FillTester(Mock())
+        tester.FILE_SIZE = 4 * MB
+        tester.CHUNK_SIZE = MB
+        return tester
+
+    def test_genuine_volume(self, tester, tmp_path):
+        messages = run_fill(tester, tmp_path, {'writers': 2, 'pattern_seed': 7})
+        stats = tester.get_statistics()
+
+        assert [f['written'] for f in stats['files']] == [4 * MB, 4 * MB, MB]
+        assert stats['verified_bytes'] == 9 * MB
+        assert stats['corrupted_bytes'] == 0
+        assert stats['status'] == 'ok'
+        assert all(f['write_speed'] > 0 and f['read_speed'] > 0 for f in stats['files'])
+        result = next(m[1] for m in messages if m[0] == 'result')
+        assert result['real'] == result['claimed'] == 16 / 1024
+        assert any(m[0] == 'complete' for m in messages)
+        # Файлы и каталог заполнения удалены
+        assert os.listdir(tmp_path) == []
+
+    def test_aliased_file_detected(self, tester, tmp_path):
+        write_file = tester._write_file
+
+        def aliasing_write(index):
+            write_file(index)
+            if index == 1:
+                # Поддельная карта: второй файл «лёг» поверх первого
+                shutil.copyfile(tester._file_path(0), tester._file_path(1))
+
+        tester._write_file = aliasing_write
+        messages = run_fill(tester, tmp_path, {'writers': 1, 'pattern_seed': 7})
+        stats = tester.get_statistics()
+
+        assert stats['status'] == 'corrupted'
+        assert stats['corrupted_bytes'] == 4 * MB
+        assert stats['first_error_offset'] == 4 * MB
+        assert [f['corrupted_bytes'] for f in stats['files']] == [0, 4 * MB, 0]
+        result = next(m[1] for m in messages if m[0] == 'result')
+        assert result['real'] == pytest.approx(7 / 1024)
+        assert not os.path.exists(os.path.join(tmp_path, FillTester.FILL_DIR))
+
+    def test_plan_respects_file_size_limit(self, tester):
+        tester.FILE_SIZE = FillTester.FILE_SIZE
+        sizes = tester._plan_files(3 * FillTester.FILE_SIZE + 1000 + FillTester.RESERVE_BYTES)
+        assert sizes == [FillTester.FILE_SIZE] * 3 + [512]
+        assert tester._plan_files(FillTester.RESERVE_BYTES) == []
+
+    def test_io_error_is_not_genuine(self, tester, tmp_path, monkeypatch):
+        pwrite = DeviceIO.pwrite
+        writes = []
+
+        def failing_pwrite(device_io, view, offset):
+            # Карта отвечает EIO после первого записанного блока
+            if writes:
+                raise OSError(errno.EIO, "Input/output error")
+            writes.append(offset)
+            return pwrite(device_io, view, offset)
+
+        monkeypatch.setattr(DeviceIO, 'pwrite', failing_pwrite)
+        messages = run_fill(tester, tmp_path, {'writers': 1, 'pattern_seed': 7})
+        stats = tester.get_statistics()
+
+        assert stats['status'] == 'corrupted'
+        assert [f['written'] for f in stats['files']] == [MB, 0, 0]
+        assert all(f['error'] for f in stats['files'])
+        # Недописанные 3 + 4 + 1 MB считаются повреждёнными, ёмкость обрезана по месту сбоя
+        assert stats['corrupted_bytes'] == stats['unverified_bytes'] == 8 * MB
+        assert stats['verified_bytes'] == MB
+        assert stats['first_error_offset'] == MB
+        result = next(m[1] for m in messages if m[0] == 'result')
+        used_before = 7 * MB - FillTester.RESERVE_BYTES
+        assert result['real'] == pytest.approx((used_before + MB) / 1024**3)
+        assert result['real'] < result['claimed']
@@ -0,0 +1,45 @@
+import pytest
+
+from core.heatmap import LBAHeatMap, grid_shape
+
+MB = 1024 * 1024
+
+
+class TestLBAHeatMap:
+    def test_bins_cover_device(self):
+        heatmap = LBAHeatMap(1000 * MB + 512, bins=1024)
+        assert heatmap.bins <= 1024
+        assert heatmap.bins * heatmap.bin_bytes >= heatmap.total_bytes
+        # Маленькая область: корзина не меньше сектора
+        assert LBAHeatMap(4 * 512, bins=1024).bins == 4
+        assert LBAHeatMap(MB, bins='bad').bins == 1024
+
+    def test_chunk_split_between_bins(self):
+        heatmap = LBAHeatMap(4 * MB, bins=4)
+        # Блок 1 MB на границе корзин 0 и 1 поровну делит время
+        heatmap.record(MB // 2, MB, 0.1)
+        heatmap.record(3 * MB, MB, 0.5)
+        speeds = heatmap.speeds()
+        assert speeds[0] == pytest.approx(10.0)
+        assert speeds[1] == pytest.approx(10.0)
+        assert speeds[2] is None
+        assert speeds[3] == pytest.approx(2.0)
+
+    def test_summary_slow_and_error_bins(self):
+        heatmap = LBAHeatMap(8 * MB, bins=8)
+        for index in range(8):
+            heatmap.record(index * MB, MB, 0.5 if index == 5 else 0.05)
+        heatmap.add_error(2 * MB // 512 - 1, 2)
+        summary = heatmap.summary()
+
+        assert summary['tested_bins'] == 8
+        assert summary['median_speed'] == pytest.approx(20.0)
+        assert summary['slow_bins'] == [5]
+        assert [(zone['start'], zone['end']) for zone in summary['slow_zones']] == [(5 * MB, 6 * MB)]
+        assert summary['error_bins'] == [1, 2]
+        assert summary['errors'][1] == 1 and summary['errors'][2] == 1
+
+    def test_grid_shape(self):
+        assert grid_shape(1024) == (32, 32)
+        rows, columns = grid_shape(1000)
+        assert rows * columns >= 1000
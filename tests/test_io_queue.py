@@ -0,0 +1,101 @@
+import threading
+import time
+
+import pytest
+
+from core.io_queue import IOQueue, clamp_depth, request_size, MAX_DEPTH, MIN_REQUEST_SIZE
+
+
+class TestIOQueue:
+    def test_clamp_depth(self):
+        assert clamp_depth(0) == 1
+        assert clamp_depth(8) == 8
+        assert clamp_depth(1000) == MAX_DEPTH
+        assert clamp_depth('bad') == 1
+
+    def test_request_size_aligned(self):
+        assert request_size(64 * 1024 * 1024, 4) == 16 * 1024 * 1024
+        assert request_size(1024, 32) == MIN_REQUEST_SIZE
+        assert request_size(10 * 1024 * 1024 + 1, 3) % 4096 == 0
+
+    def test_completions_in_submission_order(self):
+        done = []
+        delays = {0: 0.05, 1: 0.0, 2: 0.02, 3: 0.0}
+
+        def op(buffer, offset):
+            time.sleep(delays[offset])
+            return offset
+
+        with IOQueue(4, on_complete=done.append) as io_queue:
+            for offset in range(4):
+                io_queue.submit('read', op, b'x', offset)
+            io_queue.drain()
+        assert [request.offset for request in done] == [0, 1, 2, 3]
+        assert [request.result for request in done] == [0, 1, 2, 3]
+
+    def test_depth_limits_in_flight(self):
+        lock = threading.Lock()
+        active = [0, 0]
+
+        def op(buffer, offset):
+            with lock:
+                active[0] += 1
+                active[1] = max(active[1], active[0])
+            time.sleep(0.01)
+            with lock:
+                active[0] -= 1
+
+        with IOQueue(3) as io_queue:
+            for offset in range(12):
+                io_queue.submit('write', op, b'x', offset)
+                assert io_queue.in_flight <= 3
+        assert 1 < active[1] <= 3
+
+    def test_errors_reported_per_request(self):
+        done = []
+
+        def op(buffer, offset):
+            if offset == 1:
+                raise OSError(5, "I/O error")
+
+        with IOQueue(2, on_complete=done.append) as io_queue:
+            for offset in range(3):
+                io_queue.submit('write', op, b'x', offset)
+        assert [request.error is not None for request in done] == [False, True, False]
+
+    @pytest.mark.parametrize('depth', [1, 4])
+    def test_write_and_read_split(self, depth):
+        storage = bytearray(1024 * 1024)
+        data = bytes(range(256)) * 4096
+
+        def write(view, offset):
+            storage[offset:offset + len(view)] = view
+
+        def readinto(view, offset):
+            view[:] = storage[offset:offset + len(view)]
+            return len(view)
+
+        with IOQueue(depth) as io_queue:
+            io_queue.write_all(write, data, 0)
+            buffer = bytearray(len(data))
+            assert io_queue.readinto_all(readinto, buffer, 0) == len(data)
+        assert bytes(storage) == data
+        assert bytes(buffer) == data
+
+    def test_short_read_truncates_result(self):
+        def readinto(view, offset):
+            # Носитель заканчивается на 300 KB
+            n = max(0, min(len(view), 300 * 1024 - offset))
+            return n
+
+        with IOQueue(4) as io_queue:
+            assert io_queue.readinto_all(readinto, bytearray(1024 * 1024), 0) == 300 * 1024
+
+    def test_write_error_raised(self):
+        def write(view, offset):
+            if offset > 0:
+                raise OSError(5, "I/O error")
+
+        with IOQueue(4) as io_queue:
+            with pytest.raises(OSError):
+                io_queue.write_all(write, bytearray(1024 * 1024), 0)
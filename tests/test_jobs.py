@@ -0,0 +1,121 @@
+import queue
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from core.jobs import JobManager
+
+
+class FakeEngine:
+    """Движок с управляемым завершением: сообщения выдаются после release()"""
+
+    def __init__(self, messages, stats=None):
+        self.messages = messages
+        self.stats = stats or {}
+        self.message_queue = queue.Queue()
+        self.running = False
+        self.released = threading.Event()
+        self.test_thread = None
+        self.started_with = None
+
+    def start_test(self, drive_path, params=None):
+        self.started_with = (drive_path, params)
+        self.running = True
+        self.test_thread = threading.Thread(target=self._worker, daemon=True)
+        self.test_thread.start()
+
+    def _worker(self):
+        self.message_queue.put(('speed', 10.0, 1, None))
+        self.released.wait(5)
+        for msg in self.messages:
+            self.message_queue.put(msg)
+        self.running = False
+
+    def get_message(self):
+        try:
+            return self.message_queue.get_nowait()
+        except queue.Empty:
+            return None
+
+    def is_running(self):
+        return self.running
+
+    def stop(self):
+        self.released.set()
+
+    def get_statistics(self):
+        return self.stats
+
+
+def poll_until(manager, condition, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        manager.poll()
+        if condition():
+            return
+        time.sleep(0.01)
+    raise AssertionError("Условие не выполнено")
+
+
+class TestJobManager:
+    @pytest.fixture
+    def engines(self):
+        return []
+
+    @pytest.fixture
+    def manager(self, engines):
+        outcomes = iter([
+            FakeEngine([('complete', 'Готово')], {'bad_sectors_count': 0}),
+            FakeEngine([('complete', 'Готово')], {'bad_sectors_count': 3}),
+            FakeEngine([('error', 'Сбой')]),
+        ])
+
+        def factory(kind):
+            engine = next(outcomes)
+            engines.append(engine)
+            return engine
+
+        app = Mock()
+        app.config = {'jobs': {'max_concurrent': 2}}
+        return JobManager(app, engine_factory=factory)
+
+    def test_concurrency_limit_and_outcomes(self, manager, engines):
+        jobs = [manager.submit('test', f"/media/card{i}", {'mode': 'free'}) for i in range(3)]
+        with pytest.raises(ValueError):
+            manager.submit('test', '/media/card0')
+
+        poll_until(manager, lambda: all(job.speed for job in jobs[:2]))
+        # Третье задание ждёт освобождения слота
+        assert [job.status for job in jobs] == ['running', 'running', 'queued']
+        assert engines[0].started_with == ('/media/card0', {'mode': 'free'})
+        assert manager.aggregate()['throughput'] == 20.0
+
+        for engine in engines:
+            engine.released.set()
+        poll_until(manager, lambda: len(engines) == 3)
+        engines[2].released.set()
+        poll_until(manager, lambda: not manager.is_active())
+
+        assert [job.status for job in jobs] == ['passed', 'defects', 'failed']
+        assert jobs[2].errors == ['Сбой']
+        summary = manager.aggregate()
+        assert summary['by_status'] == {'passed': 1, 'defects': 1, 'failed': 1}
+        assert summary['throughput'] == 0
+
+        manager.clear_finished()
+        assert manager.jobs() == []
+
+    def test_stop_queued_and_running(self, manager, engines):
+        first = manager.submit('capacity', '/media/a')
+        manager.submit('capacity', '/media/b')
+        queued = manager.submit('capacity', '/media/c')
+        manager.poll()
+        manager.stop(queued.id)
+        assert queued.status == 'stopped'
+
+        manager.stop()
+        poll_until(manager, lambda: not manager.is_active())
+        assert first.status == 'stopped'
+        assert len(engines) == 2
@@ -0,0 +1,53 @@
+import os
+
+from core.journal import CheckpointJournal, merge_intervals, subtract_intervals, journal_path
+
+
+class TestCheckpointJournal:
+    def test_interval_helpers(self):
+        assert merge_intervals([(10, 20), (0, 5), (5, 8), (15, 30)]) == [(0, 8), (10, 30)]
+        assert subtract_intervals([(0, 100)], [(0, 10), (40, 50)]) == [(10, 40), (50, 100)]
+        assert subtract_intervals([(0, 10), (20, 30)], [(5, 25)]) == [(0, 5), (25, 30)]
+        assert subtract_intervals([(0, 10)], [(0, 10)]) == []
+
+    def test_reload_after_interruption(self, tmp_path):
+        path = journal_path('test', '/media/card', str(tmp_path))
+        journal = CheckpointJournal.create(path, {'drive_path': '/media/card', 'total_bytes': 100},
+                                           flush_records=1000, flush_interval=60)
+        for end in range(10, 60, 10):
+            journal.mark_done((1, 'ones', 'rw'), 0, end)
+        journal.mark_done((1, 'ones', 'rw'), 80, 90)
+        journal.add_bad_sector({'sector': 7, 'count': 1})
+        journal.flush()
+        journal.mark_done((1, 'ones', 'rw'), 0, 70)   # не сброшено: теряется при сбое
+        os.close(journal._fd)
+        journal._fd = None
+        # Оборванная при сбое последняя строка
+        with open(path, 'a') as f:
+            f.write('{"type": "done", "key"')
+
+        resumed = CheckpointJournal.load(path)
+        assert resumed.matches({'drive_path': '/media/card', 'total_bytes': 100}, ('drive_path', 'total_bytes'))
+        assert not resumed.matches({'drive_path': '/media/card', 'total_bytes': 200}, ('total_bytes',))
+        assert resumed.completed((1, 'ones', 'rw')) == [(0, 50), (80, 90)]
+        assert resumed.completed((2, 'ones', 'rw')) == []
+        assert resumed.bad_sectors == [{'sector': 7, 'count': 1}]
+        assert resumed.completed_bytes() == 60
+
+        resumed.discard()
+        assert not os.path.exists(path)
+        assert CheckpointJournal.load(path) is None
+
+    def test_batches_records_until_threshold(self, tmp_path):
+        path = str(tmp_path / 'wipe.jsonl')
+        journal = CheckpointJournal.create(path, {}, flush_records=3, flush_interval=60)
+        size = os.path.getsize(path)
+        journal.mark_done(('pass', 1), 0, 10)
+        journal.mark_done(('pass', 1), 0, 20)   # заменяет предыдущую отметку того же участка
+        assert os.path.getsize(path) == size
+        journal.mark_done(('pass', 2), 0, 10)
+        journal.add_bad_sector({'offset': 0})
+        assert os.path.getsize(path) > size
+        journal.close()
+        with open(path) as f:
+            assert len(f.read().splitlines()) == 4
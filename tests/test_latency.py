@@ -0,0 +1,31 @@
+import pytest
+from core.latency import LatencyHistogram
+
+
+class TestLatencyHistogram:
+    def test_percentiles_and_tail(self):
+        histogram = LatencyHistogram()
+        # 999 быстрых операций по 2 мс и одно «зависание» на 1.5 с
+        for _ in range(999):
+            histogram.record(2_000_000)
+        histogram.record(1_500_000_000)
+        summary = histogram.summary()
+        assert summary['count'] == 1000
+        assert summary['p50_ms'] == pytest.approx(2.0, rel=0.01)
+        assert summary['p99_ms'] == pytest.approx(2.0, rel=0.01)
+        assert summary['max_ms'] == pytest.approx(1500.0)
+        assert summary['p99_9_ms'] == pytest.approx(2.0, rel=0.01)
+
+    def test_relative_precision(self):
+        histogram = LatencyHistogram()
+        for value in range(1000, 1_000_000, 997):
+            histogram.record(value * 1000)
+        assert histogram.percentiles([50])[50] == pytest.approx(500_000_000, rel=0.02)
+
+    def test_merge(self):
+        a, b = LatencyHistogram(), LatencyHistogram()
+        a.record(1000)
+        b.record(3_000_000)
+        a.merge(b)
+        assert a.count == 2
+        assert a.max_ns == 3_000_000 and a.min_ns == 1000
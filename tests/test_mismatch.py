@@ -0,0 +1,28 @@
+import pytest
+from core.mismatch import find_mismatched_sectors
+
+
+class TestFindMismatchedSectors:
+    def test_exact_sectors_and_bits(self):
+        expected = bytes(8 * 512)
+        actual = bytearray(expected)
+        actual[512 + 10] ^= 0x04       # сектор 1, бит 82
+        actual[3 * 512] ^= 0x01        # сектор 3
+        actual[4 * 512 + 511] ^= 0x80  # сектор 4 — продолжение диапазона
+        ranges = find_mismatched_sectors(expected, actual, offset=100 * 512)
+        assert [(r['sector'], r['count']) for r in ranges] == [(101, 1), (103, 2)]
+        assert ranges[0]['bits'] == [[101, 82]]
+        assert ranges[0]['flip_mask'] == 0x04
+        assert ranges[1]['bit_flips'] == 2
+
+    def test_unaligned_offset(self):
+        expected = bytes(2048)
+        actual = bytearray(expected)
+        actual[0] = 0xFF
+        ranges = find_mismatched_sectors(expected, actual, offset=300)
+        # Байт по смещению 300 лежит в секторе 0, бит 300 * 8
+        assert ranges == [{'sector': 0, 'count': 1, 'bit_flips': 8, 'flip_mask': 0xFF,
+                           'bits': [[0, 2400 + i] for i in range(8)]}]
+
+    def test_equal_buffers(self):
+        assert find_mismatched_sectors(b'\x01' * 4096, b'\x01' * 4096) == []
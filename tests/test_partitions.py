@@ -0,0 +1,105 @@
+import struct
+import uuid
+import zlib
+
+import pytest
+from core.partitions import (parse_partition_table, read_partition_table, partition_intervals,
+                             invalidate_partition_cache)
+
+SECTOR = 512
+DISK_SECTORS = 4096
+
+
+def _mbr_entry(part_type, start_lba, num_sectors, status=0x00):
+    return struct.pack('<B3sB3sII', status, b'\x00' * 3, part_type, b'\x00' * 3, start_lba, num_sectors)
+
+
+def _write_table(image, lba, entries):
+    image[lba * SECTOR + 446:lba * SECTOR + 446 + 16 * len(entries)] = b''.join(entries)
+    image[lba * SECTOR + 510:lba * SECTOR + 512] = b'\x55\xAA'
+
+
+def _mbr_image():
+    """Два основных раздела и расширенный с двумя логическими"""
+    image = bytearray(DISK_SECTORS * SECTOR)
+    _write_table(image, 0, [_mbr_entry(0x0C, 2048, 512, 0x80), _mbr_entry(0x83, 2560, 256),
+                            _mbr_entry(0x0F, 3000, 1000)])
+    # EBR 1: логический раздел на +63 от EBR и ссылка на следующий EBR (от начала расширенного)
+    _write_table(image, 3000, [_mbr_entry(0x07, 63, 200), _mbr_entry(0x05, 400, 300)])
+    _write_table(image, 3400, [_mbr_entry(0x0B, 63, 100)])
+    return image
+
+
+def _gpt_image():
+    image = bytearray(DISK_SECTORS * SECTOR)
+    _write_table(image, 0, [_mbr_entry(0xEE, 1, DISK_SECTORS - 1)])
+    entries = bytearray(128 * 128)
+    basic_data = uuid.UUID('ebd0a0a2-b9e5-4433-87c0-68b6b72699c7')
+    for index, (first, last, name) in enumerate([(34, 1033, 'DATA'), (2048, 4000, 'BACKUP')]):
+        entries[index * 128:index * 128 + 56] = (basic_data.bytes_le + uuid.uuid4().bytes_le +
+                                                 struct.pack('<QQQ', first, last, 0))
+        entries[index * 128 + 56:index * 128 + 56 + len(name) * 2] = name.encode('utf-16-le')
+    header = bytearray(struct.pack('<8sIIIIQQQQ16sQIII', b'EFI PART', 0x10000, 92, 0, 0, 1, DISK_SECTORS - 1,
+                                   34, DISK_SECTORS - 34, uuid.uuid4().bytes_le, 2, 128, 128, zlib.crc32(entries)))
+    struct.pack_into('<I', header, 16, zlib.crc32(header))
+    image[SECTOR:SECTOR + 92] = header
+    image[2 * SECTOR:2 * SECTOR + len(entries)] = entries
+    return image
+
+
+class TestPartitionTable:
+    def _parse(self, image):
+        return parse_partition_table(bytes(image[:34 * SECTOR]),
+                                     lambda offset, size: bytes(image[offset:offset + size]),
+                                     disk_size=len(image))
+
+    def test_mbr_with_extended_partitions(self):
+        table = self._parse(_mbr_image())
+        assert table['scheme'] == 'mbr'
+        assert [(p['index'], p['start'] // SECTOR, p['end'] // SECTOR) for p in table['partitions']] == \
+            [(1, 2048, 2560), (2, 2560, 2816), (5, 3063, 3263), (6, 3463, 3563)]
+
+    def test_gpt(self):
+        table = self._parse(_gpt_image())
+        assert table['scheme'] == 'gpt'
+        assert [(p['name'], p['start'] // SECTOR, p['end'] // SECTOR) for p in table['partitions']] == \
+            [('DATA', 34, 1034), ('BACKUP', 2048, 4001)]
+
+    def test_corrupted_gpt_is_not_trusted(self):
+        image = _gpt_image()
+        image[2 * SECTOR + 40] ^= 0xFF
+        assert self._parse(image)['partitions'] == []
+
+    def test_fat_superfloppy_has_no_table(self):
+        image = bytearray(DISK_SECTORS * SECTOR)
+        image[0:3] = b'\xEB\x3C\x90'
+        image[11:13] = struct.pack('<H', 512)
+        image[54:59] = b'FAT16'
+        image[510:512] = b'\x55\xAA'
+        assert self._parse(image)['scheme'] == 'none'
+
+    def test_read_from_image_file_and_cache(self, tmp_path):
+        path = tmp_path / 'disk.img'
+        path.write_bytes(_mbr_image())
+        table = read_partition_table(str(path))
+        assert read_partition_table(str(path)) is table
+        assert partition_intervals(table, 3500 * SECTOR)[-1] == (3463 * SECTOR, 3500 * SECTOR)
+
+        # Новая таблица на носителе распознаётся без явного сброса кэша
+        path.write_bytes(_gpt_image())
+        assert read_partition_table(str(path))['scheme'] == 'gpt'
+        invalidate_partition_cache(str(path))
+
+    def test_cache_detects_changed_ebr(self, tmp_path):
+        path = tmp_path / 'disk.img'
+        image = _mbr_image()
+        path.write_bytes(image)
+        table = read_partition_table(str(path))
+        assert len(table['partitions']) == 4
+
+        # Второй логический раздел удалён в EBR 1, LBA 0–33 не изменились
+        _write_table(image, 3000, [_mbr_entry(0x07, 63, 200), b'\x00' * 16])
+        path.write_bytes(image)
+        table = read_partition_table(str(path))
+        assert [p['start'] // SECTOR for p in table['partitions']] == [2048, 2560, 3063]
+        invalidate_partition_cache(str(path))
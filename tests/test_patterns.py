@@ -0,0 +1,23 @@
+import pytest
+from core.patterns import PatternGenerator
+
+
+class TestPatternGenerator:
+    def test_any_offset_matches_stream(self):
+        generator = PatternGenerator(42)
+        stream = generator.generate(1, 0, 10000)
+        # Данные участка не зависят от того, как устройство нарезано на блоки
+        for offset, length in [(7, 100), (33, 5000), (4096, 4096), (9999, 1)]:
+            assert generator.generate(1, offset, length) == stream[offset:offset + length]
+
+    def test_key_changes_data(self):
+        data = PatternGenerator(42).generate(1, 0, 256)
+        assert PatternGenerator(42).generate(2, 0, 256) != data
+        assert PatternGenerator(43).generate(1, 0, 256) != data
+
+    def test_fill_in_place(self):
+        generator = PatternGenerator(7)
+        buffer = bytearray(1024)
+        generator.fill(memoryview(buffer)[512:], 1, 512)
+        assert bytes(buffer[512:]) == generator.generate(1, 512, 512)
+        assert bytes(buffer[:512]) == bytes(512)
@@ -0,0 +1,88 @@
+import threading
+
+import pytest
+from core.pipeline import ChunkPipeline, STAGES
+
+
+class TestChunkPipeline:
+    def _chunks(self, count, size):
+        return ({'offset': i * size, 'length': size} for i in range(count))
+
+    def test_writes_and_verifies_in_order(self):
+        storage = {}
+        done = []
+        pipeline = ChunkPipeline(16)
+
+        def fill(view, chunk):
+            view[:] = bytes([chunk['offset'] // 16 % 256]) * len(view)
+
+        def write(data, offset):
+            storage[offset] = bytes(data)
+
+        def readinto(view, offset):
+            view[:] = storage[offset]
+            return len(view)
+
+        timings = pipeline.run(self._chunks(10, 16), fill, write, lambda: None,
+                               readinto, done.append, lambda: False)
+        assert [chunk['offset'] for chunk in done] == [i * 16 for i in range(10)]
+        assert all(chunk['error'] is None for chunk in done)
+        assert set(timings) == set(STAGES)
+
+    def test_mismatch_reported_as_verify_error(self):
+        done = []
+        pipeline = ChunkPipeline(8)
+        def readinto(view, offset):
+            view[:] = b'\x01' * len(view)
+            return len(view)
+
+        pipeline.run(self._chunks(3, 8), lambda view, chunk: None, lambda data, offset: None,
+                     lambda: None, readinto, done.append, lambda: False)
+        assert [chunk['stage'] for chunk in done] == ['verify'] * 3
+
+    def test_write_error_skips_verify(self):
+        done = []
+        reads = []
+
+        def write(data, offset):
+            if offset == 8:
+                raise OSError(5, "I/O error")
+
+        def readinto(view, offset):
+            reads.append(offset)
+            return len(view)
+
+        pipeline = ChunkPipeline(8)
+        pipeline.run(self._chunks(3, 8), lambda view, chunk: None, write, lambda: None,
+                     readinto, done.append, lambda: False)
+        assert [chunk['error'] is None for chunk in done] == [True, False, True]
+        assert done[1]['stage'] == 'write'
+        assert reads == [0, 16]
+
+    def test_stop_skips_chunks_already_in_ring(self):
+        done = []
+        writes = []
+        stop = threading.Event()
+        ring_full = threading.Event()
+
+        def write(data, offset):
+            writes.append(offset)
+            if len(writes) == 3:
+                ring_full.set()
+
+        def readinto(view, offset):
+            # Проверка первого блока ждёт, пока в кольце не окажутся записанные следом блоки
+            if offset == 0:
+                ring_full.wait(5)
+            return len(view)
+
+        def on_chunk(chunk):
+            done.append(chunk['offset'])
+            stop.set()
+
+        pipeline = ChunkPipeline(8)
+        pipeline.run(self._chunks(10, 8), lambda view, chunk: None, write, lambda: None,
+                     readinto, on_chunk, stop.is_set)
+        # Блоки 1 и 2 записаны до остановки, но не проверяются и обработчику не передаются
+        assert writes[:3] == [0, 8, 16]
+        assert done == [0]
@@ -0,0 +1,39 @@
+import pytest
+from core.sampling import stratified_samples, defect_rate_estimate
+
+MB = 1024 * 1024
+
+
+class TestStratifiedSamples:
+    def test_coverage_and_edges(self):
+        intervals = [(0, 1024 * MB), (2048 * MB, 3072 * MB)]
+        plan = stratified_samples(intervals, 0.05, 4 * MB, seed=1)
+        assert len(plan) == 2
+        for (start, end), samples in zip(intervals, plan):
+            # Края интервала проверяются всегда
+            assert samples[0][0] == start
+            assert samples[-1][1] == end
+            # Участки не пересекаются и не выходят за интервал
+            for (a_start, a_end), (b_start, _) in zip(samples, samples[1:]):
+                assert a_end <= b_start
+            assert all(start <= s and e <= end for s, e in samples)
+            covered = sum(e - s for s, e in samples)
+            assert covered == pytest.approx(0.05 * (end - start), rel=0.1)
+
+    def test_same_seed_same_plan(self):
+        intervals = [(0, 512 * MB)]
+        assert stratified_samples(intervals, 0.1, MB, seed=7) == stratified_samples(intervals, 0.1, MB, seed=7)
+
+    def test_small_interval_tested_fully(self):
+        assert stratified_samples([(0, MB)], 0.01, 4 * MB, seed=0) == [[(0, MB)]]
+
+
+class TestDefectRateEstimate:
+    def test_no_defects_rule_of_three(self):
+        estimate = defect_rate_estimate(0, 1000)
+        assert estimate['defect_rate'] == 0.0
+        assert estimate['defect_rate_high'] == pytest.approx(3 / 1000, rel=0.35)
+
+    def test_interval_contains_rate(self):
+        estimate = defect_rate_estimate(10, 100)
+        assert estimate['defect_rate_low'] < 0.1 < estimate['defect_rate_high']
@@ -0,0 +1,42 @@
+import random
+import statistics
+
+import pytest
+from core.streaming_stats import StreamingStats, DownsampledSeries
+
+
+class TestStreamingStats:
+    def test_moments_match_exact_values(self):
+        rng = random.Random(1)
+        values = [rng.uniform(10, 200) for _ in range(5000)]
+        acc = StreamingStats()
+        for value in values:
+            acc.add(value)
+        assert acc.count == len(values)
+        assert acc.mean == pytest.approx(statistics.fmean(values))
+        assert acc.stdev == pytest.approx(statistics.stdev(values))
+        assert (acc.min, acc.max) == (min(values), max(values))
+
+    def test_percentiles_within_bucket_precision(self):
+        values = list(range(1, 10001))
+        acc = StreamingStats()
+        for value in values:
+            acc.add(value)
+        assert acc.percentile(50) == pytest.approx(5000, rel=0.01)
+        assert acc.percentile(99) == pytest.approx(9900, rel=0.01)
+        assert acc.percentile(1) == pytest.approx(100, rel=0.01)
+
+    def test_empty_summary(self):
+        summary = StreamingStats().summary()
+        assert summary['count'] == 0 and summary['p50'] == 0.0 and summary['min'] == 0.0
+
+
+class TestDownsampledSeries:
+    def test_bounded_and_covers_whole_run(self):
+        series = DownsampledSeries(max_points=100)
+        for i in range(100000):
+            series.add(float(i), 1.0)
+        times, values = series.snapshot()
+        assert len(times) <= 101
+        assert times[0] < 1000 and times[-1] > 98000
+        assert all(value == 1.0 for value in values)
@@ -0,0 +1,111 @@
+import threading
+
+from core.sync_policy import SyncPolicy, normalize_policy, DEFAULT_POLICY
+
+MB = 1024 * 1024
+
+
+class TestSyncPolicy:
+    def make(self, policy, **kwargs):
+        calls = []
+        return SyncPolicy(lambda: calls.append(1), policy, **kwargs), calls
+
+    def test_chunk_syncs_every_write(self):
+        policy, calls = self.make('chunk')
+        for _ in range(3):
+            policy.written(MB)
+            assert policy.commit() is True
+        assert len(calls) == 3
+        # Без новых записей sync не нужен
+        assert policy.commit() is True
+        assert len(calls) == 3
+
+    def test_interval_syncs_after_threshold(self):
+        latencies = []
+        policy, calls = self.make('interval', interval_mb=4, record_latency=latencies.append)
+        durable = []
+        for _ in range(10):
+            policy.written(MB)
+            durable.append(policy.commit())
+        assert durable == [False, False, False, True] * 2 + [False, False]
+        assert len(calls) == 2
+        policy.flush()
+        assert len(calls) == 3
+        assert len(latencies) == 3
+        summary = policy.summary()
+        assert summary['syncs'] == 3 and summary['interval_mb'] == 4
+
+    def test_pass_syncs_only_on_flush(self):
+        policy, calls = self.make('pass')
+        for _ in range(5):
+            policy.written(MB)
+            assert policy.commit() is False
+        policy.flush()
+        policy.flush()
+        assert len(calls) == 1
+
+    def test_direct_falls_back_without_direct_io(self):
+        policy, calls = self.make('direct', direct=True)
+        policy.written(MB)
+        assert policy.commit() is True
+        assert calls == []
+        policy.flush()
+        assert len(calls) == 1
+
+        policy, calls = self.make('direct', direct=False)
+        assert policy.effective == 'chunk'
+        policy.written(MB)
+        policy.commit()
+        assert len(calls) == 1
+        assert '→ chunk' in policy.describe()
+
+    def test_normalize(self):
+        assert normalize_policy('INTERVAL') == 'interval'
+        assert normalize_policy('bogus') == DEFAULT_POLICY
+        assert normalize_policy(None) == DEFAULT_POLICY
+
+    def test_concurrent_writers(self):
+        policy, calls = self.make('interval', interval_mb=8)
+
+        def writer():
+            for _ in range(100):
+                policy.written(MB)
+                policy.commit()
+
+        threads = [threading.Thread(target=writer) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        policy.flush()
+        assert 1 <= len(calls) <= 400 // 8 + 1
+        assert policy.summary()['syncs'] == len(calls)
+
+    def test_commit_waits_for_sync_in_flight(self):
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def slow_sync():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+
+        policy = SyncPolicy(slow_sync, 'chunk')
+        # Оба блока записаны до того, как первый поток начал sync
+        policy.written(MB)
+        policy.written(MB)
+        results = {}
+        first = threading.Thread(target=lambda: results.setdefault('first', policy.commit()))
+        first.start()
+        assert started.wait(5)
+        second = threading.Thread(target=lambda: results.setdefault('second', policy.commit()))
+        second.start()
+        second.join(0.2)
+        # sync первого потока покрывает и второй блок, но ещё не завершён
+        assert second.is_alive() and 'second' not in results
+        release.set()
+        first.join(5)
+        second.join(5)
+        assert results == {'first': True, 'second': True}
+        assert len(calls) == 1